@@ -0,0 +1,55 @@
+"""Native Conversion Benchmark
+
+Measures the NumPy conversion path (no Blender) between GLB, STL and OBJ
+on a synthetic height-field scan with UVs, including a uniform scale.
+
+Usage:
+    python benchmarks/bench_convert.py                 # 1M faces
+    python benchmarks/bench_convert.py --faces 200000
+"""
+
+import sys
+import time
+import argparse
+import tempfile
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src'))
+
+from convert.native_convert import NativeConverter, OUTPUT_FORMATS
+from utils.mesh import Mesh
+from utils.mesh_io import save_mesh
+from bench_diagnose import make_grid_scan
+
+
+def run(num_faces: int) -> None:
+    data = make_grid_scan(num_faces)
+    vertices = data['vertices']
+    mesh = Mesh(vertices, data['faces'], uvs=vertices[:, :2])
+    print(f"Faces: {mesh.num_faces:,}  vertices: {mesh.num_vertices:,}")
+    
+    converter = NativeConverter()
+    with tempfile.TemporaryDirectory() as tmp:
+        sources = []
+        for ext in OUTPUT_FORMATS:
+            source = str(Path(tmp) / f"input{ext}")
+            save_mesh(source, mesh)
+            sources.append(source)
+        
+        for source in sources:
+            for ext in OUTPUT_FORMATS:
+                output = str(Path(tmp) / f"output{ext}")
+                start = time.perf_counter()
+                result = converter.convert(source, output, {'scale': 2.0})
+                elapsed = time.perf_counter() - start
+                print(f"{Path(source).suffix:>5} -> {ext:<5} {elapsed:8.3f}s  "
+                      f"{result['size'] / 1e6:8.1f} MB")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Native conversion benchmark')
+    parser.add_argument('--faces', type=int, default=1_000_000, help='Approximate face count')
+    args = parser.parse_args()
+    
+    run(args.faces)
@@ -0,0 +1,70 @@
+"""Parallel Diagnosis Benchmark
+
+Times GeometryDiagnostics.analyze on a synthetic height-field scan with
+1, 2, 4, ... worker processes and checks that every report matches the
+serial one.
+
+Usage:
+    python benchmarks/bench_diagnose.py                  # 10M faces, up to 8 workers
+    python benchmarks/bench_diagnose.py --faces 2000000 --max-workers 4
+"""
+
+import sys
+import time
+import argparse
+from pathlib import Path
+
+import numpy as np
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src'))
+
+from diagnose.index import GeometryDiagnostics
+
+
+def make_grid_scan(num_faces: int, seed: int = 0) -> dict:
+    """Noisy height-field grid with roughly num_faces triangles"""
+    rng = np.random.default_rng(seed)
+    side = int(np.sqrt(num_faces / 2)) + 1
+    xs, ys = np.meshgrid(np.arange(side), np.arange(side))
+    vertices = np.column_stack([xs.ravel(), ys.ravel(), rng.random(side * side) * 0.1])
+    
+    grid = np.arange(side * side).reshape(side, side)
+    a = grid[:-1, :-1].ravel()
+    b = grid[1:, :-1].ravel()
+    c = grid[:-1, 1:].ravel()
+    d = grid[1:, 1:].ravel()
+    faces = np.concatenate([np.column_stack([a, b, c]), np.column_stack([b, d, c])])
+    return {'vertices': vertices, 'faces': faces[rng.permutation(len(faces))]}
+
+
+def run(num_faces: int, max_workers: int) -> None:
+    mesh = make_grid_scan(num_faces)
+    print(f"Faces: {len(mesh['faces']):,}  vertices: {len(mesh['vertices']):,}")
+    
+    baseline = None
+    serial_time = None
+    workers = 1
+    while workers <= max_workers:
+        start = time.perf_counter()
+        report = GeometryDiagnostics(mesh, num_workers=workers).analyze()
+        elapsed = time.perf_counter() - start
+        
+        if baseline is None:
+            baseline, serial_time = report, elapsed
+        status = 'identical' if report == baseline else 'MISMATCH'
+        print(
+            f"workers={workers:2d}: {elapsed:8.3f}s  "
+            f"{len(mesh['faces']) / elapsed / 1e6:6.2f} M faces/s  "
+            f"speedup {serial_time / elapsed:5.2f}x  {status}"
+        )
+        workers *= 2
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Parallel diagnosis benchmark')
+    parser.add_argument('--faces', type=int, default=10_000_000, help='Approximate face count')
+    parser.add_argument('--max-workers', type=int, default=8, help='Largest worker count to try')
+    args = parser.parse_args()
+    
+    run(args.faces, args.max_workers)
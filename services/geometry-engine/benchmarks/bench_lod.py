@@ -0,0 +1,63 @@
+"""LOD Decimation Benchmark
+
+Measures the quadric edge-collapse chain (each level decimated from the
+previous one) on a synthetic height-field scan. The x / y bounding box
+drift of every level shows how well the open border is held in place.
+
+Usage:
+    python benchmarks/bench_lod.py                  # 1M faces, ratios 0.5 0.25 0.1
+    python benchmarks/bench_lod.py --faces 5000000 --ratios 0.5 0.1
+"""
+
+import sys
+import time
+import argparse
+from pathlib import Path
+
+import numpy as np
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src'))
+
+from lod.decimate import QuadricDecimator
+from utils.mesh import Mesh
+from bench_diagnose import make_grid_scan
+
+
+def run(num_faces: int, ratios: list) -> None:
+    data = make_grid_scan(num_faces)
+    mesh = Mesh(data['vertices'], data['faces'])
+    print(f"Faces: {mesh.num_faces:,}  vertices: {mesh.num_vertices:,}")
+    
+    source = mesh.vertices.astype(np.float64)
+    
+    start = time.perf_counter()
+    decimator = QuadricDecimator(mesh)
+    print(f"{'setup':<10} {time.perf_counter() - start:8.3f}s")
+    
+    total = 0.0
+    for ratio in ratios:
+        start = time.perf_counter()
+        decimator.decimate(int(round(mesh.num_faces * ratio)))
+        lod = decimator.to_mesh()
+        elapsed = time.perf_counter() - start
+        total += elapsed
+        
+        # The border lies in x / y; z extremes are noise and are smoothed away
+        drift = max(
+            np.abs(lod.vertices[:, :2].min(axis=0) - source[:, :2].min(axis=0)).max(),
+            np.abs(lod.vertices[:, :2].max(axis=0) - source[:, :2].max(axis=0)).max()
+        )
+        print(f"{ratio:<10g} {elapsed:8.3f}s  faces {lod.num_faces:>10,}  "
+              f"vertices {lod.num_vertices:>10,}  bbox drift {drift:.2e}")
+    print(f"{'chain':<10} {total:8.3f}s")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='LOD decimation benchmark')
+    parser.add_argument('--faces', type=int, default=1_000_000, help='Approximate face count')
+    parser.add_argument('--ratios', type=float, nargs='+', default=[0.5, 0.25, 0.1],
+                        help='Face fractions, finest first')
+    args = parser.parse_args()
+    
+    run(args.faces, args.ratios)
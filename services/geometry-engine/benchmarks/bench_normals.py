@@ -0,0 +1,70 @@
+"""Vertex Normal Benchmark
+
+Measures vertex-normal throughput (area and angle weighting, crease split)
+on a synthetic height-field scan, with np.add.at accumulation as the
+baseline.
+
+Usage:
+    python benchmarks/bench_normals.py                  # 5M faces
+    python benchmarks/bench_normals.py --faces 1000000
+"""
+
+import sys
+import time
+import argparse
+from pathlib import Path
+
+import numpy as np
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src'))
+
+from repair.normals import compute_vertex_normals, split_creases
+from bench_diagnose import make_grid_scan
+
+
+def add_at_normals(vertices: np.ndarray, faces: np.ndarray) -> np.ndarray:
+    """Baseline: area-weighted normals accumulated with np.add.at"""
+    p0 = vertices[faces[:, 0]]
+    cross = np.cross(vertices[faces[:, 1]] - p0, vertices[faces[:, 2]] - p0)
+    normals = np.zeros_like(vertices)
+    for k in range(3):
+        np.add.at(normals, faces[:, k], cross)
+    length = np.linalg.norm(normals, axis=1)
+    length[length == 0] = 1
+    return normals / length[:, None]
+
+
+def report(name: str, num_faces: int, elapsed: float) -> None:
+    print(f"{name:<16} {elapsed:8.3f}s  {num_faces / elapsed / 1e6:6.2f} M faces/s")
+
+
+def run(num_faces: int, crease_angle: float) -> None:
+    mesh = make_grid_scan(num_faces)
+    vertices, faces = mesh['vertices'], mesh['faces']
+    print(f"Faces: {len(faces):,}  vertices: {len(vertices):,}")
+    
+    for weighting in ('area', 'angle'):
+        start = time.perf_counter()
+        compute_vertex_normals(vertices, faces, weighting)
+        report(f"bincount/{weighting}", len(faces), time.perf_counter() - start)
+    
+    start = time.perf_counter()
+    split_creases(vertices, faces, crease_angle)
+    report(f"crease {crease_angle:g} deg", len(faces), time.perf_counter() - start)
+    
+    start = time.perf_counter()
+    baseline = add_at_normals(vertices, faces)
+    report("np.add.at/area", len(faces), time.perf_counter() - start)
+    
+    area = compute_vertex_normals(vertices, faces, 'area')
+    print(f"max deviation from baseline: {np.abs(area - baseline).max():.2e}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Vertex normal benchmark')
+    parser.add_argument('--faces', type=int, default=5_000_000, help='Approximate face count')
+    parser.add_argument('--crease-angle', type=float, default=30.0, help='Crease angle in degrees')
+    args = parser.parse_args()
+    
+    run(args.faces, args.crease_angle)
@@ -0,0 +1,59 @@
+"""Diagnose -> Repair Pipeline Benchmark
+
+Compares the upload flow as two separate calls (diagnose_mesh, then
+repair_mesh; each loads the file and rebuilds the topology) with the fused
+pipeline on a synthetic height-field scan, stored as GLB (indexed) and
+STL (unwelded corners).
+
+Usage:
+    python benchmarks/bench_pipeline.py                 # 1M faces
+    python benchmarks/bench_pipeline.py --faces 200000
+"""
+
+import sys
+import time
+import argparse
+import tempfile
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src'))
+
+from diagnose.index import diagnose_mesh
+from repair.index import repair_mesh
+from pipeline.index import diagnose_and_repair
+from utils.mesh import Mesh
+from utils.mesh_io import save_mesh
+from bench_diagnose import make_grid_scan
+
+
+def run(num_faces: int) -> None:
+    data = make_grid_scan(num_faces)
+    mesh = Mesh(data['vertices'], data['faces'])
+    print(f"Faces: {mesh.num_faces:,}  vertices: {mesh.num_vertices:,}")
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        for suffix in ('.glb', '.stl'):
+            source = str(Path(tmp) / f"scan{suffix}")
+            save_mesh(source, mesh)
+            
+            start = time.perf_counter()
+            diagnose_mesh(source)
+            repair_mesh(source, str(Path(tmp) / 'separate.glb'))
+            separate = time.perf_counter() - start
+            
+            start = time.perf_counter()
+            result = diagnose_and_repair(source, str(Path(tmp) / 'fused.glb'))
+            fused = time.perf_counter() - start
+            
+            print(f"{suffix:<6} separate {separate:8.3f}s  pipeline {fused:8.3f}s  "
+                  f"skipped {result['skipped']}")
+            print(f"{'':<6} {result['timings']}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Diagnose -> repair pipeline benchmark')
+    parser.add_argument('--faces', type=int, default=1_000_000, help='Approximate face count')
+    args = parser.parse_args()
+    
+    run(args.faces)
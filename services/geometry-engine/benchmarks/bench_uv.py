@@ -0,0 +1,55 @@
+"""UV Diagnostics Benchmark
+
+Measures the UV analysis pass (areas, flips, stretch, coverage, island
+overlaps) on a synthetic height-field scan with a planar projection,
+with and without scrambled UVs (worst case for rasterization).
+
+Usage:
+    python benchmarks/bench_uv.py                  # 1M faces
+    python benchmarks/bench_uv.py --faces 5000000
+"""
+
+import sys
+import time
+import argparse
+from pathlib import Path
+
+import numpy as np
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src'))
+
+from diagnose.uv import analyze_uvs
+from utils.mesh import Mesh
+from utils.topology import shell_labels
+from bench_diagnose import make_grid_scan
+
+
+def report(name: str, num_faces: int, elapsed: float, result: dict) -> None:
+    coverage = 'skipped' if result['coverage'] is None else f"{result['coverage']:.3f}"
+    print(f"{name:<10} {elapsed:8.3f}s  {num_faces / elapsed / 1e6:6.2f} M faces/s  "
+          f"coverage {coverage}  stretch {result['stretch']:.3f}  "
+          f"flipped {result['flipped_faces']:,}  raster {result['raster_resolution']}")
+
+
+def run(num_faces: int) -> None:
+    data = make_grid_scan(num_faces)
+    vertices = data['vertices']
+    uvs = (vertices[:, :2] - vertices[:, :2].min(axis=0)) / np.ptp(vertices[:, :2], axis=0)
+    mesh = Mesh(vertices, data['faces'], uvs=uvs)
+    print(f"Faces: {mesh.num_faces:,}  vertices: {mesh.num_vertices:,}")
+    
+    label = shell_labels(mesh.num_faces, mesh.edge_table)
+    scrambled = np.random.default_rng(1).random(mesh.uvs.shape).astype(mesh.uvs.dtype)
+    for name, coords in (('planar', mesh.uvs), ('scrambled', scrambled)):
+        start = time.perf_counter()
+        result = analyze_uvs(mesh.vertices, mesh.faces, coords, label=label)
+        report(name, mesh.num_faces, time.perf_counter() - start, result)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='UV diagnostics benchmark')
+    parser.add_argument('--faces', type=int, default=1_000_000, help='Approximate face count')
+    args = parser.parse_args()
+    
+    run(args.faces)
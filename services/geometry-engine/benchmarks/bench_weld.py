@@ -0,0 +1,85 @@
+"""Vertex Welding Benchmark
+
+Compares the spatial-hash welding engine against a KD-tree baseline
+(scipy.spatial.cKDTree pair query + connected components) on a
+synthetic point soup with jittered duplicates.
+
+Usage:
+    python benchmarks/bench_weld.py                    # 1M vertices
+    python benchmarks/bench_weld.py --vertices 10000000
+"""
+
+import sys
+import time
+import argparse
+from pathlib import Path
+
+import numpy as np
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src'))
+
+from repair.weld import weld_vertices
+
+
+def make_point_soup(num_vertices: int, duplicate_ratio: float, tolerance: float, seed: int = 0) -> np.ndarray:
+    """Random unique points plus jittered copies of a subset of them"""
+    rng = np.random.default_rng(seed)
+    num_unique = int(num_vertices / (1.0 + duplicate_ratio))
+    unique = rng.random((num_unique, 3))
+    source = rng.integers(0, num_unique, num_vertices - num_unique)
+    jitter = rng.uniform(-0.2, 0.2, (len(source), 3)) * tolerance
+    points = np.concatenate([unique, unique[source] + jitter])
+    return points[rng.permutation(len(points))]
+
+
+def kdtree_weld(vertices: np.ndarray, tolerance: float) -> int:
+    """Baseline: number of clusters found with a KD-tree"""
+    from scipy.spatial import cKDTree
+    from scipy.sparse import coo_matrix
+    from scipy.sparse.csgraph import connected_components
+    
+    pairs = cKDTree(vertices).query_pairs(tolerance, output_type='ndarray')
+    n = len(vertices)
+    graph = coo_matrix(
+        (np.ones(len(pairs), dtype=np.int8), (pairs[:, 0], pairs[:, 1])),
+        shape=(n, n)
+    )
+    count, _ = connected_components(graph, directed=False)
+    return count
+
+
+def run(num_vertices: int, duplicate_ratio: float, tolerance: float) -> None:
+    vertices = make_point_soup(num_vertices, duplicate_ratio, tolerance)
+    print(f"Vertices: {len(vertices):,}  tolerance: {tolerance:g}")
+    
+    start = time.perf_counter()
+    keep, _ = weld_vertices(vertices, tolerance)
+    elapsed = time.perf_counter() - start
+    print(
+        f"spatial hash: {elapsed:8.3f}s  "
+        f"{len(vertices) / elapsed / 1e6:6.2f} M vertices/s  "
+        f"-> {len(keep):,} vertices"
+    )
+    
+    try:
+        start = time.perf_counter()
+        clusters = kdtree_weld(vertices, tolerance)
+        elapsed = time.perf_counter() - start
+        print(
+            f"kd-tree:      {elapsed:8.3f}s  "
+            f"{len(vertices) / elapsed / 1e6:6.2f} M vertices/s  "
+            f"-> {clusters:,} vertices"
+        )
+    except ImportError:
+        print("kd-tree:      skipped (scipy not installed)")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Vertex welding benchmark')
+    parser.add_argument('--vertices', type=int, default=1_000_000, help='Total vertex count')
+    parser.add_argument('--duplicates', type=float, default=0.5, help='Duplicates per unique vertex')
+    parser.add_argument('--tolerance', type=float, default=1e-6, help='Weld tolerance')
+    args = parser.parse_args()
+    
+    run(args.vertices, args.duplicates, args.tolerance)
@@ -0,0 +1,191 @@
+"""Synthetic Mesh Generators
+
+Seeded, vectorized generators for benchmarks. Each takes an approximate
+face count and a seed and returns a Mesh; the same arguments always give
+the same mesh.
+
+- sphere: geodesic (subdivided icosahedron) sphere, one closed shell
+- scan: noisy height-field scan with circular holes punched in it
+- soup: unwelded triangle soup (every corner its own vertex, jittered
+  below the weld tolerance) of a sphere
+- knot: trefoil tube thick enough to pass through itself
+- scene: many small closed shells, scattered and partly overlapping, some
+  with inverted winding
+"""
+
+from typing import Callable, Dict
+
+import numpy as np
+
+from utils.mesh import Mesh
+
+# Face counts of the named benchmark sizes
+SIZES = {'10k': 10_000, '1m': 1_000_000, '10m': 10_000_000}
+
+_ICOSAHEDRON_FACES = np.array([
+    [0, 11, 5], [0, 5, 1], [0, 1, 7], [0, 7, 10], [0, 10, 11],
+    [1, 5, 9], [5, 11, 4], [11, 10, 2], [10, 7, 6], [7, 1, 8],
+    [3, 9, 4], [3, 4, 2], [3, 2, 6], [3, 6, 8], [3, 8, 9],
+    [4, 9, 5], [2, 4, 11], [6, 2, 10], [8, 6, 7], [9, 8, 1],
+])
+
+
+def _icosahedron() -> np.ndarray:
+    t = (1.0 + np.sqrt(5.0)) / 2.0
+    vertices = np.array([
+        [-1, t, 0], [1, t, 0], [-1, -t, 0], [1, -t, 0],
+        [0, -1, t], [0, 1, t], [0, -1, -t], [0, 1, -t],
+        [t, 0, -1], [t, 0, 1], [-t, 0, -1], [-t, 0, 1],
+    ], dtype=np.float64)
+    return vertices / np.linalg.norm(vertices, axis=1, keepdims=True)
+
+
+def _triangle_grid(frequency: int):
+    """Barycentric points and triangles splitting one triangle into frequency^2"""
+    n = frequency
+    i, j = np.nonzero(np.add.outer(np.arange(n + 1), np.arange(n + 1)) <= n)
+    index = np.zeros((n + 2, n + 2), dtype=np.int64)
+    index[i, j] = np.arange(len(i))
+    
+    ui, uj = np.nonzero(np.add.outer(np.arange(n), np.arange(n)) < n)
+    up = np.column_stack([index[ui, uj], index[ui + 1, uj], index[ui, uj + 1]])
+    di, dj = np.nonzero(np.add.outer(np.arange(n), np.arange(n)) < n - 1)
+    down = np.column_stack([index[di + 1, dj], index[di + 1, dj + 1], index[di, dj + 1]])
+    return i / n, j / n, np.concatenate([up, down])
+
+
+def _weld_exact(vertices: np.ndarray, faces: np.ndarray, digits: int = 9):
+    """Merge vertices that coincide up to rounding (shared subdivision edges)"""
+    keys = np.round(vertices, digits)
+    _, first, inverse = np.unique(keys, axis=0, return_index=True, return_inverse=True)
+    return vertices[first], inverse.ravel()[faces]
+
+
+def _geodesic_sphere(num_faces: int) -> Mesh:
+    """Unit geodesic sphere with 20 * n^2 faces, n chosen closest to num_faces"""
+    frequency = max(1, int(round(np.sqrt(num_faces / 20.0))))
+    corners = _icosahedron()
+    u, v, grid_faces = _triangle_grid(frequency)
+    
+    a = corners[_ICOSAHEDRON_FACES[:, 0]]
+    b = corners[_ICOSAHEDRON_FACES[:, 1]]
+    c = corners[_ICOSAHEDRON_FACES[:, 2]]
+    # (20, P, 3) points of every base face
+    points = a[:, None] + (b - a)[:, None] * u[None, :, None] + (c - a)[:, None] * v[None, :, None]
+    vertices = points.reshape(-1, 3)
+    faces = (grid_faces[None] + (np.arange(20) * len(u))[:, None, None]).reshape(-1, 3)
+    
+    vertices, faces = _weld_exact(vertices, faces)
+    vertices /= np.linalg.norm(vertices, axis=1, keepdims=True)
+    return Mesh(vertices.astype(np.float32), faces)
+
+
+def sphere(num_faces: int, seed: int = 0) -> Mesh:
+    """Closed geodesic sphere (faces in random order)"""
+    rng = np.random.default_rng(seed)
+    mesh = _geodesic_sphere(num_faces)
+    return Mesh(mesh.vertices, mesh.faces[rng.permutation(mesh.num_faces)])
+
+
+def scan(num_faces: int, seed: int = 0, hole_fraction: float = 0.02) -> Mesh:
+    """Noisy height field with round holes covering about hole_fraction of it"""
+    rng = np.random.default_rng(seed)
+    side = int(np.sqrt(num_faces / (2.0 * (1.0 - hole_fraction)))) + 1
+    xs, ys = np.meshgrid(np.arange(side, dtype=np.float64), np.arange(side, dtype=np.float64))
+    heights = np.sin(xs / side * 6.0) * np.cos(ys / side * 4.0) * side * 0.05
+    heights += rng.normal(0.0, 0.05, heights.shape)
+    vertices = np.column_stack([xs.ravel(), ys.ravel(), heights.ravel()])
+    
+    grid = np.arange(side * side).reshape(side, side)
+    a = grid[:-1, :-1].ravel()
+    b = grid[1:, :-1].ravel()
+    c = grid[:-1, 1:].ravel()
+    d = grid[1:, 1:].ravel()
+    faces = np.concatenate([np.column_stack([a, b, c]), np.column_stack([b, d, c])])
+    
+    # Round holes of radius 2.5 cells, rasterized onto the grid cells
+    radius = 2.5
+    cells = side - 1
+    num_holes = max(1, int(hole_fraction * cells ** 2 / (np.pi * radius ** 2)))
+    centers = rng.integers(0, cells, (num_holes, 2))
+    reach = int(np.ceil(radius))
+    dx, dy = np.meshgrid(np.arange(-reach, reach + 1), np.arange(-reach, reach + 1))
+    disk = np.column_stack([dx.ravel(), dy.ravel()])[dx.ravel() ** 2 + dy.ravel() ** 2 <= radius ** 2]
+    covered = (centers[:, None] + disk[None]).reshape(-1, 2)
+    covered = covered[((covered >= 0) & (covered < cells)).all(axis=1)]
+    cell_mask = np.zeros((cells, cells), dtype=bool)
+    cell_mask[covered[:, 1], covered[:, 0]] = True
+    # Both triangles of a cell go (faces are ordered cell by cell, twice)
+    in_hole = np.tile(cell_mask.ravel(), 2)
+    
+    faces = faces[~in_hole]
+    return Mesh(vertices.astype(np.float32), faces[rng.permutation(len(faces))])
+
+
+def soup(num_faces: int, seed: int = 0, jitter: float = 1e-8) -> Mesh:
+    """Sphere with every face corner as its own (slightly jittered) vertex"""
+    rng = np.random.default_rng(seed)
+    mesh = _geodesic_sphere(num_faces)
+    corners = mesh.vertices.astype(np.float64)[mesh.faces.ravel()]
+    corners += rng.uniform(-jitter, jitter, corners.shape)
+    order = rng.permutation(mesh.num_faces)
+    faces = np.arange(len(corners)).reshape(-1, 3)[order]
+    return Mesh(corners.astype(np.float32), faces)
+
+
+def knot(num_faces: int, seed: int = 0, tube_radius: float = 0.9) -> Mesh:
+    """(2, 3) torus knot tube; the radius makes neighbouring strands overlap"""
+    rng = np.random.default_rng(seed)
+    ring = max(8, int(np.sqrt(num_faces / 2.0 / 16.0)))
+    segments = max(16, int(num_faces / 2.0 / ring))
+    
+    t = np.arange(segments) * (2.0 * np.pi / segments)
+    radius = 2.0 + np.cos(3.0 * t)
+    curve = np.column_stack([radius * np.cos(2.0 * t), radius * np.sin(2.0 * t), np.sin(3.0 * t)])
+    tangent = np.roll(curve, -1, axis=0) - np.roll(curve, 1, axis=0)
+    tangent /= np.linalg.norm(tangent, axis=1, keepdims=True)
+    normal = np.cross(tangent, [0.0, 0.0, 1.0])
+    normal /= np.linalg.norm(normal, axis=1, keepdims=True)
+    binormal = np.cross(tangent, normal)
+    
+    angle = np.arange(ring) * (2.0 * np.pi / ring)
+    offsets = np.cos(angle)[None, :, None] * normal[:, None] + np.sin(angle)[None, :, None] * binormal[:, None]
+    vertices = (curve[:, None] + tube_radius * offsets).reshape(-1, 3)
+    
+    s, r = np.meshgrid(np.arange(segments), np.arange(ring), indexing='ij')
+    s1 = (s + 1) % segments
+    r1 = (r + 1) % ring
+    a = (s * ring + r).ravel()
+    b = (s1 * ring + r).ravel()
+    c = (s1 * ring + r1).ravel()
+    d = (s * ring + r1).ravel()
+    faces = np.concatenate([np.column_stack([a, b, c]), np.column_stack([a, c, d])])
+    return Mesh(vertices.astype(np.float32), faces[rng.permutation(len(faces))])
+
+
+def scene(num_faces: int, seed: int = 0, shell_faces: int = 320, inverted: float = 0.1) -> Mesh:
+    """Scattered closed spheres of about shell_faces faces, some inside out"""
+    rng = np.random.default_rng(seed)
+    unit = _geodesic_sphere(shell_faces)
+    count = max(1, int(round(num_faces / unit.num_faces)))
+    
+    # Spread the shells so that neighbours sometimes overlap
+    extent = np.cbrt(count) * 2.0
+    centers = rng.uniform(0.0, extent, (count, 3))
+    scales = rng.uniform(0.5, 1.5, count)
+    vertices = (unit.vertices[None].astype(np.float64) * scales[:, None, None] + centers[:, None]).reshape(-1, 3)
+    
+    faces = unit.faces[None] + (np.arange(count) * unit.num_vertices)[:, None, None]
+    flip = rng.random(count) < inverted
+    faces[flip] = faces[flip][:, :, ::-1]
+    faces = faces.reshape(-1, 3)
+    return Mesh(vertices.astype(np.float32), faces[rng.permutation(len(faces))])
+
+
+GENERATORS: Dict[str, Callable[..., Mesh]] = {
+    'sphere': sphere,
+    'scan': scan,
+    'soup': soup,
+    'knot': knot,
+    'scene': scene,
+}
@@ -0,0 +1,260 @@
+"""Geometry Engine Benchmark Suite
+
+Times (and optionally memory-profiles) every stage of the engine on the
+seeded synthetic meshes of benchmarks/generators.py:
+- load: reading each serialized format back (glb / stl / obj / tmsh)
+- diagnose.*: every GeometryDiagnostics check (plus the shared mesh stats)
+- repair.*: every GeometryRepair pass (aggressive mode, so all of them run)
+- save.*: serialization to each format
+
+Stage times come from the utils.metrics spans the engine already records;
+each case runs --repeat times and the median run counts. With --memory a
+separate traced run adds each stage's tracemalloc allocation peak.
+
+Results are written as JSON keyed "<mesh>/<size>/<stage>". --compare
+checks them against a stored baseline and exits with status 1 on a
+regression, so CI can run e.g.:
+    
+    python benchmarks/suite.py --sizes 10k --output bench.json \\
+        --compare benchmarks/baseline.json
+
+Times are normalized by a fixed NumPy calibration workload measured on
+both machines (median of several runs, before and after the suite), so a
+baseline recorded on a faster or slower host still compares. A stage only
+regresses when it is both --time-threshold times and NOISE_FLOOR_SECONDS
+slower than expected, so millisecond stages do not trip on timer jitter,
+and cases that look regressed are measured again before they are
+reported (a real regression is slow both times).
+Refresh the baseline with --output benchmarks/baseline.json after
+intended performance changes.
+
+Usage:
+    python benchmarks/suite.py                                # all meshes, 10k faces
+    python benchmarks/suite.py --sizes 10k 1m --meshes sphere soup --memory
+"""
+
+import sys
+import json
+import time
+import argparse
+import platform
+import tempfile
+from pathlib import Path
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src'))
+
+from diagnose.index import GeometryDiagnostics
+from repair.index import GeometryRepair
+from utils.mesh import Mesh
+from utils.mesh_io import load_mesh, save_mesh
+from utils.metrics import run_traced
+from generators import GENERATORS, SIZES
+
+RESULTS_VERSION = 1
+
+FORMATS = ('.glb', '.stl', '.obj', '.tmsh')
+
+# Slowdowns smaller than this are timer noise and never count as regressions
+NOISE_FLOOR_SECONDS = 0.02
+NOISE_FLOOR_MB = 1.0
+
+
+def calibrate(repeat: int = 7) -> List[float]:
+    """Seconds per run of a fixed sort / gather / reduce workload"""
+    rng = np.random.default_rng(0)
+    data = rng.random(4_000_000)
+    index = rng.integers(0, len(data), len(data))
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        np.sort(data)
+        np.add.reduceat(data[index], np.arange(0, len(data), 16))
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def _fresh(mesh: Mesh) -> Mesh:
+    """Same arrays without any cached derived data"""
+    return Mesh(mesh.vertices, mesh.faces, mesh.normals, mesh.uvs)
+
+
+def _steps(mesh: Mesh, workdir: Path) -> List[Tuple[str, Callable[[], Any]]]:
+    """(format suffix, callable) per traced step; their spans name the stages"""
+    def diagnose():
+        GeometryDiagnostics(_fresh(mesh)).analyze()
+    
+    def repair():
+        GeometryRepair(_fresh(mesh)).repair_all(aggressive=True)
+    
+    steps = [('', diagnose), ('', repair)]
+    # Files are written before they are read back
+    steps += [(ext, partial(save_mesh, str(workdir / f"mesh{ext}"), mesh)) for ext in FORMATS]
+    steps += [(ext, partial(load_mesh, str(workdir / f"mesh{ext}"))) for ext in FORMATS]
+    return steps
+
+
+def _collect(step: Callable[[], Any], suffix: str, memory: bool) -> Dict[str, Dict[str, float]]:
+    """Run one step under a trace; stage name -> measurements"""
+    _, report = run_traced(step, memory=memory)
+    stages = {}
+    for entry in report['spans']:
+        # load / save spans are told apart by format
+        name = entry['name'] + suffix if entry['name'] in ('load', 'save') else entry['name']
+        stage = stages.setdefault(name, {'seconds': 0.0})
+        stage['seconds'] += entry['seconds']
+        if 'alloc_peak_mb' in entry:
+            stage['alloc_peak_mb'] = max(stage.get('alloc_peak_mb', 0.0), entry['alloc_peak_mb'])
+    return stages
+
+
+def run_case(mesh: Mesh, repeat: int, memory: bool) -> Dict[str, Dict[str, float]]:
+    """Median time (and allocation peak) of every stage for one mesh"""
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for suffix, step in _steps(mesh, Path(tmp)):
+            samples = {}
+            for _ in range(repeat):
+                for name, stage in _collect(step, suffix, memory=False).items():
+                    samples.setdefault(name, []).append(stage['seconds'])
+            for name, seconds in samples.items():
+                results.setdefault(name, {})['seconds'] = float(np.median(seconds))
+            if memory:
+                for name, stage in _collect(step, suffix, memory=True).items():
+                    if 'alloc_peak_mb' in stage:
+                        results.setdefault(name, {})['alloc_peak_mb'] = stage['alloc_peak_mb']
+    return results
+
+
+def run_suite(meshes: List[str], sizes: List[str], repeat: int, memory: bool, seed: int) -> Dict[str, Any]:
+    """Run all cases and return the results document"""
+    calibration = calibrate()
+    results = {}
+    for size in sizes:
+        for name in meshes:
+            start = time.perf_counter()
+            mesh = GENERATORS[name](SIZES[size], seed=seed)
+            generated = time.perf_counter() - start
+            print(f"{name}/{size}: {mesh.num_faces:,} faces, {mesh.num_vertices:,} vertices "
+                  f"(generated in {generated:.2f}s)")
+            
+            for stage, values in run_case(mesh, repeat, memory).items():
+                key = f"{name}/{size}/{stage}"
+                results[key] = dict(values, faces=mesh.num_faces)
+                memory_note = f"  {values['alloc_peak_mb']:9.1f} MB" if 'alloc_peak_mb' in values else ''
+                print(f"  {stage:<30} {values['seconds']:9.4f}s{memory_note}")
+    
+    return {
+        'version': RESULTS_VERSION,
+        'machine': {
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            # Sampled on both ends of the run, so a host slowing down in
+            # between shifts it as well
+            'calibration_seconds': float(np.median(calibration + calibrate())),
+        },
+        'config': {'meshes': meshes, 'sizes': sizes, 'repeat': repeat, 'memory': memory, 'seed': seed},
+        'results': results,
+    }
+
+
+def compare(
+    current: Dict[str, Any],
+    baseline: Dict[str, Any],
+    time_threshold: float,
+    memory_threshold: float
+) -> List[str]:
+    """
+    Regressions of current against baseline
+    
+    Args:
+        current: Results document of this run
+        baseline: Stored results document
+        time_threshold: Allowed (calibration-normalized) slowdown factor
+        memory_threshold: Allowed allocation-peak growth factor
+    
+    Returns:
+        One message per regressed stage (empty if none)
+    """
+    speed = current['machine']['calibration_seconds'] / baseline['machine']['calibration_seconds']
+    regressions = []
+    for key, base in baseline['results'].items():
+        now = current['results'].get(key)
+        if now is None:
+            continue
+        expected = base['seconds'] * speed
+        if now['seconds'] > max(expected * time_threshold, expected + NOISE_FLOOR_SECONDS):
+            regressions.append(
+                f"{key}: {now['seconds']:.4f}s vs {expected:.4f}s expected "
+                f"({now['seconds'] / expected:.2f}x)"
+            )
+        if 'alloc_peak_mb' in base and 'alloc_peak_mb' in now:
+            limit = max(base['alloc_peak_mb'] * memory_threshold, NOISE_FLOOR_MB)
+            if now['alloc_peak_mb'] > limit:
+                regressions.append(
+                    f"{key}: {now['alloc_peak_mb']:.1f} MB allocated vs {base['alloc_peak_mb']:.1f} MB"
+                )
+    return regressions
+
+
+def recheck(document: Dict[str, Any], regressions: List[str], repeat: int) -> None:
+    """
+    Measure the cases behind regressions again, keeping each stage's faster median
+    
+    Args:
+        document: Results document (updated in place)
+        regressions: Messages from compare ("<mesh>/<size>/<stage>: ...")
+        repeat: Runs per stage
+    """
+    seed = document['config']['seed']
+    cases = sorted({tuple(message.split('/', 2)[:2]) for message in regressions})
+    for name, size in cases:
+        print(f"Re-measuring {name}/{size}")
+        mesh = GENERATORS[name](SIZES[size], seed=seed)
+        for stage, values in run_case(mesh, repeat, memory=False).items():
+            result = document['results'].get(f"{name}/{size}/{stage}")
+            if result is not None:
+                result['seconds'] = min(result['seconds'], values['seconds'])
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Geometry engine benchmark suite')
+    parser.add_argument('--meshes', nargs='+', default=list(GENERATORS), choices=list(GENERATORS))
+    parser.add_argument('--sizes', nargs='+', default=['10k'], choices=list(SIZES))
+    parser.add_argument('--repeat', type=int, default=7, help='Runs per stage (the median counts)')
+    parser.add_argument('--memory', action='store_true', help='Also record allocation peaks')
+    parser.add_argument('--seed', type=int, default=0, help='Generator seed')
+    parser.add_argument('--output', help='Write results JSON here')
+    parser.add_argument('--compare', help='Baseline results JSON to check against')
+    parser.add_argument('--time-threshold', type=float, default=1.5, help='Allowed slowdown factor')
+    parser.add_argument('--memory-threshold', type=float, default=1.25, help='Allowed allocation growth factor')
+    args = parser.parse_args(argv)
+    
+    document = run_suite(args.meshes, args.sizes, max(1, args.repeat), args.memory, args.seed)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(document, f, indent=1, sort_keys=True)
+        print(f"Results written to {args.output}")
+    
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(document, baseline, args.time_threshold, args.memory_threshold)
+        if regressions:
+            recheck(document, regressions, max(1, args.repeat))
+            regressions = compare(document, baseline, args.time_threshold, args.memory_threshold)
+        for message in regressions:
+            print(f"REGRESSION {message}")
+        if regressions:
+            return 1
+        print(f"No regressions against {args.compare}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -3,48 +3,104 @@
 HTTP API server for 3D geometry processing:
 - Mesh diagnosis (analyze issues)
 - Mesh repair (fix problems)
-- Format conversion (GLB, OBJ, FBX, etc.)
+- Fused diagnose -> repair pipeline (one load, shared mesh state)
+- Level-of-detail chains (quadric decimation)
+- Format conversion (GLB, OBJ, FBX, etc.; geometry-only STL / OBJ / GLB
+  natively, everything else through Blender), singly or in batches
+- Out-of-core diagnosis / repair of very large GLB / TMSH files, tile by
+  tile within a memory budget
+- Incremental diagnosis / repair of re-uploaded assets: results are cached
+  per connected part, so only changed parts are checked again
 
 Usage:
     python main.py                  # Start development server
     python main.py --port 8000      # Custom port
     python main.py --production     # Production mode
+    python main.py --convert-batch jobs.jsonl   # Convert the listed files, one JSON result per line
 """
 
 import sys
+import json
 import argparse
 import logging
+import threading
 from pathlib import Path
+from typing import Iterator
 
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent / 'src'))
 
 from utils.helper import setup_logging, Config
+from utils.cache import ResultCache
 from diagnose.index import diagnose_mesh
+from diagnose.incremental import diagnose_incremental
 from repair.index import repair_mesh
+from pipeline.index import diagnose_and_repair
+from tiles.index import diagnose_tiled, repair_tiled, supports_tiled
+from lod.index import generate_lods
 from convert.blender_convert import BlenderConverter
+from convert.native_convert import NativeConverter
+from convert.batch import BatchConverter, conversion_timeout
 
 logger = logging.getLogger(__name__)
 
+# Uploads are streamed to disk in chunks of this size
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
 
 class GeometryEngine:
     """Main geometry processing engine"""
     
-    def __init__(self, config: Config):
-        """Initialize geometry engine with configuration"""
+    def __init__(self, config: Config, use_blender: bool = True):
+        """
+        Initialize geometry engine with configuration
+        
+        Args:
+            config: Engine configuration
+            use_blender: Start the Blender converter (job worker processes
+                only diagnose / repair / build LODs and skip it)
+        """
         self.config = config
+        self.native = NativeConverter()
         self.converter = None
+        self.cache = ResultCache.from_config(config)
+        # Per-component results of earlier uploads (Config 'incremental_cache')
+        self.component_cache = self.cache if config.get('incremental_cache') else None
+        
+        if not use_blender:
+            return
         
-        # Initialize Blender converter if available
+        # Initialize Blender converter (with a warm worker pool) if available
         try:
-            self.converter = BlenderConverter()
+            self.converter = BlenderConverter(
+                num_workers=config.get('num_workers', 0),
+                max_jobs_per_worker=config.get('blender_max_jobs_per_worker', 50),
+                max_worker_memory_mb=config.get('blender_max_worker_memory_mb', 4096)
+            )
+            threading.Thread(target=self.converter.warm_up, daemon=True).start()
             logger.info("Blender converter initialized")
         except RuntimeError as e:
             logger.warning(f"Blender not available: {e}")
     
+    def close(self) -> None:
+        """Shut down the Blender worker pool (if any)"""
+        if self.converter:
+            self.converter.close()
+    
+    def _out_of_core(self, mesh_path: str, output_path: str = None) -> bool:
+        """Whether a file is large enough (and in a format) for the tiled mode"""
+        threshold = self.config.get('out_of_core_threshold_mb')
+        if threshold is None or not supports_tiled(mesh_path, output_path):
+            return False
+        try:
+            return Path(mesh_path).stat().st_size >= float(threshold) * 1024 * 1024
+        except OSError:
+            return False
+    
     def diagnose(self, mesh_path: str) -> dict:
         """
-        Diagnose mesh issues
+        Diagnose mesh issues (tile by tile for files above
+        'out_of_core_threshold_mb')
         
         Args:
             mesh_path: Path to 3D model file
@@ -53,11 +109,26 @@ class GeometryEngine:
             Diagnosis report
         """
         logger.info(f"Diagnosing mesh: {mesh_path}")
-        return diagnose_mesh(mesh_path)
+        num_workers = self.config.get('num_workers', 1) if self.config.get('parallel_processing') else 1
+        tiled = self._out_of_core(mesh_path)
+        
+        def run() -> dict:
+            if tiled:
+                return diagnose_tiled(mesh_path, self.config.get('out_of_core_memory_mb'))
+            if self.component_cache is not None:
+                return diagnose_incremental(mesh_path, self.component_cache, num_workers)
+            return diagnose_mesh(mesh_path, num_workers)
+        
+        if self.cache is None:
+            return run()
+        
+        # The report does not depend on num_workers, so it is not part of the key
+        return self.cache.get_or_compute(mesh_path, 'diagnose', {'tiled': True} if tiled else {}, run)
     
     def repair(self, mesh_path: str, output_path: str, aggressive: bool = False) -> dict:
         """
-        Repair mesh issues
+        Repair mesh issues (tile by tile for files above
+        'out_of_core_threshold_mb')
         
         Args:
             mesh_path: Input mesh path
@@ -68,50 +139,289 @@ class GeometryEngine:
             Repair report
         """
         logger.info(f"Repairing mesh: {mesh_path} -> {output_path}")
-        return repair_mesh(mesh_path, output_path, aggressive)
+        tolerance = self.config.get('tolerance')
+        crease_angle = self.config.get('crease_angle')
+        tiled = bool(output_path) and self._out_of_core(mesh_path, output_path)
+        
+        def run() -> dict:
+            if tiled:
+                if crease_angle is not None:
+                    logger.warning("crease_angle is ignored by the out-of-core repair")
+                return repair_tiled(
+                    mesh_path, output_path, aggressive,
+                    tolerance=tolerance, memory_mb=self.config.get('out_of_core_memory_mb')
+                )
+            return repair_mesh(
+                mesh_path, output_path, aggressive,
+                tolerance=tolerance, crease_angle=crease_angle, cache=self.component_cache
+            )
+        
+        if self.cache is None or not output_path:
+            return run()
+        
+        options = {
+            'aggressive': aggressive,
+            'tolerance': tolerance,
+            'crease_angle': crease_angle,
+            'output_format': Path(output_path).suffix.lower()
+        }
+        if tiled:
+            options['tiled'] = True
+        return self.cache.get_or_compute(mesh_path, 'repair', options, run, output_path)
     
-    def convert(self, input_path: str, output_path: str, options: dict = None) -> dict:
+    def diagnose_and_repair(self, mesh_path: str, output_path: str, aggressive: bool = False) -> dict:
+        """
+        Diagnose and repair a mesh in one pass
+        
+        Args:
+            mesh_path: Input mesh path
+            output_path: Output mesh path
+            aggressive: Apply aggressive repairs
+        
+        Returns:
+            Pipeline report (before / after diagnosis, repairs, timings)
+        """
+        logger.info(f"Diagnosing and repairing mesh: {mesh_path} -> {output_path}")
+        tolerance = self.config.get('tolerance')
+        crease_angle = self.config.get('crease_angle')
+        num_workers = self.config.get('num_workers', 1) if self.config.get('parallel_processing') else 1
+        
+        def run() -> dict:
+            return diagnose_and_repair(
+                mesh_path, output_path, aggressive,
+                tolerance=tolerance, crease_angle=crease_angle, num_workers=num_workers,
+                cache=self.component_cache
+            )
+        
+        if self.cache is None or not output_path:
+            return run()
+        
+        options = {
+            'aggressive': aggressive,
+            'tolerance': tolerance,
+            'crease_angle': crease_angle,
+            'output_format': Path(output_path).suffix.lower()
+        }
+        return self.cache.get_or_compute(mesh_path, 'diagnose_and_repair', options, run, output_path)
+    
+    def lod(self, mesh_path: str, output_path: str, ratios: list = None) -> dict:
+        """
+        Generate a level-of-detail chain
+        
+        Args:
+            mesh_path: Input mesh path
+            output_path: Base output path (level i is written to
+                <stem>_lod<i><suffix>)
+            ratios: Target face fractions, finest first (default from
+                Config 'lod_ratios')
+        
+        Returns:
+            LOD report
+        """
+        logger.info(f"Generating LODs: {mesh_path} -> {output_path}")
+        if ratios is None:
+            ratios = self.config.get('lod_ratios')
+        
+        # Not cached: the cache keeps one artifact per entry and a chain
+        # writes one file per level
+        return generate_lods(mesh_path, output_path, ratios, tolerance=self.config.get('tolerance'))
+    
+    def convert(self, input_path: str, output_path, options: dict = None, timeout: float = None) -> dict:
         """
         Convert mesh format
         
+        Geometry-only STL / OBJ / GLB conversions run natively; other
+        formats, options and material-heavy scenes go through Blender.
+        
         Args:
             input_path: Source file
-            output_path: Destination file
+            output_path: Destination file, or a list of them (converted
+                from a single import, see 'outputs' in the result)
             options: Conversion options
+            timeout: Seconds Blender may take (default grows with the
+                input size)
         
         Returns:
             Conversion result
         """
-        if not self.converter:
+        options = options or {}
+        if self.native.supports(input_path, output_path, options):
+            converter = self.native
+        elif self.converter:
+            converter = self.converter
+        else:
             return {
                 'success': False,
                 'error': 'Blender converter not available'
             }
         
-        logger.info(f"Converting: {input_path} -> {output_path}")
-        return self.converter.convert(input_path, output_path, options or {})
+        logger.info(f"Converting ({converter.__class__.__name__}): {input_path} -> {output_path}")
+        
+        def run() -> dict:
+            if converter is self.native:
+                return converter.convert(input_path, output_path, options)
+            limit = timeout
+            if limit is None:
+                try:
+                    limit = self._conversion_timeout(Path(input_path).stat().st_size)
+                except OSError:
+                    limit = self._conversion_timeout(0)
+            return converter.convert(input_path, output_path, options, timeout=limit)
+        
+        # Multi-output conversions are not cached: the cache keeps one
+        # artifact per entry
+        if self.cache is None or not isinstance(output_path, str):
+            return run()
+        
+        key_options = dict(options, output_format=Path(output_path).suffix.lower())
+        return self.cache.get_or_compute(input_path, 'convert', key_options, run, output_path)
+    
+    def _conversion_timeout(self, size: int) -> float:
+        """Blender timeout for an input of this many bytes (Config 'convert_timeout_*')"""
+        return conversion_timeout(
+            size,
+            self.config.get('convert_timeout_seconds', 300),
+            self.config.get('convert_timeout_per_mb', 0.0),
+            self.config.get('convert_timeout_max_seconds')
+        )
+    
+    def convert_batch(self, jobs: list) -> Iterator[dict]:
+        """
+        Convert many files, smallest inputs first, with per-format
+        concurrency caps (Config 'convert_format_concurrency')
+        
+        Args:
+            jobs: Dicts with 'input', 'output' and optional 'options'
+        
+        Returns:
+            Iterator over the conversion results in completion order (each
+            with the 'index' of its job)
+        """
+        num_workers = self.config.get('num_workers', 1) if self.config.get('parallel_processing') else 1
+        batch = BatchConverter(
+            self.convert,
+            num_workers=num_workers,
+            format_limits=self.config.get('convert_format_concurrency'),
+            scratch_dir=str(Path(self.config.get('temp_dir')) / 'batch'),
+            timeout=self._conversion_timeout
+        )
+        return batch.run(jobs)
 
 
-def create_api_server(engine: GeometryEngine, port: int = 8000):
+def create_api_server(engine: GeometryEngine, port: int = 8000, run: bool = True):
     """
     Create HTTP API server (using FastAPI)
     
-    TODO: Implement FastAPI endpoints:
-    - POST /diagnose - Upload and diagnose mesh
-    - POST /repair - Upload and repair mesh
-    - POST /convert - Convert mesh format
-    - GET /health - Health check
+    Work is submitted as jobs and executed off the event loop:
+    - POST /diagnose, /repair, /pipeline, /lod, /convert - Upload a mesh, returns 202 + job_id
+      (/pipeline diagnoses and repairs in one job; /convert takes several
+      comma-separated output formats)
+    - GET /jobs/{job_id} - Job status
+    - GET /jobs/{job_id}/result - Result of a finished job (with its stage spans)
+    - GET /jobs/{job_id}/profile - cProfile dump of a job submitted with profile=true
+    - GET /jobs/{job_id}/download?lod=i - Output file of a finished job
+      (LOD jobs: level i, default 0; multi-output conversions: pick one
+      with format=stl)
+    - GET /jobs/{job_id}/mesh?format=tmsh|glb&lod=i - Output mesh as a binary stream
+    - GET /health - Health check (with queue stats)
+    - GET /metrics - Prometheus metrics (latency by operation and mesh size,
+      time per stage, job counts)
+    
+    Uploads are streamed to disk in chunks. When the queue is full the
+    submission endpoints answer 429. Every submission accepts profile=true
+    when Config 'allow_profiling' is on (403 otherwise).
+    
+    Args:
+        engine: Geometry engine (used directly for conversions)
+        port: Port to listen on
+        run: Start uvicorn (False returns the app, e.g. for tests)
     """
     try:
-        from fastapi import FastAPI, UploadFile, File
-        from fastapi.responses import JSONResponse
+        import asyncio
+        from contextlib import asynccontextmanager
+        from fastapi import FastAPI, UploadFile, File, Form, HTTPException
+        from fastapi.responses import JSONResponse, FileResponse, StreamingResponse, PlainTextResponse
         import uvicorn
+        from jobs.job_queue import JobManager, QueueFullError
+        from utils.mesh_io import load_mesh, mesh_chunks, STREAM_FORMATS
+        from lod.index import normalize_ratios
+        
+        job_manager = JobManager(engine, engine.config)
+        
+        @asynccontextmanager
+        async def lifespan(app):
+            yield
+            job_manager.shutdown()
+            engine.close()
         
         app = FastAPI(
             title="Teeli Geometry Engine",
             description="3D Mesh Processing API",
-            version="0.1.0"
+            version="0.1.0",
+            lifespan=lifespan
         )
+        max_upload_bytes = int(float(engine.config.get('max_file_size_mb', 500)) * 1024 * 1024)
+        
+        async def submit(
+            operation: str,
+            file: UploadFile,
+            output_suffix: str = None,
+            profile: bool = False,
+            **options
+        ):
+            """Stream the upload into a new job's directory and queue the job"""
+            if profile and not job_manager.allow_profiling:
+                raise HTTPException(status_code=403, detail="Profiling is disabled")
+            suffix = Path(file.filename or '').suffix.lower()
+            try:
+                job = job_manager.create_job(operation, suffix)
+            except QueueFullError as e:
+                raise HTTPException(status_code=429, detail=str(e), headers={'Retry-After': '5'})
+            
+            try:
+                size = 0
+                with open(job.input_path, 'wb') as f:
+                    while True:
+                        chunk = await file.read(UPLOAD_CHUNK_SIZE)
+                        if not chunk:
+                            break
+                        size += len(chunk)
+                        if size > max_upload_bytes:
+                            raise HTTPException(status_code=413, detail="File too large")
+                        await asyncio.to_thread(f.write, chunk)
+            except BaseException:
+                job_manager.cancel(job)
+                raise
+            finally:
+                await file.close()
+            
+            job_manager.start(job, output_suffix, profile, **options)
+            return JSONResponse(job.to_dict(), status_code=202)
+        
+        def find_job(job_id: str):
+            job = job_manager.get(job_id)
+            if job is None:
+                raise HTTPException(status_code=404, detail="Job not found")
+            return job
+        
+        def finished_output(job_id: str, lod: int = None, output_format: str = None) -> Path:
+            job = find_job(job_id)
+            if not job.done:
+                raise HTTPException(status_code=409, detail=f"Job is {job.status}")
+            outputs = job.output_files()
+            level = lod or 0
+            if output_format:
+                suffix = normalize_suffix(output_format)
+                suffixes = [Path(output).suffix.lower() if output else None for output in outputs]
+                if suffix not in suffixes:
+                    raise HTTPException(status_code=404, detail=f"Job has no {suffix} output")
+                level = suffixes.index(suffix)
+            if not 0 <= level < len(outputs):
+                raise HTTPException(status_code=404, detail=f"Job has no output {level}")
+            output = outputs[level]
+            if not output or not Path(output).exists():
+                raise HTTPException(status_code=404, detail="Job has no output file")
+            return Path(output)
         
         @app.get("/")
         async def root():
@@ -125,27 +435,131 @@ def create_api_server(engine: GeometryEngine, port: int = 8000):
         async def health():
             return {
                 "status": "healthy",
-                "blender_available": engine.converter is not None
+                "blender_available": engine.converter is not None,
+                "jobs": job_manager.stats()
             }
         
-        @app.post("/diagnose")
-        async def api_diagnose(file: UploadFile = File(...)):
-            # TODO: Save uploaded file temporarily
-            # TODO: Run diagnosis
-            # TODO: Return results
-            return JSONResponse({
-                "status": "not_implemented",
-                "message": "Coming soon"
-            })
+        @app.get("/metrics", response_class=PlainTextResponse)
+        async def metrics():
+            gauges = {f"geometry_jobs_{name}": value for name, value in job_manager.stats().items()}
+            return PlainTextResponse(
+                job_manager.metrics.render(gauges),
+                media_type='text/plain; version=0.0.4'
+            )
+        
+        @app.post("/diagnose", status_code=202)
+        async def api_diagnose(file: UploadFile = File(...), profile: bool = Form(False)):
+            return await submit('diagnose', file, profile=profile)
+        
+        @app.post("/repair", status_code=202)
+        async def api_repair(
+            file: UploadFile = File(...),
+            aggressive: bool = Form(False),
+            output_format: str = Form('.glb'),
+            profile: bool = Form(False)
+        ):
+            return await submit('repair', file, normalize_suffix(output_format), profile, aggressive=aggressive)
+        
+        @app.post("/pipeline", status_code=202)
+        async def api_pipeline(
+            file: UploadFile = File(...),
+            aggressive: bool = Form(False),
+            output_format: str = Form('.glb'),
+            profile: bool = Form(False)
+        ):
+            return await submit(
+                'diagnose_and_repair', file, normalize_suffix(output_format), profile, aggressive=aggressive
+            )
+        
+        @app.post("/lod", status_code=202)
+        async def api_lod(
+            file: UploadFile = File(...),
+            ratios: str = Form('0.5,0.25,0.1'),
+            output_format: str = Form('.glb'),
+            profile: bool = Form(False)
+        ):
+            try:
+                levels = normalize_ratios(float(r) for r in ratios.split(',') if r.strip())
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+            return await submit('lod', file, normalize_suffix(output_format), profile, ratios=levels)
+        
+        @app.post("/convert", status_code=202)
+        async def api_convert(
+            file: UploadFile = File(...),
+            output_format: str = Form(...),
+            scale: float = Form(1.0),
+            profile: bool = Form(False)
+        ):
+            # 'glb,stl,fbx' converts to all three from one import
+            suffixes = list(dict.fromkeys(normalize_suffix(f) for f in output_format.split(',') if f.strip()))
+            if not suffixes:
+                raise HTTPException(status_code=400, detail="No output format given")
+            output_suffix = suffixes if len(suffixes) > 1 else suffixes[0]
+            return await submit('convert', file, output_suffix, profile, scale=scale)
+        
+        @app.get("/jobs/{job_id}")
+        async def job_status(job_id: str):
+            return find_job(job_id).to_dict()
+        
+        @app.get("/jobs/{job_id}/result")
+        async def job_result(job_id: str):
+            job = find_job(job_id)
+            if not job.done:
+                raise HTTPException(status_code=409, detail=f"Job is {job.status}")
+            return dict(job.to_dict(), result=job.result, trace=job.trace)
+        
+        @app.get("/jobs/{job_id}/profile")
+        async def job_profile(job_id: str):
+            job = find_job(job_id)
+            if not job.done:
+                raise HTTPException(status_code=409, detail=f"Job is {job.status}")
+            if not job.profile_path or not Path(job.profile_path).exists():
+                raise HTTPException(status_code=404, detail="Job has no profile")
+            return FileResponse(job.profile_path, filename=f"{job_id}.prof")
+        
+        @app.get("/jobs/{job_id}/download")
+        async def job_download(job_id: str, lod: int = None, format: str = None):
+            output = finished_output(job_id, lod, format)
+            return FileResponse(output, filename=f"{job_id}{output.suffix}")
+        
+        @app.get("/jobs/{job_id}/mesh")
+        async def job_mesh(job_id: str, format: str = '.tmsh', lod: int = None):
+            # The output is memory-mapped and streamed (chunked) straight
+            # from its array buffers in the requested binary format
+            output = finished_output(job_id, lod)
+            suffix = normalize_suffix(format)
+            if suffix not in STREAM_FORMATS:
+                raise HTTPException(status_code=400, detail=f"Unsupported stream format: {format}")
+            if output.suffix.lower() == suffix:
+                return FileResponse(output, media_type=STREAM_FORMATS[suffix], filename=f"{job_id}{suffix}")
+            try:
+                mesh = await asyncio.to_thread(load_mesh, str(output))
+            except ValueError as e:
+                raise HTTPException(status_code=422, detail=str(e))
+            return StreamingResponse(
+                mesh_chunks(mesh, suffix),
+                media_type=STREAM_FORMATS[suffix],
+                headers={'Content-Disposition': f'attachment; filename="{job_id}{suffix}"'}
+            )
+        
+        if not run:
+            return app
         
         logger.info(f"Starting API server on port {port}...")
         uvicorn.run(app, host="0.0.0.0", port=port)
-        
+    
     except ImportError:
-        logger.error("FastAPI not installed. Install with: pip install fastapi uvicorn")
+        logger.error("FastAPI not installed. Install with: pip install fastapi uvicorn python-multipart")
         logger.info("Running in CLI mode only...")
 
 
+def normalize_suffix(output_format: str) -> str:
+    """'glb' / '.GLB' -> '.glb'"""
+    output_format = output_format.strip().lower()
+    return output_format if output_format.startswith('.') else f".{output_format}"
+
+
 def cli_mode(engine: GeometryEngine):
     """Interactive CLI mode for testing"""
     print("""
@@ -156,6 +570,8 @@ def cli_mode(engine: GeometryEngine):
 Commands:
   diagnose <file>              - Analyze mesh
   repair <input> <output>      - Repair mesh
+  pipeline <input> <output>    - Diagnose + repair in one pass
+  lod <input> <output> [r ...] - LOD chain (default 0.5 0.25 0.1)
   convert <input> <output>     - Convert format
   quit                         - Exit
     """)
@@ -180,6 +596,15 @@ Commands:
                 result = engine.repair(cmd[1], cmd[2])
                 print(f"\nResult: {result}")
             
+            elif action == 'pipeline' and len(cmd) >= 3:
+                result = engine.diagnose_and_repair(cmd[1], cmd[2])
+                print(f"\nResult: {result}")
+            
+            elif action == 'lod' and len(cmd) >= 3:
+                ratios = [float(r) for r in cmd[3:]] or None
+                result = engine.lod(cmd[1], cmd[2], ratios)
+                print(f"\nResult: {result}")
+            
             elif action == 'convert' and len(cmd) >= 3:
                 result = engine.convert(cmd[1], cmd[2])
                 print(f"\nResult: {result}")
@@ -194,12 +619,34 @@ Commands:
             logger.error(f"Error: {e}")
 
 
+def batch_mode(engine: GeometryEngine, manifest: str) -> int:
+    """
+    Convert the jobs listed in a JSON-lines manifest
+    
+    Each line holds {"input": ..., "output": ..., "options": {...}}. One
+    JSON result is printed per line as each conversion finishes.
+    
+    Returns:
+        Process exit code (1 if any conversion failed)
+    """
+    with open(manifest) as f:
+        jobs = [json.loads(line) for line in f if line.strip()]
+    
+    failed = 0
+    for result in engine.convert_batch(jobs):
+        failed += not result.get('success')
+        print(json.dumps(result), flush=True)
+    logger.info(f"Batch finished: {len(jobs) - failed} converted, {failed} failed")
+    return 1 if failed else 0
+
+
 def main():
     """Main entry point"""
     parser = argparse.ArgumentParser(description='Teeli Geometry Engine')
     parser.add_argument('--port', type=int, default=8000, help='API server port')
     parser.add_argument('--production', action='store_true', help='Production mode')
     parser.add_argument('--cli', action='store_true', help='CLI mode (no API server)')
+    parser.add_argument('--convert-batch', metavar='MANIFEST', help='Convert the jobs of a JSON-lines manifest and exit')
     parser.add_argument('--log-level', default='INFO', help='Logging level')
     args = parser.parse_args()
     
@@ -214,7 +661,12 @@ def main():
     engine = GeometryEngine(config)
     
     # Start in appropriate mode
-    if args.cli:
+    if args.convert_batch:
+        code = batch_mode(engine, args.convert_batch)
+        if engine.converter:
+            engine.converter.close()
+        sys.exit(code)
+    elif args.cli:
         cli_mode(engine)
     else:
         create_api_server(engine, args.port)
@@ -0,0 +1,203 @@
+"""Batch Conversion
+
+Converts many (input, output, options) jobs with a bounded set of threads
+(the Blender worker pool and the native converter do the heavy lifting):
+- Shortest job first: pending jobs run in order of input size, so small
+  files are not stuck behind large ones
+- Per-format concurrency caps (Config 'convert_format_concurrency'), since
+  e.g. FBX imports need far more memory than STL
+- Each job writes into its own scratch directory; its files are moved to
+  the requested output location only when the conversion succeeds
+- Timeouts grow with the input size (see conversion_timeout)
+- Results are yielded as soon as each job finishes
+"""
+
+import os
+import time
+import heapq
+import shutil
+import logging
+import tempfile
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional
+
+from utils.helper import ensure_directory
+
+logger = logging.getLogger(__name__)
+
+
+def conversion_timeout(
+    size_bytes: int,
+    base: float = 300.0,
+    per_mb: float = 2.0,
+    maximum: Optional[float] = None
+) -> float:
+    """
+    Conversion timeout for an input of the given size
+    
+    Args:
+        size_bytes: Input file size
+        base: Seconds for an empty file
+        per_mb: Seconds added per MB of input
+        maximum: Upper bound (None for none)
+    
+    Returns:
+        Timeout in seconds
+    """
+    timeout = float(base) + float(per_mb) * size_bytes / (1024 * 1024)
+    return timeout if maximum is None else min(timeout, float(maximum))
+
+
+class BatchConverter:
+    """Size-aware scheduler for many conversions"""
+    
+    def __init__(
+        self,
+        convert: Callable[..., Dict[str, Any]],
+        num_workers: int = 4,
+        format_limits: Optional[Dict[str, int]] = None,
+        scratch_dir: Optional[str] = None,
+        timeout: Optional[Callable[[int], float]] = None
+    ):
+        """
+        Args:
+            convert: Called as convert(input_path, output_path, options,
+                timeout=seconds) and returning a conversion result
+                (e.g. GeometryEngine.convert)
+            num_workers: Conversions running at once
+            format_limits: Conversions running at once per input format
+                (e.g. {'.fbx': 1}); formats not listed use num_workers
+            scratch_dir: Parent of the per-job scratch directories
+                (default: the system temp directory)
+            timeout: Seconds allowed for an input of the given size
+                (default: conversion_timeout)
+        """
+        self.convert = convert
+        self.num_workers = max(1, int(num_workers))
+        self.format_limits = {k.lower(): max(1, int(v)) for k, v in (format_limits or {}).items()}
+        self.scratch_dir = scratch_dir
+        self.timeout = timeout or conversion_timeout
+    
+    def run(self, jobs: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        """
+        Convert all jobs, yielding each result as it completes
+        
+        Args:
+            jobs: Dicts with 'input', 'output' (a path, or a list of paths
+                converted from one import) and optional 'options'
+        
+        Yields:
+            The conversion result of each job (in completion order) with
+            its 'index' in jobs, 'input', final 'output', 'input_bytes',
+            'timeout' and 'seconds' added
+        """
+        # One heap per format: (input bytes, index, job)
+        pending = {}
+        num_jobs = 0
+        invalid = []
+        for index, job in enumerate(jobs):
+            num_jobs += 1
+            if not isinstance(job, dict) or not job.get('input') or not job.get('output'):
+                invalid.append(self._failed(index, job, "Job needs an 'input' and an 'output'"))
+                continue
+            try:
+                size = os.path.getsize(job['input'])
+            except OSError as e:
+                invalid.append(self._failed(index, job, f"Input not readable: {e}"))
+                continue
+            heapq.heappush(pending.setdefault(_format(job['input']), []), (size, index, job))
+        
+        yield from invalid
+        if not pending:
+            return
+        
+        root = ensure_directory(self.scratch_dir) if self.scratch_dir else None
+        scratch = Path(tempfile.mkdtemp(prefix='batch_', dir=root))
+        logger.info(f"Batch conversion of {num_jobs} files with {self.num_workers} workers")
+        running = {}
+        active = {}
+        executor = ThreadPoolExecutor(max_workers=self.num_workers)
+        try:
+            while pending or running:
+                # Smallest pending input among the formats with a free slot
+                while len(running) < self.num_workers:
+                    ready = [
+                        fmt for fmt, heap in pending.items()
+                        if active.get(fmt, 0) < self.format_limits.get(fmt, self.num_workers)
+                    ]
+                    if not ready:
+                        break
+                    fmt = min(ready, key=lambda f: pending[f][0])
+                    size, index, job = heapq.heappop(pending[fmt])
+                    if not pending[fmt]:
+                        del pending[fmt]
+                    active[fmt] = active.get(fmt, 0) + 1
+                    future = executor.submit(self._run_job, index, job, size, scratch / str(index))
+                    running[future] = fmt
+                
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    active[running.pop(future)] -= 1
+                    yield future.result()
+        finally:
+            # Also reached when the caller stops iterating early
+            executor.shutdown(wait=True, cancel_futures=True)
+            shutil.rmtree(scratch, ignore_errors=True)
+    
+    def _run_job(self, index: int, job: Dict[str, Any], size: int, work_dir: Path) -> Dict[str, Any]:
+        """Convert one job inside its scratch directory and move the output into place"""
+        many = isinstance(job['output'], list)
+        outputs = [Path(path) for path in (job['output'] if many else [job['output']])]
+        # One scratch subdirectory per output, so each can be moved as a whole
+        targets = [work_dir / str(i) / output.name for i, output in enumerate(outputs)]
+        timeout = self.timeout(size)
+        start = time.perf_counter()
+        try:
+            for target in targets:
+                target.parent.mkdir(parents=True)
+            result = self.convert(
+                job['input'], [str(t) for t in targets] if many else str(targets[0]),
+                job.get('options') or {}, timeout=timeout
+            )
+            if result.get('success'):
+                # Everything the converter wrote (e.g. .gltf plus .bin)
+                for output, target in zip(outputs, targets):
+                    ensure_directory(str(output.parent))
+                    for path in target.parent.iterdir():
+                        shutil.move(str(path), str(output.parent / path.name))
+                if many:
+                    result['outputs'] = [
+                        dict(entry, output=str(output)) for entry, output in zip(result.get('outputs', []), outputs)
+                    ]
+        except Exception as e:
+            logger.error(f"Batch conversion of {job['input']} failed: {e}")
+            result = {'success': False, 'error': str(e)}
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+        
+        return dict(
+            result,
+            index=index,
+            input=job['input'],
+            output=str(outputs[0]),
+            input_bytes=size,
+            timeout=timeout,
+            seconds=time.perf_counter() - start
+        )
+    
+    @staticmethod
+    def _failed(index: int, job: Any, error: str) -> Dict[str, Any]:
+        """Result of a job that never ran"""
+        job = job if isinstance(job, dict) else {}
+        return {
+            'success': False,
+            'error': error,
+            'index': index,
+            'input': job.get('input'),
+            'output': job.get('output'),
+        }
+
+
+def _format(path: str) -> str:
+    return Path(path).suffix.lower()
@@ -8,83 +8,150 @@ Uses Blender's Python API for format conversion between:
 - DAE (Collada)
 - Blend (Blender native)
 
+Several output formats can be produced from one import (the scene is
+loaded and transformed once, then exported to each target).
+
 Requires Blender to be installed and accessible.
 """
 
 import subprocess
 import os
 import json
+import tempfile
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Union
 import logging
 
+from convert.blender_pool import BlenderWorkerPool
+from utils.metrics import timed
+
 logger = logging.getLogger(__name__)
 
 # Supported formats
 INPUT_FORMATS = ['.fbx', '.obj', '.stl', '.dae', '.blend', '.gltf', '.glb']
 OUTPUT_FORMATS = ['.glb', '.gltf', '.obj', '.stl', '.fbx']
 
+# Seconds a conversion may take unless the caller says otherwise
+DEFAULT_TIMEOUT = 300
+
+# Export call per output format ({path!r} is the output path as a Python literal)
+EXPORT_CALLS = {
+    '.glb': "bpy.ops.export_scene.gltf(filepath={path!r}, export_format='GLB')",
+    '.gltf': "bpy.ops.export_scene.gltf(filepath={path!r}, export_format='GLTF_SEPARATE')",
+    '.obj': "bpy.ops.export_scene.obj(filepath={path!r})",
+    '.stl': "bpy.ops.export_mesh.stl(filepath={path!r})",
+    '.fbx': "bpy.ops.export_scene.fbx(filepath={path!r})",
+}
+
 
 class BlenderConverter:
     """Blender-based 3D format converter"""
     
-    def __init__(self, blender_path: Optional[str] = None):
+    def __init__(
+        self,
+        blender_path: Optional[str] = None,
+        num_workers: int = 0,
+        max_jobs_per_worker: int = 50,
+        max_worker_memory_mb: float = 4096
+    ):
         """
         Initialize converter
         
         Args:
             blender_path: Path to Blender executable (auto-detect if None)
+            num_workers: Size of the warm Blender worker pool
+                (0 starts a fresh Blender process per conversion)
+            max_jobs_per_worker: Recycle pooled workers after this many jobs
+            max_worker_memory_mb: Recycle pooled workers above this peak RSS
         """
         self.blender_path = blender_path or self._find_blender()
         if not self.blender_path:
             raise RuntimeError("Blender not found. Please install Blender.")
         
+        self.pool = None
+        if num_workers > 0:
+            self.pool = BlenderWorkerPool(
+                self.blender_path,
+                size=num_workers,
+                max_jobs_per_worker=max_jobs_per_worker,
+                max_memory_mb=max_worker_memory_mb
+            )
+        
         logger.info(f"Using Blender at: {self.blender_path}")
     
+    def warm_up(self) -> None:
+        """Start pooled Blender workers ahead of the first conversion"""
+        if self.pool:
+            self.pool.warm_up()
+    
+    def close(self) -> None:
+        """Shut down pooled Blender workers"""
+        if self.pool:
+            self.pool.close()
+    
     def convert(
         self,
         input_path: str,
-        output_path: str,
-        options: Optional[Dict[str, Any]] = None
+        output_path: Union[str, List[str]],
+        options: Optional[Dict[str, Any]] = None,
+        timeout: float = DEFAULT_TIMEOUT
     ) -> Dict[str, Any]:
         """
         Convert 3D model from one format to another
         
         Args:
             input_path: Source file path
-            output_path: Destination file path
+            output_path: Destination file path, or a list of them (the
+                scene is imported once and exported to each)
             options: Conversion options (scale, axes, etc.)
+            timeout: Seconds before Blender is killed
         
         Returns:
-            Conversion result with metadata
+            Conversion result with metadata ('outputs' lists every file
+            with its size when output_path is a list)
         """
         input_ext = Path(input_path).suffix.lower()
-        output_ext = Path(output_path).suffix.lower()
+        output_paths = [output_path] if isinstance(output_path, str) else list(output_path)
         
         # Validate formats
         if input_ext not in INPUT_FORMATS:
             raise ValueError(f"Unsupported input format: {input_ext}")
-        if output_ext not in OUTPUT_FORMATS:
-            raise ValueError(f"Unsupported output format: {output_ext}")
+        if not output_paths:
+            raise ValueError("No output path given")
+        for path in output_paths:
+            output_ext = Path(path).suffix.lower()
+            if output_ext not in OUTPUT_FORMATS:
+                raise ValueError(f"Unsupported output format: {output_ext}")
         
         # Generate Blender Python script
-        script = self._generate_script(input_path, output_path, options or {})
-        script_path = Path(output_path).parent / "_blender_script.py"
+        script = self._generate_script(input_path, output_paths, options or {})
+        script_path = None
         
         try:
-            # Write temporary script
-            with open(script_path, 'w') as f:
-                f.write(script)
-            
-            # Run Blender in background
-            result = self._run_blender(script_path)
+            if self.pool:
+                # Run on a warm pooled worker
+                result = self.pool.run(script, timeout)
+            else:
+                # Unique temporary script so concurrent conversions don't collide
+                fd, script_path = tempfile.mkstemp(prefix='teeli_blender_', suffix='.py')
+                script_path = Path(script_path)
+                with os.fdopen(fd, 'w') as f:
+                    f.write(script)
+                
+                # Run Blender in background
+                result = self._run_blender(script_path, timeout)
             
-            return {
+            sizes = [os.path.getsize(path) if os.path.exists(path) else 0 for path in output_paths]
+            result = {
                 'success': True,
                 'input': input_path,
-                'output': output_path,
-                'size': os.path.getsize(output_path) if os.path.exists(output_path) else 0
+                'output': output_paths[0],
+                'size': sizes[0],
+                'converter': 'blender'
             }
+            if not isinstance(output_path, str):
+                result['outputs'] = [{'output': path, 'size': size} for path, size in zip(output_paths, sizes)]
+            return result
         
         except Exception as e:
             logger.error(f"Conversion failed: {e}")
@@ -95,18 +162,22 @@ class BlenderConverter:
         
         finally:
             # Cleanup temporary script
-            if script_path.exists():
+            if script_path is not None and script_path.exists():
                 script_path.unlink()
     
     def _generate_script(
         self,
         input_path: str,
-        output_path: str,
+        output_path: Union[str, List[str]],
         options: Dict[str, Any]
     ) -> str:
-        """Generate Blender Python script for conversion"""
+        """Generate Blender Python script for conversion (one import, an export per output)"""
         input_ext = Path(input_path).suffix.lower()
-        output_ext = Path(output_path).suffix.lower()
+        input_path = str(input_path)
+        output_paths = [output_path] if isinstance(output_path, str) else output_path
+        exports = '\n'.join(
+            '    ' + EXPORT_CALLS[Path(path).suffix.lower()].format(path=str(path)) for path in output_paths
+        )
         
         script = f"""
 import bpy
@@ -117,40 +188,25 @@ bpy.ops.wm.read_homefile(use_empty=True)
 
 # Import model
 try:
-    if '{input_ext}' == '.fbx':
-        bpy.ops.import_scene.fbx(filepath='{input_path}')
-    elif '{input_ext}' == '.obj':
-        bpy.ops.import_scene.obj(filepath='{input_path}')
-    elif '{input_ext}' in ['.gltf', '.glb']:
-        bpy.ops.import_scene.gltf(filepath='{input_path}')
-    elif '{input_ext}' == '.stl':
-        bpy.ops.import_mesh.stl(filepath='{input_path}')
+    if {input_ext!r} == '.fbx':
+        bpy.ops.import_scene.fbx(filepath={input_path!r})
+    elif {input_ext!r} == '.obj':
+        bpy.ops.import_scene.obj(filepath={input_path!r})
+    elif {input_ext!r} in ['.gltf', '.glb']:
+        bpy.ops.import_scene.gltf(filepath={input_path!r})
+    elif {input_ext!r} == '.stl':
+        bpy.ops.import_mesh.stl(filepath={input_path!r})
     else:
-        print(f"Unsupported input format: {input_ext}")
+        print("Unsupported input format: " + {input_ext!r})
         sys.exit(1)
     
     # Apply transformations
-    scale = {options.get('scale', 1.0)}
+    scale = {float(options.get('scale', 1.0))!r}
     for obj in bpy.context.scene.objects:
         obj.scale = (scale, scale, scale)
     
-    # Export model
-    if '{output_ext}' == '.glb':
-        bpy.ops.export_scene.gltf(
-            filepath='{output_path}',
-            export_format='GLB'
-        )
-    elif '{output_ext}' == '.gltf':
-        bpy.ops.export_scene.gltf(
-            filepath='{output_path}',
-            export_format='GLTF_SEPARATE'
-        )
-    elif '{output_ext}' == '.obj':
-        bpy.ops.export_scene.obj(filepath='{output_path}')
-    elif '{output_ext}' == '.stl':
-        bpy.ops.export_mesh.stl(filepath='{output_path}')
-    elif '{output_ext}' == '.fbx':
-        bpy.ops.export_scene.fbx(filepath='{output_path}')
+    # Export model to every target
+{exports}
     
     print("Conversion successful")
     sys.exit(0)
@@ -161,8 +217,9 @@ except Exception as e:
 """
         return script
     
-    def _run_blender(self, script_path: Path) -> str:
-        """Execute Blender with Python script"""
+    @timed('blender.process')
+    def _run_blender(self, script_path: Path, timeout: float = DEFAULT_TIMEOUT) -> str:
+        """Execute Blender with Python script (launch and run in one process)"""
         cmd = [
             self.blender_path,
             '--background',
@@ -173,7 +230,7 @@ except Exception as e:
             cmd,
             capture_output=True,
             text=True,
-            timeout=300  # 5 minute timeout
+            timeout=timeout
         )
         
         if result.returncode != 0:
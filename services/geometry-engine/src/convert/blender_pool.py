@@ -0,0 +1,276 @@
+"""Blender Worker Pool
+
+Keeps a set of warm `blender --background` processes (see blender_worker.py)
+and hands conversion scripts to them over stdin/stdout pipes, so requests
+no longer pay Blender's multi-second startup:
+- Pool size is bounded (one job per worker at a time)
+- Workers are recycled after N jobs or when their peak RSS grows too large
+- Workers that time out or die are killed and replaced on demand
+"""
+
+import json
+import queue
+import logging
+import threading
+import subprocess
+from collections import deque
+from pathlib import Path
+from typing import Optional, Dict, Any
+
+from utils.metrics import span
+
+logger = logging.getLogger(__name__)
+
+WORKER_SCRIPT = Path(__file__).parent / 'blender_worker.py'
+MARKER = '@@TEELI_WORKER@@'
+
+
+class BlenderWorker:
+    """One long-lived Blender process speaking the worker protocol"""
+    
+    def __init__(self, blender_path: str, startup_timeout: float = 60):
+        """
+        Start a worker and wait until it reports ready
+        
+        Args:
+            blender_path: Blender executable (or a compatible stub)
+            startup_timeout: Seconds to wait for the ready message
+        
+        Raises:
+            RuntimeError: Worker did not start
+        """
+        self.jobs_done = 0
+        self.max_rss_kb = 0
+        self._next_id = 0
+        self._messages = queue.Queue()
+        self._log_tail = deque(maxlen=50)
+        
+        cmd = [blender_path, '--background', '--python', str(WORKER_SCRIPT)]
+        self.process = subprocess.Popen(
+            cmd,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            bufsize=1
+        )
+        self._reader = threading.Thread(target=self._read_output, daemon=True)
+        self._reader.start()
+        
+        try:
+            ready = self._messages.get(timeout=startup_timeout)
+        except queue.Empty:
+            self.kill()
+            raise RuntimeError("Blender worker did not start in time")
+        if ready is None or not ready.get('ready'):
+            self.kill()
+            raise RuntimeError(f"Blender worker failed to start: {self.log_tail()}")
+        self.max_rss_kb = ready.get('max_rss_kb', 0)
+    
+    @property
+    def alive(self) -> bool:
+        """Whether the process is still running"""
+        return self.process.poll() is None
+    
+    def run(self, script: str, timeout: float) -> Dict[str, Any]:
+        """
+        Execute a script in this worker
+        
+        Returns:
+            Reply message from the worker
+        
+        Raises:
+            TimeoutError: No reply within timeout (worker is killed)
+            RuntimeError: Worker died while running the job
+        """
+        self._next_id += 1
+        job_id = self._next_id
+        self._log_tail.clear()
+        
+        try:
+            self.process.stdin.write(json.dumps({'id': job_id, 'script': script}) + '\n')
+            self.process.stdin.flush()
+        except (BrokenPipeError, OSError) as e:
+            self.kill()
+            raise RuntimeError(f"Blender worker is not accepting jobs: {e}")
+        
+        try:
+            message = self._messages.get(timeout=timeout)
+        except queue.Empty:
+            self.kill()
+            raise TimeoutError(f"Blender job timed out after {timeout}s")
+        
+        if message is None:
+            # Output ended before the process may have been reaped; make
+            # sure it no longer counts as alive
+            self.kill()
+            raise RuntimeError(f"Blender worker exited: {self.log_tail()}")
+        
+        self.jobs_done += 1
+        self.max_rss_kb = message.get('max_rss_kb', self.max_rss_kb)
+        return message
+    
+    def log_tail(self) -> str:
+        """Last lines Blender printed outside the protocol"""
+        return '\n'.join(self._log_tail)
+    
+    def close(self, timeout: float = 10) -> None:
+        """Ask the worker to exit by closing stdin, kill it if it does not"""
+        try:
+            self.process.stdin.close()
+            self.process.wait(timeout=timeout)
+        except (OSError, subprocess.TimeoutExpired):
+            self.kill()
+    
+    def kill(self) -> None:
+        """Terminate the worker immediately"""
+        if self.alive:
+            self.process.kill()
+        try:
+            self.process.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            pass
+    
+    def _read_output(self) -> None:
+        """Reader thread: route protocol lines to the queue, keep the rest as log"""
+        for line in self.process.stdout:
+            if line.startswith(MARKER):
+                try:
+                    self._messages.put(json.loads(line[len(MARKER):]))
+                except ValueError:
+                    self._log_tail.append(line.rstrip())
+            else:
+                self._log_tail.append(line.rstrip())
+        # EOF: wake up anyone waiting for a reply
+        self._messages.put(None)
+
+
+class BlenderWorkerPool:
+    """Bounded pool of warm Blender workers"""
+    
+    def __init__(
+        self,
+        blender_path: str,
+        size: int = 4,
+        max_jobs_per_worker: int = 50,
+        max_memory_mb: float = 4096,
+        startup_timeout: float = 60
+    ):
+        """
+        Initialize pool (workers start lazily or via warm_up)
+        
+        Args:
+            blender_path: Blender executable (or a compatible stub)
+            size: Maximum number of concurrent workers
+            max_jobs_per_worker: Recycle a worker after this many jobs
+            max_memory_mb: Recycle a worker once its peak RSS exceeds this
+            startup_timeout: Seconds to wait for a worker to come up
+        """
+        self.blender_path = blender_path
+        self.size = max(1, int(size))
+        self.max_jobs_per_worker = max_jobs_per_worker
+        self.max_memory_kb = int(max_memory_mb * 1024)
+        self.startup_timeout = startup_timeout
+        
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(self.size)
+        self._closed = False
+    
+    def warm_up(self, count: Optional[int] = None) -> None:
+        """Start workers ahead of the first request"""
+        count = self.size if count is None else min(count, self.size)
+        started = []
+        for _ in range(count):
+            if not self._slots.acquire(blocking=False):
+                break
+            try:
+                started.append(self._spawn())
+            except RuntimeError as e:
+                logger.warning(f"Blender warm-up failed: {e}")
+                self._slots.release()
+                break
+        for worker in started:
+            self._idle.put(worker)
+            self._slots.release()
+        logger.info(f"Warmed up {len(started)} Blender workers")
+    
+    def run(self, script: str, timeout: float = 300) -> str:
+        """
+        Run a conversion script on a pooled worker
+        
+        Blocks while all workers are busy.
+        
+        Returns:
+            Blender output printed during the job
+        
+        Raises:
+            RuntimeError: Script failed, worker crashed or timed out
+        """
+        if self._closed:
+            raise RuntimeError("Blender worker pool is closed")
+        
+        self._slots.acquire()
+        worker = None
+        try:
+            worker = self._checkout()
+            try:
+                with span('blender.run'):
+                    message = worker.run(script, timeout)
+            except TimeoutError as e:
+                raise RuntimeError(str(e))
+            
+            if not message.get('ok'):
+                detail = message.get('error') or worker.log_tail()
+                raise RuntimeError(f"Blender failed (exit code {message.get('code')}): {detail}")
+            return worker.log_tail()
+        finally:
+            if worker is not None:
+                self._checkin(worker)
+            self._slots.release()
+    
+    def close(self) -> None:
+        """Shut down all idle workers"""
+        self._closed = True
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+    
+    def _spawn(self) -> BlenderWorker:
+        logger.info("Starting Blender worker")
+        with span('blender.launch'):
+            return BlenderWorker(self.blender_path, self.startup_timeout)
+    
+    def _checkout(self) -> BlenderWorker:
+        """Take a healthy idle worker or start a new one"""
+        while True:
+            try:
+                worker = self._idle.get_nowait()
+            except queue.Empty:
+                return self._spawn()
+            if worker.alive:
+                return worker
+            worker.kill()
+    
+    def _checkin(self, worker: BlenderWorker) -> None:
+        """Return a worker to the pool or recycle it"""
+        if not worker.alive:
+            worker.kill()
+            return
+        if self._closed:
+            self._retire(worker)
+            return
+        if worker.jobs_done >= self.max_jobs_per_worker:
+            logger.info(f"Recycling Blender worker after {worker.jobs_done} jobs")
+            self._retire(worker)
+            return
+        if worker.max_rss_kb > self.max_memory_kb:
+            logger.info(f"Recycling Blender worker at {worker.max_rss_kb // 1024} MB peak RSS")
+            self._retire(worker)
+            return
+        self._idle.put(worker)
+    
+    def _retire(self, worker: BlenderWorker) -> None:
+        """Shut a worker down without blocking the caller"""
+        threading.Thread(target=worker.close, daemon=True).start()
@@ -0,0 +1,98 @@
+"""Blender Worker Process
+
+Runs inside a long-lived `blender --background` process started by
+BlenderWorkerPool. Jobs arrive on stdin as one JSON object per line:
+    
+    {"id": 7, "script": "<python source>"}
+
+Each job's script is executed in a fresh namespace after the scene has been
+reset, and a single reply line is written to stdout:
+    
+    @@TEELI_WORKER@@ {"id": 7, "ok": true, "code": 0, "error": null, "max_rss_kb": 123456}
+
+Everything else Blender prints is ignored by the pool. The worker exits when
+stdin is closed. It only depends on the standard library (and bpy when run
+inside Blender), so it can also be driven by a stub executable in tests.
+"""
+
+import sys
+import json
+import traceback
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+try:
+    import bpy
+except ImportError:  # Stub executable without Blender
+    bpy = None
+
+MARKER = '@@TEELI_WORKER@@'
+
+
+def reply(message):
+    """Write one protocol line to the real stdout"""
+    sys.__stdout__.write(f"{MARKER} {json.dumps(message)}\n")
+    sys.__stdout__.flush()
+
+
+def max_rss_kb():
+    """Peak resident set size of this process in KB (0 if unknown)"""
+    if resource is None:
+        return 0
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS reports bytes, Linux kilobytes
+    return usage // 1024 if sys.platform == 'darwin' else usage
+
+
+def reset_scene():
+    """Return Blender to an empty scene and drop orphaned data blocks"""
+    if bpy is None:
+        return
+    bpy.ops.wm.read_homefile(use_empty=True)
+    try:
+        bpy.data.orphans_purge(do_recursive=True)
+    except (AttributeError, TypeError):
+        pass
+
+
+def run_job(job):
+    """Execute one job script, translating sys.exit() into a return code"""
+    code = 0
+    error = None
+    try:
+        reset_scene()
+        exec(compile(job['script'], '<teeli-job>', 'exec'), {'__name__': '__main__'})
+    except SystemExit as e:
+        code = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+    except Exception:
+        code = 1
+        error = traceback.format_exc()
+    
+    return {
+        'id': job.get('id'),
+        'ok': code == 0,
+        'code': code,
+        'error': error,
+        'max_rss_kb': max_rss_kb(),
+    }
+
+
+def main():
+    reply({'id': None, 'ready': True, 'max_rss_kb': max_rss_kb()})
+    for line in sys.stdin:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            job = json.loads(line)
+        except ValueError:
+            reply({'id': None, 'ok': False, 'code': 1, 'error': 'Malformed job', 'max_rss_kb': max_rss_kb()})
+            continue
+        reply(run_job(job))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,196 @@
+"""Native Conversion Module
+
+Geometry-only conversions without Blender:
+- STL, OBJ, GLB / glTF in; GLB, STL, OBJ out
+- Reading and writing use the bulk array I/O of utils.mesh_io
+  (memory-mapped buffers in, tofile / streamed chunks out)
+- Uniform scale is the only transform, as in the Blender script
+- Several outputs are written from a single read of the input
+- Up axes follow Blender's importers and exporters (STL is Z-up, OBJ and
+  glTF are Y-up), so results match the Blender path
+
+OBJ corners with their own texture coordinates or normals (UV seams,
+hard edges) are split into separate vertices, as glTF stores them.
+Anything the mesh writers would lose (materials, textures, skins,
+animation, morph targets, node transforms, instancing, required
+extensions such as Draco, OBJ material libraries) is left to Blender.
+"""
+
+import os
+import re
+import mmap
+import logging
+from pathlib import Path
+from typing import Optional, Dict, Any, List, Union
+
+import numpy as np
+
+from utils.helper import batch_face_normals
+from utils.mesh import Mesh
+from utils.mesh_io import load_mesh, save_mesh, gltf_document
+
+logger = logging.getLogger(__name__)
+
+INPUT_FORMATS = ['.stl', '.obj', '.glb', '.gltf']
+OUTPUT_FORMATS = ['.glb', '.stl', '.obj']
+
+# Options the native path implements (anything else goes to Blender)
+SUPPORTED_OPTIONS = ('scale',)
+
+# Up axis of each format as Blender imports / exports it
+UP_AXIS = {'.stl': 'Z', '.obj': 'Y', '.glb': 'Y', '.gltf': 'Y'}
+
+# Scene features that only Blender carries through a conversion
+_GLTF_BLENDER_KEYS = ('materials', 'skins', 'animations', 'textures', 'images', 'extensionsRequired')
+_NODE_TRANSFORMS = ('matrix', 'translation', 'rotation', 'scale')
+_OBJ_MATERIALS = re.compile(rb'^[ \t]*mtllib[ \t]', re.MULTILINE)
+
+
+def _gltf_is_simple(filepath: str) -> bool:
+    """True if the glTF scene is plain triangle geometry"""
+    document = gltf_document(filepath)
+    if any(document.get(key) for key in _GLTF_BLENDER_KEYS):
+        return False
+    
+    instances = {}
+    for node in document.get('nodes', []):
+        if any(key in node for key in _NODE_TRANSFORMS):
+            return False
+        if 'mesh' in node:
+            instances[node['mesh']] = instances.get(node['mesh'], 0) + 1
+    if any(count > 1 for count in instances.values()):
+        return False
+    
+    for mesh in document.get('meshes', []):
+        for primitive in mesh.get('primitives', []):
+            if primitive.get('targets') or primitive.get('mode', 4) != 4:
+                return False
+    return True
+
+
+def _obj_is_simple(filepath: str) -> bool:
+    """True if the OBJ references no material library"""
+    if os.path.getsize(filepath) == 0:
+        return True
+    with open(filepath, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        return _OBJ_MATERIALS.search(data) is None
+
+
+def _to_up_axis(data: np.ndarray, source: str, target: str) -> np.ndarray:
+    """Rotate Nx3 vectors between Z-up and Y-up frames"""
+    if source == target:
+        return data
+    x, y, z = data[:, 0], data[:, 1], data[:, 2]
+    if source == 'Z':
+        return np.column_stack([x, z, -y])
+    return np.column_stack([x, -z, y])
+
+
+class NativeConverter:
+    """NumPy converter for geometry-only formats"""
+    
+    def supports(
+        self,
+        input_path: str,
+        output_path: Union[str, List[str]],
+        options: Optional[Dict[str, Any]] = None
+    ) -> bool:
+        """
+        Whether a conversion can run natively
+        
+        Args:
+            input_path: Source file path
+            output_path: Destination file path (or a list of them)
+            options: Conversion options
+        
+        Returns:
+            True for geometry-only formats, options and scenes
+        """
+        input_ext = Path(input_path).suffix.lower()
+        output_paths = [output_path] if isinstance(output_path, str) else output_path
+        options = options or {}
+        
+        if input_ext not in INPUT_FORMATS or not output_paths:
+            return False
+        if any(Path(path).suffix.lower() not in OUTPUT_FORMATS for path in output_paths):
+            return False
+        if any(key not in SUPPORTED_OPTIONS for key in options):
+            return False
+        if float(options.get('scale', 1.0)) <= 0:
+            return False
+        
+        try:
+            if input_ext in ('.glb', '.gltf'):
+                return _gltf_is_simple(input_path)
+            if input_ext == '.obj':
+                return _obj_is_simple(input_path)
+        except (OSError, ValueError) as e:
+            # Unreadable here; let Blender try (and report) it
+            logger.debug(f"Native conversion check failed: {e}")
+            return False
+        return True
+    
+    def convert(
+        self,
+        input_path: str,
+        output_path: Union[str, List[str]],
+        options: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Convert a geometry-only model
+        
+        Args:
+            input_path: Source file path
+            output_path: Destination file path, or a list of them (the
+                input is read once and written to each)
+            options: Conversion options (scale)
+        
+        Returns:
+            Conversion result with metadata (same keys as BlenderConverter)
+        """
+        input_ext = Path(input_path).suffix.lower()
+        output_paths = [output_path] if isinstance(output_path, str) else list(output_path)
+        scale = float((options or {}).get('scale', 1.0))
+        
+        try:
+            mesh = load_mesh(input_path, split_seams=True)
+            vertices = mesh.vertices
+            normals = mesh.normals if mesh.has_normals else None
+            if scale != 1.0:
+                vertices = vertices * np.float32(scale)
+            
+            # STL corners are unwelded, so flat face normals are exact vertex normals
+            face_normals = None
+            if input_ext == '.stl' and mesh.num_faces:
+                face_normals = np.repeat(batch_face_normals(mesh.vertices, mesh.faces), 3, axis=0)
+            
+            sizes = []
+            for path in output_paths:
+                output_ext = Path(path).suffix.lower()
+                source = face_normals if face_normals is not None and output_ext != '.stl' else normals
+                up = (UP_AXIS[input_ext], UP_AXIS[output_ext])
+                output = Mesh(
+                    _to_up_axis(vertices, *up),
+                    mesh.faces,
+                    _to_up_axis(source, *up) if source is not None else None,
+                    mesh.uvs if mesh.has_uvs else None
+                )
+                sizes.append(save_mesh(path, output))
+            
+            result = {
+                'success': True,
+                'input': input_path,
+                'output': output_paths[0],
+                'size': sizes[0],
+                'converter': 'native'
+            }
+            if not isinstance(output_path, str):
+                result['outputs'] = [{'output': path, 'size': size} for path, size in zip(output_paths, sizes)]
+            return result
+        
+        except Exception as e:
+            logger.error(f"Native conversion failed: {e}")
+            return {
+                'success': False,
+                'error': str(e)
+            }
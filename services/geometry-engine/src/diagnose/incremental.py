@@ -0,0 +1,334 @@
+"""Incremental Diagnosis
+
+Reuses the diagnosis of unchanged parts when an asset is uploaded again:
+- The mesh is split into vertex-connected components identified by
+  content hashes (see utils.components). Winding / orientation counts and
+  self-intersections are cached per component hash; intersections between
+  two components with overlapping bounding boxes are kept in both entries,
+  keyed by the other component's hash
+- Only components without a cache entry (and the overlapping pairs they
+  take part in) are checked again; the cheap whole-mesh checks (face,
+  edge and UV statistics) always run
+- When nothing is cached or most faces changed, the regular diagnosis runs
+  and its per-component results are recorded, so reports of fresh uploads
+  are unchanged. Merged reports have the same counts and list the
+  lowest-numbered intersecting pairs as samples
+- Keys include the plane tolerance and volume centre, which follow the
+  bounding box of the mesh: growing the bounding box invalidates all parts
+"""
+
+import logging
+from typing import Any, Dict, Tuple
+
+import numpy as np
+
+from diagnose.index import GeometryDiagnostics
+from diagnose.intersections import IntersectionGrid, face_bounds, distance_epsilon, SAMPLE_PAIRS
+from diagnose.parallel import chunk_face_stats, reduce_face_stats, edge_stats, face_chunks, CHUNK_FACES
+from utils.cache import ResultCache
+from utils.components import MeshComponents, ComponentCache
+from utils.helper import degenerate_area_epsilon, FaceBuffers
+from utils.mesh_io import load_mesh
+from utils.metrics import span
+from utils.orientation import ORIENTATION_COUNTS, orient_components, bbox_center
+from utils.topology import EdgeTable
+
+logger = logging.getLogger(__name__)
+
+# Above this fraction of changed faces the whole mesh is diagnosed again
+FULL_RECHECK_FRACTION = 0.5
+
+
+def overlapping_components(lo: np.ndarray, hi: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Pairs of boxes that overlap (sweep along x)
+    
+    Args:
+        lo, hi: Kx3 box corners
+    
+    Returns:
+        (a, b) box indices with a < b
+    """
+    order = np.argsort(lo[:, 0], kind='stable')
+    lo = lo[order]
+    hi = hi[order]
+    ends = np.searchsorted(lo[:, 0], hi[:, 0], side='right')
+    counts = np.maximum(ends - np.arange(len(order)) - 1, 0)
+    i = np.repeat(np.arange(len(order)), counts)
+    j = np.arange(len(i)) - np.repeat(np.cumsum(counts) - counts, counts) + i + 1
+    keep = np.ones(len(i), dtype=bool)
+    for axis in (1, 2):
+        keep &= (lo[i, axis] <= hi[j, axis]) & (lo[j, axis] <= hi[i, axis])
+    a = order[i[keep]]
+    b = order[j[keep]]
+    return np.minimum(a, b), np.maximum(a, b)
+
+
+class IncrementalDiagnostics(GeometryDiagnostics):
+    """GeometryDiagnostics reusing cached results of unchanged components"""
+    
+    def __init__(self, mesh_data: Any, cache: ResultCache, num_workers: int = 1):
+        """
+        Args:
+            mesh_data: Mesh or mesh dictionary (see GeometryDiagnostics)
+            cache: Result cache holding the per-component results
+            num_workers: Processes used for a full diagnosis of large meshes
+        """
+        super().__init__(mesh_data, num_workers)
+        self.cache = cache
+    
+    def _check_normals(self) -> None:
+        # The orientation summary is computed together with the mesh stats
+        if len(self.faces):
+            self.mesh_stats
+        super()._check_normals()
+    
+    def _compute_mesh_stats(self, keep_pairs: bool = False) -> Dict[str, Any]:
+        if len(self.faces) < 2:
+            return super()._compute_mesh_stats(keep_pairs)
+        
+        with span('diagnose.components'):
+            components = MeshComponents(self.vertices, self.faces)
+        if components.hashes is None:
+            logger.info(f"{components.count} components, diagnosing the whole mesh")
+            return super()._compute_mesh_stats(keep_pairs)
+        
+        store = ComponentCache(self.cache, 'diagnose.component', {
+            'epsilon': distance_epsilon(self.vertices),
+            'center': bbox_center(self.vertices).tolist(),
+        })
+        entries = store.lookup(components.hashes)
+        
+        lo, hi = face_bounds(self.vertices, self.faces)
+        starts = components.offsets[:-1]
+        comp_lo = np.minimum.reduceat(lo[components.order], starts)
+        comp_hi = np.maximum.reduceat(hi[components.order], starts)
+        pair_a, pair_b = overlapping_components(comp_lo, comp_hi)
+        
+        missing = np.array([h not in entries for h in components.hashes], dtype=bool)
+        # Overlapping pairs of cached components that were never checked together
+        hashes = components.hashes
+        for a, b in zip(pair_a.tolist(), pair_b.tolist()):
+            if missing[a] or missing[b] or hashes[b] in entries[hashes[a]]['partners']:
+                continue
+            missing[a if components.size(a) <= components.size(b) else b] = True
+        
+        changed = int(sum(components.size(c) for c in np.flatnonzero(missing).tolist()))
+        if changed > FULL_RECHECK_FRACTION * len(self.faces):
+            stats = super()._compute_mesh_stats(keep_pairs=True)
+            pairs = stats.pop('pairs', np.empty((0, 2), dtype=np.int64))
+            self.face_flips, counts = orient_components(
+                self.vertices, self.faces, self.edge_table, components.component, components.count,
+                label=self.shell_labels
+            )
+            self._orientation = {key: int(counts[key].sum()) for key in ORIENTATION_COUNTS}
+            computed = np.ones(components.count, dtype=bool)
+        else:
+            logger.info(f"Reusing {components.count - int(np.count_nonzero(missing))} "
+                        f"of {components.count} components ({changed} faces changed)")
+            stats, pairs, counts = self._merge(components, entries, missing, pair_a, pair_b, store.options)
+            computed = missing
+        
+        self._record(store, components, entries, computed, counts, pairs, pair_a, pair_b)
+        return stats
+    
+    def _merge(
+        self,
+        components: MeshComponents,
+        entries: Dict[str, Dict[str, Any]],
+        missing: np.ndarray,
+        pair_a: np.ndarray,
+        pair_b: np.ndarray,
+        options: Dict[str, Any]
+    ) -> Tuple[Dict[str, Any], np.ndarray, Dict[str, np.ndarray]]:
+        """
+        Check the missing components and combine them with the cached ones
+        
+        Returns:
+            (mesh stats, intersecting pairs found by the new checks,
+            per-component orientation counts of the missing components)
+        """
+        vertices, faces = self.vertices, self.faces
+        hashes = components.hashes
+        
+        # Whole-mesh face and edge statistics (cheap)
+        with span('diagnose.face_stats'):
+            buffers = FaceBuffers(CHUNK_FACES, vertices.dtype)
+            area_epsilon = degenerate_area_epsilon(vertices)
+            stats = reduce_face_stats([
+                chunk_face_stats(vertices, faces[start:stop], area_epsilon, start, buffers)
+                for start, stop in face_chunks(len(faces))
+            ])
+        with span('diagnose.edge_stats'):
+            stats.update(edge_stats(self.edge_table))
+        
+        self.face_flips = np.zeros(len(faces), dtype=bool)
+        full_counts = {key: np.zeros(components.count, dtype=np.int64) for key in ORIENTATION_COUNTS}
+        pairs = np.empty((0, 2), dtype=np.int64)
+        missing_ids = np.flatnonzero(missing)
+        if len(missing_ids):
+            checked = np.sort(np.concatenate([components.faces(c) for c in missing_ids.tolist()]))
+            
+            # Orientation of the missing components, around the centre of the whole mesh
+            with span('diagnose.orientation'):
+                sub_faces = faces[checked]
+                local = np.searchsorted(missing_ids, components.component[checked])
+                flips, counts = orient_components(
+                    vertices, sub_faces, EdgeTable.from_faces(sub_faces), local, len(missing_ids),
+                    center=np.asarray(options['center'])
+                )
+                self.face_flips[checked] = flips
+                for key in ORIENTATION_COUNTS:
+                    full_counts[key][missing_ids] = counts[key]
+            with span('diagnose.intersection_search'):
+                pairs = self._pairs_with(checked, components, missing, pair_a, pair_b, options['epsilon'])
+        
+        # Cached results of the unchanged components
+        totals = {key: int(full_counts[key].sum()) for key in ORIENTATION_COUNTS}
+        merged = [pairs]
+        for c in np.flatnonzero(~missing).tolist():
+            entry = entries[hashes[c]]
+            ids = components.faces(c)
+            self.face_flips[ids[np.asarray(entry['flips'], dtype=np.int64)]] = True
+            for key in ORIENTATION_COUNTS:
+                totals[key] += entry['orientation'][key]
+            if entry['pairs']:
+                merged.append(ids[np.asarray(entry['pairs'], dtype=np.int64)])
+        for a, b in zip(pair_a.tolist(), pair_b.tolist()):
+            if missing[a] or missing[b]:
+                continue
+            cross = entries[hashes[a]]['partners'][hashes[b]]
+            if cross:
+                cross = np.asarray(cross, dtype=np.int64)
+                merged.append(np.stack([components.faces(a)[cross[:, 0]], components.faces(b)[cross[:, 1]]], axis=1))
+        self._orientation = totals
+        
+        every = np.sort(np.concatenate(merged), axis=1)
+        every = every[np.lexsort((every[:, 1], every[:, 0]))]
+        stats.update({
+            'intersecting_faces': len(np.unique(every)),
+            'intersecting_pairs': len(every),
+            'sample_pairs': every[:SAMPLE_PAIRS].tolist(),
+        })
+        return stats, pairs, full_counts
+    
+    def _pairs_with(
+        self,
+        checked: np.ndarray,
+        components: MeshComponents,
+        missing: np.ndarray,
+        pair_a: np.ndarray,
+        pair_b: np.ndarray,
+        epsilon: float
+    ) -> np.ndarray:
+        """
+        Intersecting pairs with at least one face in checked (the faces
+        of the missing components)
+        
+        The checked faces come first and own their pairs; the faces of
+        overlapping cached components are only tested against them.
+        """
+        partner = np.zeros(components.count, dtype=bool)
+        partner[pair_b[missing[pair_a]]] = True
+        partner[pair_a[missing[pair_b]]] = True
+        partner &= ~missing
+        partner_ids = np.flatnonzero(partner).tolist()
+        others = [components.faces(c) for c in partner_ids]
+        sub = np.concatenate([checked, np.sort(np.concatenate(others))]) if others else checked
+        
+        owned = np.arange(len(sub)) < len(checked)
+        grid = IntersectionGrid(self.vertices, self.faces[sub], epsilon=epsilon, owned=owned)
+        found = [grid.scan(*task, keep_pairs=True)['pairs'] for task in grid.tasks()]
+        if not found:
+            return np.empty((0, 2), dtype=np.int64)
+        return np.sort(sub[np.concatenate(found)], axis=1)
+    
+    def _record(
+        self,
+        store: ComponentCache,
+        components: MeshComponents,
+        entries: Dict[str, Dict[str, Any]],
+        computed: np.ndarray,
+        counts: Dict[str, np.ndarray],
+        pairs: np.ndarray,
+        pair_a: np.ndarray,
+        pair_b: np.ndarray
+    ) -> None:
+        """
+        Store the results of the computed components, and add the pairs
+        they formed with cached components to those components' entries
+        """
+        hashes = components.hashes
+        position = components.position
+        comp = components.component
+        
+        # Intersecting pairs grouped by (component, other component), both ways round
+        ca = comp[pairs[:, 0]]
+        cb = comp[pairs[:, 1]]
+        forward = np.stack([ca, cb, position[pairs[:, 0]], position[pairs[:, 1]]], axis=1)
+        backward = forward[ca != cb][:, [1, 0, 3, 2]]
+        grouped = np.concatenate([forward, backward])
+        grouped = grouped[np.lexsort((grouped[:, 3], grouped[:, 2], grouped[:, 1], grouped[:, 0]))]
+        found = {}
+        if len(grouped):
+            cuts = np.flatnonzero(np.any(grouped[1:, :2] != grouped[:-1, :2], axis=1)) + 1
+            for block in np.split(grouped, cuts):
+                found[(int(block[0, 0]), int(block[0, 1]))] = block[:, 2:].tolist()
+        
+        # Overlapping components of every component
+        neighbors = [[] for _ in range(components.count)]
+        for a, b in zip(pair_a.tolist(), pair_b.tolist()):
+            neighbors[a].append(b)
+            neighbors[b].append(a)
+        
+        stored = set()
+        for c in range(components.count):
+            content_hash = hashes[c]
+            if content_hash in stored:
+                continue
+            cached = entries.get(content_hash)
+            if cached is None:
+                entry = {
+                    'orientation': {key: int(counts[key][c]) for key in ORIENTATION_COUNTS},
+                    'flips': np.flatnonzero(self.face_flips[components.faces(c)]).tolist(),
+                    'pairs': found.get((c, c), []),
+                    'partners': {hashes[d]: found.get((c, d), []) for d in neighbors[c]},
+                }
+            else:
+                # Only pairs with a computed side were checked this time
+                fresh = {hashes[d]: found.get((c, d), []) for d in neighbors[c] if computed[c] or computed[d]}
+                if not fresh.keys() - cached['partners'].keys():
+                    continue
+                current = {hashes[d] for d in neighbors[c]}
+                partners = {h: v for h, v in cached['partners'].items() if h in current}
+                partners.update(fresh)
+                entry = dict(cached, partners=partners)
+            stored.add(content_hash)
+            store.put(content_hash, entry)
+
+
+def diagnose_incremental(mesh_path: str, cache: ResultCache, num_workers: int = 1) -> Dict[str, Any]:
+    """
+    diagnose.index.diagnose_mesh reusing the per-component results of
+    earlier diagnoses
+    
+    Args:
+        mesh_path: Path to 3D model file
+        cache: Result cache holding the per-component results
+        num_workers: Processes used for a full diagnosis of large meshes
+    
+    Returns:
+        Diagnosis report as dictionary
+    """
+    try:
+        mesh = load_mesh(mesh_path)
+    except (OSError, ValueError) as e:
+        logger.error(f"Failed to load mesh: {e}")
+        return {
+            'status': 'error',
+            'message': str(e)
+        }
+    
+    report = IncrementalDiagnostics(mesh, cache, num_workers).analyze()
+    report['status'] = 'success'
+    return report
@@ -10,28 +10,108 @@ Analyzes 3D meshes for common issues:
 """
 
 import numpy as np
-from typing import Dict, List, Tuple, Any
+from typing import Dict, List, Tuple, Any, Union
 import json
+import logging
+
+from utils.mesh import Mesh
+from utils.metrics import span, timed
+from utils.mesh_io import load_mesh
+from utils.topology import EdgeTable, shell_labels
+from utils.orientation import orient_faces
+from diagnose.uv import analyze_uvs, STRETCH_LIMIT
+from diagnose.parallel import serial_mesh_stats, parallel_mesh_stats, PARALLEL_MIN_FACES
+
+logger = logging.getLogger(__name__)
 
 
 class GeometryDiagnostics:
     """Main class for 3D geometry diagnostics"""
     
-    def __init__(self, mesh_data: Dict[str, Any]):
+    def __init__(self, mesh_data: Union[Mesh, Dict[str, Any]], num_workers: int = 1):
         """
         Initialize diagnostics with mesh data
         
         Args:
-            mesh_data: Dictionary containing vertices, faces, normals, uvs
+            mesh_data: Mesh, or dictionary containing vertices, faces,
+                normals, uvs (lists or arrays)
+            num_workers: Processes used for per-face checks on large meshes
+                (1 = serial; the report is identical either way)
         """
-        self.vertices = np.array(mesh_data.get('vertices', []))
-        self.faces = np.array(mesh_data.get('faces', []))
-        self.normals = np.array(mesh_data.get('normals', []))
-        self.uvs = np.array(mesh_data.get('uvs', []))
+        self.num_workers = max(1, int(num_workers))
+        self.mesh = Mesh.from_any(mesh_data)
         
         self.issues = []
         self.warnings = []
         self.stats = {}
+        
+        # Per-face statistics, built lazily and reused by all checks
+        self._mesh_stats = None
+        self._shell_labels = None
+        self._orientation = None
+        
+        # Faces to flip for consistent outward winding (reusable by repair
+        # while the faces are unchanged)
+        self.face_flips = None
+        self._uv_stats = None
+    
+    @property
+    def vertices(self) -> np.ndarray:
+        return self.mesh.vertices
+    
+    @property
+    def faces(self) -> np.ndarray:
+        return self.mesh.faces
+    
+    @property
+    def normals(self) -> np.ndarray:
+        return self.mesh.normals
+    
+    @property
+    def uvs(self) -> np.ndarray:
+        return self.mesh.uvs
+    
+    @property
+    def edge_table(self) -> EdgeTable:
+        """Undirected edge table of the mesh (cached on the Mesh)"""
+        return self.mesh.edge_table
+    
+    @property
+    def shell_labels(self) -> np.ndarray:
+        """Per-face shell labels, shared by the orientation and UV checks"""
+        if self._shell_labels is None:
+            self._shell_labels = shell_labels(len(self.faces), self.edge_table)
+        return self._shell_labels
+    
+    @property
+    def mesh_stats(self) -> Dict[str, Any]:
+        """Face, edge and intersection counts, computed in parallel for large meshes"""
+        if self._mesh_stats is None:
+            with span('diagnose.mesh_stats'):
+                self._mesh_stats = self._compute_mesh_stats()
+        return self._mesh_stats
+    
+    def _compute_mesh_stats(self, keep_pairs: bool = False) -> Dict[str, Any]:
+        """Serial or parallel per-face statistics (with every intersecting pair when keep_pairs)"""
+        if self.num_workers > 1 and len(self.faces) >= PARALLEL_MIN_FACES:
+            try:
+                return parallel_mesh_stats(self.vertices, self.faces, self.num_workers, keep_pairs)
+            except (OSError, RuntimeError, AssertionError) as e:
+                # e.g. no shared memory, or already inside a daemon worker
+                logger.warning(f"Parallel diagnosis unavailable, running serially: {e}")
+        return serial_mesh_stats(self.vertices, self.faces, self.edge_table, keep_pairs)
+    
+    def reuse(self, other: 'GeometryDiagnostics') -> None:
+        """
+        Take over the per-face results of a diagnosis of the same vertices
+        and faces (e.g. when only normals changed since)
+        """
+        self._mesh_stats = other._mesh_stats
+        self._shell_labels = other._shell_labels
+        self._orientation = other._orientation
+        self.face_flips = other.face_flips
+        if self.mesh.uvs is other.mesh.uvs:
+            self._uv_stats = other._uv_stats
     
     def analyze(self) -> Dict[str, Any]:
         """
@@ -44,6 +124,8 @@ class GeometryDiagnostics:
         self._check_holes()
         self._check_normals()
         self._check_degenerate()
+        self._check_self_intersections()
+        self._check_uvs()
         self._calculate_stats()
         
         return {
@@ -53,32 +135,203 @@ class GeometryDiagnostics:
             'health_score': self._calculate_health_score()
         }
     
+    @timed('diagnose.manifold')
     def _check_manifold(self) -> None:
-        """Check for non-manifold geometry"""
-        # TODO: Implement manifold check
-        # Non-manifold edges have != 2 adjacent faces
-        pass
+        """Check for non-manifold geometry (edges shared by > 2 faces)"""
+        if len(self.faces) == 0:
+            return
+        
+        count = self.mesh_stats['non_manifold_edges']
+        if count > 0:
+            self.issues.append({
+                'type': 'non_manifold_edges',
+                'severity': 'high',
+                'message': f'{count} edges are shared by more than two faces',
+                'count': count
+            })
     
+    @timed('diagnose.holes')
     def _check_holes(self) -> None:
-        """Detect holes and open boundaries"""
-        # TODO: Implement hole detection
-        # Find edges that belong to only one face
-        pass
+        """Detect holes and open boundaries (edges used by one face)"""
+        if len(self.faces) == 0:
+            return
+        
+        count = self.mesh_stats['boundary_edges']
+        if count > 0:
+            self.issues.append({
+                'type': 'open_boundaries',
+                'severity': 'medium',
+                'message': f'Mesh has {count} boundary edges (holes or open borders)',
+                'count': count
+            })
     
+    @timed('diagnose.normals')
     def _check_normals(self) -> None:
-        """Check for inverted or missing normals"""
+        """Check for missing normals, inconsistent winding and inside-out shells"""
         if len(self.normals) == 0:
             self.issues.append({
                 'type': 'missing_normals',
                 'severity': 'medium',
                 'message': 'Mesh has no normal data'
             })
+        
+        if len(self.faces) == 0:
+            return
+        
+        if self._orientation is None:
+            self.face_flips, self._orientation = orient_faces(
+                self.vertices, self.faces, self.edge_table, self.shell_labels
+            )
+        orientation = self._orientation
+        
+        count = orientation['winding_conflicts']
+        if count > 0:
+            self.issues.append({
+                'type': 'inconsistent_winding',
+                'severity': 'medium',
+                'message': f"{count} edges join faces with opposite winding "
+                           f"({orientation['inconsistent_shells']} shells affected)",
+                'count': count,
+                'shells': orientation['inconsistent_shells']
+            })
+        
+        count = orientation['inverted_shells']
+        if count > 0:
+            self.issues.append({
+                'type': 'inverted_normals',
+                'severity': 'medium',
+                'message': f'{count} closed shells are inside out (negative volume)',
+                'count': count
+            })
+        
+        count = orientation['non_orientable_shells']
+        if count > 0:
+            self.warnings.append({
+                'type': 'non_orientable_shells',
+                'message': f'{count} shells cannot be wound consistently',
+                'count': count
+            })
     
+    @timed('diagnose.degenerate')
     def _check_degenerate(self) -> None:
-        """Find degenerate triangles (zero area)"""
-        # TODO: Implement degenerate triangle detection
-        pass
+        """Find degenerate triangles (near-zero area or repeated vertices), slivers and unused vertices"""
+        if len(self.faces) == 0:
+            return
+        
+        stats = self.mesh_stats
+        count = stats['degenerate_faces']
+        if count > 0:
+            self.issues.append({
+                'type': 'degenerate_faces',
+                'severity': 'medium',
+                'message': f'{count} faces have (near-)zero area or repeated vertices',
+                'count': count,
+                'sample_faces': stats['degenerate_samples']
+            })
+        
+        count = stats['sliver_faces']
+        if count > 0:
+            self.warnings.append({
+                'type': 'sliver_faces',
+                'message': f'{count} faces are extremely thin slivers',
+                'count': count,
+                'sample_faces': stats['sliver_samples']
+            })
+        
+        count = stats.get('unreferenced_vertices')
+        if count is None:
+            count = int(np.count_nonzero(np.bincount(self.faces.ravel(), minlength=len(self.vertices)) == 0))
+        if count > 0:
+            self.warnings.append({
+                'type': 'unreferenced_vertices',
+                'message': f'{count} vertices are not used by any face',
+                'count': count
+            })
+    
+    @timed('diagnose.self_intersections')
+    def _check_self_intersections(self) -> None:
+        """Find faces crossing other faces they share no vertex with"""
+        if len(self.faces) < 2:
+            return
+        
+        stats = self.mesh_stats
+        count = stats['intersecting_faces']
+        if count > 0:
+            self.issues.append({
+                'type': 'self_intersections',
+                'severity': 'high',
+                'message': f"{count} faces intersect other faces ({stats['intersecting_pairs']} pairs)",
+                'count': count,
+                'pair_count': stats['intersecting_pairs'],
+                'sample_pairs': stats['sample_pairs']
+            })
     
+    @timed('diagnose.uvs')
+    def _check_uvs(self) -> None:
+        """Check texture coordinates: collapsed, flipped, stretched and overlapping UVs"""
+        if len(self.uvs) == 0 or len(self.faces) == 0:
+            return
+        
+        if not self.mesh.has_uvs:
+            self.issues.append({
+                'type': 'invalid_uvs',
+                'severity': 'medium',
+                'message': f'Mesh has {len(self.uvs)} UVs for {len(self.vertices)} vertices'
+            })
+            return
+        
+        if self._uv_stats is None:
+            self._uv_stats = analyze_uvs(self.vertices, self.faces, self.uvs, label=self.shell_labels)
+        uv = self._uv_stats
+        
+        count = uv['flipped_faces']
+        if count > 0:
+            self.issues.append({
+                'type': 'flipped_uvs',
+                'severity': 'medium',
+                'message': f'{count} faces are flipped in UV space relative to their island',
+                'count': count,
+                'sample_faces': uv['flipped_samples']
+            })
+        
+        count = uv['overlapping_islands']
+        if count > 0:
+            self.issues.append({
+                'type': 'overlapping_uvs',
+                'severity': 'medium',
+                'message': f"{count} UV islands overlap other islands "
+                           f"({uv['overlap']:.1%} of covered texels)",
+                'count': count
+            })
+        
+        count = uv['degenerate_faces']
+        if count > 0:
+            self.warnings.append({
+                'type': 'degenerate_uvs',
+                'message': f'{count} faces have (near-)zero UV area',
+                'count': count,
+                'sample_faces': uv['degenerate_samples']
+            })
+        
+        count = uv['stretched_faces']
+        if count > 0:
+            self.warnings.append({
+                'type': 'uv_stretch',
+                'message': f'{count} faces are stretched more than {STRETCH_LIMIT:g}x in UV space',
+                'count': count,
+                'sample_faces': uv['stretched_samples']
+            })
+        
+        count = uv['out_of_range_faces']
+        if count > 0:
+            self.warnings.append({
+                'type': 'uvs_out_of_range',
+                'message': f'{count} faces have UVs outside [0, 1]',
+                'count': count,
+                'sample_faces': uv['out_of_range_samples']
+            })
+    
+    @timed('diagnose.stats')
     def _calculate_stats(self) -> None:
         """Calculate mesh statistics"""
         self.stats = {
@@ -86,7 +339,18 @@ class GeometryDiagnostics:
             'face_count': len(self.faces),
             'has_normals': len(self.normals) > 0,
             'has_uvs': len(self.uvs) > 0,
+            'edge_count': self.mesh_stats['edge_count'] if len(self.faces) else 0,
+            'surface_area': self.mesh_stats['surface_area'] if len(self.faces) else 0.0,
+            'shell_count': self._orientation['shells'] if self._orientation else 0,
+            'closed_shells': self._orientation['closed_shells'] if self._orientation else 0,
         }
+        if self._uv_stats:
+            coverage = self._uv_stats['coverage']
+            self.stats.update({
+                'uv_islands': self._uv_stats['islands'],
+                'uv_coverage': round(coverage, 4) if coverage is not None else None,
+                'uv_stretch': round(self._uv_stats['stretch'], 4),
+            })
     
     def _calculate_health_score(self) -> int:
         """Calculate overall mesh health (0-100)"""
@@ -96,24 +360,29 @@ class GeometryDiagnostics:
         return max(0, score)
 
 
-def diagnose_mesh(mesh_path: str) -> Dict[str, Any]:
+def diagnose_mesh(mesh_path: str, num_workers: int = 1) -> Dict[str, Any]:
     """
     Main entry point for mesh diagnosis
     
     Args:
         mesh_path: Path to 3D model file
+        num_workers: Processes used for per-face checks on large meshes
     
     Returns:
         Diagnosis report as dictionary
     """
-    # TODO: Load mesh from file
-    # TODO: Initialize diagnostics
-    # TODO: Return analysis results
+    try:
+        mesh = load_mesh(mesh_path)
+    except (OSError, ValueError) as e:
+        logger.error(f"Failed to load mesh: {e}")
+        return {
+            'status': 'error',
+            'message': str(e)
+        }
     
-    return {
-        'status': 'not_implemented',
-        'message': 'Mesh diagnosis coming soon'
-    }
+    report = GeometryDiagnostics(mesh, num_workers).analyze()
+    report['status'] = 'success'
+    return report
 
 
 if __name__ == '__main__':
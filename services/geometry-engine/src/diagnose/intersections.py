@@ -0,0 +1,559 @@
+"""Self-Intersection Detection
+
+Finds pairs of faces that cross each other without sharing a vertex:
+- Broad phase: hierarchical uniform grid over triangle bounding boxes.
+  Each face is placed on the finest level whose cells are at least as
+  large as the face, so it covers at most two cells per axis; larger
+  faces go to coarser levels and are paired there with the smaller faces
+  overlapping the same cells
+- A candidate pair is only emitted in the single cell that contains the
+  corner max(min_a, min_b) of the two boxes, so pairs found in several
+  cells need no global de-duplication
+- Grid cells are processed in slabs along x and candidate pairs are
+  enumerated in fixed-size batches, so memory stays bounded no matter how
+  many faces or pairs there are
+- Narrow phase: batched plane-side rejection, then edge / triangle
+  crossing tests; coplanar pairs use a 2D overlap test. Faces that only
+  touch are not reported.
+- The sampled pairs are the lowest (lower, higher) face ID pairs, so they
+  do not depend on the scan order (serial, parallel, tiled or merged
+  from cached components)
+"""
+
+import numpy as np
+from typing import Dict, Any, List, Optional, Tuple
+
+# Candidate pairs tested per batch
+PAIR_BATCH = 1 << 18
+
+# Grid entries (face x cell) generated per slab; slabs are also the unit of
+# parallel work
+SLAB_ENTRIES = 1 << 20
+
+# Intersecting pairs reported, lowest face IDs first (counts are always exact)
+SAMPLE_PAIRS = 10
+
+# Cell size ratio between consecutive grid levels
+LEVEL_FACTOR = 4
+
+# Faces up to this size percentile live on the finest grid level
+BASE_CELL_PERCENTILE = 90
+
+# Points closer than this (relative to the bounding box diagonal) to a
+# face plane count as lying on it
+DISTANCE_EPSILON_RATIO = 1e-7
+
+# Bits per axis in packed cell keys
+_AXIS_BITS = 21
+_AXIS_MASK = (1 << _AXIS_BITS) - 1
+
+
+def face_bounds(
+    vertices: np.ndarray,
+    faces: np.ndarray,
+    chunk_size: int = 1 << 20
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Per-face axis-aligned bounding boxes (Fx3 min, Fx3 max)"""
+    lo = np.empty((len(faces), 3), dtype=vertices.dtype)
+    hi = np.empty((len(faces), 3), dtype=vertices.dtype)
+    for start in range(0, len(faces), chunk_size):
+        chunk = faces[start:start + chunk_size]
+        corners = vertices[chunk]
+        np.min(corners, axis=1, out=lo[start:start + len(chunk)])
+        np.max(corners, axis=1, out=hi[start:start + len(chunk)])
+    return lo, hi
+
+
+def distance_epsilon(vertices: np.ndarray) -> float:
+    """Default plane distance tolerance (relative to the bounding box of vertices)"""
+    size = vertices.max(axis=0).astype(np.float64) - vertices.min(axis=0).astype(np.float64)
+    return DISTANCE_EPSILON_RATIO * float(np.sqrt(size @ size))
+
+
+def _pack_cells(x: np.ndarray, y: np.ndarray, z: np.ndarray) -> np.ndarray:
+    """Pack integer cell coordinates into uint64 keys"""
+    keys = x.astype(np.uint64) << np.uint64(2 * _AXIS_BITS)
+    keys |= y.astype(np.uint64) << np.uint64(_AXIS_BITS)
+    keys |= z.astype(np.uint64)
+    return keys
+
+
+def _unpack_cells(keys: np.ndarray) -> np.ndarray:
+    """Inverse of _pack_cells (Kx3 int64)"""
+    cells = np.empty((len(keys), 3), dtype=np.int64)
+    cells[:, 0] = keys >> np.uint64(2 * _AXIS_BITS)
+    cells[:, 1] = (keys >> np.uint64(_AXIS_BITS)) & np.uint64(_AXIS_MASK)
+    cells[:, 2] = keys & np.uint64(_AXIS_MASK)
+    return cells
+
+
+def _cell_entries(
+    face_ids: np.ndarray,
+    cell_lo: np.ndarray,
+    cell_hi: np.ndarray,
+    x_start: int,
+    x_stop: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    One (cell key, face) entry for every cell a face covers inside a slab
+    
+    Args:
+        face_ids: Faces to insert
+        cell_lo, cell_hi: Their inclusive integer cell ranges (Nx3)
+        x_start, x_stop: Slab range of x cells
+    
+    Returns:
+        (keys, faces) of all entries
+    """
+    lo = cell_lo.copy()
+    np.maximum(lo[:, 0], x_start, out=lo[:, 0])
+    hi = cell_hi.copy()
+    np.minimum(hi[:, 0], x_stop - 1, out=hi[:, 0])
+    span = hi - lo + 1
+    counts = span[:, 0] * span[:, 1] * span[:, 2]
+    
+    total = int(counts.sum())
+    owner = np.repeat(np.arange(len(face_ids)), counts)
+    local = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+    
+    sz = span[owner, 2]
+    sy = span[owner, 1]
+    dz = local % sz
+    local //= sz
+    dy = local % sy
+    dx = local // sy
+    keys = _pack_cells(lo[owner, 0] + dx, lo[owner, 1] + dy, lo[owner, 2] + dz)
+    return keys, face_ids[owner]
+
+
+def _slabs(cell_lo: np.ndarray, cell_hi: np.ndarray) -> List[Tuple[int, int]]:
+    """Split the x cell range into slabs of about SLAB_ENTRIES entries"""
+    span = cell_hi - cell_lo + 1
+    per_face = span[:, 1] * span[:, 2]
+    size = int(cell_hi[:, 0].max()) + 2
+    # Difference array: a face adds per_face entries to each x cell it covers
+    per_column = np.bincount(cell_lo[:, 0], weights=per_face, minlength=size)
+    per_column -= np.bincount(cell_hi[:, 0] + 1, weights=per_face, minlength=size)
+    cumulative = np.cumsum(np.cumsum(per_column))
+    
+    num_slabs = int(np.ceil(cumulative[-1] / SLAB_ENTRIES))
+    cuts = np.searchsorted(cumulative, np.arange(1, num_slabs) * SLAB_ENTRIES, side='left') + 1
+    cuts = np.minimum(cuts, size - 1)
+    bounds = np.unique(np.concatenate([[0], cuts, [size - 1]]))
+    return list(zip(bounds[:-1].tolist(), bounds[1:].tolist()))
+
+
+def _cross(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    return np.stack([
+        a[..., 1] * b[..., 2] - a[..., 2] * b[..., 1],
+        a[..., 2] * b[..., 0] - a[..., 0] * b[..., 2],
+        a[..., 0] * b[..., 1] - a[..., 1] * b[..., 0],
+    ], axis=-1)
+
+
+def _edges_cross_triangle(
+    p: np.ndarray,
+    dist: np.ndarray,
+    tri: np.ndarray,
+    normal: np.ndarray
+) -> np.ndarray:
+    """Does any edge of triangles p pass through the plane of tri inside tri"""
+    hit = np.zeros(len(p), dtype=bool)
+    for k in range(3):
+        d0 = dist[:, k]
+        d1 = dist[:, (k + 1) % 3]
+        crossing = d0 * d1 < 0
+        if not crossing.any():
+            continue
+        idx = np.flatnonzero(crossing)
+        t = d0[idx] / (d0[idx] - d1[idx])
+        point = p[idx, k] + t[:, None] * (p[idx, (k + 1) % 3] - p[idx, k])
+        
+        inside = np.ones(len(idx), dtype=bool)
+        for j in range(3):
+            edge = tri[idx, (j + 1) % 3] - tri[idx, j]
+            side = np.einsum('ij,ij->i', _cross(edge, point - tri[idx, j]), normal[idx])
+            inside &= side >= 0
+        hit[idx] |= inside
+    return hit
+
+
+def _orient2d(a: np.ndarray, b: np.ndarray, c: np.ndarray) -> np.ndarray:
+    return (b[:, 0] - a[:, 0]) * (c[:, 1] - a[:, 1]) - (b[:, 1] - a[:, 1]) * (c[:, 0] - a[:, 0])
+
+
+def _strictly_inside2d(point: np.ndarray, tri: np.ndarray) -> np.ndarray:
+    o = [_orient2d(tri[:, j], tri[:, (j + 1) % 3], point) for j in range(3)]
+    return ((o[0] > 0) & (o[1] > 0) & (o[2] > 0)) | ((o[0] < 0) & (o[1] < 0) & (o[2] < 0))
+
+
+def _coplanar_overlap(a: np.ndarray, b: np.ndarray, normal: np.ndarray) -> np.ndarray:
+    """Interior overlap of coplanar triangle pairs (projected to 2D)"""
+    axis = np.abs(normal).argmax(axis=1)
+    # Drop the dominant normal axis
+    keep = np.array([[1, 2], [0, 2], [0, 1]])[axis][:, None, :].repeat(3, axis=1)
+    a2 = np.take_along_axis(a, keep, axis=2)
+    b2 = np.take_along_axis(b, keep, axis=2)
+    
+    hit = _strictly_inside2d(a2.mean(axis=1), b2) | _strictly_inside2d(b2.mean(axis=1), a2)
+    for i in range(3):
+        p, q = a2[:, i], a2[:, (i + 1) % 3]
+        for j in range(3):
+            r, s = b2[:, j], b2[:, (j + 1) % 3]
+            hit |= (
+                (_orient2d(p, q, r) * _orient2d(p, q, s) < 0)
+                & (_orient2d(r, s, p) * _orient2d(r, s, q) < 0)
+            )
+    return hit
+
+
+def triangles_intersect(a: np.ndarray, b: np.ndarray, epsilon: float) -> np.ndarray:
+    """
+    Batched triangle-triangle intersection test
+    
+    Args:
+        a, b: Nx3x3 corner positions of the two triangles of each pair
+        epsilon: Distance below which a point counts as lying on a plane
+    
+    Returns:
+        N booleans; True where the triangles cross (touching does not count)
+    """
+    a = a.astype(np.float64, copy=False)
+    b = b.astype(np.float64, copy=False)
+    na = _cross(a[:, 1] - a[:, 0], a[:, 2] - a[:, 0])
+    nb = _cross(b[:, 1] - b[:, 0], b[:, 2] - b[:, 0])
+    la = np.sqrt(np.einsum('ij,ij->i', na, na))
+    lb = np.sqrt(np.einsum('ij,ij->i', nb, nb))
+    valid = (la > 0) & (lb > 0)
+    na /= np.where(la > 0, la, 1)[:, None]
+    nb /= np.where(lb > 0, lb, 1)[:, None]
+    
+    # Signed distances of each triangle's corners to the other's plane
+    db = np.einsum('nkj,nj->nk', b - a[:, None, 0], na)
+    da = np.einsum('nkj,nj->nk', a - b[:, None, 0], nb)
+    db[np.abs(db) <= epsilon] = 0
+    da[np.abs(da) <= epsilon] = 0
+    
+    # All corners strictly on one side of the other plane: no intersection
+    separated = (
+        (db > 0).all(axis=1) | (db < 0).all(axis=1)
+        | (da > 0).all(axis=1) | (da < 0).all(axis=1)
+    )
+    candidates = valid & ~separated
+    coplanar = candidates & (db == 0).all(axis=1)
+    crossing = candidates & ~coplanar
+    
+    hit = np.zeros(len(a), dtype=bool)
+    idx = np.flatnonzero(crossing)
+    if len(idx):
+        hit[idx] = (
+            _edges_cross_triangle(a[idx], da[idx], b[idx], nb[idx])
+            | _edges_cross_triangle(b[idx], db[idx], a[idx], na[idx])
+        )
+    idx = np.flatnonzero(coplanar)
+    if len(idx):
+        hit[idx] = _coplanar_overlap(a[idx], b[idx], na[idx])
+    return hit
+
+
+class IntersectionGrid:
+    """
+    Grid levels and slabs of one mesh
+    
+    The slab list depends only on the mesh, so scanning the slabs in order
+    (serially, or in worker processes followed by reduce_intersections)
+    always gives the same result.
+    """
+    
+    def __init__(
+        self,
+        vertices: np.ndarray,
+        faces: np.ndarray,
+        bounds: Optional[Tuple[np.ndarray, np.ndarray]] = None,
+        epsilon: Optional[float] = None,
+        owned: Optional[np.ndarray] = None
+    ):
+        """
+        Args:
+            vertices: Vx3 vertex positions
+            faces: Fx3 vertex indices
+            bounds: Optional precomputed face_bounds (e.g. in shared memory)
+            epsilon: Plane distance tolerance (default: relative to the
+                bounding box of vertices)
+            owned: Optional per-face mask; only pairs whose lower-indexed
+                face is owned are tested (e.g. one tile of a larger mesh)
+        """
+        self.vertices = vertices
+        self.faces = faces
+        self.owned = owned
+        self.lo, self.hi = bounds if bounds is not None else face_bounds(vertices, faces)
+        
+        self.origin = vertices.min(axis=0).astype(np.float64)
+        size = vertices.max(axis=0).astype(np.float64) - self.origin
+        self.epsilon = distance_epsilon(vertices) if epsilon is None else epsilon
+        
+        # Finest cell size; coarse enough for packed keys to fit
+        extent = (self.hi - self.lo).max(axis=1).astype(np.float64)
+        base = float(np.percentile(extent, BASE_CELL_PERCENTILE))
+        self.base = max(base, float(size.max()) / (1 << (_AXIS_BITS - 1)), np.finfo(np.float32).tiny)
+        ratio = np.maximum(extent / self.base, 1)
+        self.level = np.ceil(np.log(ratio) / np.log(LEVEL_FACTOR) - 1e-9).astype(np.int64)
+        self._cells = None
+    
+    def level_cells(self, current: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Faces taking part on one grid level (the last level is cached)
+        
+        Returns:
+            (members, is_native, cell_lo, cell_hi): faces of this level
+            followed by the smaller faces of finer levels, and their
+            inclusive integer cell ranges
+        """
+        if self._cells is None or self._cells[0] != current:
+            cell = self.base * LEVEL_FACTOR ** current
+            natives = np.flatnonzero(self.level == current)
+            members = np.concatenate([natives, np.flatnonzero(self.level < current)])
+            is_native = np.zeros(len(members), dtype=bool)
+            is_native[:len(natives)] = True
+            cell_lo = np.floor((self.lo[members] - self.origin) / cell).astype(np.int32)
+            cell_hi = np.floor((self.hi[members] - self.origin) / cell).astype(np.int32)
+            self._cells = (current, (members, is_native, cell_lo, cell_hi))
+        return self._cells[1]
+    
+    def tasks(self) -> List[Tuple[int, int, int]]:
+        """(level, x_start, x_stop) of every slab, in scan order"""
+        tasks = []
+        if len(self.faces) < 2:
+            return tasks
+        for current in np.unique(self.level).tolist():
+            _, _, cell_lo, cell_hi = self.level_cells(current)
+            tasks.extend((current, x_start, x_stop) for x_start, x_stop in _slabs(cell_lo, cell_hi))
+        return tasks
+    
+    def scan(
+        self,
+        current: int,
+        x_start: int,
+        x_stop: int,
+        sample_size: int = SAMPLE_PAIRS,
+        keep_pairs: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Test all candidate pairs of one slab
+        
+        Returns:
+            Partial result: intersecting_pairs, sample_pairs and the
+            sorted IDs of intersecting faces (faces); with keep_pairs also
+            every intersecting pair as a Px2 array of (lower, higher)
+            face IDs (pairs)
+        """
+        members, is_native, cell_lo, cell_hi = self.level_cells(current)
+        in_slab = np.flatnonzero((cell_lo[:, 0] < x_stop) & (cell_hi[:, 0] >= x_start))
+        keys, owner = _cell_entries(in_slab, cell_lo[in_slab], cell_hi[in_slab], x_start, x_stop)
+        # Stable sort keeps natives (inserted first) ahead of queries in each cell
+        order = np.argsort(keys, kind='stable')
+        owner = owner[order]
+        return _scan_cells(
+            keys[order], members[owner], is_native[owner], np.ascontiguousarray(cell_lo[owner].T),
+            self.vertices, self.faces, self.lo, self.hi, self.epsilon, sample_size, self.owned, keep_pairs
+        )
+
+
+def reduce_intersections(
+    partials: List[Dict[str, Any]],
+    num_faces: int,
+    sample_size: int = SAMPLE_PAIRS
+) -> Dict[str, Any]:
+    """Combine slab results in slab order (pairs are concatenated when the slabs kept them)"""
+    intersecting = np.zeros(num_faces, dtype=bool)
+    result = {'intersecting_faces': 0, 'intersecting_pairs': 0, 'sample_pairs': []}
+    pairs = []
+    for partial in partials:
+        intersecting[partial['faces']] = True
+        result['intersecting_pairs'] += partial['intersecting_pairs']
+        result['sample_pairs'] = lowest_pairs(result['sample_pairs'] + partial['sample_pairs'], sample_size)
+        if 'pairs' in partial:
+            pairs.append(partial['pairs'])
+    result['intersecting_faces'] = int(np.count_nonzero(intersecting))
+    if pairs:
+        result['pairs'] = np.concatenate(pairs)
+    return result
+
+
+def lowest_pairs(pairs: Any, sample_size: int = SAMPLE_PAIRS) -> List[List[int]]:
+    """
+    The sample_size lexicographically smallest face pairs, in order
+    
+    Args:
+        pairs: Px2 (lower, higher) face IDs (array or nested list)
+        sample_size: Number of pairs to keep
+    """
+    pairs = np.asarray(pairs, dtype=np.int64).reshape(-1, 2)
+    if len(pairs) > sample_size > 0:
+        key = pairs[:, 0] * (int(pairs[:, 1].max()) + 1) + pairs[:, 1]
+        pairs = pairs[np.argpartition(key, sample_size - 1)[:sample_size]]
+    pairs = pairs[:max(sample_size, 0)]
+    return pairs[np.lexsort((pairs[:, 1], pairs[:, 0]))].tolist()
+
+
+def find_self_intersections(
+    vertices: np.ndarray,
+    faces: np.ndarray,
+    sample_size: int = SAMPLE_PAIRS,
+    keep_pairs: bool = False
+) -> Dict[str, Any]:
+    """
+    Find crossing face pairs that do not share a vertex
+    
+    Args:
+        vertices: Vx3 vertex positions
+        faces: Fx3 vertex indices
+        sample_size: Number of intersecting pairs to report
+        keep_pairs: Also return every intersecting pair (pairs, Px2)
+    
+    Returns:
+        Dictionary with intersecting_faces (faces in at least one
+        intersecting pair), intersecting_pairs and sample_pairs
+    """
+    grid = IntersectionGrid(vertices, faces)
+    partials = [grid.scan(*task, sample_size=sample_size, keep_pairs=keep_pairs) for task in grid.tasks()]
+    return reduce_intersections(partials, len(faces), sample_size)
+
+
+def _batch_pairs(
+    cumulative: np.ndarray,
+    pair_counts: np.ndarray,
+    first: int,
+    stop: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Entry index pairs [first, stop) of the enumeration in which entry k
+    pairs with the pair_counts[k] entries following it
+    """
+    k0 = int(np.searchsorted(cumulative, first, side='right'))
+    k1 = int(np.searchsorted(cumulative, stop - 1, side='right'))
+    counts = pair_counts[k0:k1 + 1].copy()
+    skip = first - (int(cumulative[k0]) - int(pair_counts[k0]))
+    counts[0] -= skip
+    counts[-1] -= int(cumulative[k1]) - stop
+    
+    k = np.repeat(np.arange(k0, k1 + 1), counts)
+    offsets = np.cumsum(counts) - counts
+    offsets[0] -= skip
+    other = np.arange(len(k)) - np.repeat(offsets, counts)
+    other += k + 1
+    return k, other
+
+
+def _scan_cells(
+    keys: np.ndarray,
+    entry_faces: np.ndarray,
+    native: np.ndarray,
+    entry_cells: np.ndarray,
+    vertices: np.ndarray,
+    faces: np.ndarray,
+    lo: np.ndarray,
+    hi: np.ndarray,
+    epsilon: float,
+    sample_size: int,
+    owned: Optional[np.ndarray] = None,
+    keep_pairs: bool = False
+) -> Dict[str, Any]:
+    """
+    Enumerate and test the candidate pairs of one slab in batches
+    
+    Args:
+        keys: Sorted cell keys of the slab's entries
+        entry_faces: Face of every entry
+        native: Entry belongs to a face of the current level
+        entry_cells: 3xE lowest cell covered by each entry's face
+        vertices, faces: The mesh
+        lo, hi: Face bounding boxes
+        epsilon: Plane distance tolerance
+        sample_size: Number of pairs to sample
+        owned: Optional mask of faces whose pairs (as the lower-indexed
+            face) are tested
+        keep_pairs: Return every intersecting pair
+    
+    Returns:
+        Partial result (see IntersectionGrid.scan)
+    """
+    result = {'intersecting_pairs': 0, 'sample_pairs': [], 'faces': np.empty(0, dtype=np.int64)}
+    if keep_pairs:
+        result['pairs'] = np.empty((0, 2), dtype=np.int64)
+    num_entries = len(keys)
+    if num_entries < 2:
+        return result
+    
+    # Every native entry pairs with all later entries of its cell
+    starts = np.flatnonzero(np.concatenate([[True], keys[1:] != keys[:-1]]))
+    group_end = np.repeat(np.append(starts[1:], num_entries), np.diff(np.append(starts, num_entries)))
+    pair_counts = np.where(native, group_end - np.arange(num_entries) - 1, 0)
+    cumulative = np.cumsum(pair_counts)
+    total = int(cumulative[-1])
+    if total == 0:
+        return result
+    
+    # Per-entry columns in entry order, so pair lookups stay local. Bit
+    # `axis` of `lowest` is set when the entry's cell is the face's lowest
+    # cell on that axis; both faces cover the cell, so it holds
+    # max(min_a, min_b) exactly when every axis bit is set for a or b
+    cell = _unpack_cells(keys)
+    lowest = np.zeros(num_entries, dtype=np.uint8)
+    for axis in range(3):
+        lowest |= (entry_cells[axis] == cell[:, axis]).astype(np.uint8) << axis
+    box_lo = np.ascontiguousarray(lo[entry_faces].T)
+    box_hi = np.ascontiguousarray(hi[entry_faces].T)
+    
+    found = []
+    for first in range(0, total, PAIR_BATCH):
+        k, other = _batch_pairs(cumulative, pair_counts, first, min(first + PAIR_BATCH, total))
+        
+        # Report each pair in one cell only, and only if the boxes overlap
+        keep = (lowest[k] | lowest[other]) == 7
+        k = k[keep]
+        other = other[keep]
+        keep = np.ones(len(k), dtype=bool)
+        for axis in range(3):
+            keep &= box_lo[axis][k] <= box_hi[axis][other]
+            keep &= box_lo[axis][other] <= box_hi[axis][k]
+        k = k[keep]
+        other = other[keep]
+        
+        fa = entry_faces[k]
+        fb = entry_faces[other]
+        if owned is not None:
+            keep = owned[np.minimum(fa, fb)]
+            fa = fa[keep]
+            fb = fb[keep]
+        
+        # Faces sharing a vertex touch by construction
+        va = faces[fa]
+        vb = faces[fb]
+        shared = np.zeros(len(fa), dtype=bool)
+        for i in range(3):
+            for j in range(3):
+                shared |= va[:, i] == vb[:, j]
+        fa = fa[~shared]
+        fb = fb[~shared]
+        if len(fa) == 0:
+            continue
+        
+        hit = triangles_intersect(vertices[faces[fa]], vertices[faces[fb]], epsilon)
+        if not hit.any():
+            continue
+        
+        fa = fa[hit]
+        fb = fb[hit]
+        found.extend((fa, fb))
+        result['intersecting_pairs'] += len(fa)
+        pairs = np.stack([np.minimum(fa, fb), np.maximum(fa, fb)], axis=1)
+        result['sample_pairs'] = lowest_pairs(result['sample_pairs'] + lowest_pairs(pairs, sample_size), sample_size)
+    
+    if found:
+        result['faces'] = np.unique(np.concatenate(found))
+        if keep_pairs:
+            fa = np.concatenate(found[0::2])
+            fb = np.concatenate(found[1::2])
+            result['pairs'] = np.stack([np.minimum(fa, fb), np.maximum(fa, fb)], axis=1).astype(np.int64)
+    return result
@@ -0,0 +1,299 @@
+"""Parallel Diagnosis
+
+Chunked face checks shared by the serial and the multi-process paths:
+- The face array is split into fixed-size chunks (independent of the worker
+  count), so per-chunk partial results and their reduction order - and
+  therefore the final report - are identical on both paths
+- Vertex and face buffers are placed in shared memory once; workers attach
+  to them by name instead of receiving pickled arrays
+- Edge counts use a two-phase reduction: each chunk partitions its edge keys
+  by hash into a shared buffer, then each partition is counted independently
+- Self-intersection slabs (see diagnose.intersections) are scanned by the
+  same workers and reduced in slab order
+"""
+
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Dict, Any, List, Tuple
+
+import numpy as np
+
+from utils.helper import (
+    batch_triangle_areas, find_degenerate_faces, degenerate_area_epsilon, FaceBuffers
+)
+from utils.metrics import span
+from utils.topology import face_edge_keys, EdgeTable
+from diagnose.intersections import IntersectionGrid, reduce_intersections, find_self_intersections
+
+logger = logging.getLogger(__name__)
+
+# Faces per chunk (fixed so results do not depend on the number of workers)
+CHUNK_FACES = 1 << 18
+
+# Below this many faces process startup costs more than it saves
+PARALLEL_MIN_FACES = 1 << 20
+
+# Offending face IDs reported per category (counts are always exact)
+SAMPLE_FACES = 10
+
+# Multiplicative hash spreading edge keys over partitions
+_PARTITION_HASH = np.uint64(0x9E3779B97F4A7C15)
+
+
+def face_chunks(num_faces: int, chunk_size: int = CHUNK_FACES) -> List[Tuple[int, int]]:
+    """[start, stop) ranges covering all faces"""
+    return [(start, min(start + chunk_size, num_faces)) for start in range(0, num_faces, chunk_size)]
+
+
+def chunk_face_stats(
+    vertices: np.ndarray,
+    faces: np.ndarray,
+    area_epsilon: float,
+    start: int = 0,
+    buffers: FaceBuffers = None
+) -> Dict[str, Any]:
+    """
+    Per-face checks on one chunk of faces
+    
+    Args:
+        vertices: Vx3 vertex positions
+        faces: The chunk's faces
+        area_epsilon: Zero-area threshold (see degenerate_area_epsilon)
+        start: Index of the chunk's first face in the whole mesh
+        buffers: Optional reusable scratch buffers
+    
+    Returns:
+        Partial results: degenerate / sliver counts with sample face IDs,
+        and summed area
+    """
+    areas = batch_triangle_areas(vertices, faces, buffers=buffers)
+    degenerate, sliver = find_degenerate_faces(
+        vertices, faces, area_epsilon, areas=areas, buffers=buffers
+    )
+    return {
+        'degenerate_faces': int(np.count_nonzero(degenerate)),
+        'degenerate_samples': (np.flatnonzero(degenerate)[:SAMPLE_FACES] + start).tolist(),
+        'sliver_faces': int(np.count_nonzero(sliver)),
+        'sliver_samples': (np.flatnonzero(sliver)[:SAMPLE_FACES] + start).tolist(),
+        'surface_area': float(areas.sum()),
+    }
+
+
+def reduce_face_stats(partials: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Combine chunk results in chunk order"""
+    total = {
+        'degenerate_faces': 0,
+        'degenerate_samples': [],
+        'sliver_faces': 0,
+        'sliver_samples': [],
+        'surface_area': 0.0,
+    }
+    for partial in partials:
+        for key in ('degenerate_faces', 'sliver_faces', 'surface_area'):
+            total[key] += partial[key]
+        for key in ('degenerate_samples', 'sliver_samples'):
+            total[key] = (total[key] + partial[key])[:SAMPLE_FACES]
+    return total
+
+
+def edge_stats(edge_table: EdgeTable) -> Dict[str, int]:
+    """Edge counts of a complete edge table"""
+    return {
+        'edge_count': len(edge_table),
+        'boundary_edges': int(np.count_nonzero(edge_table.boundary_mask)),
+        'non_manifold_edges': int(np.count_nonzero(edge_table.non_manifold_mask)),
+    }
+
+
+def serial_mesh_stats(
+    vertices: np.ndarray,
+    faces: np.ndarray,
+    edge_table: EdgeTable,
+    keep_pairs: bool = False
+) -> Dict[str, Any]:
+    """Face, edge and intersection statistics computed in this process"""
+    buffers = FaceBuffers(CHUNK_FACES, vertices.dtype)
+    area_epsilon = degenerate_area_epsilon(vertices)
+    with span('diagnose.face_stats'):
+        partials = [
+            chunk_face_stats(vertices, faces[start:stop], area_epsilon, start, buffers)
+            for start, stop in face_chunks(len(faces))
+        ]
+        stats = reduce_face_stats(partials)
+    with span('diagnose.edge_stats'):
+        stats.update(edge_stats(edge_table))
+    with span('diagnose.intersection_search'):
+        stats.update(find_self_intersections(vertices, faces, keep_pairs=keep_pairs))
+    return stats
+
+
+# ===== Worker process side =====
+
+_shared = {}
+_buffers = None
+_grid = None
+
+
+def _init_worker(layout: Dict[str, Tuple[str, tuple, str]]) -> None:
+    """Map the parent's shared buffers into this worker"""
+    global _buffers, _grid
+    _grid = None
+    _shared.clear()
+    for key, (name, shape, dtype) in layout.items():
+        shm = shared_memory.SharedMemory(name=name)
+        _shared[key] = (shm, np.ndarray(shape, dtype=dtype, buffer=shm.buf))
+    _buffers = FaceBuffers(CHUNK_FACES, _view('vertices').dtype)
+
+
+def _view(key: str) -> np.ndarray:
+    return _shared[key][1]
+
+
+def _partition_ids(keys: np.ndarray, num_partitions: int) -> np.ndarray:
+    """Partition of every edge key (uniform for any key distribution)"""
+    hashed = (keys * _PARTITION_HASH) >> np.uint64(40)
+    return (hashed % np.uint64(num_partitions)).astype(np.uint16)
+
+
+def _chunk_task(
+    start: int,
+    stop: int,
+    area_epsilon: float,
+    num_partitions: int
+) -> Tuple[Dict[str, Any], np.ndarray]:
+    """
+    Phase 1: face checks plus partitioning of the chunk's edge keys
+    
+    Keys are written, grouped by partition, into the shared key buffer at
+    the chunk's own slice [3 * start, 3 * stop).
+    
+    Returns:
+        (partial face stats, number of keys per partition)
+    """
+    vertices = _view('vertices')
+    faces = _view('faces')[start:stop]
+    stats = chunk_face_stats(vertices, faces, area_epsilon, start, _buffers)
+    
+    keys = face_edge_keys(faces).ravel()
+    partition = _partition_ids(keys, num_partitions)
+    order = np.argsort(partition, kind='stable')  # radix sort on uint16
+    _view('keys')[3 * start:3 * stop] = keys[order]
+    sizes = np.bincount(partition, minlength=num_partitions)
+    return stats, sizes
+
+
+def _partition_task(ranges: List[Tuple[int, int]]) -> Dict[str, int]:
+    """Phase 2: count the edges of one partition (gathered from every chunk)"""
+    all_keys = _view('keys')
+    keys = np.concatenate([all_keys[begin:end] for begin, end in ranges])
+    _, counts = np.unique(keys, return_counts=True)
+    return {
+        'edge_count': len(counts),
+        'boundary_edges': int(np.count_nonzero(counts == 1)),
+        'non_manifold_edges': int(np.count_nonzero(counts > 2)),
+    }
+
+
+def _intersection_task(level: int, x_start: int, x_stop: int, keep_pairs: bool = False) -> Dict[str, Any]:
+    """Phase 3: self-intersection scan of one grid slab"""
+    global _grid
+    if _grid is None:
+        _grid = IntersectionGrid(_view('vertices'), _view('faces'), bounds=(_view('lo'), _view('hi')))
+    return _grid.scan(level, x_start, x_stop, keep_pairs=keep_pairs)
+
+
+# ===== Parent side =====
+
+def _share(
+    segments: list,
+    shape: tuple,
+    dtype: np.dtype,
+    source: np.ndarray = None
+) -> Tuple[str, tuple, str]:
+    """Create a shared memory segment (optionally filled from source)"""
+    dtype = np.dtype(dtype)
+    size = int(np.prod(shape)) * dtype.itemsize
+    shm = shared_memory.SharedMemory(create=True, size=max(size, 1))
+    segments.append(shm)
+    if source is not None:
+        np.ndarray(shape, dtype=dtype, buffer=shm.buf)[...] = source
+    return shm.name, tuple(shape), dtype.str
+
+
+def parallel_mesh_stats(
+    vertices: np.ndarray,
+    faces: np.ndarray,
+    num_workers: int,
+    keep_pairs: bool = False
+) -> Dict[str, Any]:
+    """
+    Face and edge statistics computed by a pool of worker processes
+    
+    Produces exactly the same result as serial_mesh_stats.
+    
+    Args:
+        vertices: Vx3 vertex positions
+        faces: Fx3 vertex indices
+        num_workers: Number of worker processes
+        keep_pairs: Also return every intersecting pair (see
+            find_self_intersections)
+    
+    Returns:
+        Statistics dictionary (see reduce_face_stats, edge_stats and
+        reduce_intersections)
+    """
+    chunks = face_chunks(len(faces))
+    area_epsilon = degenerate_area_epsilon(vertices)
+    num_partitions = num_workers * 4
+    grid = IntersectionGrid(vertices, faces)
+    tasks = grid.tasks()
+    segments = []
+    try:
+        layout = {}
+        layout['vertices'] = _share(segments, vertices.shape, vertices.dtype, vertices)
+        layout['faces'] = _share(segments, faces.shape, faces.dtype, faces)
+        layout['keys'] = _share(segments, (3 * len(faces),), np.uint64)
+        layout['lo'] = _share(segments, grid.lo.shape, grid.lo.dtype, grid.lo)
+        layout['hi'] = _share(segments, grid.hi.shape, grid.hi.dtype, grid.hi)
+        
+        with ProcessPoolExecutor(
+            max_workers=num_workers,
+            initializer=_init_worker,
+            initargs=(layout,)
+        ) as pool:
+            phase1 = list(pool.map(
+                _chunk_task,
+                [start for start, _ in chunks],
+                [stop for _, stop in chunks],
+                [area_epsilon] * len(chunks),
+                [num_partitions] * len(chunks)
+            ))
+            
+            # Absolute [begin, end) ranges of every partition inside every chunk
+            sizes = np.array([chunk_sizes for _, chunk_sizes in phase1])
+            ends = np.cumsum(sizes, axis=1) + 3 * np.array([start for start, _ in chunks])[:, None]
+            begins = ends - sizes
+            partition_ranges = [
+                list(zip(begins[:, p].tolist(), ends[:, p].tolist()))
+                for p in range(num_partitions)
+            ]
+            phase2 = list(pool.map(_partition_task, partition_ranges))
+            
+            # Contiguous runs of slabs keep each worker on few grid levels
+            phase3 = list(pool.map(
+                _intersection_task,
+                *zip(*tasks),
+                [keep_pairs] * len(tasks),
+                chunksize=max(1, len(tasks) // (4 * num_workers))
+            )) if tasks else []
+    finally:
+        for shm in segments:
+            shm.close()
+            shm.unlink()
+    
+    stats = reduce_face_stats([partial for partial, _ in phase1])
+    for key in ('edge_count', 'boundary_edges', 'non_manifold_edges'):
+        stats[key] = sum(partial[key] for partial in phase2)
+    stats.update(reduce_intersections(phase3, len(faces)))
+    return stats
@@ -0,0 +1,329 @@
+"""UV Diagnostics
+
+Texture-mapping checks computed in one chunked pass over the faces:
+- UV-space triangle areas; faces whose UV triangle has collapsed
+- Flipped UV faces: wound against the majority of their island (mirrored
+  islands are fine, folds inside an island are not)
+- Stretch: singular values of the UV -> 3D map of every face, normalized
+  so the whole mesh has unit texel density (Sander et al. L2 stretch)
+- Coverage of the [0, 1] texture square, rasterized into a low-res
+  occupancy bitmap
+- Overlapping islands: texel centres covered by faces of more than one
+  island, found by hashing (island, texel) keys
+
+UVs are per vertex and therefore split along seams, so the UV islands are
+the mesh shells (faces connected through manifold edges).
+"""
+
+import numpy as np
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+
+from utils.helper import degenerate_area_epsilon
+from utils.topology import EdgeTable, shell_labels
+
+# Occupancy bitmap resolution (texels per side)
+RASTER_RESOLUTION = 256
+
+# Smallest bitmap used when UV triangles are huge (see raster_resolution)
+MIN_RASTER_RESOLUTION = 8
+
+# Expected texel-centre tests allowed per mesh before the bitmap is coarsened
+RASTER_BUDGET = 1 << 22
+
+# Texel-centre tests per rasterization batch
+RASTER_BATCH = 1 << 22
+
+# Faces per pass chunk
+UV_CHUNK = 1 << 20
+
+# Normalized stretch (or compression) factor above which a face is distorted
+STRETCH_LIMIT = 4.0
+
+# Faces reported per finding (counts are always exact)
+SAMPLE_FACES = 10
+
+# UVs this far outside [0, 1] count as out of range (float32 round-off)
+RANGE_TOLERANCE = 1e-6
+
+
+def _cross2(a: Tuple[np.ndarray, np.ndarray], b: Tuple[np.ndarray, np.ndarray]) -> np.ndarray:
+    """z component of the cross product of 2D vectors given as (x, y)"""
+    return a[0] * b[1] - a[1] * b[0]
+
+
+def _samples(mask: np.ndarray, sample_size: int) -> List[int]:
+    """First sample_size flagged indices"""
+    return np.flatnonzero(mask)[:sample_size].tolist()
+
+
+def _batches(counts: np.ndarray, limit: int) -> Iterator[Tuple[int, int]]:
+    """Consecutive ranges of items whose counts sum to at most limit (at least one item each)"""
+    cumulative = np.cumsum(counts)
+    start = 0
+    while start < len(counts):
+        base = int(cumulative[start - 1]) if start else 0
+        stop = int(np.searchsorted(cumulative, base + limit, side='right'))
+        stop = max(stop, start + 1)
+        yield start, stop
+        start = stop
+
+
+def uv_jacobian(p: np.ndarray, q: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    UV and 3D areas, and singular values of the UV -> 3D map of triangles
+    
+    Args:
+        p: 2x3xN UV corners (coordinate, corner, face)
+        q: 3x3xN position corners (coordinate, corner, face)
+    
+    Returns:
+        (uv_area2, area, sigma_max, sigma_min): twice the signed UV area,
+        the 3D area, and the largest / smallest 3D length per unit UV
+        length (NaN where the UV triangle has no area)
+    """
+    du1, du2 = p[0, 1] - p[0, 0], p[0, 2] - p[0, 0]
+    dv1, dv2 = p[1, 1] - p[1, 0], p[1, 2] - p[1, 0]
+    area2 = du1 * dv2 - du2 * dv1
+    
+    # Metric of the two 3D edge vectors; the Jacobian follows from it
+    # without forming the 3D tangent vectors
+    e1 = q[:, 1] - q[:, 0]
+    e2 = q[:, 2] - q[:, 0]
+    g11 = np.einsum('ij,ij->j', e1, e1)
+    g12 = np.einsum('ij,ij->j', e1, e2)
+    g22 = np.einsum('ij,ij->j', e2, e2)
+    area = np.sqrt(np.maximum(g11 * g22 - g12 * g12, 0)) / 2
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        scale = 1.0 / (area2 * area2)
+        a = (dv2 * dv2 * g11 - 2 * dv1 * dv2 * g12 + dv1 * dv1 * g22) * scale
+        c = (du2 * du2 * g11 - 2 * du1 * du2 * g12 + du1 * du1 * g22) * scale
+        b = ((du1 * dv2 + du2 * dv1) * g12 - du2 * dv2 * g11 - du1 * dv1 * g22) * scale
+        root = np.sqrt((a - c) ** 2 + 4 * b * b)
+        sigma_max = np.sqrt((a + c + root) / 2)
+        sigma_min = np.sqrt(np.maximum(a + c - root, 0) / 2)
+    
+    sigma_max[area2 == 0] = np.nan
+    sigma_min[area2 == 0] = np.nan
+    return area2, area, sigma_max, sigma_min
+
+
+def raster_resolution(faces: np.ndarray, uvs: np.ndarray, sample_faces: int = 1 << 16) -> int:
+    """
+    Bitmap size keeping the expected texel-centre tests within budget
+    
+    Halves RASTER_RESOLUTION while the UV bounding boxes of an evenly
+    strided face sample, scaled to the whole mesh, would need more than
+    max(RASTER_BUDGET, 4 * faces) tests. Returns 0 (skip rasterization)
+    if even MIN_RASTER_RESOLUTION is over budget, e.g. for scrambled UVs
+    where every face spans the texture.
+    """
+    if len(faces) == 0:
+        return RASTER_RESOLUTION
+    step = max(1, len(faces) // sample_faces)
+    p = uvs[faces[::step]].astype(np.float64)
+    extent = np.clip(p.max(axis=1), 0, 1) - np.clip(p.min(axis=1), 0, 1)
+    box_area = float(np.dot(extent[:, 0], extent[:, 1])) / len(p) * len(faces)
+    budget = max(RASTER_BUDGET, 4 * len(faces))
+    
+    resolution = RASTER_RESOLUTION
+    while box_area * resolution * resolution > budget:
+        if resolution == MIN_RASTER_RESOLUTION:
+            return 0
+        resolution //= 2
+    return resolution
+
+
+def _rasterize(
+    x: np.ndarray,
+    lo: np.ndarray,
+    hi: np.ndarray,
+    valid: np.ndarray,
+    resolution: int
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Texel centres inside triangles
+    
+    Args:
+        x: 2x3xN corners in texel units
+        lo, hi: 2xN corner bounds in texel units
+        valid: Faces to rasterize
+        resolution: Bitmap size
+    
+    Returns:
+        (face, texel, hit): local face index and flat texel index of every
+        covered texel centre, and a per-face flag for faces covering any
+    """
+    # Texel centres i + 0.5 inside the bounding box, clipped to the bitmap
+    first = np.clip(np.ceil(lo - 0.5), 0, resolution).astype(np.int64)
+    last = np.clip(np.floor(hi - 0.5), -1, resolution - 1).astype(np.int64)
+    size = np.maximum(last - first + 1, 0)
+    counts = np.where(valid, size[0] * size[1], 0)
+    
+    faces = []
+    texels = []
+    hit = np.zeros(len(counts), dtype=bool)
+    for start, stop in _batches(counts, RASTER_BATCH):
+        batch = counts[start:stop]
+        total = int(batch.sum())
+        if total == 0:
+            continue
+        # Tests of a face are consecutive, so per-face values are repeated
+        # rather than gathered
+        face = np.repeat(np.arange(start, stop), batch)
+        local = np.arange(total) - np.repeat(np.cumsum(batch) - batch, batch)
+        width = np.repeat(size[0, start:stop], batch)
+        px = np.repeat(first[0, start:stop], batch) + local % width
+        py = np.repeat(first[1, start:stop], batch) + local // width
+        corners = np.repeat(x[:, :, start:stop], batch, axis=2)
+        cx = px + 0.5
+        cy = py + 0.5
+        
+        # Centre on the same side of all three edges (either winding)
+        side = [
+            _cross2(
+                corners[:, (k + 1) % 3] - corners[:, k],
+                (cx - corners[0, k], cy - corners[1, k])
+            )
+            for k in range(3)
+        ]
+        inside = (((side[0] >= 0) & (side[1] >= 0) & (side[2] >= 0))
+                  | ((side[0] <= 0) & (side[1] <= 0) & (side[2] <= 0)))
+        face = face[inside]
+        faces.append(face)
+        texels.append(py[inside] * resolution + px[inside])
+        hit[face] = True
+    
+    if not faces:
+        empty = np.zeros(0, dtype=np.int64)
+        return empty, empty, hit
+    return np.concatenate(faces), np.concatenate(texels), hit
+
+
+def analyze_uvs(
+    vertices: np.ndarray,
+    faces: np.ndarray,
+    uvs: np.ndarray,
+    edge_table: Optional[EdgeTable] = None,
+    label: Optional[np.ndarray] = None,
+    resolution: Optional[int] = None,
+    sample_size: int = SAMPLE_FACES
+) -> Dict[str, Any]:
+    """
+    Texture-mapping statistics of a mesh with per-vertex UVs
+    
+    Args:
+        vertices: Vx3 vertex positions
+        faces: Fx3 vertex indices
+        uvs: Vx2 texture coordinates
+        edge_table: Optional prebuilt edge table (only used for island labels)
+        label: Optional precomputed shell labels (see utils.topology.shell_labels)
+        resolution: Occupancy bitmap size for coverage and overlaps
+            (default: see raster_resolution; 0 skips both)
+        sample_size: Face indices reported per finding
+    
+    Returns:
+        Dictionary with islands, uv_area, degenerate_faces, flipped_faces,
+        stretched_faces, out_of_range_faces (plus *_samples), stretch
+        (area-weighted L2 stretch, 1.0 is ideal), max_stretch, coverage
+        (fraction of the [0, 1] square covered), overlapping_islands and
+        overlap (fraction of covered texels shared by several islands),
+        and the raster_resolution used (coverage and overlap are None
+        when rasterization was skipped)
+    """
+    num_faces = len(faces)
+    if label is None:
+        if edge_table is None:
+            edge_table = EdgeTable.from_faces(faces)
+        label = shell_labels(num_faces, edge_table)
+    if resolution is None:
+        resolution = raster_resolution(faces, uvs)
+    
+    area2 = np.empty(num_faces, dtype=np.float64)
+    area3 = np.empty(num_faces, dtype=np.float64)
+    sigma_max = np.empty(num_faces, dtype=np.float64)
+    sigma_min = np.empty(num_faces, dtype=np.float64)
+    out_of_range = np.zeros(num_faces, dtype=bool)
+    covered = np.zeros(resolution * resolution, dtype=bool)
+    island_texels = []
+    
+    uv_epsilon = degenerate_area_epsilon(uvs)
+    for start in range(0, num_faces, UV_CHUNK):
+        chunk = faces[start:start + UV_CHUNK]
+        stop = start + len(chunk)
+        # Coordinate-major corners keep every per-face array contiguous
+        p = uvs[chunk].transpose(2, 1, 0).astype(np.float64)
+        q = vertices[chunk].transpose(2, 1, 0).astype(np.float64)
+        
+        area2[start:stop], area3[start:stop], sigma_max[start:stop], sigma_min[start:stop] = uv_jacobian(p, q)
+        lo = np.minimum(np.minimum(p[:, 0], p[:, 1]), p[:, 2])
+        hi = np.maximum(np.maximum(p[:, 0], p[:, 1]), p[:, 2])
+        out_of_range[start:stop] = ((lo < -RANGE_TOLERANCE) | (hi > 1 + RANGE_TOLERANCE)).any(axis=0)
+        
+        if not resolution:
+            continue
+        
+        # Occupancy: texel centres inside the face, or the texel holding
+        # the centroid for faces smaller than a texel
+        x = p * resolution
+        valid = np.abs(area2[start:stop]) / 2 > uv_epsilon
+        face, texel, hit = _rasterize(x, lo * resolution, hi * resolution, valid, resolution)
+        covered[texel] = True
+        island_texels.append(np.unique(label[start + face] * covered.size + texel))
+        
+        missed = x[:, :, ~hit]
+        cx = np.floor((missed[0, 0] + missed[0, 1] + missed[0, 2]) / 3).astype(np.int64)
+        cy = np.floor((missed[1, 0] + missed[1, 1] + missed[1, 2]) / 3).astype(np.int64)
+        inside = (cx >= 0) & (cx < resolution) & (cy >= 0) & (cy < resolution)
+        covered[cy[inside] * resolution + cx[inside]] = True
+    
+    degenerate = np.abs(area2) / 2 <= uv_epsilon
+    sign = np.where(degenerate, 0.0, np.sign(area2))
+    island_sign = np.bincount(label, weights=sign, minlength=num_faces)
+    flipped = sign * island_sign[label] < 0
+    
+    # Normalize so the total UV area maps to the total 3D area
+    measured = ~degenerate & (area3 > 0)
+    total_uv = float(np.abs(area2[measured]).sum()) / 2
+    total_3d = float(area3[measured].sum())
+    scale = np.sqrt(total_uv / total_3d) if total_uv > 0 and total_3d > 0 else 1.0
+    with np.errstate(divide='ignore', invalid='ignore'):
+        distortion = np.maximum(sigma_max * scale, 1 / (sigma_min * scale))
+    distortion[~measured] = 1.0
+    stretched = distortion > STRETCH_LIMIT
+    if total_3d > 0:
+        mean_square = (sigma_max[measured] ** 2 + sigma_min[measured] ** 2) / 2
+        stretch = float(np.sqrt(np.dot(area3[measured], mean_square) / total_3d) * scale)
+    else:
+        stretch = 1.0
+    
+    # Texels covered by more than one island
+    coverage = overlap = None
+    overlapping = 0
+    if resolution:
+        keys = np.unique(np.concatenate(island_texels))
+        texel = keys % covered.size
+        shared = np.bincount(texel, minlength=covered.size) > 1
+        overlapping = len(np.unique(keys[shared[texel]] // covered.size))
+        covered_count = int(np.count_nonzero(covered))
+        coverage = covered_count / covered.size
+        overlap = int(np.count_nonzero(shared)) / covered_count if covered_count else 0.0
+    
+    return {
+        'islands': int(np.count_nonzero(label == np.arange(num_faces))),
+        'uv_area': total_uv,
+        'degenerate_faces': int(np.count_nonzero(degenerate)),
+        'degenerate_samples': _samples(degenerate, sample_size),
+        'flipped_faces': int(np.count_nonzero(flipped)),
+        'flipped_samples': _samples(flipped, sample_size),
+        'stretched_faces': int(np.count_nonzero(stretched)),
+        'stretched_samples': _samples(stretched, sample_size),
+        'out_of_range_faces': int(np.count_nonzero(out_of_range)),
+        'out_of_range_samples': _samples(out_of_range, sample_size),
+        'stretch': stretch,
+        'max_stretch': float(distortion.max()) if num_faces else 1.0,
+        'coverage': coverage,
+        'overlapping_islands': overlapping,
+        'overlap': overlap,
+        'raster_resolution': resolution,
+    }
@@ -0,0 +1,341 @@
+"""Job Queue
+
+Asynchronous execution of engine operations for the HTTP API:
+- Each submission gets a job ID and its own work directory
+- CPU-bound work (diagnose / repair / diagnose_and_repair / lod) runs in a
+  process pool bounded by Config['num_workers'], each process holding its
+  own GeometryEngine
+- Conversions run on threads that hand work to the engine's Blender worker
+  pool (which already provides the process isolation)
+- Admission is bounded; a full queue raises QueueFullError (HTTP 429)
+- Finished jobs are pruned together with their files after a TTL
+- A worker process that dies (OOM kill, crash in native code) breaks the
+  process pool; the affected jobs fail and the pool is replaced, so later
+  jobs still run
+- Jobs run under a metrics Trace (Config['metrics_enabled']); their spans
+  are kept on the job and aggregated into JobManager.metrics, and a job
+  can opt into a cProfile dump (Config['allow_profiling'])
+"""
+
+import os
+import time
+import uuid
+import shutil
+import logging
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, Future
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Callable, Tuple, Union
+
+from utils.helper import Config, ensure_directory
+from utils.cache import is_successful
+from utils.metrics import MetricsRegistry, run_traced
+
+logger = logging.getLogger(__name__)
+
+# Operations executed in worker processes; everything else runs on threads
+PROCESS_OPERATIONS = ('diagnose', 'repair', 'diagnose_and_repair', 'lod')
+OPERATIONS = ('diagnose', 'repair', 'diagnose_and_repair', 'lod', 'convert')
+
+UPLOADING = 'uploading'
+QUEUED = 'queued'
+RUNNING = 'running'
+COMPLETED = 'completed'
+FAILED = 'failed'
+
+
+class QueueFullError(RuntimeError):
+    """Raised when the job queue cannot accept more work"""
+
+
+class Job:
+    """State of one submitted operation"""
+    
+    def __init__(
+        self,
+        operation: str,
+        input_path: str,
+        output_path: Optional[str],
+        options: Dict[str, Any],
+        work_dir: Path,
+        job_id: str
+    ):
+        self.id = job_id
+        self.operation = operation
+        self.input_path = input_path
+        self.output_path = output_path
+        self.options = options
+        self.work_dir = work_dir
+        self.status = UPLOADING
+        self.result = None
+        self.error = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.trace = None
+        self.profile_path = None
+    
+    @property
+    def done(self) -> bool:
+        return self.status in (COMPLETED, FAILED)
+    
+    def output_files(self) -> List[str]:
+        """Output paths of the job (one per LOD level, or per format of a multi-output conversion)"""
+        lods = (self.result or {}).get('lods')
+        if lods:
+            return [lod.get('output') for lod in lods]
+        if isinstance(self.output_path, list):
+            return list(self.output_path)
+        return [self.output_path] if self.output_path else []
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Public status (without the result payload)"""
+        return {
+            'job_id': self.id,
+            'operation': self.operation,
+            'status': self.status,
+            'error': self.error,
+            'created_at': self.created_at,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at,
+            'has_output': any(path and os.path.exists(path) for path in self.output_files()),
+        }
+
+
+# ===== Worker process side =====
+
+_worker_engine = None
+
+
+def _init_worker(engine_factory: Callable, config: Config) -> None:
+    """Create one engine per worker process (without Blender)"""
+    global _worker_engine
+    _worker_engine = engine_factory(config, use_blender=False)
+
+
+def _run_call(
+    func: Callable,
+    args: tuple,
+    trace: bool,
+    memory: bool,
+    profile_path: Optional[str]
+) -> Tuple[Dict[str, Any], Optional[Dict[str, Any]]]:
+    """Call func(*args), traced when metrics or a profile are wanted"""
+    if not trace and profile_path is None:
+        return func(*args), None
+    return run_traced(func, args, memory and trace, profile_path)
+
+
+def _run_in_worker(
+    operation: str,
+    args: tuple,
+    trace: bool = False,
+    memory: bool = False,
+    profile_path: Optional[str] = None
+) -> Tuple[Dict[str, Any], Optional[Dict[str, Any]]]:
+    """Execute an engine operation inside a worker process"""
+    return _run_call(getattr(_worker_engine, operation), args, trace, memory, profile_path)
+
+
+# ===== Manager =====
+
+class JobManager:
+    """Bounded asynchronous job runner"""
+    
+    def __init__(self, engine: Any, config: Config):
+        """
+        Initialize job manager
+        
+        Args:
+            engine: Parent-process GeometryEngine (used for conversions)
+            config: Engine configuration
+        """
+        self.engine = engine
+        self.num_workers = max(1, int(config.get('num_workers', 1)))
+        self.max_pending = int(config.get('max_queued_jobs', 32))
+        self.job_ttl = float(config.get('job_ttl_seconds', 3600))
+        self.jobs_dir = ensure_directory(os.path.join(config.get('temp_dir'), 'jobs'))
+        self.trace_enabled = bool(config.get('metrics_enabled', True))
+        self.trace_memory = bool(config.get('trace_memory', False))
+        self.allow_profiling = bool(config.get('allow_profiling', False))
+        self.metrics = MetricsRegistry()
+        
+        self._config = config
+        self._processes = self._process_pool()
+        self._threads = ThreadPoolExecutor(max_workers=self.num_workers)
+        self._jobs = {}
+        self._pending = deque()
+        self._running = 0
+        self._lock = threading.RLock()
+    
+    def create_job(self, operation: str, input_suffix: str) -> Job:
+        """
+        Reserve a job slot and its work directory before the upload arrives
+        
+        Raises:
+            QueueFullError: Too many active jobs
+            ValueError: Unknown operation
+        """
+        if operation not in OPERATIONS:
+            raise ValueError(f"Unknown operation: {operation}")
+        
+        self._prune()
+        with self._lock:
+            if self.active_count() >= self.num_workers + self.max_pending:
+                raise QueueFullError("Job queue is full, retry later")
+            
+            job_id = uuid.uuid4().hex
+            work_dir = ensure_directory(self.jobs_dir / job_id)
+            job = Job(operation, str(work_dir / f"input{input_suffix}"), None, {}, work_dir, job_id)
+            self._jobs[job_id] = job
+        return job
+    
+    def start(
+        self,
+        job: Job,
+        output_suffix: Optional[Union[str, List[str]]] = None,
+        profile: bool = False,
+        **options: Any
+    ) -> Job:
+        """
+        Queue a created job once its input file is in place
+        
+        A list of output suffixes gives the job one output per suffix
+        (multi-output conversions).
+        
+        Raises:
+            PermissionError: profile requested while Config['allow_profiling'] is off
+        """
+        if profile and not self.allow_profiling:
+            raise PermissionError("Profiling is disabled")
+        if isinstance(output_suffix, (list, tuple)):
+            job.output_path = [str(job.work_dir / f"output{suffix}") for suffix in output_suffix]
+        elif output_suffix:
+            job.output_path = str(job.work_dir / f"output{output_suffix}")
+        if profile:
+            job.profile_path = str(job.work_dir / 'profile.prof')
+        job.options = options
+        
+        with self._lock:
+            job.status = QUEUED
+            self._pending.append(job)
+        self._dispatch()
+        return job
+    
+    def cancel(self, job: Job) -> None:
+        """Drop a created job that will never start (e.g. failed upload)"""
+        with self._lock:
+            self._jobs.pop(job.id, None)
+        shutil.rmtree(job.work_dir, ignore_errors=True)
+    
+    def get(self, job_id: str) -> Optional[Job]:
+        return self._jobs.get(job_id)
+    
+    def active_count(self) -> int:
+        """Jobs not yet finished (including reserved uploads)"""
+        return sum(1 for job in list(self._jobs.values()) if not job.done)
+    
+    def stats(self) -> Dict[str, int]:
+        return {
+            'workers': self.num_workers,
+            'queued': len(self._pending),
+            'running': self._running,
+            'active': self.active_count(),
+            'capacity': self.num_workers + self.max_pending,
+        }
+    
+    def shutdown(self) -> None:
+        """Stop accepting work and shut down the pools"""
+        self._processes.shutdown(wait=False, cancel_futures=True)
+        self._threads.shutdown(wait=False, cancel_futures=True)
+    
+    def _process_pool(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(
+            max_workers=self.num_workers,
+            initializer=_init_worker,
+            initargs=(type(self.engine), self._config)
+        )
+    
+    def _replace_processes(self, broken: ProcessPoolExecutor) -> None:
+        """Swap a broken process pool for a fresh one (once, however many jobs noticed)"""
+        with self._lock:
+            if self._processes is not broken:
+                return
+            logger.warning("Worker process died, restarting the process pool")
+            self._processes = self._process_pool()
+        broken.shutdown(wait=False, cancel_futures=True)
+    
+    def _dispatch(self) -> None:
+        """Hand queued jobs to the executors while workers are free"""
+        with self._lock:
+            while self._pending and self._running < self.num_workers:
+                job = self._pending.popleft()
+                self._running += 1
+                job.status = RUNNING
+                job.started_at = time.time()
+                
+                if job.operation == 'diagnose':
+                    args = (job.input_path,)
+                elif job.operation in ('repair', 'diagnose_and_repair'):
+                    args = (job.input_path, job.output_path, job.options.get('aggressive', False))
+                elif job.operation == 'lod':
+                    args = (job.input_path, job.output_path, job.options.get('ratios'))
+                else:
+                    args = (job.input_path, job.output_path, job.options)
+                
+                trace_options = (self.trace_enabled, self.trace_memory, job.profile_path)
+                if job.operation in PROCESS_OPERATIONS:
+                    pool = self._processes
+                    try:
+                        future = pool.submit(_run_in_worker, job.operation, args, *trace_options)
+                    except BrokenProcessPool as e:
+                        self._replace_processes(pool)
+                        future = Future()
+                        future.set_exception(e)
+                else:
+                    pool = None
+                    future = self._threads.submit(
+                        _run_call, getattr(self.engine, job.operation), args, *trace_options
+                    )
+                future.add_done_callback(lambda f, job=job, pool=pool: self._finish(job, f, pool))
+    
+    def _finish(self, job: Job, future: Future, pool: Optional[ProcessPoolExecutor] = None) -> None:
+        """Record the outcome of a job and start the next one"""
+        try:
+            job.result, job.trace = future.result()
+            if is_successful(job.result):
+                job.status = COMPLETED
+            else:
+                job.error = job.result.get('message') or job.result.get('error')
+                job.status = FAILED
+        except BrokenProcessPool as e:
+            logger.error(f"Job {job.id} ({job.operation}) lost its worker process: {e}")
+            job.error = f"Worker process died: {e}"
+            job.status = FAILED
+            if pool is not None:
+                self._replace_processes(pool)
+        except Exception as e:
+            logger.error(f"Job {job.id} ({job.operation}) failed: {e}")
+            job.error = str(e)
+            job.status = FAILED
+        job.finished_at = time.time()
+        self.metrics.record(
+            job.operation, job.status, job.trace,
+            cached=bool(isinstance(job.result, dict) and job.result.get('cached'))
+        )
+        
+        with self._lock:
+            self._running -= 1
+        self._dispatch()
+    
+    def _prune(self) -> None:
+        """Forget finished jobs older than the TTL and delete their files"""
+        cutoff = time.time() - self.job_ttl
+        with self._lock:
+            expired = [j for j in self._jobs.values() if j.done and j.finished_at < cutoff]
+            for job in expired:
+                del self._jobs[job.id]
+        for job in expired:
+            shutil.rmtree(job.work_dir, ignore_errors=True)
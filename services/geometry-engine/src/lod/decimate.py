@@ -0,0 +1,471 @@
+"""Quadric Edge-Collapse Decimation
+
+Quadric error metric (Garland-Heckbert) simplification on whole arrays:
+- Vertex quadrics are stored as a 10xV array (upper triangle of the
+  symmetric 4x4 matrix, one contiguous row per coefficient) and
+  accumulated with np.bincount. Boundary edges add heavily weighted
+  perpendicular planes, so open borders and UV seams (which are borders
+  in the index topology) keep their shape
+- Collapse costs live in a flat array parallel to the edge array. Each
+  round takes the cheapest candidates with np.argpartition (the array
+  form of popping a heap), ranks them by cost class, and collapses an
+  independent set at once: an edge is taken only if it has the best rank
+  within one ring of both endpoints, so no face is touched by two
+  collapses
+- Invalidation is lazy: after a round the edges merged by a collapse are
+  removed and only the edges around vertices that moved are re-costed;
+  every other cost is kept
+- Collapses that would flip a face, pinch two borders together or break
+  the link condition (non-manifold edges, doubled faces) are rejected and
+  their edges retried in a later round
+
+The decimator keeps its state between calls, so a chain of levels of
+detail is produced by decimating further from the previous level.
+"""
+
+import numpy as np
+from typing import Optional, Tuple
+
+from utils.mesh import Mesh
+from utils.topology import EdgeTable, compact_vertices
+from repair.normals import compute_vertex_normals
+
+# Weight of the border-preserving planes relative to face planes
+BOUNDARY_WEIGHT = 100.0
+
+# Cheapest edges considered per round, as a multiple of the collapses still needed
+CANDIDATE_FACTOR = 4
+
+# At least this fraction (1/n) of the edges are candidates, so the last
+# few collapses before a target do not each cost a full round
+MIN_CANDIDATE_DIVISOR = 8
+
+# Coarse cost classes for ordering the candidates of a round; inside a
+# class the order is pseudo-random so independent picks are plentiful
+COST_BUCKETS = 16
+
+# Relative slack on the face target; rounds near the target are nearly empty
+TARGET_TOLERANCE = 0.001
+
+# Candidate costs sampled to place the bucket boundaries
+QUANTILE_SAMPLE = 1 << 16
+
+# Independent-set passes per round
+SELECT_PASSES = 2
+
+# Collapses that turn a face normal by more than this (cosine) are rejected
+FOLD_COS = 0.2
+
+# Upper-triangle entries of the symmetric 4x4 quadric, row by row
+_ROWS, _COLS = np.triu_indices(4)
+
+
+def plane_quadrics(normals: np.ndarray, offsets: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    """
+    Weighted quadrics of planes n.x + d = 0
+    
+    Args:
+        normals: Nx3 unit plane normals
+        offsets: N plane offsets d
+        weights: N plane weights
+    
+    Returns:
+        10xN quadrics (upper triangle of (n, d)(n, d)^T * weight)
+    """
+    plane = np.vstack([normals.T, offsets])
+    return plane[_ROWS] * plane[_COLS] * weights
+
+
+def quadric_error(q: np.ndarray, p: np.ndarray) -> np.ndarray:
+    """Error v^T Q v of points p (3xN) under quadrics q (10xN)"""
+    x, y, z = p
+    return (
+        q[0] * x * x + q[4] * y * y + q[7] * z * z
+        + 2 * (q[1] * x * y + q[2] * x * z + q[5] * y * z)
+        + 2 * (q[3] * x + q[6] * y + q[8] * z)
+        + q[9]
+    )
+
+
+def optimal_points(q: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Minimizers of the quadrics (solving A x = -b by the adjugate)
+    
+    Args:
+        q: 10xN quadrics
+    
+    Returns:
+        (points, solvable): 3xN minimizers and a flag for well-conditioned
+        systems (flat or linear regions have no unique minimizer)
+    """
+    a, b, c = q[0], q[1], q[2]
+    d, e, f = q[4], q[5], q[7]
+    c00 = d * f - e * e
+    c01 = c * e - b * f
+    c02 = b * e - c * d
+    c11 = a * f - c * c
+    c12 = b * c - a * e
+    c22 = a * d - b * b
+    det = a * c00 + b * c01 + c * c02
+    
+    # Relative to the scale of the matrix, so the test is unit-free
+    scale = (a + d + f) / 3
+    solvable = np.abs(det) > 1e-9 * scale ** 3
+    with np.errstate(divide='ignore', invalid='ignore'):
+        inverse = np.where(solvable, -1.0 / det, 0.0)
+    x, y, z = q[3], q[6], q[8]
+    points = np.array([
+        c00 * x + c01 * y + c02 * z,
+        c01 * x + c11 * y + c12 * z,
+        c02 * x + c12 * y + c22 * z,
+    ])
+    points *= inverse
+    return points, solvable
+
+
+class QuadricDecimator:
+    """Edge-collapse simplifier with state kept across decimation calls"""
+    
+    def __init__(self, mesh: Mesh, boundary_weight: float = BOUNDARY_WEIGHT):
+        """
+        Build quadrics and initial collapse costs
+        
+        Args:
+            mesh: Source mesh (not modified)
+            boundary_weight: Weight of border-preserving planes
+        """
+        vertices = mesh.vertices.astype(np.float64)
+        
+        # Work in a unit-sized frame so costs and thresholds are scale-free
+        lo, hi = (vertices.min(axis=0), vertices.max(axis=0)) if len(vertices) else (np.zeros(3), np.ones(3))
+        self.center = (lo + hi) / 2
+        self.scale = float((hi - lo).max()) / 2 or 1.0
+        self.positions = (vertices - self.center) / self.scale
+        self.faces = mesh.faces.astype(np.int64)
+        self.uvs = mesh.uvs.astype(np.float64) if mesh.has_uvs else None
+        self.with_normals = mesh.has_normals
+        
+        edge_table = EdgeTable.from_faces(mesh.faces)
+        self.quadrics = self._initial_quadrics(edge_table, boundary_weight)
+        self.boundary = np.zeros(len(vertices), dtype=bool)
+        self.boundary[edge_table.boundary_edges().ravel()] = True
+        
+        self._rng = np.random.default_rng(0)
+        edges = edge_table.edges.astype(np.int64)
+        self.edges = edges[edges[:, 0] != edges[:, 1]]
+        self.costs = self._edge_costs(self.edges)[0]
+    
+    @property
+    def num_faces(self) -> int:
+        return len(self.faces)
+    
+    def _initial_quadrics(self, edge_table: EdgeTable, boundary_weight: float) -> np.ndarray:
+        """Area-weighted face planes plus border planes, summed per vertex"""
+        p = [self.positions[self.faces[:, k]] for k in range(3)]
+        normal = np.cross(p[1] - p[0], p[2] - p[0])
+        length = np.sqrt(np.einsum('ij,ij->i', normal, normal))
+        unit = normal / np.where(length > 0, length, 1)[:, None]
+        offset = -np.einsum('ij,ij->i', unit, p[0])
+        face_q = plane_quadrics(unit, offset, length / 2)
+        
+        # Plane through each border edge, perpendicular to its face
+        slots = np.flatnonzero(edge_table.counts[edge_table.face_edges].ravel() == 1)
+        face = slots // 3
+        corner = slots % 3
+        start = self.positions[self.faces[face, corner]]
+        edge = self.positions[self.faces[face, (corner + 1) % 3]] - start
+        side = np.cross(edge, unit[face])
+        side_length = np.sqrt(np.einsum('ij,ij->i', side, side))
+        side /= np.where(side_length > 0, side_length, 1)[:, None]
+        border_q = plane_quadrics(
+            side, -np.einsum('ij,ij->i', side, start),
+            boundary_weight * np.einsum('ij,ij->i', edge, edge)
+        )
+        
+        num_vertices = len(self.positions)
+        quadrics = np.zeros((10, num_vertices), dtype=np.float64)
+        corners = [self.faces[:, k] for k in range(3)]
+        ends = [self.faces[face, corner], self.faces[face, (corner + 1) % 3]]
+        for j in range(10):
+            for index in corners:
+                quadrics[j] += np.bincount(index, weights=face_q[j], minlength=num_vertices)
+            for index in ends:
+                quadrics[j] += np.bincount(index, weights=border_q[j], minlength=num_vertices)
+        return quadrics
+    
+    def _edge_costs(self, edges: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Collapse error and position of each edge
+        
+        The quadric optimum is used when it is well defined and lies near
+        the edge; otherwise the best of the endpoints and the midpoint.
+        
+        Returns:
+            (costs, targets): N errors and Nx3 new vertex positions
+        """
+        q = self.quadrics[:, edges[:, 0]] + self.quadrics[:, edges[:, 1]]
+        a = self.positions[edges[:, 0]].T
+        b = self.positions[edges[:, 1]].T
+        best, usable = optimal_points(q)
+        
+        middle = (a + b) / 2
+        offset = best - middle
+        span = b - a
+        usable &= np.einsum('ij,ij->j', offset, offset) <= np.einsum('ij,ij->j', span, span)
+        cost = quadric_error(q, best)
+        
+        fallback = np.flatnonzero(~usable)
+        if len(fallback):
+            qf = q[:, fallback]
+            points = middle[:, fallback]
+            errors = quadric_error(qf, points)
+            for candidate in (a[:, fallback], b[:, fallback]):
+                error = quadric_error(qf, candidate)
+                better = error < errors
+                points[:, better] = candidate[:, better]
+                errors[better] = error[better]
+            best[:, fallback] = points
+            cost[fallback] = errors
+        return np.maximum(cost, 0), best.T
+    
+    def decimate(self, target_faces: int) -> int:
+        """
+        Collapse edges until about target_faces remain (within
+        TARGET_TOLERANCE, or until nothing more can be collapsed)
+        
+        Returns:
+            Number of collapses performed
+        """
+        # The last few collapses would each cost a full round
+        stop = target_faces + max(2, int(target_faces * TARGET_TOLERANCE))
+        total = 0
+        while self.num_faces > stop and np.isfinite(self.costs).any():
+            # Every collapse removes about two faces
+            total += self._collapse_round(max(1, (self.num_faces - target_faces + 1) // 2))
+        return total
+    
+    def _select(self, max_collapses: int) -> np.ndarray:
+        """
+        Indices of an independent set of cheap edges, cheapest first
+        
+        Candidates are ranked by cost in COST_BUCKETS coarse buckets with a
+        fixed pseudo-random order inside each bucket. An edge is picked when
+        its rank is the lowest within one ring of both endpoints; repeating
+        this on the edges not blocked by earlier picks (Luby's algorithm)
+        fills the set.
+        """
+        num_edges = len(self.edges)
+        k = min(num_edges, max(CANDIDATE_FACTOR * max_collapses, num_edges // MIN_CANDIDATE_DIVISOR))
+        if k < num_edges:
+            candidates = np.argpartition(self.costs, k - 1)[:k]
+        else:
+            candidates = np.arange(num_edges)
+        costs = self.costs[candidates]
+        finite = np.isfinite(costs)
+        candidates, costs = candidates[finite], costs[finite]
+        k = len(candidates)
+        sample = costs[::max(1, k // QUANTILE_SAMPLE)]
+        bounds = np.quantile(sample, np.linspace(0, 1, COST_BUCKETS + 1)[1:-1]) if k else np.zeros(0)
+        bucket = np.searchsorted(bounds, costs, side='right')
+        rank = bucket * k + self._rng.permutation(k)
+        
+        a = self.edges[:, 0]
+        b = self.edges[:, 1]
+        ca = a[candidates]
+        cb = b[candidates]
+        num_vertices = len(self.positions)
+        available = np.ones(k, dtype=bool)
+        picked = np.zeros(k, dtype=bool)
+        for _ in range(SELECT_PASSES):
+            # Lowest available rank at each vertex, then over its one ring
+            vertex_rank = np.full(num_vertices, COST_BUCKETS * k, dtype=np.int64)
+            np.minimum.at(vertex_rank, ca[available], rank[available])
+            np.minimum.at(vertex_rank, cb[available], rank[available])
+            ring_rank = vertex_rank.copy()
+            np.minimum.at(ring_rank, a, vertex_rank[b])
+            np.minimum.at(ring_rank, b, vertex_rank[a])
+            pick = available & (ring_rank[ca] == rank) & (ring_rank[cb] == rank)
+            if not pick.any():
+                break
+            picked |= pick
+            
+            # Later picks must stay out of the one ring of every picked endpoint
+            blocked = np.zeros(num_vertices, dtype=bool)
+            blocked[ca[pick]] = True
+            blocked[cb[pick]] = True
+            near = blocked[a] | blocked[b]
+            blocked[a[near]] = True
+            blocked[b[near]] = True
+            available &= ~blocked[ca] & ~blocked[cb]
+        
+        chosen = np.flatnonzero(picked)
+        chosen = chosen[np.argsort(rank[chosen])][:max_collapses]
+        return candidates[chosen]
+    
+    def _collapse_round(self, max_collapses: int) -> int:
+        """Collapse one independent set of edges; returns the number collapsed"""
+        selected = self._select(max_collapses)
+        num_selected = len(selected)
+        keep = self.edges[selected, 0]
+        drop = self.edges[selected, 1]
+        target = self._edge_costs(self.edges[selected])[1]
+        
+        # Endpoints of different selected edges are never neighbours, so
+        # every affected face and edge belongs to exactly one collapse
+        owner = np.full(len(self.positions), -1, dtype=np.int64)
+        owner[keep] = np.arange(num_selected)
+        owner[drop] = np.arange(num_selected)
+        face_ids = np.flatnonzero((owner[self.faces] >= 0).any(axis=1))
+        old = self.faces[face_ids]
+        face_owner = owner[old].max(axis=1)
+        is_keep = old == keep[face_owner][:, None]
+        is_drop = old == drop[face_owner][:, None]
+        shared = is_keep.any(axis=1) & is_drop.any(axis=1)
+        
+        edge_owner = np.maximum(owner[self.edges[:, 0]], owner[self.edges[:, 1]])
+        touched = np.flatnonzero(edge_owner >= 0)
+        
+        reject = self._violations(old, face_owner, is_keep | is_drop, shared, touched, edge_owner[touched],
+                                  keep, drop, target)
+        
+        # Rejected edges wait until a neighbouring collapse re-costs them
+        self.costs[selected[reject]] = np.inf
+        accepted = ~reject
+        collapsed = int(np.count_nonzero(accepted))
+        if collapsed == 0:
+            return 0
+        
+        # UVs slide along the edge to the projection of the new position
+        if self.uvs is not None:
+            k, d = keep[accepted], drop[accepted]
+            direction = self.positions[d] - self.positions[k]
+            length = np.einsum('ij,ij->i', direction, direction)
+            t = np.einsum('ij,ij->i', target[accepted] - self.positions[k], direction)
+            t = np.clip(t / np.where(length > 0, length, 1), 0, 1)
+            self.uvs[k] += t[:, None] * (self.uvs[d] - self.uvs[k])
+        
+        self.positions[keep[accepted]] = target[accepted]
+        self.quadrics[:, keep[accepted]] += self.quadrics[:, drop[accepted]]
+        self.boundary[keep[accepted]] |= self.boundary[drop[accepted]]
+        
+        remap = np.arange(len(self.positions))
+        remap[drop[accepted]] = keep[accepted]
+        moved_faces = accepted[face_owner]
+        self.faces[face_ids[moved_faces]] = remap[old[moved_faces]]
+        gone = moved_faces & shared
+        self.faces = np.delete(self.faces, face_ids[gone], axis=0)
+        
+        # The faces on a collapsed edge take the edge and one edge from the
+        # dropped vertex to their opposite corner with them; by the link
+        # condition no other edges merge
+        opposite = np.full((num_selected, 2), -1, dtype=np.int64)
+        gone_owner = face_owner[gone]
+        corner = old[gone][~(is_keep | is_drop)[gone]]
+        order = np.argsort(gone_owner, kind='stable')
+        first = np.ones(len(order), dtype=bool)
+        first[1:] = gone_owner[order][1:] != gone_owner[order][:-1]
+        opposite[gone_owner[order], np.where(first, 0, 1)] = corner[order]
+        
+        edges = self.edges[touched]
+        owners = edge_owner[touched]
+        from_drop = (edges == drop[owners][:, None]).any(axis=1)
+        other = np.where(edges[:, 0] == drop[owners], edges[:, 1], edges[:, 0])
+        merged = accepted[owners] & from_drop & (
+            (other == keep[owners]) | (other == opposite[owners, 0]) | (other == opposite[owners, 1])
+        )
+        
+        # Lazy invalidation: only edges around a moved vertex are re-costed
+        dirty = touched[accepted[owners] & ~merged]
+        self.edges[dirty] = remap[self.edges[dirty]]
+        self.costs[dirty] = self._edge_costs(self.edges[dirty])[0]
+        
+        alive = np.ones(len(self.edges), dtype=bool)
+        alive[touched[merged]] = False
+        self.edges = self.edges[alive]
+        self.costs = self.costs[alive]
+        return collapsed
+    
+    def _violations(
+        self,
+        old: np.ndarray,
+        face_owner: np.ndarray,
+        moving: np.ndarray,
+        shared: np.ndarray,
+        touched: np.ndarray,
+        edge_owner: np.ndarray,
+        keep: np.ndarray,
+        drop: np.ndarray,
+        target: np.ndarray
+    ) -> np.ndarray:
+        """
+        Per selected edge: collapsing it would damage the surface
+        
+        Args:
+            old: Faces around the selected edges
+            face_owner: Selected edge each of them belongs to
+            moving: Corners of old on an endpoint of the edge
+            shared: Faces containing the whole edge
+            touched: Edges with an endpoint on a selected edge
+            edge_owner: Selected edge each of them belongs to
+            keep, drop, target: Endpoints and new positions of the selected edges
+        """
+        num_selected = len(keep)
+        reject = np.zeros(num_selected, dtype=bool)
+        
+        # Faces around the edge that survive must not flip or collapse
+        survivors = ~shared
+        owners = face_owner[survivors]
+        before = self.positions[old[survivors]]
+        after = np.where(moving[survivors][:, :, None], target[owners][:, None, :], before)
+        n0 = np.cross(before[:, 1] - before[:, 0], before[:, 2] - before[:, 0])
+        n1 = np.cross(after[:, 1] - after[:, 0], after[:, 2] - after[:, 0])
+        dot = np.einsum('ij,ij->i', n0, n1)
+        norms = np.sqrt(np.einsum('ij,ij->i', n0, n0) * np.einsum('ij,ij->i', n1, n1))
+        reject[owners[dot <= FOLD_COS * norms]] = True
+        
+        # Only manifold edges collapse, and an interior edge between two
+        # border vertices would pinch the surface
+        edge_faces = np.bincount(face_owner[shared], minlength=num_selected)
+        reject |= edge_faces > 2
+        reject |= self.boundary[keep] & self.boundary[drop] & (edge_faces != 1)
+        
+        # Link condition: the endpoints may only share the opposite corners
+        # of the faces on the edge. Each endpoint lists its neighbours once
+        # (edges are unique), so shared neighbours show up as repeated keys.
+        edges = self.edges[touched]
+        at_keep = edges == keep[edge_owner][:, None]
+        at_drop = edges == drop[edge_owner][:, None]
+        on_edge = at_keep.any(axis=1) & at_drop.any(axis=1)
+        other = np.where(at_keep[:, 0] | at_drop[:, 0], edges[:, 1], edges[:, 0])
+        ring = np.sort(edge_owner[~on_edge] * np.int64(len(self.positions)) + other[~on_edge])
+        repeated = ring[1:][ring[1:] == ring[:-1]] // len(self.positions)
+        reject |= np.bincount(repeated, minlength=num_selected) > edge_faces
+        return reject
+    
+    def to_mesh(self) -> Mesh:
+        """Current state as a compact Mesh in the original frame"""
+        keep, remap = compact_vertices(self.faces, len(self.positions))
+        faces = remap[self.faces]
+        vertices = self.positions[keep] * self.scale + self.center
+        normals = compute_vertex_normals(vertices, faces) if self.with_normals else None
+        uvs = self.uvs[keep] if self.uvs is not None else None
+        return Mesh(vertices, faces, normals, uvs)
+
+
+def decimate(mesh: Mesh, ratio: float, decimator: Optional[QuadricDecimator] = None) -> Mesh:
+    """
+    Reduce a mesh to about ratio of its face count
+    
+    Args:
+        mesh: Source mesh
+        ratio: Target fraction of faces (0-1]
+        decimator: Existing decimator to continue from (mesh is then only
+            used for the target face count)
+    
+    Returns:
+        Decimated mesh
+    """
+    if decimator is None:
+        decimator = QuadricDecimator(mesh)
+    decimator.decimate(int(round(mesh.num_faces * ratio)))
+    return decimator.to_mesh()
@@ -0,0 +1,141 @@
+"""Level of Detail Generation
+
+Chains of decimated meshes for viewers that switch detail by distance:
+- Each level is decimated further from the previous one (one
+  QuadricDecimator holds the state), so a chain costs about as much as
+  its finest level
+- The input is welded first: STL (and other unindexed) files have three
+  vertices per face, every edge would be a border and the decimator
+  could only drop whole triangles. Vertices with different UVs stay
+  apart, so texture seams are kept
+- Levels are written next to the requested output as <stem>_lod<i><suffix>
+"""
+
+import logging
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from lod.decimate import QuadricDecimator
+from repair.weld import weld_vertices
+from utils.helper import Config
+from utils.mesh import Mesh
+from utils.mesh_io import load_mesh, save_mesh
+from utils.metrics import span
+from utils.topology import compact_vertices
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RATIOS = (0.5, 0.25, 0.1)
+
+
+def normalize_ratios(ratios: Optional[Iterable[float]]) -> List[float]:
+    """
+    Validated LOD ratios, finest first
+    
+    Raises:
+        ValueError: A ratio outside (0, 1] or an empty list
+    """
+    ratios = sorted({float(r) for r in (DEFAULT_RATIOS if ratios is None else ratios)}, reverse=True)
+    if not ratios:
+        raise ValueError("At least one LOD ratio is required")
+    if ratios[0] > 1 or ratios[-1] <= 0:
+        raise ValueError(f"LOD ratios must be in (0, 1]: {ratios}")
+    return ratios
+
+
+def lod_path(output_path: str, level: int) -> str:
+    """File of LOD level for a chain written to output_path"""
+    path = Path(output_path)
+    return str(path.with_name(f"{path.stem}_lod{level}{path.suffix}"))
+
+
+def weld_for_decimation(mesh: Mesh, tolerance: float) -> Mesh:
+    """
+    Mesh with coincident vertices merged, collapsed faces and unused
+    vertices dropped
+    
+    Args:
+        mesh: Loaded mesh
+        tolerance: Vertex merge distance
+    """
+    if mesh.num_vertices == 0:
+        return mesh
+    keep, remap = weld_vertices(mesh.vertices, tolerance)
+    target = keep[remap]
+    if mesh.has_uvs:
+        # Texture seams are borders in the index topology; keep them split
+        seam = np.any(mesh.uvs != mesh.uvs[target], axis=1)
+        target[seam] = np.flatnonzero(seam)
+    
+    faces = target[mesh.faces]
+    faces = faces[(faces[:, 0] != faces[:, 1]) & (faces[:, 1] != faces[:, 2]) & (faces[:, 2] != faces[:, 0])]
+    keep, remap = compact_vertices(faces, mesh.num_vertices)
+    return Mesh(
+        mesh.vertices[keep],
+        remap[faces],
+        mesh.normals[keep] if mesh.has_normals else None,
+        mesh.uvs[keep] if mesh.has_uvs else None
+    )
+
+
+def generate_lods(
+    mesh_path: str,
+    output_path: Optional[str] = None,
+    ratios: Optional[Sequence[float]] = None,
+    tolerance: Optional[float] = None
+) -> Dict[str, Any]:
+    """
+    Main entry point for LOD generation
+    
+    Args:
+        mesh_path: Input mesh file path
+        output_path: Base output path; level i is saved to
+            <stem>_lod<i><suffix> (if None, the Meshes are returned under
+            'mesh' of each level instead)
+        ratios: Target fractions of the input face count (default 0.5,
+            0.25, 0.1); levels are produced from finest to coarsest
+        tolerance: Vertex merge distance (defaults to Config 'tolerance')
+    
+    Returns:
+        Report with one entry per level under 'lods'
+    """
+    try:
+        ratios = normalize_ratios(ratios)
+        mesh = load_mesh(mesh_path)
+    except (OSError, ValueError) as e:
+        logger.error(f"Failed to generate LODs: {e}")
+        return {
+            'status': 'error',
+            'message': str(e)
+        }
+    if tolerance is None:
+        tolerance = Config().get('tolerance')
+    
+    with span('lod.setup'):
+        welded = weld_for_decimation(mesh, tolerance)
+        decimator = QuadricDecimator(welded)
+    lods = []
+    for level, ratio in enumerate(ratios):
+        with span('lod.decimate'):
+            decimator.decimate(int(round(welded.num_faces * ratio)))
+            lod = decimator.to_mesh()
+        entry = {
+            'ratio': ratio,
+            'faces': lod.num_faces,
+            'vertices': lod.num_vertices,
+        }
+        if output_path:
+            entry['output'] = lod_path(output_path, level)
+            save_mesh(entry['output'], lod)
+        else:
+            entry['mesh'] = lod
+        lods.append(entry)
+    
+    return {
+        'status': 'success',
+        'original_faces': mesh.num_faces,
+        'original_vertices': mesh.num_vertices,
+        'lods': lods,
+    }
@@ -0,0 +1,258 @@
+"""Diagnose -> Repair Pipeline
+
+Single pass over one in-memory mesh for the upload flow:
+- The file is loaded once; diagnosis and repair share the mesh's derived
+  data (edge table, vertex-face adjacency, face normals and areas), and
+  repair edits update it incrementally (see Mesh.remove_faces and friends)
+- Results of the diagnosis (e.g. the winding flips) are handed to repair
+  while the faces are still the ones that were diagnosed
+- Every stage names the diagnosis findings it fixes; while the mesh is
+  unchanged since the diagnosis, stages with nothing to fix are skipped
+- Custom stages can be inserted anywhere in the chain
+- The repaired mesh is diagnosed again for a before/after report (reusing
+  the per-face results when only normals changed)
+- With a result cache, both diagnoses and the winding step reuse the
+  results of components seen in earlier uploads (see diagnose.incremental)
+"""
+
+import time
+import logging
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from diagnose.index import GeometryDiagnostics
+from diagnose.incremental import IncrementalDiagnostics
+from repair.index import GeometryRepair
+from utils.cache import ResultCache
+from utils.helper import Config
+from utils.mesh import Mesh
+from utils.mesh_io import load_mesh, save_mesh
+
+logger = logging.getLogger(__name__)
+
+
+class Stage:
+    """One repair step of a pipeline"""
+    
+    def __init__(
+        self,
+        name: str,
+        run: Callable[['RepairPipeline'], None],
+        fixes: Optional[Iterable[str]] = None
+    ):
+        """
+        Args:
+            name: Stage name (reported in 'repairs' / 'skipped')
+            run: Called with the pipeline; edits pipeline.repair.mesh
+            fixes: Diagnosis issue / warning types this stage addresses
+                (None = always run)
+        """
+        self.name = name
+        self.run = run
+        self.fixes = None if fixes is None else frozenset(fixes)
+    
+    def __repr__(self) -> str:
+        return f"Stage({self.name!r})"
+
+
+def default_stages(aggressive: bool = False, crease_angle: Optional[float] = None) -> List[Stage]:
+    """The repair chain of GeometryRepair.repair_all as pipeline stages"""
+    def unify_winding(pipeline: 'RepairPipeline') -> None:
+        pipeline.repair._unify_winding(pipeline.reusable('face_flips'))
+    
+    stages = [
+        Stage('remove_duplicates', lambda p: p.repair._remove_duplicates(),
+              ('open_boundaries', 'non_manifold_edges')),
+        Stage('remove_degenerate', lambda p: p.repair._remove_degenerate_faces(remove_slivers=aggressive),
+              ('degenerate_faces', 'unreferenced_vertices') + (('sliver_faces',) if aggressive else ())),
+        Stage('unify_winding', unify_winding,
+              ('inconsistent_winding', 'inverted_normals')),
+    ]
+    if aggressive:
+        # Before fix_normals: split hard edges would look like holes
+        stages.append(Stage('fill_holes', lambda p: p.repair._fill_holes(), ('open_boundaries',)))
+    # Hard edges are only split on request, so existing normals are kept otherwise
+    stages.append(Stage('fix_normals', lambda p: p.repair._fix_normals(),
+                        None if crease_angle is not None else ('missing_normals', 'inconsistent_winding', 'inverted_normals')))
+    if aggressive:
+        stages.append(Stage('smooth_normals', lambda p: p.repair._smooth_normals()))
+    return stages
+
+
+class RepairPipeline:
+    """Diagnose, repair and re-diagnose one mesh with shared state"""
+    
+    def __init__(
+        self,
+        mesh: Mesh,
+        aggressive: bool = False,
+        tolerance: float = 1e-6,
+        crease_angle: Optional[float] = None,
+        num_workers: int = 1,
+        stages: Optional[List[Stage]] = None,
+        cache: Optional[ResultCache] = None
+    ):
+        """
+        Args:
+            mesh: Mesh to process (its arrays are never modified in place)
+            aggressive: Include the aggressive repair stages
+            tolerance: Vertex merge distance
+            crease_angle: Hard-edge angle for normal recomputation
+            num_workers: Processes used for the diagnosis of large meshes
+            stages: Repair chain (default: default_stages)
+            cache: Result cache for per-component results (None: process
+                the whole mesh every time)
+        """
+        self.mesh = mesh
+        self.tolerance = tolerance
+        self.crease_angle = crease_angle
+        self.num_workers = num_workers
+        self.stages = list(stages) if stages is not None else default_stages(aggressive, crease_angle)
+        self.cache = cache
+        
+        # Set by run(); the repair starts from a copy of the diagnosed mesh
+        # that carries its derived data
+        self.diagnostics = None
+        self.repair = None
+        self._diagnosed = None
+        self.timings = {}
+    
+    def add_stage(self, stage: Stage, before: Optional[str] = None, after: Optional[str] = None) -> None:
+        """
+        Insert a stage (at the end unless before / after name a stage)
+        
+        Raises:
+            ValueError: Unknown stage name
+        """
+        names = [s.name for s in self.stages]
+        anchor = before or after
+        if anchor is None:
+            self.stages.append(stage)
+            return
+        if anchor not in names:
+            raise ValueError(f"Unknown stage: {anchor}")
+        self.stages.insert(names.index(anchor) + (0 if before else 1), stage)
+    
+    @property
+    def unchanged(self) -> bool:
+        """The mesh being repaired still has the diagnosed vertices and faces"""
+        vertices, faces = self._diagnosed
+        return self.repair.mesh.vertices is vertices and self.repair.mesh.faces is faces
+    
+    def reusable(self, name: str) -> Any:
+        """Attribute of the first diagnosis, or None once the mesh changed"""
+        if self.repair is None or not self.unchanged:
+            return None
+        return getattr(self.diagnostics, name)
+    
+    def _diagnostics(self, mesh: Mesh) -> GeometryDiagnostics:
+        if self.cache is not None:
+            return IncrementalDiagnostics(mesh, self.cache, self.num_workers)
+        return GeometryDiagnostics(mesh, self.num_workers)
+    
+    def _timed(self, name: str, run: Callable[[], Any]) -> Any:
+        start = time.perf_counter()
+        result = run()
+        self.timings[name] = round(time.perf_counter() - start, 4)
+        return result
+    
+    def run(self) -> Dict[str, Any]:
+        """
+        Run diagnosis, the repair stages and the final diagnosis
+        
+        Returns:
+            Repaired Mesh ('mesh'), before/after diagnosis, applied and
+            skipped stages, before/after stats and per-step timings
+        """
+        self.diagnostics = self._diagnostics(self.mesh)
+        before = self._timed('diagnose', self.diagnostics.analyze)
+        findings = {item['type'] for item in before['issues'] + before['warnings']}
+        self.repair = GeometryRepair(
+            self.mesh, tolerance=self.tolerance, crease_angle=self.crease_angle, cache=self.cache
+        )
+        self._diagnosed = (self.repair.mesh.vertices, self.repair.mesh.faces)
+        
+        skipped = []
+        for stage in self.stages:
+            if stage.fixes is not None and self.unchanged and not stage.fixes & findings:
+                skipped.append(stage.name)
+                continue
+            applied = len(self.repair.repairs_applied)
+            self._timed(stage.name, lambda: stage.run(self))
+            if len(self.repair.repairs_applied) == applied:
+                # Custom stages are recorded here; built-in ones log themselves
+                self.repair.repairs_applied.append(stage.name)
+        
+        mesh = self.repair.mesh
+        rediagnosis = self._diagnostics(mesh)
+        if self.unchanged:
+            rediagnosis.reuse(self.diagnostics)
+        after = self._timed('rediagnose', rediagnosis.analyze)
+        logger.info(
+            f"Pipeline: health {before['health_score']} -> {after['health_score']}, "
+            f"{len(self.repair.repairs_applied)} stages run, {len(skipped)} skipped"
+        )
+        return {
+            'mesh': mesh,
+            'diagnosis': {'before': before, 'after': after},
+            'repairs': self.repair.repairs_applied,
+            'skipped': skipped,
+            'stats': {
+                'before': self.repair.original_stats,
+                'after': self.repair._get_stats()
+            },
+            'timings': self.timings,
+        }
+
+
+def diagnose_and_repair(
+    mesh_path: str,
+    output_path: Optional[str] = None,
+    aggressive: bool = False,
+    tolerance: Optional[float] = None,
+    crease_angle: Optional[float] = None,
+    num_workers: int = 1,
+    stages: Optional[List[Stage]] = None,
+    cache: Optional[ResultCache] = None
+) -> Dict[str, Any]:
+    """
+    Main entry point for the diagnose -> repair pipeline
+    
+    Args:
+        mesh_path: Input mesh file path
+        output_path: Output path (if None, the repaired Mesh is returned
+            under 'mesh' instead)
+        aggressive: Apply aggressive repairs
+        tolerance: Vertex merge distance (defaults to Config 'tolerance')
+        crease_angle: Hard-edge angle in degrees for normal recomputation
+        num_workers: Processes used for the diagnosis of large meshes
+        stages: Custom repair chain (default: default_stages)
+        cache: Result cache for per-component results of earlier uploads
+    
+    Returns:
+        Pipeline report and optionally saves to file
+    """
+    try:
+        mesh = load_mesh(mesh_path)
+    except (OSError, ValueError) as e:
+        logger.error(f"Failed to load mesh: {e}")
+        return {
+            'status': 'error',
+            'message': str(e)
+        }
+    
+    if tolerance is None:
+        tolerance = Config().get('tolerance')
+    
+    pipeline = RepairPipeline(
+        mesh, aggressive, tolerance, crease_angle, num_workers, stages, cache
+    )
+    result = pipeline.run()
+    result['status'] = 'success'
+    
+    if output_path:
+        start = time.perf_counter()
+        save_mesh(output_path, result.pop('mesh'))
+        result['timings']['save'] = round(time.perf_counter() - start, 4)
+        result['output'] = output_path
+    
+    return result
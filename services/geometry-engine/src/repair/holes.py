@@ -0,0 +1,290 @@
+"""Hole Filling
+
+Boundary-loop extraction and triangulation for GeometryRepair:
+- Boundary half-edges are linked through an array-backed next-edge map
+  (vertex -> outgoing boundary edge); loops are labelled and ordered with
+  pointer doubling, so there is no per-edge Python graph walk
+- Vertices where several boundary loops touch are ambiguous; loops through
+  them are left open
+- Triangles, quads and convex loops (most scanner holes) are filled in
+  bulk; concave loops are ear-clipped in their best-fit (Newell) plane
+- Loops whose perimeter exceeds a cap are skipped (real openings, not holes)
+- All new faces are returned as one array
+"""
+
+import numpy as np
+from typing import Optional, Tuple, List
+
+from utils.topology import EdgeTable
+
+# Default perimeter cap as a fraction of the bounding-box diagonal
+MAX_HOLE_PERIMETER_RATIO = 0.25
+
+# Loops with more edges than this are not ear-clipped
+MAX_HOLE_EDGES = 1000
+
+
+def boundary_loops(
+    faces: np.ndarray,
+    edge_table: Optional[EdgeTable] = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Extract closed boundary loops
+    
+    Loops run opposite to the boundary edges of the adjacent faces, so a
+    triangle (a, b, c) taken in loop order closes the hole with matching
+    winding.
+    
+    Args:
+        faces: Fx3 vertex indices
+        edge_table: Optional prebuilt edge table of faces
+    
+    Returns:
+        (loop_vertices, starts): loop i is
+        loop_vertices[starts[i]:starts[i + 1]]
+    """
+    empty = (np.empty(0, dtype=np.int64), np.zeros(1, dtype=np.int64))
+    if len(faces) == 0:
+        return empty
+    if edge_table is None:
+        edge_table = EdgeTable.from_faces(faces)
+    
+    # Boundary half-edges, reversed so they run around the hole
+    slots = np.flatnonzero(edge_table.counts[edge_table.face_edges.ravel()] == 1)
+    num_edges = len(slots)
+    if num_edges == 0:
+        return empty
+    f = slots // 3
+    k = slots % 3
+    dst = faces[f, k].astype(np.int64)
+    src = faces[f, (k + 1) % 3].astype(np.int64)
+    
+    # Next-edge map; edges into vertices with several boundary edges point at
+    # the sentinel (num_edges) and are dropped below
+    size = int(max(src.max(), dst.max())) + 1
+    out_degree = np.bincount(src, minlength=size)
+    in_degree = np.bincount(dst, minlength=size)
+    out_edge = np.full(size, num_edges, dtype=np.int64)
+    out_edge[src] = np.arange(num_edges)
+    simple = (out_degree[dst] == 1) & (in_degree[dst] == 1)
+    nxt = np.append(np.where(simple, out_edge[dst], num_edges), num_edges)
+    
+    # Pointer doubling: label = smallest edge on the loop; chains reach the sentinel
+    label = np.arange(num_edges + 1)
+    jump = nxt.copy()
+    for _ in range(int(num_edges).bit_length() + 1):
+        np.minimum(label, label[jump], out=label)
+        jump = jump[jump]
+    cycle = np.flatnonzero(jump[:num_edges] != num_edges)
+    if len(cycle) == 0:
+        return empty
+    
+    # Rank edges by distance to the loop's last edge (the one before its head)
+    head = label[cycle]
+    tail = nxt[cycle] == head
+    position_of = np.full(num_edges + 1, -1, dtype=np.int64)
+    position_of[cycle] = np.arange(len(cycle))
+    succ = np.where(tail, np.arange(len(cycle)), position_of[nxt[cycle]])
+    dist = (~tail).astype(np.int64)
+    for _ in range(len(cycle).bit_length() + 1):
+        dist += dist[succ]
+        succ = succ[succ]
+        if tail[succ].all():
+            break
+    
+    _, loop_index, sizes = np.unique(head, return_inverse=True, return_counts=True)
+    starts = np.concatenate([[0], np.cumsum(sizes)])
+    order = np.empty(len(cycle), dtype=np.int64)
+    order[starts[loop_index] + sizes[loop_index] - 1 - dist] = cycle
+    return src[order], starts
+
+
+def _ear_clip(xs: List[float], ys: List[float]) -> List[Tuple[int, int, int]]:
+    """
+    Triangulate a counter-clockwise simple polygon (local indices)
+    
+    The sharpest valid ear is clipped first, which keeps nearly straight
+    corners (collinear boundary points) from ending up as slivers.
+    """
+    remaining = list(range(len(xs)))
+    triangles = []
+    
+    def cross(a: int, b: int, c: int) -> float:
+        return (xs[b] - xs[a]) * (ys[c] - ys[a]) - (ys[b] - ys[a]) * (xs[c] - xs[a])
+    
+    def sharpness(a: int, b: int, c: int) -> float:
+        """Sine of the turn at b (negative for reflex corners)"""
+        ab = ((xs[b] - xs[a]) ** 2 + (ys[b] - ys[a]) ** 2) ** 0.5
+        bc = ((xs[c] - xs[b]) ** 2 + (ys[c] - ys[b]) ** 2) ** 0.5
+        return cross(a, b, c) / (ab * bc or 1.0)
+    
+    def corner(t: int) -> float:
+        m = len(remaining)
+        return sharpness(remaining[t - 1], remaining[t], remaining[(t + 1) % m])
+    
+    def is_ear(t: int) -> bool:
+        m = len(remaining)
+        a, b, c = remaining[t - 1], remaining[t], remaining[(t + 1) % m]
+        for p in remaining:
+            if p != a and p != b and p != c and cross(a, b, p) >= 0 and cross(b, c, p) >= 0 and cross(c, a, p) >= 0:
+                return False
+        return True
+    
+    sharp = [corner(t) for t in range(len(remaining))]
+    while len(remaining) > 3:
+        m = len(remaining)
+        best = max(range(m), key=sharp.__getitem__)
+        if sharp[best] <= 0 or not is_ear(best):
+            # Rare: try the other convex corners, sharpest first
+            candidates = sorted((t for t in range(m) if sharp[t] > 0), key=sharp.__getitem__, reverse=True)
+            best = next((t for t in candidates if is_ear(t)), None)
+            if best is None:
+                # No valid ear (self-overlapping projection): fan the rest
+                break
+        
+        triangles.append((remaining[best - 1], remaining[best], remaining[(best + 1) % m]))
+        del remaining[best]
+        del sharp[best]
+        m -= 1
+        before = best - 1 if best > 0 else m - 1
+        after = best % m
+        sharp[before] = corner(before)
+        sharp[after] = corner(after)
+    
+    for i in range(1, len(remaining) - 1):
+        triangles.append((remaining[0], remaining[i], remaining[i + 1]))
+    return triangles
+
+
+def _fan(first: np.ndarray, sizes: np.ndarray, ids: np.ndarray) -> np.ndarray:
+    """Fan triangles (v0, vi, vi+1) of the polygons ids[first:first + size]"""
+    counts = sizes - 2
+    offsets = np.repeat(first - np.concatenate([[0], np.cumsum(counts)[:-1]]), counts)
+    i = np.arange(counts.sum()) + offsets
+    base = np.repeat(first, counts)
+    return np.column_stack([ids[base], ids[i + 1], ids[i + 2]])
+
+
+def _triangulate_polygons(
+    points: np.ndarray,
+    loop_vertices: np.ndarray,
+    starts: np.ndarray,
+    successor: np.ndarray,
+    loops: np.ndarray
+) -> List[np.ndarray]:
+    """
+    Triangulate the given loops in their Newell planes
+    
+    Convex loops are fanned in bulk; only concave ones go through the
+    (per-loop) ear clipper.
+    """
+    sizes = np.diff(starts)[loops]
+    local_starts = np.concatenate([[0], np.cumsum(sizes)])
+    members = np.arange(local_starts[-1]) + np.repeat(starts[loops] - local_starts[:-1], sizes)
+    p = points[members]
+    newell = np.add.reduceat(np.cross(p, points[successor[members]]), local_starts[:-1])
+    normal = newell / np.maximum(np.linalg.norm(newell, axis=1), 1e-300)[:, None]
+    
+    # Orthonormal basis (u, v) with u x v = normal, so loops are counter-clockwise
+    helper = np.where(np.abs(normal[:, :1]) < 0.9, [[1.0, 0.0, 0.0]], [[0.0, 1.0, 0.0]])
+    u = np.cross(helper, normal)
+    u /= np.linalg.norm(u, axis=1)[:, None]
+    v = np.cross(normal, u)
+    loop_of = np.repeat(np.arange(len(loops)), sizes)
+    xs = np.einsum('ij,ij->i', p, u[loop_of])
+    ys = np.einsum('ij,ij->i', p, v[loop_of])
+    ids = loop_vertices[members]
+    
+    # Convex loops: every corner turns left
+    local_next = np.arange(1, len(members) + 1)
+    local_next[local_starts[1:] - 1] = local_starts[:-1]
+    local_prev = np.empty_like(local_next)
+    local_prev[local_next] = np.arange(len(members))
+    turn = (
+        (xs - xs[local_prev]) * (ys[local_next] - ys[local_prev]) -
+        (ys - ys[local_prev]) * (xs[local_next] - xs[local_prev])
+    )
+    convex = np.minimum.reduceat(turn, local_starts[:-1]) > 0
+    
+    parts = []
+    if convex.any():
+        parts.append(_fan(local_starts[:-1][convex], sizes[convex], ids))
+    
+    concave = np.flatnonzero(~convex)
+    if len(concave):
+        xs, ys, id_list = xs.tolist(), ys.tolist(), ids.tolist()
+        triangles = []
+        for i in concave:
+            lo, hi = int(local_starts[i]), int(local_starts[i + 1])
+            loop_ids = id_list[lo:hi]
+            for a, b, c in _ear_clip(xs[lo:hi], ys[lo:hi]):
+                triangles.append((loop_ids[a], loop_ids[b], loop_ids[c]))
+        parts.append(np.array(triangles, dtype=np.int64).reshape(-1, 3))
+    return parts
+
+
+def fill_holes(
+    vertices: np.ndarray,
+    faces: np.ndarray,
+    max_perimeter: Optional[float] = None,
+    edge_table: Optional[EdgeTable] = None
+) -> Tuple[np.ndarray, int, int]:
+    """
+    Triangulate the boundary loops of a mesh
+    
+    Args:
+        vertices: Vx3 vertex positions
+        faces: Fx3 vertex indices
+        max_perimeter: Skip loops longer than this (default:
+            MAX_HOLE_PERIMETER_RATIO times the bounding-box diagonal)
+        edge_table: Optional prebuilt edge table of faces
+    
+    Returns:
+        (new_faces, filled, skipped): Nx3 faces closing the holes, and the
+        number of loops filled and skipped
+    """
+    loop_vertices, starts = boundary_loops(faces, edge_table)
+    num_loops = len(starts) - 1
+    no_faces = np.empty((0, 3), dtype=np.int64)
+    if num_loops == 0:
+        return no_faces, 0, 0
+    
+    if max_perimeter is None:
+        diagonal = np.linalg.norm(vertices.max(axis=0) - vertices.min(axis=0))
+        max_perimeter = MAX_HOLE_PERIMETER_RATIO * float(diagonal)
+    
+    sizes = np.diff(starts)
+    successor = np.arange(1, len(loop_vertices) + 1)
+    successor[starts[1:] - 1] = starts[:-1]
+    points = vertices[loop_vertices].astype(np.float64)
+    segments = points[successor] - points
+    perimeter = np.add.reduceat(np.sqrt(np.einsum('ij,ij->i', segments, segments)), starts[:-1])
+    fill = (sizes >= 3) & (perimeter <= max_perimeter) & (sizes <= MAX_HOLE_EDGES)
+    
+    parts = []
+    
+    # Triangles: the loop itself
+    first = starts[:-1][fill & (sizes == 3)]
+    if len(first):
+        parts.append(np.column_stack([
+            loop_vertices[first], loop_vertices[first + 1], loop_vertices[first + 2]
+        ]))
+    
+    # Quads: split along the shorter diagonal
+    first = starts[:-1][fill & (sizes == 4)]
+    if len(first):
+        q = [loop_vertices[first + i] for i in range(4)]
+        d02 = np.einsum('ij,ij->i', points[first + 2] - points[first], points[first + 2] - points[first])
+        d13 = np.einsum('ij,ij->i', points[first + 3] - points[first + 1], points[first + 3] - points[first + 1])
+        use02 = (d02 <= d13)[:, None]
+        parts.append(np.where(use02, np.column_stack([q[0], q[1], q[2]]), np.column_stack([q[1], q[2], q[3]])))
+        parts.append(np.where(use02, np.column_stack([q[0], q[2], q[3]]), np.column_stack([q[1], q[3], q[0]])))
+    
+    # Larger loops: triangulated in the Newell plane of each loop
+    large = np.flatnonzero(fill & (sizes > 4))
+    if len(large):
+        parts.extend(_triangulate_polygons(points, loop_vertices, starts, successor, large))
+    
+    new_faces = np.concatenate(parts) if parts else no_faces
+    filled = int(np.count_nonzero(fill))
+    return new_faces, filled, num_loops - filled
@@ -4,38 +4,100 @@ Automatic repair of common 3D mesh issues:
 - Fill holes
 - Remove duplicate vertices
 - Fix non-manifold geometry
+- Unify face winding (outward-facing shells)
 - Recalculate normals
 - Remove degenerate faces
 - Merge close vertices
 """
 
 import numpy as np
-from typing import Dict, List, Tuple, Any, Optional
+from typing import Dict, List, Tuple, Any, Optional, Union
 import logging
 
+from repair.weld import weld_vertices
+from repair.holes import fill_holes
+from repair.normals import compute_vertex_normals, split_creases, smooth_vertex_normals
+from utils.cache import ResultCache
+from utils.components import component_flips
+from utils.helper import Config, degenerate_area_epsilon, find_degenerate_faces
+from utils.mesh import Mesh
+from utils.metrics import timed
+from utils.topology import compact_vertices
+from utils.orientation import orient_faces
+from utils.mesh_io import load_mesh, save_mesh
+
 logger = logging.getLogger(__name__)
 
 
 class GeometryRepair:
     """Automated 3D mesh repair toolkit"""
     
-    def __init__(self, mesh_data: Dict[str, Any], tolerance: float = 1e-6):
+    def __init__(
+        self,
+        mesh_data: Union[Mesh, Dict[str, Any]],
+        tolerance: float = 1e-6,
+        crease_angle: Optional[float] = None,
+        max_hole_perimeter: Optional[float] = None,
+        cache: Optional[ResultCache] = None
+    ):
         """
         Initialize repair engine
         
         Args:
-            mesh_data: Dictionary with vertices, faces, normals, uvs
+            mesh_data: Mesh, or dictionary with vertices, faces, normals, uvs
+                (the caller's arrays are never modified in place)
             tolerance: Distance threshold for merging vertices
+            crease_angle: Split vertices along edges sharper than this many
+                degrees when recomputing normals (None = smooth everywhere)
+            max_hole_perimeter: Leave boundary loops longer than this open
+                (None = a quarter of the bounding-box diagonal)
+            cache: Optional result cache; winding flips are then reused
+                per connected component (see utils.components)
         """
-        self.vertices = np.array(mesh_data.get('vertices', []))
-        self.faces = np.array(mesh_data.get('faces', []))
-        self.normals = np.array(mesh_data.get('normals', []))
-        self.uvs = np.array(mesh_data.get('uvs', []))
+        self.mesh = Mesh.from_any(mesh_data).copy()
         self.tolerance = tolerance
+        self.crease_angle = crease_angle
+        self.max_hole_perimeter = max_hole_perimeter
+        self.cache = cache
         
         self.repairs_applied = []
         self.original_stats = self._get_stats()
     
+    # Columns of the mesh being repaired; assigning replaces the array and
+    # invalidates the mesh's derived data
+    
+    @property
+    def vertices(self) -> np.ndarray:
+        return self.mesh.vertices
+    
+    @vertices.setter
+    def vertices(self, value: np.ndarray) -> None:
+        self.mesh.vertices = value
+    
+    @property
+    def faces(self) -> np.ndarray:
+        return self.mesh.faces
+    
+    @faces.setter
+    def faces(self, value: np.ndarray) -> None:
+        self.mesh.faces = value
+    
+    @property
+    def normals(self) -> np.ndarray:
+        return self.mesh.normals
+    
+    @normals.setter
+    def normals(self, value: np.ndarray) -> None:
+        self.mesh.normals = value
+    
+    @property
+    def uvs(self) -> np.ndarray:
+        return self.mesh.uvs
+    
+    @uvs.setter
+    def uvs(self, value: np.ndarray) -> None:
+        self.mesh.uvs = value
+    
     def repair_all(self, aggressive: bool = False) -> Dict[str, Any]:
         """
         Apply all repair operations
@@ -44,25 +106,25 @@ class GeometryRepair:
             aggressive: If True, apply more destructive repairs
         
         Returns:
-            Repaired mesh data and repair log
+            Repaired Mesh ('mesh'), repair log and before/after stats
         """
         logger.info("Starting mesh repair...")
         
-        # Standard repairs
+        # Standard repairs; holes are filled before the normals are
+        # recomputed, since splitting hard edges opens seams that would
+        # look like holes
         self._remove_duplicates()
-        self._remove_degenerate_faces()
+        self._remove_degenerate_faces(remove_slivers=aggressive)
+        self._unify_winding()
+        if aggressive:
+            self._fill_holes()
         self._fix_normals()
         
         if aggressive:
-            # More aggressive repairs
-            self._fill_holes()
             self._smooth_normals()
         
         return {
-            'vertices': self.vertices.tolist(),
-            'faces': self.faces.tolist(),
-            'normals': self.normals.tolist(),
-            'uvs': self.uvs.tolist(),
+            'mesh': self.mesh,
             'repairs': self.repairs_applied,
             'stats': {
                 'before': self.original_stats,
@@ -70,44 +132,127 @@ class GeometryRepair:
             }
         }
     
-    def _remove_duplicates(self) -> None:
-        """Remove duplicate vertices and update face indices"""
-        # TODO: Implement vertex deduplication
-        # Use KD-tree or spatial hashing for efficiency
+    @timed('repair.remove_duplicates')
+    def _remove_duplicates(self) -> Optional[np.ndarray]:
+        """
+        Weld vertices closer than self.tolerance and update face indices
+        
+        Returns:
+            Remap array (old vertex index -> new index), or None when the
+            mesh has no vertices. Per-vertex normals and UVs are carried
+            along automatically; use the remap for any other attributes.
+        """
+        if len(self.vertices) == 0:
+            return None
+        
+        keep, remap = weld_vertices(self.vertices, self.tolerance)
+        removed = len(self.vertices) - len(keep)
+        if removed:
+            self._apply_vertex_remap(keep, remap)
+        
         self.repairs_applied.append('remove_duplicates')
-        logger.info("Removed duplicate vertices")
+        logger.info(f"Removed {removed} duplicate vertices")
+        return remap
     
-    def _remove_degenerate_faces(self) -> None:
-        """Remove faces with zero area or duplicate indices"""
-        # TODO: Calculate face areas and filter
+    @timed('repair.remove_degenerate')
+    def _remove_degenerate_faces(self, remove_slivers: bool = False) -> None:
+        """
+        Remove faces with zero area or duplicate indices, then drop the
+        vertices no face references any more
+        
+        Args:
+            remove_slivers: Also remove needle-shaped faces (may open holes)
+        """
+        if len(self.faces) == 0:
+            return
+        
+        degenerate, sliver = find_degenerate_faces(
+            self.vertices, self.faces, degenerate_area_epsilon(self.vertices),
+            areas=self.mesh.face_areas
+        )
+        remove = degenerate | sliver if remove_slivers else degenerate
+        removed_faces = int(np.count_nonzero(remove))
+        if removed_faces:
+            self.mesh.remove_faces(remove)
+        
+        keep, remap = compact_vertices(self.faces, len(self.vertices))
+        removed_vertices = len(self.vertices) - len(keep)
+        if removed_vertices:
+            self._apply_vertex_remap(keep, remap)
+        
         self.repairs_applied.append('remove_degenerate')
-        logger.info("Removed degenerate faces")
+        logger.info(f"Removed {removed_faces} degenerate faces and {removed_vertices} orphaned vertices")
+    
+    def _apply_vertex_remap(self, keep: np.ndarray, remap: np.ndarray) -> None:
+        """Keep the given vertices (with their normals / UVs) and renumber faces"""
+        self.mesh.remap_vertices(keep, remap)
+    
+    @timed('repair.unify_winding')
+    def _unify_winding(self, flip: Optional[np.ndarray] = None) -> None:
+        """
+        Flip faces so every shell is consistently wound and closed shells face outwards
+        
+        Args:
+            flip: Precomputed per-face flip flags for the current faces
+                (see GeometryDiagnostics.face_flips)
+        """
+        if len(self.faces) == 0:
+            return
+        
+        if flip is None and self.cache is not None:
+            flip = component_flips(self.vertices, self.faces, self.mesh.edge_table, self.cache)
+        elif flip is None:
+            flip, _ = orient_faces(self.vertices, self.faces, self.mesh.edge_table)
+        flipped = int(np.count_nonzero(flip))
+        if flipped:
+            self.mesh.flip_faces(flip)
+        
+        self.repairs_applied.append('unify_winding')
+        logger.info(f"Flipped {flipped} faces")
     
+    @timed('repair.fix_normals')
     def _fix_normals(self) -> None:
-        """Recalculate face and vertex normals"""
+        """Recalculate area-weighted vertex normals (splitting hard edges if enabled)"""
         if len(self.vertices) == 0 or len(self.faces) == 0:
             return
         
-        # TODO: Implement normal recalculation
-        # 1. Calculate face normals from cross product
-        # 2. Average face normals to get vertex normals
-        # 3. Normalize
+        if self.crease_angle is None:
+            normals = compute_vertex_normals(self.vertices, self.faces)
+        else:
+            source, self.faces, normals = split_creases(
+                self.vertices, self.faces, self.crease_angle, edge_table=self.mesh.edge_table
+            )
+            if len(self.uvs) == len(self.vertices):
+                self.uvs = self.uvs[source]
+            self.vertices = self.vertices[source]
+        self.normals = normals.astype(self.vertices.dtype, copy=False)
         
         self.repairs_applied.append('fix_normals')
         logger.info("Recalculated normals")
     
+    @timed('repair.fill_holes')
     def _fill_holes(self) -> None:
-        """Fill holes by detecting boundary edges and triangulating"""
-        # TODO: Implement hole filling
-        # 1. Find boundary loops
-        # 2. Triangulate using earcut or similar
-        # 3. Add new faces
+        """Fill holes by detecting boundary loops and triangulating them"""
+        if len(self.faces) == 0:
+            return
+        
+        new_faces, filled, skipped = fill_holes(
+            self.vertices, self.faces, self.max_hole_perimeter, self.mesh.edge_table
+        )
+        if len(new_faces):
+            self.mesh.add_faces(new_faces)
+        
         self.repairs_applied.append('fill_holes')
-        logger.info("Filled holes")
+        logger.info(f"Filled {filled} holes ({skipped} openings left open)")
     
+    @timed('repair.smooth_normals')
     def _smooth_normals(self) -> None:
         """Smooth normals for better shading"""
-        # TODO: Average normals of adjacent vertices
+        if len(self.faces) == 0 or len(self.normals) != len(self.vertices):
+            return
+        
+        smoothed = smooth_vertex_normals(self.normals, self.faces, edge_table=self.mesh.edge_table)
+        self.normals = smoothed.astype(self.vertices.dtype, copy=False)
         self.repairs_applied.append('smooth_normals')
         logger.info("Smoothed normals")
     
@@ -124,27 +269,48 @@ class GeometryRepair:
 def repair_mesh(
     mesh_path: str,
     output_path: Optional[str] = None,
-    aggressive: bool = False
+    aggressive: bool = False,
+    tolerance: Optional[float] = None,
+    crease_angle: Optional[float] = None,
+    cache: Optional[ResultCache] = None
 ) -> Dict[str, Any]:
     """
     Main entry point for mesh repair
     
     Args:
         mesh_path: Input mesh file path
-        output_path: Output path (if None, returns data only)
+        output_path: Output path (if None, the repaired Mesh is returned
+            under 'mesh' instead)
         aggressive: Apply aggressive repairs
+        tolerance: Vertex merge distance (defaults to Config 'tolerance')
+        crease_angle: Hard-edge angle in degrees for normal recomputation
+        cache: Result cache for per-component winding flips (None: orient
+            the whole mesh)
     
     Returns:
         Repair report and optionally saves to file
     """
-    # TODO: Load mesh from file
-    # TODO: Apply repairs
-    # TODO: Save to output_path if provided
+    try:
+        mesh = load_mesh(mesh_path)
+    except (OSError, ValueError) as e:
+        logger.error(f"Failed to load mesh: {e}")
+        return {
+            'status': 'error',
+            'message': str(e)
+        }
     
-    return {
-        'status': 'not_implemented',
-        'message': 'Mesh repair coming soon'
-    }
+    if tolerance is None:
+        tolerance = Config().get('tolerance')
+    
+    repair = GeometryRepair(mesh, tolerance=tolerance, crease_angle=crease_angle, cache=cache)
+    result = repair.repair_all(aggressive)
+    result['status'] = 'success'
+    
+    if output_path:
+        save_mesh(output_path, result.pop('mesh'))
+        result['output'] = output_path
+    
+    return result
 
 
 if __name__ == '__main__':
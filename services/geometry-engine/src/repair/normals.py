@@ -0,0 +1,226 @@
+"""Normal Recomputation
+
+Vectorized face and vertex normals for GeometryRepair:
+- Area- or angle-weighted vertex normals accumulated with np.bincount
+  (one call per corner slot and axis, no np.add.at, no Python loops)
+- Optional crease-angle split: corners of a vertex stay together only if
+  they are connected through edges whose dihedral angle is below the
+  crease angle, so hard edges get separate vertices
+- Normal smoothing over the edge graph
+"""
+
+import numpy as np
+from typing import Optional, Tuple
+
+from utils.helper import FaceBuffers, calculate_face_geometry
+from utils.topology import EdgeTable, connected_components
+
+WEIGHTINGS = ('area', 'angle')
+
+
+def _normalize_rows(vectors: np.ndarray) -> np.ndarray:
+    """Normalize rows in place; zero rows stay zero"""
+    length = np.sqrt(np.einsum('ij,ij->i', vectors, vectors))
+    length[length == 0] = 1
+    vectors /= length[:, None]
+    return vectors
+
+
+def _accumulate(index: np.ndarray, weights: np.ndarray, size: int, out: np.ndarray) -> None:
+    """out[:, axis] += sum of weights[axis] grouped by index (weights is 3xF)"""
+    for axis in range(3):
+        out[:, axis] += np.bincount(index, weights=weights[axis], minlength=size)
+
+
+def corner_angles(vertices: np.ndarray, faces: np.ndarray, chunk_size: int = 1 << 20) -> np.ndarray:
+    """Interior angle at every corner (Fx3, radians)"""
+    angles = np.empty((len(faces), 3), dtype=np.float64)
+    for start in range(0, len(faces), chunk_size):
+        chunk = faces[start:start + chunk_size]
+        p = [vertices[chunk[:, k]] for k in range(3)]
+        for k in range(3):
+            a = p[(k + 1) % 3] - p[k]
+            b = p[(k + 2) % 3] - p[k]
+            cross = np.cross(a, b)
+            # atan2 stays accurate for very small and very obtuse angles
+            angles[start:start + len(chunk), k] = np.arctan2(
+                np.sqrt(np.einsum('ij,ij->i', cross, cross)),
+                np.einsum('ij,ij->i', a, b)
+            )
+    return angles
+
+
+def corner_weights(
+    vertices: np.ndarray,
+    faces: np.ndarray,
+    weighting: str = 'area',
+    face_normals: Optional[np.ndarray] = None
+) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+    """
+    Normal contribution of each face to its corners
+    
+    Returns:
+        (face_vectors, angles): face_vectors is 3xF (unit normals scaled by
+        face area, or unit normals for angle weighting); angles is Fx3 for
+        angle weighting, otherwise None (all corners use face_vectors)
+    """
+    if weighting not in WEIGHTINGS:
+        raise ValueError(f"Unknown normal weighting: {weighting}")
+    
+    if face_normals is None:
+        buffers = FaceBuffers(min(len(faces), 1 << 20), np.float64)
+        face_normals, areas, _ = calculate_face_geometry(
+            vertices, faces, buffers=buffers, want=('normals', 'areas')
+        )
+    else:
+        areas = None
+    
+    if weighting == 'area':
+        if areas is None:
+            _, areas, _ = calculate_face_geometry(vertices, faces, want=('areas',))
+        return np.ascontiguousarray((face_normals * areas[:, None]).T), None
+    return np.ascontiguousarray(face_normals.T), corner_angles(vertices, faces)
+
+
+def compute_vertex_normals(
+    vertices: np.ndarray,
+    faces: np.ndarray,
+    weighting: str = 'area',
+    face_normals: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """
+    Weighted average of the normals of the faces around each vertex
+    
+    Args:
+        vertices: Vx3 vertex positions
+        faces: Fx3 vertex indices
+        weighting: 'area' (face area) or 'angle' (corner angle)
+        face_normals: Optional precomputed unit face normals (Fx3)
+    
+    Returns:
+        Vx3 unit vertex normals (zero for unreferenced vertices)
+    """
+    num_vertices = len(vertices)
+    normals = np.zeros((num_vertices, 3), dtype=np.float64)
+    if len(faces) == 0:
+        return normals
+    
+    vectors, angles = corner_weights(vertices, faces, weighting, face_normals)
+    for k in range(3):
+        weights = vectors if angles is None else vectors * angles[:, k]
+        _accumulate(faces[:, k], weights, num_vertices, normals)
+    return _normalize_rows(normals)
+
+
+def split_creases(
+    vertices: np.ndarray,
+    faces: np.ndarray,
+    crease_angle: float,
+    weighting: str = 'area',
+    edge_table: Optional[EdgeTable] = None
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Vertex normals with hard edges: split vertices along creases
+    
+    Two faces sharing an edge are smoothed together when the angle between
+    their normals is at most crease_angle. Corners of the same vertex that
+    are linked through such edges share one output vertex; every other
+    group of corners gets its own copy of the vertex.
+    
+    Args:
+        vertices: Vx3 vertex positions
+        faces: Fx3 vertex indices
+        crease_angle: Maximum smoothed dihedral angle in degrees
+        weighting: 'area' or 'angle'
+        edge_table: Optional prebuilt edge table of faces
+    
+    Returns:
+        (source, new_faces, normals): original vertex index of every output
+        vertex (use it to carry positions, UVs, ...), faces renumbered to
+        the output vertices, and the output vertex normals. Vertices not
+        used by any face are dropped.
+    """
+    num_faces = len(faces)
+    if num_faces == 0:
+        return np.arange(len(vertices)), faces, compute_vertex_normals(vertices, faces, weighting)
+    
+    face_normals = calculate_face_geometry(vertices, faces, want=('normals',))[0]
+    if edge_table is None:
+        edge_table = EdgeTable.from_faces(faces)
+    
+    # The two faces sharing each manifold edge
+    s1, s2 = edge_table.manifold_slots()
+    f1 = s1 // 3
+    f2 = s2 // 3
+    
+    # Smooth only across edges flatter than the crease angle
+    cos_limit = np.cos(np.radians(crease_angle))
+    smooth = np.einsum('ij,ij->i', face_normals[f1], face_normals[f2]) >= cos_limit
+    s1, s2, f1, f2 = s1[smooth], s2[smooth], f1[smooth], f2[smooth]
+    
+    # Link the corners of both edge endpoints across the two faces
+    flat = faces.ravel()
+    k1 = s1 % 3
+    k2 = s2 % 3
+    a1 = 3 * f1 + k1
+    b1 = 3 * f1 + (k1 + 1) % 3
+    c2 = 3 * f2 + k2
+    d2 = 3 * f2 + (k2 + 1) % 3
+    same = flat[a1] == flat[c2]
+    partner_a = np.where(same, c2, d2)
+    partner_b = np.where(same, d2, c2)
+    label = connected_components(
+        3 * num_faces,
+        np.concatenate([a1, b1]),
+        np.concatenate([partner_a, partner_b])
+    )
+    
+    # Corners sharing a vertex but not linked by smooth edges end up in different groups
+    groups, corner_vertex = np.unique(label, return_inverse=True)
+    source = flat[groups]
+    new_faces = corner_vertex.reshape(-1, 3).astype(faces.dtype, copy=False)
+    
+    num_out = len(groups)
+    normals = np.zeros((num_out, 3), dtype=np.float64)
+    vectors, angles = corner_weights(vertices, faces, weighting, face_normals)
+    for k in range(3):
+        weights = vectors if angles is None else vectors * angles[:, k]
+        _accumulate(new_faces[:, k], weights, num_out, normals)
+    return source, new_faces, _normalize_rows(normals)
+
+
+def smooth_vertex_normals(
+    normals: np.ndarray,
+    faces: np.ndarray,
+    iterations: int = 1,
+    edge_table: Optional[EdgeTable] = None
+) -> np.ndarray:
+    """
+    Average each vertex normal with its edge neighbours
+    
+    Args:
+        normals: Vx3 vertex normals
+        faces: Fx3 vertex indices
+        iterations: Number of smoothing passes
+        edge_table: Optional prebuilt edge table of faces
+    
+    Returns:
+        Smoothed Vx3 unit normals
+    """
+    normals = np.array(normals, dtype=np.float64)
+    if len(faces) == 0 or len(normals) == 0:
+        return normals
+    
+    if edge_table is None:
+        edge_table = EdgeTable.from_faces(faces)
+    a = edge_table.edges[:, 0]
+    b = edge_table.edges[:, 1]
+    size = len(normals)
+    
+    for _ in range(iterations):
+        current = np.ascontiguousarray(normals.T)
+        summed = normals.copy()
+        _accumulate(a, current[:, b], size, summed)
+        _accumulate(b, current[:, a], size, summed)
+        normals = _normalize_rows(summed)
+    return normals
@@ -0,0 +1,301 @@
+"""Vertex Welding Engine
+
+Merges coincident and near-coincident vertices using a spatial hash:
+- Positions are quantized to a grid whose cells are 4 x tolerance wide
+- Occupied cells go into an open-addressing hash table (vectorized probing)
+- Each vertex is compared with the members of its own cell and of the
+  neighbouring cells on the sides it is closest to, so pairs that
+  straddle a cell boundary still merge
+- Linked vertices are clustered with vectorized connected components
+
+Runs in O(n) time and memory for ordinary meshes (O(n log n) when many
+vertices share a cell); everything is done with whole-array NumPy
+operations, there are no Python loops over vertices.
+"""
+
+import numpy as np
+from typing import Tuple
+
+from utils.topology import connected_components
+
+_EMPTY = np.int64(-1)
+
+# Multiplicative hashing constants (64-bit, odd)
+_HASH_MULT = np.uint64(0x9E3779B97F4A7C15)
+_AXIS_MULTS = (
+    np.uint64(0x8DA6B343D1F2A9C5),
+    np.uint64(0xD8163841C3B7F2E1),
+    np.uint64(0xCB1AB31F5A7E4D93),
+)
+_KEY_MASK = np.uint64(0x7FFFFFFFFFFFFFFF)
+
+# Grid cell edge length in multiples of the weld tolerance
+_CELL_FACTOR = 4.0
+
+# Cell occupancy above which vertices are grouped by sorting
+_MAX_RANK_ROUNDS = 16
+
+
+def _cell_keys(cells: np.ndarray) -> np.ndarray:
+    """Hash Nx3 integer cell coordinates into non-negative int64 keys"""
+    c = cells.astype(np.uint64, copy=False)
+    key = c[:, 0] * _AXIS_MULTS[0]
+    key ^= c[:, 1] * _AXIS_MULTS[1]
+    key ^= c[:, 2] * _AXIS_MULTS[2]
+    key &= _KEY_MASK
+    return key.view(np.int64)
+
+
+class CellHashTable:
+    """
+    Open-addressing (linear probing) hash table of grid cell keys
+    
+    Inserts and lookups are processed for all keys at once; each probing
+    round only touches the keys that have not been resolved yet, so the
+    number of rounds is bounded by the longest probe sequence.
+    """
+    
+    def __init__(self, capacity_hint: int):
+        """
+        Args:
+            capacity_hint: Expected number of keys (table is sized 2-4x)
+        """
+        bits = max(4, int(np.ceil(np.log2(max(capacity_hint, 1) * 2))))
+        self.capacity = 1 << bits
+        self._mask = np.int64(self.capacity - 1)
+        self._shift = np.uint64(64 - bits)
+        self.keys = np.full(self.capacity, _EMPTY, dtype=np.int64)
+    
+    def _home_slots(self, keys: np.ndarray) -> np.ndarray:
+        """Initial probe position of every key"""
+        h = keys.view(np.uint64) * _HASH_MULT
+        return (h >> self._shift).view(np.int64)
+    
+    def insert(self, keys: np.ndarray) -> np.ndarray:
+        """
+        Insert keys (duplicates allowed) and return the slot of each one
+        
+        When several new keys race for the same empty slot in a round, the
+        one that was written wins and the others keep probing.
+        """
+        slots = self._home_slots(keys)
+        pending = np.arange(len(keys))
+        
+        while pending.size:
+            s = slots[pending]
+            k = keys[pending]
+            free = self.keys[s] == _EMPTY
+            self.keys[s[free]] = k[free]
+            
+            placed = self.keys[s] == k
+            pending = pending[~placed]
+            slots[pending] = (slots[pending] + 1) & self._mask
+        
+        return slots
+    
+    def lookup(self, keys: np.ndarray) -> np.ndarray:
+        """Return the slot of every key, or -1 where the key is absent"""
+        slots = self._home_slots(keys)
+        result = np.full(len(keys), -1, dtype=np.int64)
+        pending = np.arange(len(keys))
+        
+        while pending.size:
+            s = slots[pending]
+            stored = self.keys[s]
+            hit = stored == keys[pending]
+            result[pending[hit]] = s[hit]
+            
+            pending = pending[~hit & (stored != _EMPTY)]
+            slots[pending] = (slots[pending] + 1) & self._mask
+        
+        return result
+
+
+def _neighbour_offsets(frac: np.ndarray, reach: float):
+    """
+    Neighbouring cells each vertex has to visit
+    
+    A vertex can only be within tolerance of a neighbouring cell along an
+    axis when it lies within ``reach`` (tolerance in cell units) of that
+    face, and only on that side, so most vertices visit no neighbours.
+    
+    Args:
+        frac: Nx3 position of each vertex inside its cell, in [0, 1)
+        reach: Tolerance divided by the cell size
+    
+    Yields:
+        (vertex_mask, Nx3 offsets) for each of the seven neighbour patterns
+    """
+    low = frac < reach
+    near = low | (frac >= 1.0 - reach)
+    direction = np.where(low, -1, 1).astype(np.int64)
+    for pattern in range(1, 8):
+        bits = np.array([(pattern >> axis) & 1 for axis in range(3)], dtype=bool)
+        mask = near[:, bits].all(axis=1)
+        yield mask, direction[mask] * bits
+
+
+def _group_by_cell(cell_ids: np.ndarray, num_cells: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Counting sort of vertices by dense cell id
+    
+    The rank of each vertex inside its cell is found in rounds: every round
+    lets one remaining vertex per cell claim the next position, so the
+    number of rounds is the largest cell occupancy. When a cell holds more
+    than _MAX_RANK_ROUNDS vertices (e.g. many coincident copies) a stable
+    sort is used instead, which does not depend on the occupancy.
+    
+    Returns:
+        (members, starts, counts) - CSR layout of vertex indices per cell
+    """
+    n = len(cell_ids)
+    counts = np.bincount(cell_ids, minlength=num_cells)
+    starts = np.zeros(num_cells, dtype=np.int64)
+    np.cumsum(counts[:-1], out=starts[1:])
+    if n and counts.max() > _MAX_RANK_ROUNDS:
+        return np.argsort(cell_ids, kind='stable'), starts, counts
+    
+    rank = np.empty(n, dtype=np.int64)
+    claim = np.empty(num_cells, dtype=np.int64)
+    remaining = np.arange(n)
+    round_ = 0
+    while remaining.size:
+        c = cell_ids[remaining]
+        claim[c] = remaining
+        won = claim[c] == remaining
+        rank[remaining[won]] = round_
+        remaining = remaining[~won]
+        round_ += 1
+    
+    members = np.empty(n, dtype=np.int64)
+    members[starts[cell_ids] + rank] = np.arange(n)
+    return members, starts, counts
+
+
+def _close_pairs(
+    positions: np.ndarray,
+    queries: np.ndarray,
+    cells: np.ndarray,
+    members: np.ndarray,
+    starts: np.ndarray,
+    counts: np.ndarray,
+    tol_sq: float,
+    ordered: bool = True
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Pairs (query, member) within tolerance
+    
+    With ordered=True only pairs with query < member are kept (for
+    searches that find every pair from both sides), otherwise only
+    self-pairs are dropped.
+    """
+    cnt = counts[cells]
+    total = int(cnt.sum())
+    if total == 0:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty
+    
+    offsets = np.cumsum(cnt) - cnt
+    ramp = np.arange(total) - np.repeat(offsets, cnt)
+    i = np.repeat(queries, cnt)
+    j = members[np.repeat(starts[cells], cnt) + ramp]
+    
+    keep = i < j if ordered else i != j
+    i = i[keep]
+    j = j[keep]
+    d = positions[i] - positions[j]
+    close = np.einsum('ij,ij->i', d, d) <= tol_sq
+    return i[close], j[close]
+
+
+def weld_vertices(
+    vertices: np.ndarray,
+    tolerance: float,
+    batch_size: int = 1 << 20
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Find vertices closer than tolerance and merge them
+    
+    Every vertex is linked to all vertices within tolerance in its own and
+    neighbouring cells (pairs already implied by a shared link to the
+    first member of a cell are skipped); clusters are the connected
+    components of those links and keep their lowest-indexed vertex.
+    
+    Args:
+        vertices: Nx3 array of vertex positions
+        tolerance: Merge distance
+        batch_size: Vertices processed per candidate batch (bounds memory)
+    
+    Returns:
+        (keep, remap) where keep holds the indices of surviving vertices
+        in ascending order and remap maps every old vertex index to its
+        new index (use it for faces and to carry normals/UVs along)
+    """
+    n = len(vertices)
+    if n == 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    
+    positions = np.asarray(vertices, dtype=np.float64)
+    tolerance = max(float(tolerance), np.finfo(np.float64).tiny)
+    tol_sq = tolerance * tolerance
+    
+    scaled = positions / (_CELL_FACTOR * tolerance)
+    cells = np.floor(scaled)
+    scaled -= cells
+    frac = scaled
+    cells = cells.astype(np.int64)
+    
+    # Hash occupied cells and give them dense ids
+    table = CellHashTable(n)
+    slots = table.insert(_cell_keys(cells))
+    occupied = table.keys != _EMPTY
+    dense = np.cumsum(occupied) - 1
+    num_cells = int(occupied.sum())
+    del occupied
+    cell_ids = dense[slots]
+    del slots
+    members, starts, counts = _group_by_cell(cell_ids, num_cells)
+    
+    # Link every vertex to the first member of its cell when close enough;
+    # exact duplicates (the common case) need no further pair tests
+    first = members[starts[cell_ids]]
+    d = positions - positions[first]
+    linked = np.einsum('ij,ij->i', d, d) <= tol_sq
+    del d
+    pairs_a = [np.flatnonzero(linked)]
+    pairs_b = [first[linked]]
+    del first
+    
+    for lo in range(0, n, batch_size):
+        hi = min(lo + batch_size, n)
+        queries = np.arange(lo, hi)
+        
+        # Vertices not linked to their cell's first member test all cellmates
+        loose = ~linked[lo:hi]
+        a, b = _close_pairs(
+            positions, queries[loose], cell_ids[lo:hi][loose],
+            members, starts, counts, tol_sq, ordered=False
+        )
+        pairs_a.append(a)
+        pairs_b.append(b)
+        
+        for mask, offset in _neighbour_offsets(frac[lo:hi], 1.0 / _CELL_FACTOR):
+            found = table.lookup(_cell_keys(cells[lo:hi][mask] + offset))
+            hit = found >= 0
+            a, b = _close_pairs(
+                positions, queries[mask][hit], dense[found[hit]],
+                members, starts, counts, tol_sq
+            )
+            pairs_a.append(a)
+            pairs_b.append(b)
+    
+    label = connected_components(
+        n, np.concatenate(pairs_a), np.concatenate(pairs_b)
+    )
+    
+    index = np.arange(n)
+    keep = np.flatnonzero(label == index)
+    new_index = np.empty(n, dtype=np.int64)
+    new_index[keep] = np.arange(len(keep))
+    remap = new_index[label]
+    return keep, remap
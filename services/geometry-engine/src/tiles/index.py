@@ -0,0 +1,468 @@
+"""Out-of-Core Processing
+
+Diagnosis and repair of meshes that do not fit in memory, one spatial
+tile at a time (see tiles.partition):
+- The input is memory-mapped (GLB / TMSH) and tiled once; afterwards every
+  pass holds a single tile (its owned faces plus halo) in memory. Tiles
+  and streaming chunks are sized from a memory budget
+  (Config['out_of_core_memory_mb']), so peak memory follows the budget
+  rather than the mesh size
+- Whole-mesh results are assembled from per-tile parts that never count
+  anything twice: per-face checks run on owned faces, edges belong to the
+  tile owning their lowest face, intersecting pairs to the tile owning
+  their lower face, and shells are stitched across tiles
+  (see tiles.stitch)
+- Per-face and per-vertex state shared between tiles (weld targets, kept
+  and flipped faces, normals, output arrays) lives in memory-mapped
+  scratch files in a work directory
+- Repair runs the standard chain (weld, degenerate removal, winding,
+  normals) and writes GLB / TMSH output straight from the scratch arrays.
+  Hole filling, normal smoothing and crease splitting need whole
+  boundary loops or shells and are not run out of core
+"""
+
+import shutil
+import logging
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+from diagnose.index import GeometryDiagnostics
+from diagnose.intersections import IntersectionGrid, SAMPLE_PAIRS, DISTANCE_EPSILON_RATIO, lowest_pairs
+from diagnose.parallel import CHUNK_FACES, SAMPLE_FACES, chunk_face_stats, face_chunks, reduce_face_stats
+from repair.weld import weld_vertices
+from repair.normals import compute_vertex_normals
+from utils.helper import Config, DEGENERATE_AREA_RATIO, FaceBuffers, ensure_directory, find_degenerate_faces
+from utils.mesh import Mesh
+from utils.mesh_io import STREAM_FORMATS, load_mesh, save_mesh
+from utils.metrics import span
+from utils.topology import EdgeTable
+from tiles.partition import TileSet, Tile, stream_rows
+from tiles.stitch import OrientationStitch, first_faces
+
+logger = logging.getLogger(__name__)
+
+# Inputs that load as memory maps
+TILED_INPUTS = ('.glb', '.tmsh')
+
+# Peak working memory per tile face (edge table, intersection grid,
+# orientation), and per face of a streaming chunk
+TILE_BYTES_PER_FACE = 2048
+STREAM_BYTES_PER_FACE = 512
+
+_MB = 1024 * 1024
+
+
+def supports_tiled(input_path: str, output_path: Optional[str] = None) -> bool:
+    """Formats the out-of-core mode can read (and write)"""
+    if Path(input_path).suffix.lower() not in TILED_INPUTS:
+        return False
+    return output_path is None or Path(output_path).suffix.lower() in STREAM_FORMATS
+
+
+class TiledMesh:
+    """A memory-mapped mesh split into tiles, with scratch arrays on disk"""
+    
+    def __init__(self, mesh: Mesh, work_dir: str, memory_mb: float, tolerance: float = 0.0):
+        """
+        Args:
+            mesh: Mesh (typically memory-mapped by load_mesh)
+            work_dir: Directory for shards and scratch files
+            memory_mb: Working memory budget
+            tolerance: Vertex merge distance (widens the halo)
+        """
+        self.mesh = mesh
+        self.work_dir = ensure_directory(work_dir)
+        self.tolerance = tolerance
+        budget = max(float(memory_mb), 1.0) * _MB
+        self.chunk_faces = max(1 << 12, int(budget // STREAM_BYTES_PER_FACE))
+        self.max_tile_faces = max(1 << 12, int(budget // TILE_BYTES_PER_FACE))
+        
+        with span('tiles.partition'):
+            self.tiles = TileSet.build(
+                mesh.vertices, mesh.faces, str(self.work_dir / 'tiles'),
+                self.max_tile_faces, self.chunk_faces, margin=2 * tolerance
+            )
+        largest = max((tile.num_faces for tile in self.tiles), default=0)
+        if largest > 2 * self.max_tile_faces:
+            logger.warning(
+                f"Largest tile has {largest:,} faces for a budget of {self.max_tile_faces:,} "
+                f"(dense region or very large faces); memory use will exceed the budget"
+            )
+        
+        # Whole-mesh thresholds, so every tile decides the same way
+        lo, hi = self.tiles.bounds
+        diagonal = hi - lo
+        self.center = (lo + hi) / 2
+        self.area_epsilon = float(diagonal @ diagonal) * DEGENERATE_AREA_RATIO
+        self.epsilon = DISTANCE_EPSILON_RATIO * float(np.sqrt(diagonal @ diagonal))
+    
+    def scratch(self, name: str, shape: Tuple[int, ...], dtype: Any) -> np.ndarray:
+        """Zero-filled array backed by a file in the work directory"""
+        if shape[0] == 0:
+            return np.zeros(shape, dtype=dtype)
+        return np.memmap(self.work_dir / f"{name}.bin", dtype=dtype, mode='w+', shape=shape)
+    
+    def _count(self, mask: np.ndarray) -> int:
+        """Set entries of a scratch mask, read chunk by chunk"""
+        return sum(
+            int(np.count_nonzero(mask[start:stop])) for start, stop in stream_rows(len(mask), self.chunk_faces)
+        )
+    
+    def cleanup(self) -> None:
+        """Delete the work directory"""
+        shutil.rmtree(self.work_dir, ignore_errors=True)
+    
+    # ===== Diagnosis =====
+    
+    def mesh_stats(self) -> Tuple[Dict[str, Any], Dict[str, int]]:
+        """
+        Whole-mesh statistics, tile by tile
+        
+        Returns:
+            (stats, orientation): the keys of diagnose.parallel.serial_mesh_stats
+            plus unreferenced_vertices, and the orient_faces summary
+        """
+        num_faces = self.mesh.num_faces
+        referenced = self.scratch('referenced', (self.mesh.num_vertices,), np.bool_)
+        intersecting = self.scratch('intersecting', (num_faces,), np.bool_)
+        stitch = OrientationStitch(
+            self.scratch('face_node', (num_faces,), np.int64),
+            self.scratch('face_parity', (num_faces,), np.bool_),
+            self.work_dir / 'links.bin', self.center
+        )
+        buffers = FaceBuffers(min(CHUNK_FACES, self.max_tile_faces), np.float32)
+        partials = []
+        stats = {'edge_count': 0, 'boundary_edges': 0, 'non_manifold_edges': 0, 'intersecting_pairs': 0}
+        sample_pairs = []
+        
+        for tile in self.tiles:
+            if tile.num_faces == 0:
+                continue
+            with span('tiles.diagnose'):
+                face_ids, owned, faces, vertex_ids, vertices = _load(tile)
+                referenced[vertex_ids] = True
+                
+                owned_ids = face_ids[owned]
+                owned_faces = faces[owned]
+                for start, stop in face_chunks(len(owned_faces)):
+                    partial = chunk_face_stats(vertices, owned_faces[start:stop], self.area_epsilon, start, buffers)
+                    for key in ('degenerate_samples', 'sliver_samples'):
+                        partial[key] = owned_ids[np.array(partial[key], dtype=np.int64)].tolist()
+                    partials.append(partial)
+                
+                edge_table = EdgeTable.from_faces(faces)
+                attributed = owned[first_faces(edge_table, len(faces))]
+                stats['edge_count'] += int(np.count_nonzero(attributed))
+                stats['boundary_edges'] += int(np.count_nonzero(attributed & edge_table.boundary_mask))
+                stats['non_manifold_edges'] += int(np.count_nonzero(attributed & edge_table.non_manifold_mask))
+                
+                grid = IntersectionGrid(vertices, faces, epsilon=self.epsilon, owned=owned)
+                for task in grid.tasks():
+                    partial = grid.scan(*task)
+                    stats['intersecting_pairs'] += partial['intersecting_pairs']
+                    intersecting[face_ids[partial['faces']]] = True
+                    pairs = np.sort(face_ids[np.array(partial['sample_pairs'], dtype=np.int64).reshape(-1, 2)], axis=1)
+                    sample_pairs = lowest_pairs(sample_pairs + pairs.tolist(), SAMPLE_PAIRS)
+                
+                stitch.add_tile(vertices, faces, owned, face_ids, edge_table)
+        
+        with span('tiles.stitch'):
+            stats.update(reduce_face_stats(partials))
+            # Tiles visit faces out of order; report the lowest face IDs
+            for key in ('degenerate_samples', 'sliver_samples'):
+                stats[key] = sorted(s for partial in partials for s in partial[key])[:SAMPLE_FACES]
+            stats['sample_pairs'] = sample_pairs
+            stats['intersecting_faces'] = self._count(intersecting)
+            stats['unreferenced_vertices'] = self.mesh.num_vertices - self._count(referenced)
+            orientation = stitch.finish(self.chunk_faces)
+        return stats, orientation
+    
+    # ===== Repair =====
+    
+    def _welded_tile(self, tile: Tile, target: np.ndarray, remove_slivers: bool):
+        """
+        One tile after welding, with the faces the degenerate pass keeps
+        
+        Returns:
+            (face_ids, owned, faces, vertex_ids, vertices, keep): faces index
+            the surviving (target) vertices of the tile
+        """
+        face_ids, owned, faces, vertex_ids, _ = _load(tile)
+        vertex_ids, faces = np.unique(target[vertex_ids][faces].ravel(), return_inverse=True)
+        faces = faces.reshape(-1, 3)
+        vertices = np.asarray(self.mesh.vertices[vertex_ids])
+        degenerate, sliver = find_degenerate_faces(vertices, faces, self.area_epsilon)
+        keep = ~(degenerate | sliver) if remove_slivers else ~degenerate
+        return face_ids, owned, faces, vertex_ids, vertices, keep
+    
+    def repair(self, output_path: str, remove_slivers: bool = False) -> Dict[str, int]:
+        """
+        Weld, drop degenerate faces, unify winding, recompute normals and
+        write the result
+        
+        Args:
+            output_path: Output path (.glb or .tmsh)
+            remove_slivers: Also drop sliver faces
+        
+        Returns:
+            Counts of welded vertices, removed faces and flipped faces and
+            the output size
+        """
+        num_vertices = self.mesh.num_vertices
+        num_faces = self.mesh.num_faces
+        
+        # Every vertex is welded by the tile containing it; the halo holds
+        # all its neighbours within the tolerance. Clusters keep their
+        # lowest vertex ID like weld_vertices.
+        target = self.scratch('target', (num_vertices,), np.int64)
+        with span('tiles.weld'):
+            for tile in self.tiles:
+                if tile.num_faces == 0:
+                    continue
+                vertex_ids = np.array(tile.shard('vertex_ids'))
+                vertices = np.array(tile.shard('vertices'))
+                keep, remap = weld_vertices(vertices, self.tolerance)
+                own = self.tiles.owner(vertices) == tile.index
+                target[vertex_ids[own]] = vertex_ids[keep[remap[own]]]
+        
+        kept = self.scratch('kept', (num_faces,), np.bool_)
+        used = self.scratch('used', (num_vertices,), np.bool_)
+        flip = self.scratch('flip', (num_faces,), np.bool_)
+        stitch = OrientationStitch(
+            self.scratch('face_node', (num_faces,), np.int64),
+            self.scratch('face_parity', (num_faces,), np.bool_),
+            self.work_dir / 'links.bin', self.center, flip
+        )
+        with span('tiles.orient'):
+            for tile in self.tiles:
+                if tile.num_faces == 0:
+                    continue
+                face_ids, owned, faces, vertex_ids, vertices, keep = self._welded_tile(tile, target, remove_slivers)
+                kept[face_ids[owned]] = keep[owned]
+                face_ids, owned, faces = face_ids[keep], owned[keep], faces[keep]
+                used[vertex_ids[np.unique(faces[owned])]] = True
+                stitch.add_tile(vertices, faces, owned, face_ids, EdgeTable.from_faces(faces))
+            stitch.finish(self.chunk_faces)
+        
+        # Area-weighted normals of the vertices each tile contains; the
+        # halo completes their one-rings
+        normals = self.scratch('normals', (num_vertices, 3), np.float32)
+        with span('tiles.normals'):
+            for tile in self.tiles:
+                if tile.num_faces == 0:
+                    continue
+                face_ids, owned, faces, vertex_ids, vertices, keep = self._welded_tile(tile, target, remove_slivers)
+                faces = faces[keep]
+                flipped = flip[face_ids[keep]]
+                faces[flipped] = faces[flipped][:, [0, 2, 1]]
+                own = self.tiles.owner(vertices) == tile.index
+                normals[vertex_ids[own]] = compute_vertex_normals(vertices, faces)[own]
+        
+        with span('tiles.compact'):
+            mesh = self._compact(target, kept, used, flip, normals)
+        size = save_mesh(output_path, mesh)
+        return {
+            'vertices': mesh.num_vertices,
+            'faces': mesh.num_faces,
+            'removed_faces': num_faces - mesh.num_faces,
+            'flipped_faces': self._count(flip),
+            'bytes': size,
+        }
+    
+    def _compact(
+        self,
+        target: np.ndarray,
+        kept: np.ndarray,
+        used: np.ndarray,
+        flip: np.ndarray,
+        normals: np.ndarray
+    ) -> Mesh:
+        """Output mesh of the used vertices and kept faces (in scratch files)"""
+        chunk = self.chunk_faces
+        num_vertices = self._count(used)
+        new_index = self.scratch('new_index', (len(used),), np.int64)
+        out_vertices = self.scratch('out_vertices', (num_vertices, 3), np.float32)
+        out_normals = self.scratch('out_normals', (num_vertices, 3), np.float32)
+        has_uvs = self.mesh.has_uvs
+        out_uvs = self.scratch('out_uvs', (num_vertices if has_uvs else 0, 2), np.float32)
+        
+        offset = 0
+        for start, stop in stream_rows(len(used), chunk):
+            mask = np.array(used[start:stop])
+            count = int(np.count_nonzero(mask))
+            new_index[start:stop] = offset + np.cumsum(mask) - 1
+            out_vertices[offset:offset + count] = self.mesh.vertices[start:stop][mask]
+            out_normals[offset:offset + count] = normals[start:stop][mask]
+            if has_uvs:
+                out_uvs[offset:offset + count] = self.mesh.uvs[start:stop][mask]
+            offset += count
+        
+        out_faces = self.scratch('out_faces', (self._count(kept), 3), np.uint32)
+        offset = 0
+        for start, stop in stream_rows(len(kept), chunk):
+            mask = np.array(kept[start:stop])
+            faces = new_index[target[self.mesh.faces[start:stop][mask]]]
+            flipped = flip[start:stop][mask]
+            faces[flipped] = faces[flipped][:, [0, 2, 1]]
+            out_faces[offset:offset + len(faces)] = faces
+            offset += len(faces)
+        
+        return Mesh(out_vertices, out_faces, out_normals, out_uvs)
+
+
+def _load(tile: Tile) -> Tuple[np.ndarray, ...]:
+    """Shards of one tile, read into memory"""
+    return tuple(np.array(tile.shard(name)) for name in ('face_ids', 'owned', 'faces', 'vertex_ids', 'vertices'))
+
+
+class TiledDiagnostics(GeometryDiagnostics):
+    """GeometryDiagnostics whose whole-mesh statistics come from the tiles"""
+    
+    def __init__(self, tiled: TiledMesh):
+        super().__init__(tiled.mesh)
+        self.tiled = tiled
+    
+    def _compute_mesh_stats(self) -> Dict[str, Any]:
+        stats, self._orientation = self.tiled.mesh_stats()
+        return stats
+    
+    def _check_normals(self) -> None:
+        # The orientation summary is computed together with the mesh stats
+        if len(self.faces):
+            self.mesh_stats
+        super()._check_normals()
+    
+    def _check_uvs(self) -> None:
+        # UV islands and overlaps need whole shells in memory
+        if len(self.uvs):
+            logger.info("UV checks are skipped out of core")
+
+
+def _work_dir(work_dir: Optional[str]) -> str:
+    """New scratch directory (under Config 'temp_dir' unless given)"""
+    if work_dir is not None:
+        return work_dir
+    root = ensure_directory(str(Path(Config().get('temp_dir')) / 'tiles'))
+    return tempfile.mkdtemp(prefix='tiled_', dir=root)
+
+
+def _open(mesh_path: str, memory_mb: Optional[float], tolerance: float, work_dir: Optional[str]) -> TiledMesh:
+    """Memory-map and tile a mesh file"""
+    if Path(mesh_path).suffix.lower() not in TILED_INPUTS:
+        raise ValueError(f"Out-of-core mode reads {', '.join(TILED_INPUTS)} files, not {Path(mesh_path).suffix}")
+    if memory_mb is None:
+        memory_mb = Config().get('out_of_core_memory_mb')
+    return TiledMesh(load_mesh(mesh_path), _work_dir(work_dir), memory_mb, tolerance)
+
+
+def diagnose_tiled(
+    mesh_path: str,
+    memory_mb: Optional[float] = None,
+    work_dir: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Out-of-core counterpart of diagnose.index.diagnose_mesh
+    
+    Args:
+        mesh_path: Input mesh (.glb or .tmsh)
+        memory_mb: Working memory budget (defaults to Config
+            'out_of_core_memory_mb')
+        work_dir: Scratch directory (default: a new one under Config
+            'temp_dir', deleted afterwards)
+    
+    Returns:
+        Diagnosis report (UV checks are skipped)
+    """
+    try:
+        tiled = _open(mesh_path, memory_mb, 0.0, work_dir)
+    except (OSError, ValueError) as e:
+        logger.error(f"Failed to load mesh: {e}")
+        return {
+            'status': 'error',
+            'message': str(e)
+        }
+    
+    try:
+        report = TiledDiagnostics(tiled).analyze()
+    finally:
+        tiled.cleanup()
+    report['status'] = 'success'
+    report['tiles'] = len(tiled.tiles)
+    return report
+
+
+def repair_tiled(
+    mesh_path: str,
+    output_path: str,
+    aggressive: bool = False,
+    tolerance: Optional[float] = None,
+    memory_mb: Optional[float] = None,
+    work_dir: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Out-of-core counterpart of repair.index.repair_mesh
+    
+    Args:
+        mesh_path: Input mesh (.glb or .tmsh)
+        output_path: Output path (.glb or .tmsh)
+        aggressive: Also remove sliver faces (hole filling and normal
+            smoothing are not run out of core)
+        tolerance: Vertex merge distance (defaults to Config 'tolerance')
+        memory_mb: Working memory budget (defaults to Config
+            'out_of_core_memory_mb')
+        work_dir: Scratch directory (default: a new one under Config
+            'temp_dir', deleted afterwards)
+    
+    Returns:
+        Repair report
+    """
+    if tolerance is None:
+        tolerance = Config().get('tolerance')
+    try:
+        if Path(output_path).suffix.lower() not in STREAM_FORMATS:
+            raise ValueError(f"Out-of-core mode writes {', '.join(STREAM_FORMATS)} files")
+        tiled = _open(mesh_path, memory_mb, tolerance, work_dir)
+    except (OSError, ValueError) as e:
+        logger.error(f"Failed to load mesh: {e}")
+        return {
+            'status': 'error',
+            'message': str(e)
+        }
+    
+    if aggressive:
+        logger.warning("Hole filling and normal smoothing are not run out of core")
+    mesh = tiled.mesh
+    before = {
+        'vertices': mesh.num_vertices,
+        'faces': mesh.num_faces,
+        'has_normals': len(mesh.normals) > 0,
+        'has_uvs': len(mesh.uvs) > 0
+    }
+    try:
+        counts = tiled.repair(output_path, remove_slivers=aggressive)
+    finally:
+        tiled.cleanup()
+    logger.info(
+        f"Tiled repair: {counts['removed_faces']} faces removed, {counts['flipped_faces']} flipped "
+        f"({len(tiled.tiles)} tiles)"
+    )
+    
+    return {
+        'status': 'success',
+        'repairs': ['remove_duplicates', 'remove_degenerate', 'unify_winding', 'fix_normals'],
+        'skipped': ['fill_holes', 'smooth_normals'] if aggressive else [],
+        'stats': {
+            'before': before,
+            'after': {
+                'vertices': counts['vertices'],
+                'faces': counts['faces'],
+                'has_normals': True,
+                'has_uvs': before['has_uvs']
+            }
+        },
+        'tiles': len(tiled.tiles),
+        'output': output_path
+    }
@@ -0,0 +1,331 @@
+"""Spatial Tiling
+
+Partitions a mesh into spatial tiles stored on disk, so that it can be
+processed one tile at a time (see tiles.index):
+- Faces are streamed in fixed-size chunks; apart from a coarse histogram
+  grid nothing proportional to the mesh is held in memory
+- Tiles are boxes of that grid, split k-d style at the median face until
+  each owns at most max_faces faces
+- A face is owned by the tile containing its centroid, a vertex by the
+  tile containing its position
+- Every tile also carries a halo: all faces whose bounding box comes
+  within `halo` of the tile box. With the halo at least as wide as the
+  largest face (plus the weld tolerance), the edge neighbours of an owned
+  face, every face that can touch or cross it and every face around an
+  owned vertex are part of the tile
+- Tile faces are sorted by global face ID and written as raw shards
+  (face IDs, owned flags, local faces, vertex IDs, positions) that are
+  read back with np.memmap
+"""
+
+import shutil
+import logging
+from pathlib import Path
+from typing import Iterator, List, Tuple
+
+import numpy as np
+
+from utils.metrics import span
+
+logger = logging.getLogger(__name__)
+
+# Histogram grid: cells along the longest axis, and at most in total
+GRID_AXIS_CELLS = 256
+GRID_MAX_CELLS = 1 << 21
+
+# Cell width over the widest face box plus halos (keeps rounding from
+# letting a box span three cells)
+CELL_SLACK = 1.01
+
+# Shards of a tile: name -> (dtype, columns)
+SHARDS = {
+    'face_ids': (np.int64, 1),
+    'owned': (np.bool_, 1),
+    'faces': (np.uint32, 3),
+    'vertex_ids': (np.int64, 1),
+    'vertices': (np.float32, 3),
+}
+
+
+def stream_rows(num_rows: int, chunk_rows: int) -> Iterator[Tuple[int, int]]:
+    """[start, stop) ranges of at most chunk_rows rows"""
+    for start in range(0, num_rows, chunk_rows):
+        yield start, min(start + chunk_rows, num_rows)
+
+
+def vertex_bounds(vertices: np.ndarray, chunk_rows: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Bounding box of all vertices, read chunk by chunk"""
+    lo = np.full(3, np.inf)
+    hi = np.full(3, -np.inf)
+    for start, stop in stream_rows(len(vertices), chunk_rows):
+        chunk = vertices[start:stop]
+        lo = np.minimum(lo, chunk.min(axis=0))
+        hi = np.maximum(hi, chunk.max(axis=0))
+    return lo, hi
+
+
+def _split_boxes(counts: np.ndarray, max_faces: int) -> List[Tuple[np.ndarray, np.ndarray]]:
+    """
+    Split the grid into boxes holding at most max_faces faces
+    
+    Boxes are cut across their longest axis at the median face; single
+    cells are never split, so a box can exceed max_faces when one cell
+    does.
+    
+    Returns:
+        (lo, hi) cell ranges of the boxes ([lo, hi) per axis)
+    """
+    boxes = []
+    stack = [(np.zeros(3, dtype=np.int64), np.array(counts.shape, dtype=np.int64))]
+    while stack:
+        lo, hi = stack.pop()
+        block = counts[lo[0]:hi[0], lo[1]:hi[1], lo[2]:hi[2]]
+        total = int(block.sum())
+        size = hi - lo
+        if total <= max_faces or (size == 1).all():
+            boxes.append((lo, hi))
+            continue
+        
+        axis = int(np.argmax(size))
+        marginal = block.sum(axis=tuple(a for a in range(3) if a != axis))
+        cut = int(np.searchsorted(np.cumsum(marginal), total / 2)) + 1
+        cut = min(max(cut, 1), int(size[axis]) - 1)
+        mid_hi = hi.copy()
+        mid_hi[axis] = lo[axis] + cut
+        mid_lo = lo.copy()
+        mid_lo[axis] = lo[axis] + cut
+        stack.append((mid_lo, hi))
+        stack.append((lo, mid_hi))
+    return boxes
+
+
+class Tile:
+    """One tile of a TileSet"""
+    
+    def __init__(
+        self,
+        index: int,
+        directory: Path,
+        lo: np.ndarray,
+        hi: np.ndarray,
+        num_faces: int = 0,
+        num_owned: int = 0,
+        num_vertices: int = 0
+    ):
+        """
+        Args:
+            index: Tile number
+            directory: Directory holding the shards
+            lo, hi: Tile box (world coordinates)
+            num_faces: Owned and halo faces
+            num_owned: Owned faces
+            num_vertices: Vertices of all tile faces
+        """
+        self.index = index
+        self.directory = Path(directory)
+        self.lo = np.asarray(lo, dtype=np.float64)
+        self.hi = np.asarray(hi, dtype=np.float64)
+        self.num_faces = num_faces
+        self.num_owned = num_owned
+        self.num_vertices = num_vertices
+    
+    def path(self, name: str) -> Path:
+        return self.directory / f"{self.index:05d}.{name}"
+    
+    def shard(self, name: str) -> np.ndarray:
+        """Read-only memory map of one shard (see SHARDS)"""
+        dtype, columns = SHARDS[name]
+        rows = self.num_vertices if name in ('vertex_ids', 'vertices') else self.num_faces
+        shape = (rows, columns) if columns > 1 else (rows,)
+        if rows == 0:
+            return np.empty(shape, dtype=dtype)
+        return np.memmap(self.path(name), dtype=dtype, mode='r', shape=shape)
+
+
+class TileSet:
+    """Spatial tiles of one mesh, with their shards on disk"""
+    
+    def __init__(
+        self,
+        directory: Path,
+        bounds: Tuple[np.ndarray, np.ndarray],
+        cell: float,
+        lookup: np.ndarray,
+        halo: float,
+        tiles: List[Tile]
+    ):
+        """
+        Args:
+            directory: Shard directory
+            bounds: Bounding box of all vertices (the grid starts at its
+                lower corner)
+            cell: Grid cell edge length
+            lookup: Tile number of every grid cell
+            halo: Halo width
+            tiles: The tiles, in tile number order
+        """
+        self.directory = Path(directory)
+        self.bounds = bounds
+        self.origin = bounds[0]
+        self.cell = cell
+        self.lookup = lookup
+        self.halo = halo
+        self.tiles = tiles
+    
+    def __len__(self) -> int:
+        return len(self.tiles)
+    
+    def __iter__(self) -> Iterator[Tile]:
+        return iter(self.tiles)
+    
+    def cells(self, points: np.ndarray) -> np.ndarray:
+        """Grid cell of each point (clamped to the grid)"""
+        cells = np.floor((points - self.origin) / self.cell).astype(np.int64)
+        return np.clip(cells, 0, np.array(self.lookup.shape) - 1)
+    
+    def owner(self, points: np.ndarray) -> np.ndarray:
+        """Tile owning each point"""
+        cells = self.cells(points)
+        return self.lookup[cells[:, 0], cells[:, 1], cells[:, 2]]
+    
+    def _members(self, lo: np.ndarray, hi: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Tiles whose halo reaches each face box
+        
+        Returns:
+            (face, tile) pairs, each pair once, in face order
+        """
+        cell_lo = self.cells(lo - self.halo)
+        cell_hi = self.cells(hi + self.halo)
+        
+        # Cells are wider than the largest expanded box, which therefore
+        # spans at most two cells per axis and touches tiles at its corners
+        corners = np.empty((len(lo), 8), dtype=self.lookup.dtype)
+        for bits in range(8):
+            c = [cell_hi[:, axis] if bits >> axis & 1 else cell_lo[:, axis] for axis in range(3)]
+            corners[:, bits] = self.lookup[c[0], c[1], c[2]]
+        corners.sort(axis=1)
+        fresh = np.ones(corners.shape, dtype=bool)
+        fresh[:, 1:] = corners[:, 1:] != corners[:, :-1]
+        return np.repeat(np.arange(len(lo)), fresh.sum(axis=1)), corners[fresh]
+    
+    @classmethod
+    def build(
+        cls,
+        vertices: np.ndarray,
+        faces: np.ndarray,
+        directory: str,
+        max_faces: int,
+        chunk_faces: int,
+        margin: float = 0.0
+    ) -> 'TileSet':
+        """
+        Partition a mesh and write the tile shards
+        
+        Args:
+            vertices: Vx3 positions (typically memory-mapped)
+            faces: Fx3 vertex indices (typically memory-mapped)
+            directory: Empty or new directory for the shards
+            max_faces: Owned faces per tile to aim for
+            chunk_faces: Faces read per streaming step
+            margin: Added to the halo width (e.g. the weld tolerance)
+        
+        Returns:
+            TileSet with all shards written
+        """
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        num_faces = len(faces)
+        
+        with span('tiles.grid'):
+            lo, hi = vertex_bounds(vertices, chunk_faces)
+            if not np.isfinite(lo).all():
+                lo = hi = np.zeros(3)
+            largest = 0.0
+            for start, stop in stream_rows(num_faces, chunk_faces):
+                corners = vertices[faces[start:stop]]
+                largest = max(largest, float((corners.max(axis=1) - corners.min(axis=1)).max()))
+            halo = largest + margin
+            
+            # Cells hold the largest face with its halo on both sides
+            extent = hi - lo
+            cell = max(
+                float(extent.max()) / GRID_AXIS_CELLS,
+                (largest + 2 * halo) * CELL_SLACK,
+                np.finfo(np.float32).tiny
+            )
+            shape = np.maximum(np.ceil(extent / cell), 1).astype(np.int64)
+            while int(np.prod(shape)) > GRID_MAX_CELLS:
+                cell *= 1.25
+                shape = np.maximum(np.ceil(extent / cell), 1).astype(np.int64)
+            
+            # Owned faces per cell
+            grid = cls(directory, (lo, hi), cell, np.zeros(tuple(shape), dtype=np.int32), halo, [])
+            counts = np.zeros(int(np.prod(shape)), dtype=np.int64)
+            for start, stop in stream_rows(num_faces, chunk_faces):
+                corners = vertices[faces[start:stop]]
+                cells = grid.cells(corners.mean(axis=1, dtype=np.float64))
+                counts += np.bincount(np.ravel_multi_index(cells.T, tuple(shape)), minlength=len(counts))
+            
+            boxes = _split_boxes(counts.reshape(tuple(shape)), max(1, int(max_faces)))
+            lookup = np.empty(tuple(shape), dtype=np.int32)
+            tiles = []
+            for index, (box_lo, box_hi) in enumerate(boxes):
+                lookup[box_lo[0]:box_hi[0], box_lo[1]:box_hi[1], box_lo[2]:box_hi[2]] = index
+                tiles.append(Tile(index, directory, lo + box_lo * cell, lo + box_hi * cell))
+            tileset = cls(directory, (lo, hi), cell, lookup, halo, tiles)
+        
+        with span('tiles.assign'):
+            tileset._assign(vertices, faces, chunk_faces)
+        with span('tiles.shards'):
+            for tile in tileset.tiles:
+                tileset._write_shards(tile, vertices, faces)
+        
+        halo_faces = sum(t.num_faces - t.num_owned for t in tiles)
+        logger.info(
+            f"Tiled {num_faces:,} faces into {len(tiles)} tiles "
+            f"(halo {tileset.halo:.4g}, {halo_faces:,} halo faces)"
+        )
+        return tileset
+    
+    def _assign(self, vertices: np.ndarray, faces: np.ndarray, chunk_faces: int) -> None:
+        """Append the (face ID, owned) members of every tile to its member file"""
+        for start, stop in stream_rows(len(faces), chunk_faces):
+            corners = vertices[faces[start:stop]]
+            owner = self.owner(corners.mean(axis=1, dtype=np.float64))
+            face, tile = self._members(corners.min(axis=1), corners.max(axis=1))
+            
+            # Member codes: face ID * 2 + owned, ascending within each tile
+            codes = (face + start) * 2 + (tile == owner[face])
+            order = np.argsort(tile, kind='stable')
+            tile = tile[order]
+            codes = codes[order]
+            starts = np.flatnonzero(np.diff(tile, prepend=-1))
+            stops = np.append(starts[1:], len(tile))
+            for first, stop in zip(starts.tolist(), stops.tolist()):
+                with open(self.tiles[tile[first]].path('members'), 'ab') as f:
+                    codes[first:stop].tofile(f)
+    
+    def _write_shards(self, tile: Tile, vertices: np.ndarray, faces: np.ndarray) -> None:
+        """Gather one tile's faces and vertices into its shards"""
+        members = tile.path('members')
+        if not members.exists():
+            return
+        codes = np.fromfile(members, dtype=np.int64)
+        members.unlink()
+        face_ids = codes >> 1
+        owned = (codes & 1).astype(bool)
+        vertex_ids, local = np.unique(faces[face_ids].ravel(), return_inverse=True)
+        
+        tile.num_faces = len(face_ids)
+        tile.num_owned = int(np.count_nonzero(owned))
+        tile.num_vertices = len(vertex_ids)
+        face_ids.tofile(tile.path('face_ids'))
+        owned.tofile(tile.path('owned'))
+        local.astype(np.uint32).reshape(-1, 3).tofile(tile.path('faces'))
+        vertex_ids.astype(np.int64).tofile(tile.path('vertex_ids'))
+        np.ascontiguousarray(vertices[vertex_ids], dtype=np.float32).tofile(tile.path('vertices'))
+    
+    def remove(self) -> None:
+        """Delete the shard directory"""
+        shutil.rmtree(self.directory, ignore_errors=True)
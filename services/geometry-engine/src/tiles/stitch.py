@@ -0,0 +1,278 @@
+"""Shell Orientation Across Tiles
+
+Whole-mesh shell orientation (see utils.orientation.orient_faces) built
+from per-tile pieces:
+- Each tile labels and orients the shell fragments formed by its owned
+  faces and their halo neighbours, through the manifold edges attributed
+  to it (edges whose lowest face ID it owns), so every edge is used by
+  exactly one tile
+- Fragments that reach no other tile are whole shells and are finished in
+  the tile; the others become seam nodes
+- A halo face links its fragment to the fragment of the tile owning the
+  face. After the last tile the nodes are merged with their relative
+  parities; a link contradicting them makes the shell non-orientable
+- Shells are rooted at their lowest face ID like in orient_faces, so the
+  flips and the summary match an in-memory run over the whole mesh
+"""
+
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from utils.topology import EdgeTable, connected_components, shell_labels
+from utils.orientation import winding_conflicts, signed_volumes, propagate_parity
+from tiles.partition import stream_rows
+
+# Per-node columns kept for the seam fragments
+_NODE_COLUMNS = ('size', 'flips', 'volume', 'open', 'inconsistent', 'non_orientable', 'min_face', 'min_parity')
+
+
+def first_faces(edge_table: EdgeTable, num_faces: int) -> np.ndarray:
+    """Lowest face index using each edge"""
+    first = np.empty(len(edge_table), dtype=np.int64)
+    # Repeated fancy assignment keeps the last value written
+    first[edge_table.face_edges.ravel()[::-1]] = np.repeat(np.arange(num_faces), 3)[::-1]
+    return first
+
+
+def link_parity(num_nodes: int, a: np.ndarray, b: np.ndarray, relative: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Merge nodes joined by parity links
+    
+    Args:
+        num_nodes: Number of nodes
+        a, b: Linked nodes
+        relative: Parity of b relative to a for each link
+    
+    Returns:
+        (label, parity): per-node component label (smallest node index)
+        and parity relative to that node
+    """
+    label = connected_components(num_nodes, a, b)
+    parity = np.zeros(num_nodes, dtype=bool)
+    known = label == np.arange(num_nodes)
+    # Breadth-first over the links; the node graph spans a few tiles only
+    while True:
+        forward = known[a] & ~known[b]
+        backward = known[b] & ~known[a]
+        if not (forward.any() or backward.any()):
+            break
+        parity[b[forward]] = parity[a[forward]] ^ relative[forward]
+        known[b[forward]] = True
+        backward &= ~known[a]
+        parity[a[backward]] = parity[b[backward]] ^ relative[backward]
+        known[a[backward]] = True
+    return label, parity
+
+
+class OrientationStitch:
+    """Shell orientation of a tiled mesh, accumulated tile by tile"""
+    
+    def __init__(
+        self,
+        face_node: np.ndarray,
+        face_parity: np.ndarray,
+        links_path: Path,
+        center: np.ndarray,
+        flip: Optional[np.ndarray] = None
+    ):
+        """
+        Args:
+            face_node: Zeroed per-face scratch (int64): 1 + seam node of
+                each owned face in a seam fragment
+            face_parity: Per-face scratch (bool): parity within the fragment
+            links_path: Scratch file for the halo links
+            center: Fixed centre for the signed volumes
+            flip: Optional per-face scratch (bool) receiving the faces to flip
+        """
+        self.face_node = face_node
+        self.face_parity = face_parity
+        self.links_path = Path(links_path)
+        self.center = center
+        self.flip = flip
+        self.nodes = {name: [] for name in _NODE_COLUMNS}
+        self.num_nodes = 0
+        self.summary = {
+            'shells': 0,
+            'closed_shells': 0,
+            'winding_conflicts': 0,
+            'inconsistent_shells': 0,
+            'non_orientable_shells': 0,
+            'inverted_shells': 0,
+        }
+    
+    def _count_shells(
+        self,
+        is_open: np.ndarray,
+        inconsistent: np.ndarray,
+        non_orientable: np.ndarray,
+        volume: np.ndarray
+    ) -> None:
+        """Add finished shells to the summary"""
+        closed = ~is_open
+        self.summary['shells'] += len(is_open)
+        self.summary['closed_shells'] += int(np.count_nonzero(closed))
+        self.summary['inconsistent_shells'] += int(np.count_nonzero(inconsistent))
+        self.summary['non_orientable_shells'] += int(np.count_nonzero(non_orientable))
+        self.summary['inverted_shells'] += int(np.count_nonzero(closed & ~inconsistent & (volume < 0)))
+    
+    def add_tile(
+        self,
+        vertices: np.ndarray,
+        faces: np.ndarray,
+        owned: np.ndarray,
+        face_ids: np.ndarray,
+        edge_table: EdgeTable
+    ) -> None:
+        """
+        Orient the fragments of one tile
+        
+        Args:
+            vertices: Tile vertex positions
+            faces: Tile faces (local vertex indices), in face ID order
+            owned: Faces owned by the tile
+            face_ids: Global face ID of every tile face
+            edge_table: Edge table of the tile faces
+        """
+        num_faces = len(faces)
+        if num_faces == 0:
+            return
+        counts = edge_table.counts
+        attributed = owned[first_faces(edge_table, num_faces)]
+        local = EdgeTable(edge_table.keys, np.where(attributed, counts, 0), edge_table.face_edges)
+        
+        first, second = local.manifold_slots()
+        f1 = first // 3
+        f2 = second // 3
+        conflict = winding_conflicts(faces, local)
+        label = shell_labels(num_faces, local)
+        roots = np.flatnonzero(label == np.arange(num_faces))
+        parity = propagate_parity(num_faces, roots, conflict, local)
+        residual = conflict ^ parity[f1] ^ parity[f2]
+        self.summary['winding_conflicts'] += int(np.count_nonzero(conflict))
+        
+        # Per-fragment sums over the owned faces (halo faces are counted
+        # by their own tile)
+        is_open_face = (counts[edge_table.face_edges] != 2).any(axis=1)
+        volume = signed_volumes(vertices, faces, self.center)
+        size = np.bincount(label, weights=owned, minlength=num_faces)
+        flips = np.bincount(label, weights=owned & parity, minlength=num_faces)
+        shell_volume = np.bincount(label, weights=np.where(owned, np.where(parity, -volume, volume), 0),
+                                   minlength=num_faces)
+        is_open = np.bincount(label, weights=owned & is_open_face, minlength=num_faces) > 0
+        inconsistent = np.zeros(num_faces, dtype=bool)
+        inconsistent[label[f1[conflict]]] = True
+        non_orientable = np.zeros(num_faces, dtype=bool)
+        non_orientable[label[f1[residual]]] = True
+        
+        # Fragments continue in other tiles through halo faces, and through
+        # manifold edges of owned faces that another tile attributes
+        linked_halo = ~owned & (np.bincount(label, minlength=num_faces)[label] > 1)
+        external = ((counts == 2) & ~attributed)[edge_table.face_edges].any(axis=1) & owned
+        seam = np.zeros(num_faces, dtype=bool)
+        seam[label[linked_halo | external]] = True
+        
+        present = roots[size[roots] > 0]
+        complete = present[~seam[present]]
+        seams = present[seam[present]]
+        
+        # Whole shells: the root is their lowest owned face
+        turn = np.zeros(num_faces, dtype=bool)
+        turn[complete] = np.where(
+            is_open[complete], flips[complete] * 2 > size[complete], shell_volume[complete] < 0
+        )
+        self._count_shells(is_open[complete], inconsistent[complete], non_orientable[complete],
+                           shell_volume[complete])
+        if self.flip is not None:
+            whole = owned & ~seam[label]
+            self.flip[face_ids[whole]] = (parity ^ turn[label])[whole]
+        
+        if len(seams) == 0:
+            return
+        node = np.full(num_faces, -1, dtype=np.int64)
+        node[seams] = self.num_nodes + np.arange(len(seams))
+        self.num_nodes += len(seams)
+        
+        # Lowest owned face of every fragment (tile faces are in face ID order)
+        owned_index = np.flatnonzero(owned)
+        min_face = np.zeros(num_faces, dtype=np.int64)
+        min_face[label[owned_index][::-1]] = owned_index[::-1]
+        columns = {
+            'size': size, 'flips': flips, 'volume': shell_volume, 'open': is_open,
+            'inconsistent': inconsistent, 'non_orientable': non_orientable,
+            'min_face': face_ids[min_face], 'min_parity': parity[min_face],
+        }
+        for name in _NODE_COLUMNS:
+            self.nodes[name].append(columns[name][seams])
+        
+        members = owned & seam[label]
+        self.face_node[face_ids[members]] = node[label[members]] + 1
+        self.face_parity[face_ids[members]] = parity[members]
+        links = np.column_stack([node[label[linked_halo]], face_ids[linked_halo], parity[linked_halo]])
+        with open(self.links_path, 'ab') as f:
+            links.astype(np.int64).tofile(f)
+    
+    def _links(self, chunk_rows: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Distinct (node, node, relative parity) links, read chunk by chunk"""
+        found = [np.empty((0, 3), dtype=np.int64)]
+        if self.links_path.exists() and self.links_path.stat().st_size:
+            stored = np.memmap(self.links_path, dtype=np.int64, mode='r').reshape(-1, 3)
+            for start, stop in stream_rows(len(stored), chunk_rows):
+                chunk = np.array(stored[start:stop])
+                other = self.face_node[chunk[:, 1]] - 1
+                relative = chunk[:, 2].astype(bool) ^ self.face_parity[chunk[:, 1]]
+                links = np.column_stack([chunk[:, 0], other, relative])
+                found.append(np.unique(links[other >= 0], axis=0))
+        links = np.unique(np.concatenate(found), axis=0)
+        return links[:, 0], links[:, 1], links[:, 2].astype(bool)
+    
+    def finish(self, chunk_rows: int) -> Dict[str, int]:
+        """
+        Merge the seam nodes (writing the remaining flips, if wanted)
+        
+        Args:
+            chunk_rows: Rows of the per-face scratch read per step
+        
+        Returns:
+            Summary with the keys of orient_faces
+        """
+        if self.num_nodes == 0:
+            return dict(self.summary)
+        nodes = {name: np.concatenate(values) for name, values in self.nodes.items()}
+        a, b, relative = self._links(chunk_rows)
+        label, parity = link_parity(self.num_nodes, a, b, relative)
+        
+        # Shell totals relative to the root node
+        size = np.bincount(label, weights=nodes['size'], minlength=self.num_nodes)
+        flips = np.bincount(
+            label, weights=np.where(parity, nodes['size'] - nodes['flips'], nodes['flips']),
+            minlength=self.num_nodes
+        )
+        volume = np.bincount(
+            label, weights=np.where(parity, -nodes['volume'], nodes['volume']), minlength=self.num_nodes
+        )
+        is_open = np.bincount(label, weights=nodes['open'], minlength=self.num_nodes) > 0
+        inconsistent = np.bincount(label, weights=nodes['inconsistent'], minlength=self.num_nodes) > 0
+        non_orientable = np.bincount(label, weights=nodes['non_orientable'], minlength=self.num_nodes) > 0
+        non_orientable[label[a[parity[a] ^ parity[b] ^ relative]]] = True
+        
+        # Re-root every shell at its lowest face
+        order = np.lexsort((nodes['min_face'], label))
+        first = order[np.flatnonzero(np.diff(label[order], prepend=-1))]
+        reroot = np.zeros(self.num_nodes, dtype=bool)
+        reroot[label[first]] = nodes['min_parity'][first] ^ parity[first]
+        flips = np.where(reroot, size - flips, flips)
+        volume = np.where(reroot, -volume, volume)
+        
+        shells = label[first]
+        turn = np.where(is_open, flips * 2 > size, volume < 0)
+        self._count_shells(is_open[shells], inconsistent[shells], non_orientable[shells], volume[shells])
+        
+        if self.flip is not None:
+            node_flip = parity ^ reroot[label] ^ turn[label]
+            for start, stop in stream_rows(len(self.face_node), chunk_rows):
+                chunk = np.array(self.face_node[start:stop])
+                members = np.flatnonzero(chunk)
+                self.flip[start + members] = self.face_parity[start + members] ^ node_flip[chunk[members] - 1]
+        return dict(self.summary)
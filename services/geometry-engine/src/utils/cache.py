@@ -0,0 +1,390 @@
+"""Result Cache
+
+Content-addressed cache for diagnose / repair / convert results:
+- Keys combine the input file's content hash, the operation and its options
+- In-process memory tier (LRU by entry count) in front of a disk tier
+- Disk tier lives under <temp_dir>/cache, bounded in bytes with LRU eviction
+  (by mtime); its size is kept in a usage file shared by all worker
+  processes and updated under a file lock, and eviction re-scans the
+  directory under the same lock
+- Output files (repaired / converted meshes) are stored as artifacts and
+  copied back to the requested output path on a hit
+"""
+
+import os
+import json
+import shutil
+import hashlib
+import logging
+import tempfile
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Any, Iterator, List, Optional, Callable, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows: processes then only share the usage file
+    fcntl = None
+
+from utils.helper import Config, get_file_hash, ensure_directory
+from utils.metrics import span
+
+logger = logging.getLogger(__name__)
+
+# Bump when result formats change so stale entries are never served
+CACHE_VERSION = 8
+
+# Eviction frees the disk tier down to this fraction of its limit, so a
+# full cache is not re-scanned on every store
+EVICT_TO_FRACTION = 0.9
+
+# Content hashes memoized by file_hash (least recently used are dropped)
+MAX_FILE_HASHES = 4096
+
+# Bytes in the disk tier, shared by all processes (and their lock file);
+# entries live in the shard directories next to it
+_USAGE_FILE = 'usage'
+
+
+def is_successful(result: Dict[str, Any]) -> bool:
+    """Only successful results are worth caching"""
+    return result.get('status') == 'success' or result.get('success') is True
+
+
+class ResultCache:
+    """Two-tier (memory + disk) content-addressed result cache"""
+    
+    def __init__(
+        self,
+        cache_dir: str,
+        max_disk_bytes: int = 2048 * 1024 * 1024,
+        max_memory_entries: int = 256
+    ):
+        """
+        Initialize cache
+        
+        Args:
+            cache_dir: Directory for the disk tier
+            max_disk_bytes: Disk tier size limit (results + artifacts)
+            max_memory_entries: Number of results kept in memory
+        """
+        self.cache_dir = ensure_directory(cache_dir)
+        self.max_disk_bytes = max_disk_bytes
+        self.max_memory_entries = max_memory_entries
+        
+        self._memory = OrderedDict()
+        self._file_hashes = OrderedDict()  # (path, size, mtime) -> content hash
+        self._lock = threading.Lock()
+        self._usage_fd = None
+        self._usage_pid = None
+    
+    @classmethod
+    def from_config(cls, config: Config) -> Optional['ResultCache']:
+        """Create the cache described by config, or None if caching is disabled"""
+        if not config.get('cache_enabled', False):
+            return None
+        
+        cache_dir = config.get('cache_dir') or os.path.join(config.get('temp_dir'), 'cache')
+        return cls(
+            cache_dir,
+            max_disk_bytes=int(float(config.get('cache_max_size_mb', 2048)) * 1024 * 1024),
+            max_memory_entries=int(config.get('cache_memory_entries', 256))
+        )
+    
+    # ===== Keys =====
+    
+    def file_hash(self, filepath: str) -> str:
+        """Content hash of a file, memoized on (path, size, mtime)"""
+        stat = os.stat(filepath)
+        memo_key = (os.path.abspath(filepath), stat.st_size, stat.st_mtime_ns)
+        with self._lock:
+            content_hash = self._file_hashes.get(memo_key)
+            if content_hash is not None:
+                self._file_hashes.move_to_end(memo_key)
+                return content_hash
+        
+        content_hash = get_file_hash(filepath)
+        with self._lock:
+            self._file_hashes[memo_key] = content_hash
+            while len(self._file_hashes) > MAX_FILE_HASHES:
+                self._file_hashes.popitem(last=False)
+        return content_hash
+    
+    def make_key(
+        self,
+        content_hash: str,
+        operation: str,
+        options: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """Cache key for an operation on content with given options"""
+        payload = json.dumps(
+            {
+                'version': CACHE_VERSION,
+                'hash': content_hash,
+                'operation': operation,
+                'options': options or {},
+            },
+            sort_keys=True,
+            default=str
+        )
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+    
+    # ===== Lookup / store =====
+    
+    def get(self, key: str) -> Optional[Tuple[Dict[str, Any], Optional[Path]]]:
+        """
+        Look up a cached result
+        
+        Returns:
+            (result, artifact_path) or None on a miss
+        """
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+                result, artifact = entry
+                if artifact is None or artifact.exists():
+                    self._touch(key)
+                    return dict(result), artifact
+                del self._memory[key]
+        
+        result_path, artifact_path = self._paths(key)
+        try:
+            with open(result_path, 'r') as f:
+                stored = json.load(f)
+        except (OSError, ValueError):
+            return None
+        
+        artifact = artifact_path if stored.get('has_artifact') else None
+        if artifact is not None and not artifact.exists():
+            return None
+        
+        with self._lock:
+            self._remember(key, stored['result'], artifact)
+            self._touch(key)
+        return dict(stored['result']), artifact
+    
+    def put(
+        self,
+        key: str,
+        result: Dict[str, Any],
+        artifact: Optional[str] = None
+    ) -> None:
+        """
+        Store a result (and optionally a copy of its output file)
+        
+        Writes go to temporary files that are atomically renamed, so
+        concurrent readers in other processes never see partial entries.
+        """
+        result_path, artifact_path = self._paths(key)
+        ensure_directory(result_path.parent)
+        
+        try:
+            size = 0
+            if artifact is not None:
+                size += self._atomic_copy(artifact, artifact_path)
+            
+            payload = json.dumps({'result': result, 'has_artifact': artifact is not None}, default=str)
+            fd, tmp = tempfile.mkstemp(dir=result_path.parent, suffix='.tmp')
+            with os.fdopen(fd, 'w') as f:
+                f.write(payload)
+            os.replace(tmp, result_path)
+            size += len(payload)
+        except OSError as e:
+            logger.warning(f"Failed to write cache entry: {e}")
+            return
+        
+        with self._lock:
+            self._remember(key, result, artifact_path if artifact is not None else None)
+        try:
+            with self._disk_lock() as fd:
+                # Overwritten entries count twice until the next scan
+                usage = self._read_usage(fd)
+                if usage is not None and usage + size <= self.max_disk_bytes:
+                    usage += size
+                else:
+                    usage = self._evict()
+                self._write_usage(fd, usage)
+        except OSError as e:
+            logger.warning(f"Failed to update cache usage: {e}")
+    
+    def get_or_compute(
+        self,
+        input_path: str,
+        operation: str,
+        options: Optional[Dict[str, Any]],
+        compute: Callable[[], Dict[str, Any]],
+        output_path: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Return a cached result or compute and store it
+        
+        Args:
+            input_path: Input file (its content is part of the key)
+            operation: Operation name ('diagnose', 'repair', 'convert', ...)
+            options: Options that affect the result
+            compute: Function producing the result on a miss
+            output_path: File written by compute, cached as an artifact and
+                restored here on a hit
+        
+        Returns:
+            Result dictionary with a 'cached' flag
+        """
+        try:
+            with span('cache.lookup'):
+                key = self.make_key(self.file_hash(input_path), operation, options)
+                hit = self.get(key)
+        except OSError:
+            # Let the operation itself report the unreadable input
+            return compute()
+        
+        if hit is not None:
+            result, artifact = hit
+            try:
+                if output_path and artifact is not None:
+                    ensure_directory(os.path.dirname(os.path.abspath(output_path)))
+                    shutil.copyfile(artifact, output_path)
+                    if 'output' in result:
+                        result['output'] = output_path
+            except OSError as e:
+                # Another process may have evicted the artifact since the lookup
+                logger.warning(f"Cached artifact for {operation} unavailable, recomputing: {e}")
+            else:
+                logger.info(f"Cache hit for {operation}: {input_path}")
+                result['cached'] = True
+                return result
+        
+        result = compute()
+        if is_successful(result):
+            artifact = output_path if output_path and os.path.exists(output_path) else None
+            if output_path is None or artifact is not None:
+                with span('cache.store'):
+                    self.put(key, result, artifact)
+        result['cached'] = False
+        return result
+    
+    # ===== Internals =====
+    
+    def _paths(self, key: str) -> Tuple[Path, Path]:
+        """Result JSON and artifact paths of a key"""
+        shard = self.cache_dir / key[:2]
+        return shard / f"{key}.json", shard / f"{key}.artifact"
+    
+    def _atomic_copy(self, source: str, destination: Path) -> int:
+        """Copy a file into the cache via a temporary file and rename"""
+        fd, tmp = tempfile.mkstemp(dir=destination.parent, suffix='.tmp')
+        os.close(fd)
+        try:
+            shutil.copyfile(source, tmp)
+            os.replace(tmp, destination)
+        except OSError:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+            raise
+        return destination.stat().st_size
+    
+    def _remember(self, key: str, result: Dict[str, Any], artifact: Optional[Path]) -> None:
+        """Insert into the memory tier, evicting the least recently used entry"""
+        self._memory[key] = (dict(result), artifact)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+    
+    def _touch(self, key: str) -> None:
+        """Mark a key as recently used on disk"""
+        result_path, _ = self._paths(key)
+        try:
+            os.utime(result_path)
+        except OSError:
+            pass
+    
+    @contextmanager
+    def _disk_lock(self) -> Iterator[int]:
+        """
+        Hold the thread lock and, where available, an exclusive lock on the
+        usage file shared with other processes
+        
+        Yields:
+            Descriptor of the usage file
+        """
+        with self._lock:
+            # flock locks belong to the open file, which a forked child
+            # would share with its parent, so every process opens its own
+            if self._usage_pid != os.getpid():
+                self._usage_fd = os.open(self.cache_dir / _USAGE_FILE, os.O_RDWR | os.O_CREAT, 0o644)
+                self._usage_pid = os.getpid()
+            if fcntl is None:
+                yield self._usage_fd
+                return
+            fcntl.flock(self._usage_fd, fcntl.LOCK_EX)
+            try:
+                yield self._usage_fd
+            finally:
+                fcntl.flock(self._usage_fd, fcntl.LOCK_UN)
+    
+    def _read_usage(self, fd: int) -> Optional[int]:
+        """Bytes in the disk tier as recorded by all processes (None: unknown)"""
+        os.lseek(fd, 0, os.SEEK_SET)
+        try:
+            return int(os.read(fd, 32))
+        except ValueError:
+            return None
+    
+    def _write_usage(self, fd: int, usage: int) -> None:
+        data = str(usage).encode('ascii')
+        os.lseek(fd, 0, os.SEEK_SET)
+        os.write(fd, data)
+        os.ftruncate(fd, len(data))
+    
+    def _scan_disk(self) -> List[Tuple[float, str, int]]:
+        """(mtime, key, bytes) of every disk entry, least recently used first"""
+        entries = []
+        for shard in self.cache_dir.iterdir():
+            if not shard.is_dir():
+                continue
+            for item in shard.glob('*.json'):
+                key = item.stem
+                try:
+                    stat = item.stat()
+                except OSError:
+                    continue
+                size = stat.st_size
+                artifact = shard / f"{key}.artifact"
+                if artifact.exists():
+                    size += artifact.stat().st_size
+                entries.append((stat.st_mtime, key, size))
+        
+        entries.sort()
+        return entries
+    
+    def _evict(self) -> int:
+        """
+        Re-scan the disk tier and, when it is over the size limit, delete
+        least recently used entries down to EVICT_TO_FRACTION of it
+        
+        Called with the disk lock held.
+        
+        Returns:
+            Bytes left in the disk tier
+        """
+        entries = self._scan_disk()
+        usage = sum(size for _, _, size in entries)
+        if usage <= self.max_disk_bytes:
+            return usage
+        
+        target = self.max_disk_bytes * EVICT_TO_FRACTION
+        # The most recent entry is always kept
+        for _, key, size in entries[:-1]:
+            if usage <= target:
+                break
+            usage -= size
+            self._memory.pop(key, None)
+            for path in self._paths(key):
+                try:
+                    path.unlink()
+                except FileNotFoundError:
+                    pass
+            logger.debug(f"Evicted cache entry {key}")
+        return usage
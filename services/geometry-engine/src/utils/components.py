@@ -0,0 +1,184 @@
+"""Mesh Components
+
+Content-addressed connected components for incremental processing:
+- Faces are grouped into vertex-connected components; every component
+  gets a hash of its own vertex positions and faces (renumbered locally),
+  so it keeps its hash when other parts of the file change, move within
+  the vertex / face arrays or are added and removed
+- ComponentCache stores per-component results in the ResultCache under
+  (component hash, operation, options)
+- component_flips reuses cached winding flips for repair and orients only
+  the components that are not cached
+"""
+
+import hashlib
+import logging
+from typing import Any, Dict, Iterable, Optional
+
+import numpy as np
+
+from utils.cache import ResultCache
+from utils.topology import EdgeTable, connected_components
+from utils.orientation import orient_faces, bbox_center
+
+logger = logging.getLogger(__name__)
+
+# Meshes split into more components than this (e.g. triangle soups) are
+# processed as a whole
+MAX_COMPONENTS = 4096
+
+
+class MeshComponents:
+    """Vertex-connected components of a mesh and their content hashes"""
+    
+    def __init__(self, vertices: np.ndarray, faces: np.ndarray):
+        """
+        Args:
+            vertices: Vx3 vertex positions
+            faces: Fx3 vertex indices
+        """
+        num_vertices = len(vertices)
+        faces = np.asarray(faces)
+        vertex_label = connected_components(
+            num_vertices,
+            np.concatenate([faces[:, 0], faces[:, 1]]),
+            np.concatenate([faces[:, 1], faces[:, 2]])
+        )
+        roots, self.component = np.unique(vertex_label[faces[:, 0]], return_inverse=True)
+        self.component = self.component.reshape(-1)
+        self.count = len(roots)
+        
+        # Faces grouped by component, in mesh order within each group
+        self.order = np.argsort(self.component, kind='stable')
+        sizes = np.bincount(self.component, minlength=self.count)
+        self.offsets = np.concatenate([[0], np.cumsum(sizes)])
+        # Position of every face inside its component
+        self.position = np.empty(len(faces), dtype=np.int64)
+        self.position[self.order] = np.arange(len(faces)) - np.repeat(self.offsets[:-1], sizes)
+        
+        self.hashes = self._hashes(vertices, faces, vertex_label, roots) if self.count <= MAX_COMPONENTS else None
+    
+    def faces(self, index: int) -> np.ndarray:
+        """Sorted face IDs of one component"""
+        return self.order[self.offsets[index]:self.offsets[index + 1]]
+    
+    def size(self, index: int) -> int:
+        return int(self.offsets[index + 1] - self.offsets[index])
+    
+    def _hashes(
+        self,
+        vertices: np.ndarray,
+        faces: np.ndarray,
+        vertex_label: np.ndarray,
+        roots: np.ndarray
+    ) -> list:
+        """Hash of the vertex positions and locally numbered faces of every component"""
+        used = np.zeros(len(vertices), dtype=bool)
+        used[faces.ravel()] = True
+        used_ids = np.flatnonzero(used)
+        vertex_component = np.searchsorted(roots, vertex_label[used_ids])
+        vertex_order = used_ids[np.argsort(vertex_component, kind='stable')]
+        vertex_sizes = np.bincount(vertex_component, minlength=self.count)
+        vertex_offsets = np.concatenate([[0], np.cumsum(vertex_sizes)])
+        
+        local = np.zeros(len(vertices), dtype=np.int64)
+        local[vertex_order] = np.arange(len(vertex_order)) - np.repeat(vertex_offsets[:-1], vertex_sizes)
+        positions = np.ascontiguousarray(vertices[vertex_order], dtype='<f4')
+        local_faces = np.ascontiguousarray(local[faces[self.order]], dtype='<u4')
+        
+        hashes = []
+        for c in range(self.count):
+            v0, v1 = vertex_offsets[c], vertex_offsets[c + 1]
+            f0, f1 = self.offsets[c], self.offsets[c + 1]
+            digest = hashlib.blake2b(digest_size=16)
+            digest.update(np.array([v1 - v0, f1 - f0], dtype='<u8').tobytes())
+            digest.update(positions[v0:v1].tobytes())
+            digest.update(local_faces[f0:f1].tobytes())
+            hashes.append(digest.hexdigest())
+        return hashes
+
+
+class ComponentCache:
+    """Per-component results of one operation, stored in a ResultCache"""
+    
+    def __init__(self, cache: ResultCache, operation: str, options: Optional[Dict[str, Any]] = None):
+        """
+        Args:
+            cache: Backing result cache
+            operation: Name of the cached per-component operation
+            options: Everything besides the component's content that the
+                results depend on (part of every key)
+        """
+        self.cache = cache
+        self.operation = operation
+        self.options = options or {}
+    
+    def lookup(self, hashes: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """Cached entries of the given component hashes (misses are left out)"""
+        entries = {}
+        for content_hash in set(hashes):
+            hit = self.cache.get(self.cache.make_key(content_hash, self.operation, self.options))
+            if hit is not None:
+                entries[content_hash] = hit[0]
+        return entries
+    
+    def put(self, content_hash: str, entry: Dict[str, Any]) -> None:
+        self.cache.put(self.cache.make_key(content_hash, self.operation, self.options), entry)
+
+
+def component_flips(
+    vertices: np.ndarray,
+    faces: np.ndarray,
+    edge_table: EdgeTable,
+    cache: ResultCache
+) -> np.ndarray:
+    """
+    orient_faces flips, reusing the cached flips of unchanged components
+    
+    Args:
+        vertices: Vx3 vertex positions
+        faces: Fx3 vertex indices
+        edge_table: Edge table of the faces
+        cache: Result cache holding the per-component flips
+    
+    Returns:
+        Per-face flip flags (identical to orient_faces)
+    """
+    components = MeshComponents(vertices, faces)
+    if components.hashes is None:
+        return orient_faces(vertices, faces, edge_table)[0]
+    
+    # The signed volumes are taken around the centre of the whole mesh
+    center = bbox_center(vertices)
+    store = ComponentCache(cache, 'repair.winding', {'center': center.tolist()})
+    entries = store.lookup(components.hashes)
+    
+    flip = np.zeros(len(faces), dtype=bool)
+    missing = []
+    for c, content_hash in enumerate(components.hashes):
+        entry = entries.get(content_hash)
+        if entry is None:
+            missing.append(c)
+        else:
+            flip[components.faces(c)[np.asarray(entry['flips'], dtype=np.int64)]] = True
+    if not missing:
+        return flip
+    
+    # Orient the missing components together; their shells keep their roots
+    if len(missing) == components.count:
+        sub = np.arange(len(faces))
+        flip[sub] = orient_faces(vertices, faces, edge_table, center=center)[0]
+    else:
+        sub = np.sort(np.concatenate([components.faces(c) for c in missing]))
+        sub_faces = faces[sub]
+        flip[sub] = orient_faces(vertices, sub_faces, EdgeTable.from_faces(sub_faces), center=center)[0]
+    
+    stored = set()
+    for c in missing:
+        content_hash = components.hashes[c]
+        if content_hash in stored:
+            continue
+        stored.add(content_hash)
+        store.put(content_hash, {'flips': np.flatnonzero(flip[components.faces(c)]).tolist()})
+    logger.info(f"Winding: reused {components.count - len(missing)} of {components.count} components")
+    return flip
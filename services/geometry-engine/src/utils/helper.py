@@ -2,9 +2,10 @@
 
 Common utilities for 3D mesh processing:
 - File I/O (load/save meshes)
-- Math utilities (vectors, matrices)
+- Math utilities (vectors, matrices, batched per-face geometry)
 - Validation helpers
-- Performance profiling
+- Performance profiling (timer / ProgressTracker; spans and metrics live
+  in utils.metrics)
 - Logging setup
 """
 
@@ -18,18 +19,45 @@ from typing import Dict, Any, Optional, List, Tuple
 from functools import wraps
 import numpy as np
 
+from utils.metrics import timed
+
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
 logger = logging.getLogger(__name__)
 
+# Read size used when hashing files
+HASH_BUFFER_SIZE = 8 * 1024 * 1024
+
 
 # ===== File I/O Utilities =====
 
 def get_file_hash(filepath: str) -> str:
-    """Calculate MD5 hash of file for caching"""
-    hash_md5 = hashlib.md5()
-    with open(filepath, "rb") as f:
-        for chunk in iter(lambda: f.read(4096), b""):
-            hash_md5.update(chunk)
-    return hash_md5.hexdigest()
+    """
+    Calculate content hash of file for caching
+    
+    Uses XXH3-128 when the optional xxhash package is installed, otherwise
+    SHA-256 (hardware accelerated on modern CPUs). The file is read with
+    large unbuffered reads into one reusable buffer.
+    """
+    if xxhash is not None:
+        hasher = xxhash.xxh3_128()
+        prefix = 'xxh3:'
+    else:
+        hasher = hashlib.sha256()
+        prefix = 'sha256:'
+    
+    buffer = bytearray(HASH_BUFFER_SIZE)
+    view = memoryview(buffer)
+    with open(filepath, "rb", buffering=0) as f:
+        while True:
+            size = f.readinto(buffer)
+            if not size:
+                break
+            hasher.update(view[:size])
+    return prefix + hasher.hexdigest()
 
 
 def validate_file_path(filepath: str, allowed_extensions: List[str]) -> bool:
@@ -65,6 +93,266 @@ def ensure_directory(dirpath: str) -> Path:
 
 # ===== Math Utilities =====
 
+class FaceBuffers:
+    """
+    Reusable scratch space for batched per-face math
+    
+    Faces are processed in chunks of `capacity`, so scratch memory stays
+    fixed no matter how large the mesh is. Allocate once and pass the same
+    instance to repeated calls to avoid re-allocating per call.
+    """
+    
+    def __init__(self, capacity: int = 1 << 20, dtype: Any = np.float64):
+        """
+        Args:
+            capacity: Faces processed per chunk
+            dtype: Working precision (np.float32 or np.float64)
+        """
+        self.capacity = max(1, int(capacity))
+        self.dtype = np.dtype(dtype)
+        self.p0 = np.empty((self.capacity, 3), dtype=self.dtype)
+        self.e1 = np.empty((self.capacity, 3), dtype=self.dtype)
+        self.e2 = np.empty((self.capacity, 3), dtype=self.dtype)
+        self.cross = np.empty((self.capacity, 3), dtype=self.dtype)
+        self.length = np.empty(self.capacity, dtype=self.dtype)
+        self.tmp = np.empty(self.capacity, dtype=self.dtype)
+
+
+def _gather(vertices: np.ndarray, index: np.ndarray, out: np.ndarray) -> np.ndarray:
+    """Gather vertex rows into a preallocated buffer"""
+    if vertices.dtype == out.dtype:
+        return np.take(vertices, index, axis=0, out=out)
+    out[...] = vertices[index]
+    return out
+
+
+def _cross_into(a: np.ndarray, b: np.ndarray, out: np.ndarray, tmp: np.ndarray) -> None:
+    """Row-wise cross product a x b written into out (no temporaries)"""
+    for axis in range(3):
+        i = (axis + 1) % 3
+        j = (axis + 2) % 3
+        np.multiply(a[:, i], b[:, j], out=out[:, axis])
+        np.multiply(a[:, j], b[:, i], out=tmp)
+        out[:, axis] -= tmp
+
+
+def calculate_face_geometry(
+    vertices: np.ndarray,
+    faces: np.ndarray,
+    normals: Optional[np.ndarray] = None,
+    areas: Optional[np.ndarray] = None,
+    centroids: Optional[np.ndarray] = None,
+    buffers: Optional[FaceBuffers] = None,
+    want: Tuple[str, ...] = ('normals', 'areas', 'centroids')
+) -> Tuple[Optional[np.ndarray], Optional[np.ndarray], Optional[np.ndarray]]:
+    """
+    Face normals, areas and centroids for all triangles in one pass
+    
+    Args:
+        vertices: Nx3 array of vertex positions
+        faces: Fx3 array of vertex indices
+        normals, areas, centroids: Optional preallocated outputs (Fx3, F, Fx3)
+        buffers: Optional reusable scratch buffers (also sets precision)
+        want: Which outputs to compute when no output array is given
+    
+    Returns:
+        (normals, areas, centroids); entries not requested are None.
+        Normals of zero-area faces are zero vectors.
+    """
+    vertices = np.asarray(vertices)
+    faces = np.asarray(faces)
+    num_faces = len(faces)
+    
+    if buffers is None:
+        buffers = FaceBuffers(min(num_faces, 1 << 20))
+    dtype = buffers.dtype
+    
+    if normals is None and 'normals' in want:
+        normals = np.empty((num_faces, 3), dtype=dtype)
+    if areas is None and 'areas' in want:
+        areas = np.empty(num_faces, dtype=dtype)
+    if centroids is None and 'centroids' in want:
+        centroids = np.empty((num_faces, 3), dtype=dtype)
+    
+    need_cross = normals is not None or areas is not None
+    
+    for start in range(0, num_faces, buffers.capacity):
+        stop = min(start + buffers.capacity, num_faces)
+        size = stop - start
+        chunk = faces[start:stop]
+        p0 = _gather(vertices, chunk[:, 0], buffers.p0[:size])
+        e1 = _gather(vertices, chunk[:, 1], buffers.e1[:size])
+        e2 = _gather(vertices, chunk[:, 2], buffers.e2[:size])
+        
+        if centroids is not None:
+            out = centroids[start:stop]
+            np.add(p0, e1, out=out)
+            out += e2
+            out /= 3.0
+        
+        if not need_cross:
+            continue
+        
+        e1 -= p0
+        e2 -= p0
+        cross = buffers.cross[:size]
+        tmp = buffers.tmp[:size]
+        _cross_into(e1, e2, cross, tmp)
+        
+        length = buffers.length[:size]
+        np.einsum('ij,ij->i', cross, cross, out=length)
+        np.sqrt(length, out=length)
+        
+        if areas is not None:
+            np.multiply(length, 0.5, out=areas[start:stop])
+        
+        if normals is not None:
+            out = normals[start:stop]
+            np.copyto(tmp, length)
+            tmp[tmp == 0] = 1
+            np.divide(cross, tmp[:, None], out=out)
+    
+    return normals, areas, centroids
+
+
+def batch_face_normals(
+    vertices: np.ndarray,
+    faces: np.ndarray,
+    out: Optional[np.ndarray] = None,
+    buffers: Optional[FaceBuffers] = None
+) -> np.ndarray:
+    """Unit normals of all faces (Fx3); zero-area faces get zero vectors"""
+    normals, _, _ = calculate_face_geometry(
+        vertices, faces, normals=out, buffers=buffers, want=('normals',)
+    )
+    return normals
+
+
+def batch_triangle_areas(
+    vertices: np.ndarray,
+    faces: np.ndarray,
+    out: Optional[np.ndarray] = None,
+    buffers: Optional[FaceBuffers] = None
+) -> np.ndarray:
+    """Areas of all faces (F)"""
+    _, areas, _ = calculate_face_geometry(
+        vertices, faces, areas=out, buffers=buffers, want=('areas',)
+    )
+    return areas
+
+
+def batch_face_centroids(
+    vertices: np.ndarray,
+    faces: np.ndarray,
+    out: Optional[np.ndarray] = None,
+    buffers: Optional[FaceBuffers] = None
+) -> np.ndarray:
+    """Centroids of all faces (Fx3)"""
+    _, _, centroids = calculate_face_geometry(
+        vertices, faces, centroids=out, buffers=buffers, want=('centroids',)
+    )
+    return centroids
+
+
+# Faces smaller than this fraction of the squared bounding-box diagonal are degenerate
+DEGENERATE_AREA_RATIO = 1e-12
+
+# Aspect ratio (longest edge over height, 1.0 for equilateral) above which a face is a sliver
+SLIVER_ASPECT_RATIO = 1000.0
+
+
+def degenerate_area_epsilon(vertices: np.ndarray, ratio: float = DEGENERATE_AREA_RATIO) -> float:
+    """Zero-area threshold scaled by the mesh bounding box"""
+    vertices = np.asarray(vertices)
+    if len(vertices) == 0:
+        return 0.0
+    diagonal = vertices.max(axis=0).astype(np.float64) - vertices.min(axis=0)
+    return float(np.dot(diagonal, diagonal)) * ratio
+
+
+def find_degenerate_faces(
+    vertices: np.ndarray,
+    faces: np.ndarray,
+    area_epsilon: float,
+    max_aspect_ratio: float = SLIVER_ASPECT_RATIO,
+    areas: Optional[np.ndarray] = None,
+    buffers: Optional[FaceBuffers] = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Classify faces as degenerate or sliver in one vectorized pass
+    
+    Args:
+        vertices: Nx3 array of vertex positions
+        faces: Fx3 array of vertex indices
+        area_epsilon: Faces with area <= this are degenerate
+            (see degenerate_area_epsilon)
+        max_aspect_ratio: Non-degenerate faces above this aspect ratio are slivers
+        areas: Optional precomputed face areas (F)
+        buffers: Optional reusable scratch buffers (also sets precision)
+    
+    Returns:
+        (degenerate, sliver) boolean masks (F). Degenerate faces repeat a
+        vertex index or have near-zero area; slivers are the remaining
+        needle-shaped faces.
+    """
+    vertices = np.asarray(vertices)
+    faces = np.asarray(faces)
+    num_faces = len(faces)
+    
+    if buffers is None:
+        buffers = FaceBuffers(min(num_faces, 1 << 20))
+    
+    degenerate = (
+        (faces[:, 0] == faces[:, 1]) |
+        (faces[:, 1] == faces[:, 2]) |
+        (faces[:, 2] == faces[:, 0])
+    )
+    sliver = np.zeros(num_faces, dtype=bool)
+    # longest_edge^2 > ratio * (4 / sqrt(3)) * area  <=>  aspect ratio > ratio
+    sliver_factor = max_aspect_ratio * 4.0 / np.sqrt(3.0)
+    
+    for start in range(0, num_faces, buffers.capacity):
+        stop = min(start + buffers.capacity, num_faces)
+        size = stop - start
+        chunk = faces[start:stop]
+        p0 = _gather(vertices, chunk[:, 0], buffers.p0[:size])
+        e1 = _gather(vertices, chunk[:, 1], buffers.e1[:size])
+        e2 = _gather(vertices, chunk[:, 2], buffers.e2[:size])
+        e1 -= p0
+        e2 -= p0
+        
+        # Squared length of the longest edge
+        longest = buffers.length[:size]
+        tmp = buffers.tmp[:size]
+        cross = buffers.cross[:size]
+        np.subtract(e2, e1, out=cross)
+        np.einsum('ij,ij->i', cross, cross, out=longest)
+        np.einsum('ij,ij->i', e1, e1, out=tmp)
+        np.maximum(longest, tmp, out=longest)
+        np.einsum('ij,ij->i', e2, e2, out=tmp)
+        np.maximum(longest, tmp, out=longest)
+        
+        if areas is not None:
+            area = areas[start:stop]
+        else:
+            _cross_into(e1, e2, cross, tmp)
+            area = tmp
+            np.einsum('ij,ij->i', cross, cross, out=area)
+            np.sqrt(area, out=area)
+            area *= 0.5
+        
+        flat = degenerate[start:stop]
+        flat |= area <= area_epsilon
+        longest *= 1.0 / sliver_factor
+        np.greater(longest, area, out=sliver[start:stop])
+        sliver[start:stop] &= ~flat
+    
+    return degenerate, sliver
+
+
+_SINGLE_FACE = np.array([[0, 1, 2]])
+
+
 def calculate_face_normal(
     v0: np.ndarray,
     v1: np.ndarray,
@@ -79,16 +367,8 @@ def calculate_face_normal(
     Returns:
         Normalized face normal vector
     """
-    edge1 = v1 - v0
-    edge2 = v2 - v0
-    normal = np.cross(edge1, edge2)
-    
-    # Normalize
-    length = np.linalg.norm(normal)
-    if length > 0:
-        normal /= length
-    
-    return normal
+    triangle = np.array([v0, v1, v2], dtype=np.float64)
+    return batch_face_normals(triangle, _SINGLE_FACE)[0]
 
 
 def calculate_triangle_area(
@@ -97,10 +377,8 @@ def calculate_triangle_area(
     v2: np.ndarray
 ) -> float:
     """Calculate area of triangle"""
-    edge1 = v1 - v0
-    edge2 = v2 - v0
-    cross = np.cross(edge1, edge2)
-    return 0.5 * np.linalg.norm(cross)
+    triangle = np.array([v0, v1, v2], dtype=np.float64)
+    return float(batch_triangle_areas(triangle, _SINGLE_FACE)[0])
 
 
 def calculate_bounding_box(
@@ -178,33 +456,52 @@ def validate_mesh_data(mesh_data: Dict[str, Any]) -> Tuple[bool, List[str]]:
 # ===== Performance Utilities =====
 
 def timer(func):
-    """Decorator to time function execution"""
+    """
+    Decorator to time function execution
+    
+    Calls are recorded as spans of the active trace (see utils.metrics)
+    and logged at DEBUG level.
+    """
+    traced = timed()(func)
+    
     @wraps(func)
     def wrapper(*args, **kwargs):
-        start = time.time()
-        result = func(*args, **kwargs)
-        elapsed = time.time() - start
-        logger.info(f"{func.__name__} took {elapsed:.2f}s")
+        if not logger.isEnabledFor(logging.DEBUG):
+            return traced(*args, **kwargs)
+        start = time.perf_counter_ns()
+        result = traced(*args, **kwargs)
+        logger.debug(f"{func.__name__} took {(time.perf_counter_ns() - start) / 1e9:.3f}s")
         return result
     return wrapper
 
 
 class ProgressTracker:
-    """Simple progress tracker for long operations"""
+    """
+    Simple progress tracker for long operations
+    
+    Logs at most once per log_interval seconds (and on completion), so it
+    can be updated from tight loops.
+    """
     
-    def __init__(self, total: int, description: str = "Processing"):
+    def __init__(self, total: int, description: str = "Processing", log_interval: float = 5.0):
         self.total = total
         self.current = 0
         self.description = description
-        self.start_time = time.time()
+        self.log_interval = log_interval
+        self.start_time = time.perf_counter()
+        self._next_log = self.start_time + log_interval
     
     def update(self, increment: int = 1) -> None:
         """Update progress"""
         self.current += increment
-        percent = (self.current / self.total) * 100
-        elapsed = time.time() - self.start_time
+        now = time.perf_counter()
+        elapsed = now - self.start_time
         
         if self.current < self.total:
+            if now < self._next_log:
+                return
+            self._next_log = now + self.log_interval
+            percent = (self.current / self.total) * 100
             eta = (elapsed / self.current) * (self.total - self.current)
             logger.info(
                 f"{self.description}: {percent:.1f}% "
@@ -258,7 +555,26 @@ class Config:
             'cache_enabled': True,
             'parallel_processing': True,
             'num_workers': 4,
-            'tolerance': 1e-6
+            'blender_max_jobs_per_worker': 50,
+            'blender_max_worker_memory_mb': 4096,
+            'tolerance': 1e-6,
+            'crease_angle': None,  # Degrees; split hard edges when recomputing normals
+            'lod_ratios': [0.5, 0.25, 0.1],  # Face fractions of the LOD chain, finest first
+            'out_of_core_threshold_mb': 256,  # Diagnose / repair GLB and TMSH inputs this large tile by tile
+            'out_of_core_memory_mb': 512,  # Working memory budget of the tiled mode
+            'convert_timeout_seconds': 300,  # Blender timeout for an empty input...
+            'convert_timeout_per_mb': 2.0,  # ...plus this per MB of input
+            'convert_timeout_max_seconds': 3600,
+            'convert_format_concurrency': {'.fbx': 1, '.blend': 1, '.dae': 2},  # Batch jobs per input format (others: num_workers)
+            'cache_dir': None,  # Defaults to <temp_dir>/cache
+            'cache_max_size_mb': 2048,
+            'cache_memory_entries': 256,
+            'incremental_cache': True,  # Reuse per-part diagnosis / winding results of earlier uploads (needs cache_enabled)
+            'max_queued_jobs': 32,
+            'job_ttl_seconds': 3600,
+            'metrics_enabled': True,  # Per-stage spans for /metrics and job results
+            'trace_memory': False,  # Per-stage allocation peaks (tracemalloc) and peak RSS
+            'allow_profiling': False  # Honour per-request cProfile dumps (profile=true)
         }
     
     def load(self, config_path: str) -> None:
@@ -288,7 +604,7 @@ if __name__ == '__main__':
     print(f"Normal: {normal}, Area: {area}")
     
     # Test progress tracker
-    tracker = ProgressTracker(100, "Test")
+    tracker = ProgressTracker(100, "Test", log_interval=0.05)
     for i in range(100):
         time.sleep(0.01)
         if i % 20 == 0:
@@ -0,0 +1,322 @@
+"""Mesh Container
+
+Columnar triangle mesh shared by the loaders, diagnosis and repair:
+- Typed contiguous arrays: float32 positions / normals / UVs, uint32 indices
+- Derived data (face normals, areas, bounding box, edge table, vertex-face
+  adjacency) is computed lazily and dropped automatically when the arrays
+  it depends on are replaced; the incremental edits (remove / flip / add
+  faces, remap vertices) update it instead
+- Face ranges are cheap views that share the vertex arrays
+- Conversion to JSON-friendly lists only happens on request (API boundary)
+"""
+
+import numpy as np
+from typing import Dict, Any, Tuple, Union, Callable
+
+from utils.helper import calculate_face_geometry
+from utils.topology import EdgeTable, compact_vertices
+from utils.orientation import flip_faces
+
+POSITION_DTYPE = np.float32
+INDEX_DTYPE = np.uint32
+
+# Derived data that depends only on the vertex positions (plus faces)
+_GEOMETRY_KEYS = ('face_normals', 'face_areas', 'bbox')
+
+
+def _as_columns(data: Any, columns: int, dtype: Any) -> np.ndarray:
+    """Contiguous N x columns array of dtype (no copy if already matching)"""
+    if data is None:
+        return np.empty((0, columns), dtype=dtype)
+    array = np.ascontiguousarray(data, dtype=dtype)
+    if array.size == 0:
+        return array.reshape(0, columns)
+    return array.reshape(-1, columns)
+
+
+class Mesh:
+    """Triangle mesh stored as typed NumPy columns"""
+    
+    __slots__ = ('_vertices', '_faces', '_normals', '_uvs', '_derived')
+    
+    def __init__(
+        self,
+        vertices: Any = None,
+        faces: Any = None,
+        normals: Any = None,
+        uvs: Any = None
+    ):
+        """
+        Create a mesh (array inputs of the right dtype are used without copying)
+        
+        Args:
+            vertices: Nx3 positions
+            faces: Fx3 vertex indices
+            normals: Nx3 per-vertex normals (optional)
+            uvs: Nx2 per-vertex texture coordinates (optional)
+        """
+        self._derived = {}
+        self._vertices = _as_columns(vertices, 3, POSITION_DTYPE)
+        self._faces = _as_columns(faces, 3, INDEX_DTYPE)
+        self._normals = _as_columns(normals, 3, POSITION_DTYPE)
+        self._uvs = _as_columns(uvs, 2, POSITION_DTYPE)
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'Mesh':
+        """Mesh from a dictionary with vertices, faces, normals, uvs"""
+        return cls(data.get('vertices'), data.get('faces'), data.get('normals'), data.get('uvs'))
+    
+    @classmethod
+    def from_any(cls, data: Union['Mesh', Dict[str, Any]]) -> 'Mesh':
+        """Accept a Mesh as-is or build one from a mesh dictionary"""
+        if isinstance(data, cls):
+            return data
+        return cls.from_dict(data)
+    
+    def to_dict(self, as_lists: bool = False) -> Dict[str, Any]:
+        """
+        Mesh as a dictionary
+        
+        Args:
+            as_lists: Convert to nested Python lists (for JSON responses only;
+                this is expensive for large meshes)
+        """
+        data = {
+            'vertices': self._vertices,
+            'faces': self._faces,
+            'normals': self._normals,
+            'uvs': self._uvs,
+        }
+        if as_lists:
+            data = {key: value.tolist() for key, value in data.items()}
+        return data
+    
+    def copy(self, deep: bool = False) -> 'Mesh':
+        """New mesh object (sharing the arrays unless deep)"""
+        if deep:
+            return Mesh(self._vertices.copy(), self._faces.copy(), self._normals.copy(), self._uvs.copy())
+        mesh = Mesh(self._vertices, self._faces, self._normals, self._uvs)
+        mesh._derived = dict(self._derived)
+        return mesh
+    
+    # ===== Columns =====
+    
+    @property
+    def vertices(self) -> np.ndarray:
+        return self._vertices
+    
+    @vertices.setter
+    def vertices(self, value: Any) -> None:
+        self._vertices = _as_columns(value, 3, POSITION_DTYPE)
+        for key in _GEOMETRY_KEYS:
+            self._derived.pop(key, None)
+    
+    @property
+    def faces(self) -> np.ndarray:
+        return self._faces
+    
+    @faces.setter
+    def faces(self, value: Any) -> None:
+        self._faces = _as_columns(value, 3, INDEX_DTYPE)
+        self._derived.clear()
+    
+    @property
+    def normals(self) -> np.ndarray:
+        return self._normals
+    
+    @normals.setter
+    def normals(self, value: Any) -> None:
+        self._normals = _as_columns(value, 3, POSITION_DTYPE)
+    
+    @property
+    def uvs(self) -> np.ndarray:
+        return self._uvs
+    
+    @uvs.setter
+    def uvs(self, value: Any) -> None:
+        self._uvs = _as_columns(value, 2, POSITION_DTYPE)
+    
+    @property
+    def num_vertices(self) -> int:
+        return len(self._vertices)
+    
+    @property
+    def num_faces(self) -> int:
+        return len(self._faces)
+    
+    @property
+    def has_normals(self) -> bool:
+        """Per-vertex normals are present"""
+        return len(self._normals) > 0 and len(self._normals) == len(self._vertices)
+    
+    @property
+    def has_uvs(self) -> bool:
+        """Per-vertex UVs are present"""
+        return len(self._uvs) > 0 and len(self._uvs) == len(self._vertices)
+    
+    # ===== Derived data =====
+    
+    def _cached(self, key: str, build: Callable[[], Any]) -> Any:
+        value = self._derived.get(key)
+        if value is None:
+            value = build()
+            self._derived[key] = value
+        return value
+    
+    def _face_geometry(self) -> None:
+        normals, areas, _ = calculate_face_geometry(
+            self._vertices, self._faces, want=('normals', 'areas')
+        )
+        self._derived['face_normals'] = normals
+        self._derived['face_areas'] = areas
+    
+    @property
+    def face_normals(self) -> np.ndarray:
+        """Fx3 unit face normals (zero for zero-area faces)"""
+        if 'face_normals' not in self._derived:
+            self._face_geometry()
+        return self._derived['face_normals']
+    
+    @property
+    def face_areas(self) -> np.ndarray:
+        """F face areas"""
+        if 'face_areas' not in self._derived:
+            self._face_geometry()
+        return self._derived['face_areas']
+    
+    @property
+    def bbox(self) -> Tuple[np.ndarray, np.ndarray]:
+        """(min, max) corners of the vertex bounding box"""
+        def build():
+            if len(self._vertices) == 0:
+                zero = np.zeros(3, dtype=POSITION_DTYPE)
+                return zero, zero
+            return self._vertices.min(axis=0), self._vertices.max(axis=0)
+        return self._cached('bbox', build)
+    
+    @property
+    def edge_table(self) -> EdgeTable:
+        """Undirected edge table (see utils.topology.EdgeTable)"""
+        return self._cached('edge_table', lambda: EdgeTable.from_faces(self._faces))
+    
+    @property
+    def vertex_faces(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Vertex -> face adjacency in CSR form
+        
+        Returns:
+            (offsets, face_ids): faces around vertex v are
+            face_ids[offsets[v]:offsets[v + 1]]
+        """
+        def build():
+            corners = self._faces.ravel()
+            order = np.argsort(corners, kind='stable')
+            counts = np.bincount(corners, minlength=len(self._vertices))
+            offsets = np.concatenate([[0], np.cumsum(counts)])
+            return offsets, order // 3
+        return self._cached('vertex_faces', build)
+    
+    # ===== Incremental edits =====
+    # Unlike assigning new arrays, these carry the derived data over
+    
+    def remove_faces(self, remove: np.ndarray) -> None:
+        """Drop the masked faces (vertices are kept)"""
+        keep = ~remove
+        derived = dict(self._derived)
+        self.faces = self._faces[keep]
+        for key in ('face_normals', 'face_areas'):
+            if key in derived:
+                self._derived[key] = derived[key][keep]
+        if 'edge_table' in derived:
+            self._derived['edge_table'] = derived['edge_table'].without_faces(remove)
+        if 'bbox' in derived:
+            self._derived['bbox'] = derived['bbox']
+    
+    def flip_faces(self, flip: np.ndarray) -> None:
+        """Reverse the winding (vertex order 0, 2, 1) of the flagged faces"""
+        derived = dict(self._derived)
+        self.faces = flip_faces(self._faces, flip)
+        if 'face_normals' in derived:
+            normals = derived['face_normals'].copy()
+            normals[flip] *= -1
+            self._derived['face_normals'] = normals
+        if 'edge_table' in derived:
+            self._derived['edge_table'] = derived['edge_table'].flipped(flip)
+        for key in ('face_areas', 'bbox', 'vertex_faces'):
+            if key in derived:
+                self._derived[key] = derived[key]
+    
+    def remap_vertices(self, keep: np.ndarray, remap: np.ndarray) -> None:
+        """
+        Keep the given vertices (with their normals / UVs) and renumber
+        the faces (see utils.topology.compact_vertices and
+        repair.weld.weld_vertices for keep / remap)
+        
+        Face geometry is recomputed only for faces whose corners moved
+        (vertices merged into another one).
+        """
+        derived = dict(self._derived)
+        old_faces = self._faces
+        faces = remap.astype(INDEX_DTYPE, copy=False)[old_faces]
+        if self.has_normals:
+            self.normals = self._normals[keep]
+        if self.has_uvs:
+            self.uvs = self._uvs[keep]
+        self.vertices = self._vertices[keep]
+        self.faces = faces
+        
+        if 'face_areas' in derived:
+            moved = np.flatnonzero((keep[faces] != old_faces).any(axis=1))
+            normals = derived['face_normals'].copy()
+            areas = derived['face_areas'].copy()
+            if len(moved):
+                normals[moved], areas[moved], _ = calculate_face_geometry(
+                    self._vertices, faces[moved], want=('normals', 'areas')
+                )
+            self._derived['face_normals'] = normals
+            self._derived['face_areas'] = areas
+        if 'edge_table' in derived:
+            self._derived['edge_table'] = derived['edge_table'].renumbered(remap)
+    
+    def add_faces(self, faces: np.ndarray) -> None:
+        """Append faces over the existing vertices"""
+        derived = dict(self._derived)
+        faces = _as_columns(faces, 3, INDEX_DTYPE)
+        self.faces = np.concatenate([self._faces, faces])
+        if 'face_areas' in derived:
+            normals, areas, _ = calculate_face_geometry(self._vertices, faces, want=('normals', 'areas'))
+            self._derived['face_normals'] = np.concatenate([derived['face_normals'], normals])
+            self._derived['face_areas'] = np.concatenate([derived['face_areas'], areas])
+        if 'edge_table' in derived:
+            self._derived['edge_table'] = derived['edge_table'].with_faces(faces)
+        if 'bbox' in derived:
+            self._derived['bbox'] = derived['bbox']
+    
+    # ===== Subsets =====
+    
+    def face_range(self, start: int, stop: int) -> 'Mesh':
+        """View of a contiguous range of faces (no arrays are copied)"""
+        return Mesh(self._vertices, self._faces[start:stop], self._normals, self._uvs)
+    
+    def submesh(self, face_ids: np.ndarray, compact: bool = True) -> 'Mesh':
+        """
+        Mesh made of the selected faces
+        
+        Args:
+            face_ids: Face indices or boolean face mask
+            compact: Drop vertices the selected faces do not use
+        """
+        faces = self._faces[face_ids]
+        if not compact:
+            return Mesh(self._vertices, faces, self._normals, self._uvs)
+        
+        keep, remap = compact_vertices(faces, len(self._vertices))
+        return Mesh(
+            self._vertices[keep],
+            remap[faces],
+            self._normals[keep] if self.has_normals else None,
+            self._uvs[keep] if self.has_uvs else None
+        )
+    
+    def __repr__(self) -> str:
+        return f"Mesh(vertices={self.num_vertices}, faces={self.num_faces})"
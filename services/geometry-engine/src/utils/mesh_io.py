@@ -0,0 +1,879 @@
+"""Mesh File I/O
+
+Streaming readers and bulk writers for geometry-only mesh formats:
+- GLB / glTF 2.0 (binary buffers are memory-mapped)
+- STL (binary, with an ASCII fallback)
+- OBJ (streamed line by line into compact typed buffers)
+- TMSH, a minimal length-prefixed typed-array container (memory-mapped)
+
+load_mesh returns a Mesh (float32 positions, uint32 indices) whose arrays
+are zero-copy views of the file whenever the file layout allows it, so
+large uploads never pass through Python lists. mesh_chunks serializes a
+Mesh to GLB or TMSH as a sequence of header bytes and memoryviews of the
+arrays themselves, so responses can be streamed without building the file
+in memory.
+"""
+
+import json
+import base64
+from functools import partial
+import struct
+import logging
+from array import array
+from pathlib import Path
+from typing import Dict, Any, Optional, List, Tuple, Union, Iterator
+
+import numpy as np
+
+from utils.helper import batch_face_normals
+from utils.mesh import Mesh
+from utils.metrics import span, timed, note_mesh
+
+logger = logging.getLogger(__name__)
+
+MESH_FORMATS = ['.glb', '.gltf', '.stl', '.obj', '.tmsh']
+
+# Formats mesh_chunks can stream, with their media types
+STREAM_FORMATS = {
+    '.glb': 'model/gltf-binary',
+    '.tmsh': 'application/x-teeli-mesh',
+}
+
+# glTF constants
+_GLB_MAGIC = b'glTF'
+_CHUNK_JSON = 0x4E4F534A
+_CHUNK_BIN = 0x004E4942
+_MODE_TRIANGLES = 4
+_COMPONENT_TYPES = {
+    5120: np.int8,
+    5121: np.uint8,
+    5122: np.int16,
+    5123: np.uint16,
+    5125: np.uint32,
+    5126: np.float32,
+}
+_TYPE_SIZES = {'SCALAR': 1, 'VEC2': 2, 'VEC3': 3, 'VEC4': 4}
+
+# Binary STL record: normal, three vertices, attribute byte count
+_STL_HEADER_SIZE = 84
+_STL_RECORD = np.dtype([
+    ('normal', '<f4', (3,)),
+    ('vertices', '<f4', (3, 3)),
+    ('attr', '<u2'),
+])
+
+# TMSH container: magic, version, array count, then one table entry per
+# array (name, dtype, columns, rows, byte offset); array data follows,
+# each array aligned to _TMSH_ALIGN bytes
+_TMSH_MAGIC = b'TMSH'
+_TMSH_VERSION = 1
+_TMSH_HEADER = struct.Struct('<4sII')
+_TMSH_ENTRY = struct.Struct('<8s4sIQQ')
+_TMSH_ALIGN = 16
+
+# Faces written per chunk by the bulk writers
+_WRITE_CHUNK = 1 << 20
+
+# Rows formatted per call by the text writers
+_TEXT_CHUNK = 1 << 16
+
+# OBJ files are parsed in blocks of about this many bytes
+_OBJ_BLOCK = 1 << 24
+
+# Largest memoryview handed out by mesh_chunks
+_STREAM_CHUNK = 1 << 20
+
+
+def empty_mesh() -> Dict[str, np.ndarray]:
+    """Mesh dictionary with correctly shaped empty arrays"""
+    return {
+        'vertices': np.empty((0, 3), dtype=np.float32),
+        'faces': np.empty((0, 3), dtype=np.uint32),
+        'normals': np.empty((0, 3), dtype=np.float32),
+        'uvs': np.empty((0, 2), dtype=np.float32),
+    }
+
+
+def load_mesh(filepath: str, split_seams: bool = False) -> Mesh:
+    """
+    Load a mesh file
+    
+    Args:
+        filepath: Path to a .glb, .gltf, .stl, .obj or .tmsh file
+        split_seams: OBJ only; give corners whose texture coordinate or
+            normal differs their own vertex instead of dropping those
+            attributes (see load_obj)
+    
+    Returns:
+        Mesh with vertices (Nx3 float32), faces (Fx3 uint32), normals
+        (Nx3 float32, may be empty) and uvs (Nx2 float32, may be empty)
+    
+    Raises:
+        ValueError: Unsupported or malformed file
+    """
+    path = Path(filepath)
+    ext = path.suffix.lower()
+    
+    loaders = {
+        '.glb': load_glb,
+        '.gltf': load_gltf,
+        '.stl': load_stl,
+        '.obj': partial(load_obj, split_seams=split_seams),
+        '.tmsh': load_tmsh,
+    }
+    if ext not in loaders:
+        raise ValueError(f"Unsupported mesh format: {ext}")
+    with span('load'):
+        mesh = Mesh.from_dict(loaders[ext](path))
+        # Faces are unsigned, so negative indices show up as huge ones
+        if mesh.num_faces and int(mesh.faces.max()) >= mesh.num_vertices:
+            raise ValueError(
+                f"Face index {int(mesh.faces.max())} out of range for {mesh.num_vertices} vertices in {path.name}"
+            )
+    note_mesh(mesh.num_faces)
+    return mesh
+
+
+# ===== glTF / GLB =====
+
+def _read_glb_json(f: Any, filepath: str) -> Tuple[Dict[str, Any], int, int]:
+    """
+    Parse the header and JSON chunk of an open GLB file
+    
+    Returns:
+        (document, total_length, bin_offset)
+    """
+    header = f.read(20)
+    if len(header) < 20 or header[:4] != _GLB_MAGIC:
+        raise ValueError(f"Not a GLB file: {filepath}")
+    
+    _, total_length = struct.unpack_from('<II', header, 4)
+    json_length, json_type = struct.unpack_from('<II', header, 12)
+    if json_type != _CHUNK_JSON:
+        raise ValueError("GLB first chunk must be JSON")
+    return json.loads(f.read(json_length)), total_length, 20 + json_length
+
+
+def gltf_document(filepath: str) -> Dict[str, Any]:
+    """JSON document of a .glb or .gltf file (buffers are not read)"""
+    if Path(filepath).suffix.lower() == '.glb':
+        with open(filepath, 'rb') as f:
+            return _read_glb_json(f, filepath)[0]
+    with open(filepath, 'r') as f:
+        return json.load(f)
+
+
+def load_glb(filepath: str) -> Dict[str, np.ndarray]:
+    """Load a binary glTF file, memory-mapping its BIN chunk"""
+    with open(filepath, 'rb') as f:
+        document, total_length, bin_offset = _read_glb_json(f, filepath)
+        
+        buffers = []
+        if bin_offset + 8 <= total_length:
+            f.seek(bin_offset)
+            bin_length, bin_type = struct.unpack('<II', f.read(8))
+            if bin_type == _CHUNK_BIN:
+                data = np.memmap(filepath, dtype=np.uint8, mode='r')
+                buffers.append(data[bin_offset + 8:bin_offset + 8 + bin_length])
+    
+    return _read_gltf_meshes(document, buffers)
+
+
+def load_gltf(filepath: str) -> Dict[str, np.ndarray]:
+    """Load a JSON glTF file with external (memory-mapped) or embedded buffers"""
+    path = Path(filepath)
+    with open(path, 'r') as f:
+        document = json.load(f)
+    
+    buffers = []
+    for buffer in document.get('buffers', []):
+        uri = buffer.get('uri', '')
+        if uri.startswith('data:'):
+            payload = base64.b64decode(uri.split(',', 1)[1])
+            buffers.append(np.frombuffer(payload, dtype=np.uint8))
+        else:
+            buffers.append(np.memmap(path.parent / uri, dtype=np.uint8, mode='r'))
+    
+    return _read_gltf_meshes(document, buffers)
+
+
+def _accessor_view(document: Dict[str, Any], buffers: List[np.ndarray], index: int) -> np.ndarray:
+    """Zero-copy (possibly strided) array view of a glTF accessor"""
+    accessor = document['accessors'][index]
+    dtype = np.dtype(_COMPONENT_TYPES[accessor['componentType']]).newbyteorder('<')
+    width = _TYPE_SIZES[accessor['type']]
+    count = accessor['count']
+    
+    if 'bufferView' not in accessor:
+        return np.zeros((count, width), dtype=dtype)
+    
+    view = document['bufferViews'][accessor['bufferView']]
+    buffer = buffers[view.get('buffer', 0)]
+    offset = view.get('byteOffset', 0) + accessor.get('byteOffset', 0)
+    stride = view.get('byteStride') or dtype.itemsize * width
+    
+    return np.ndarray(
+        shape=(count, width),
+        dtype=dtype,
+        buffer=buffer,
+        offset=offset,
+        strides=(stride, dtype.itemsize)
+    )
+
+
+def _read_gltf_meshes(document: Dict[str, Any], buffers: List[np.ndarray]) -> Dict[str, np.ndarray]:
+    """
+    Collect all triangle primitives of a glTF document into one mesh
+    
+    A single primitive with float32 positions and uint32 indices is
+    returned as views straight into the (memory-mapped) buffer; several
+    primitives are copied once into preallocated output arrays.
+    """
+    primitives = []
+    for mesh in document.get('meshes', []):
+        for primitive in mesh.get('primitives', []):
+            if primitive.get('mode', _MODE_TRIANGLES) != _MODE_TRIANGLES:
+                logger.warning("Skipping non-triangle glTF primitive")
+                continue
+            if 'POSITION' not in primitive.get('attributes', {}):
+                continue
+            primitives.append(primitive)
+    
+    if not primitives:
+        return empty_mesh()
+    
+    parts = []
+    for primitive in primitives:
+        attributes = primitive['attributes']
+        positions = _accessor_view(document, buffers, attributes['POSITION'])
+        if 'indices' in primitive:
+            indices = _accessor_view(document, buffers, primitive['indices']).reshape(-1, 3)
+        else:
+            indices = np.arange(len(positions), dtype=np.uint32).reshape(-1, 3)
+        normals = None
+        if 'NORMAL' in attributes:
+            normals = _accessor_view(document, buffers, attributes['NORMAL'])
+        uvs = None
+        if 'TEXCOORD_0' in attributes:
+            uvs = _accessor_view(document, buffers, attributes['TEXCOORD_0'])
+        parts.append((positions, indices, normals, uvs))
+    
+    if len(parts) == 1:
+        positions, indices, normals, uvs = parts[0]
+        mesh = empty_mesh()
+        mesh['vertices'] = _as_dtype(positions, np.float32)
+        mesh['faces'] = _as_dtype(indices, np.uint32)
+        if normals is not None:
+            mesh['normals'] = _as_dtype(normals, np.float32)
+        if uvs is not None:
+            mesh['uvs'] = _as_dtype(uvs, np.float32)
+        return mesh
+    
+    return _concatenate_parts(parts)
+
+
+def _as_dtype(data: np.ndarray, dtype: Any) -> np.ndarray:
+    """Return data unchanged when it already has dtype, else convert once"""
+    if data.dtype == dtype:
+        return data
+    return data.astype(dtype)
+
+
+def _concatenate_parts(parts: List[Tuple]) -> Dict[str, np.ndarray]:
+    """Concatenate primitive arrays into single preallocated arrays"""
+    num_vertices = sum(len(p[0]) for p in parts)
+    num_faces = sum(len(p[1]) for p in parts)
+    has_normals = all(p[2] is not None for p in parts)
+    has_uvs = all(p[3] is not None for p in parts)
+    
+    mesh = empty_mesh()
+    vertices = np.empty((num_vertices, 3), dtype=np.float32)
+    faces = np.empty((num_faces, 3), dtype=np.uint32)
+    normals = np.empty((num_vertices, 3), dtype=np.float32) if has_normals else None
+    uvs = np.empty((num_vertices, 2), dtype=np.float32) if has_uvs else None
+    
+    v = 0
+    f = 0
+    for positions, indices, part_normals, part_uvs in parts:
+        vertices[v:v + len(positions)] = positions
+        np.add(indices, v, out=faces[f:f + len(indices)], casting='unsafe')
+        if normals is not None:
+            normals[v:v + len(positions)] = part_normals
+        if uvs is not None:
+            uvs[v:v + len(positions)] = part_uvs
+        v += len(positions)
+        f += len(indices)
+    
+    mesh['vertices'] = vertices
+    mesh['faces'] = faces
+    if normals is not None:
+        mesh['normals'] = normals
+    if uvs is not None:
+        mesh['uvs'] = uvs
+    return mesh
+
+
+# ===== STL =====
+
+def _stl_triangle_count(path: Path) -> Optional[int]:
+    """
+    Triangle count of a binary STL, or None for ASCII files
+    
+    Binary STL size is fully determined by its triangle count; files that
+    do not match and start with 'solid' are treated as ASCII.
+    """
+    size = path.stat().st_size
+    if size < _STL_HEADER_SIZE:
+        return None
+    with open(path, 'rb') as f:
+        header = f.read(_STL_HEADER_SIZE)
+    (count,) = struct.unpack_from('<I', header, 80)
+    expected = _STL_HEADER_SIZE + count * _STL_RECORD.itemsize
+    if size == expected or (size > expected and not header.startswith(b'solid')):
+        return count
+    return None
+
+
+def load_stl(filepath: str) -> Dict[str, np.ndarray]:
+    """
+    Load an STL file
+    
+    STL stores three independent corners per triangle, so vertices come
+    back unwelded (3 per face); run vertex welding to recover topology.
+    """
+    path = Path(filepath)
+    mesh = empty_mesh()
+    
+    count = _stl_triangle_count(path)
+    if count == 0:
+        return mesh
+    if count is not None:
+        records = np.memmap(path, dtype=_STL_RECORD, mode='r', offset=_STL_HEADER_SIZE, shape=(count,))
+        # Records are 50 bytes apart, so corners need one compacting copy
+        vertices = np.empty((len(records) * 3, 3), dtype=np.float32)
+        for start in range(0, len(records), _WRITE_CHUNK):
+            chunk = records['vertices'][start:start + _WRITE_CHUNK]
+            vertices[start * 3:(start + len(chunk)) * 3] = chunk.reshape(-1, 3)
+    else:
+        vertices = _load_ascii_stl(path)
+    
+    mesh['vertices'] = vertices
+    mesh['faces'] = np.arange(len(vertices), dtype=np.uint32).reshape(-1, 3)
+    return mesh
+
+
+def _load_ascii_stl(path: Path) -> np.ndarray:
+    """Parse 'vertex x y z' lines of an ASCII STL"""
+    coords = array('f')
+    with open(path, 'rb') as f:
+        for line in f:
+            line = line.strip()
+            if line.startswith(b'vertex'):
+                coords.extend(map(float, line.split()[1:4]))
+    vertices = np.frombuffer(coords, dtype=np.float32).reshape(-1, 3)
+    return vertices[:len(vertices) - len(vertices) % 3]
+
+
+# ===== OBJ =====
+
+def load_obj(filepath: str, split_seams: bool = False) -> Dict[str, np.ndarray]:
+    """
+    Stream an OBJ file into typed buffers
+    
+    The file is read in blocks of whole lines; each block's records are
+    parsed in bulk (one NumPy conversion per record type). Blocks with
+    relative indices or irregular records fall back to line-by-line
+    parsing. Polygons are fan-triangulated. Texture coordinates and
+    normals are kept as they are when they map one-to-one onto positions
+    (the usual layout of exported meshes). Otherwise, with split_seams
+    every distinct (position, texture coordinate, normal) corner becomes
+    its own vertex, as in glTF (unreferenced positions are dropped);
+    without it they are dropped with a warning, keeping the positions
+    welded for diagnosis and repair.
+    """
+    positions = array('f')
+    texcoords = array('f')
+    normals = array('f')
+    corners = (array('q'), array('q'), array('q'))
+    
+    with open(filepath, 'rb') as f:
+        tail = b''
+        while True:
+            block = f.read(_OBJ_BLOCK)
+            if not block:
+                lines = tail.split(b'\n')
+            else:
+                block = tail + block
+                cut = block.rfind(b'\n') + 1
+                lines, tail = block[:cut].split(b'\n'), block[cut:]
+            if b'#' in block or b'#' in tail:
+                # Comments may also trail a record (f 1 2 3 # tri)
+                lines = [line.split(b'#', 1)[0] for line in lines]
+            if not _parse_obj_block(lines, positions, texcoords, normals, corners):
+                _parse_obj_lines(lines, positions, texcoords, normals, corners)
+            if not block:
+                break
+    
+    corner_v, corner_vt, corner_vn = corners
+    mesh = empty_mesh()
+    vertices = np.frombuffer(positions, dtype=np.float32).reshape(-1, 3)
+    v_index = np.frombuffer(corner_v, dtype=np.int64)
+    mesh['vertices'] = vertices
+    if len(v_index) and (v_index.min() < 0 or v_index.max() >= len(vertices)):
+        raise ValueError(f"OBJ face references a vertex outside 1..{len(vertices)}")
+    mesh['faces'] = v_index.astype(np.uint32).reshape(-1, 3)
+    
+    # Attributes given on every corner, by mesh key
+    attributes = {}
+    for key, values, index in (
+        ('uvs', np.frombuffer(texcoords, dtype=np.float32).reshape(-1, 2), np.frombuffer(corner_vt, dtype=np.int64)),
+        ('normals', np.frombuffer(normals, dtype=np.float32).reshape(-1, 3), np.frombuffer(corner_vn, dtype=np.int64)),
+    ):
+        if len(values) and len(index) and not (index < 0).any():
+            if index.max() >= len(values):
+                raise ValueError(f"OBJ face references a missing {key[:-1]} ({index.max() + 1} of {len(values)})")
+            attributes[key] = (values, index)
+    
+    mapped = {
+        key: _per_vertex_attribute(values, v_index, index, len(vertices))
+        for key, (values, index) in attributes.items()
+    }
+    seams = [key for key, values in mapped.items() if values is None]
+    if seams and split_seams:
+        mesh['vertices'], mesh['faces'], mapped = _split_obj_corners(vertices, v_index, attributes)
+    elif seams:
+        logger.warning(f"OBJ {' and '.join(seams)} are not per-vertex; dropping them")
+    
+    for key, values in mapped.items():
+        if values is not None:
+            mesh[key] = values
+    return mesh
+
+
+def _parse_obj_lines(
+    lines: List[bytes],
+    positions: array,
+    texcoords: array,
+    normals: array,
+    corners: Tuple[array, array, array]
+) -> None:
+    """Parse OBJ records one line at a time"""
+    for line in lines:
+        if line.startswith(b'v '):
+            positions.extend(map(float, line.split()[1:4]))
+        elif line.startswith(b'vt '):
+            texcoords.extend(map(float, line.split()[1:3]))
+        elif line.startswith(b'vn '):
+            normals.extend(map(float, line.split()[1:4]))
+        elif line.startswith(b'f '):
+            _append_obj_face(
+                line.split()[1:],
+                len(positions) // 3, len(texcoords) // 2, len(normals) // 3,
+                *corners
+            )
+
+
+def _obj_floats(lines: List[bytes], width: int) -> Optional[np.ndarray]:
+    """
+    First width values of each record as float32, or None when the
+    records do not all have the same number of values
+    """
+    tokens = b' '.join(lines).split()
+    if not tokens:
+        return np.empty(0, dtype=np.float32)
+    columns = len(tokens) // len(lines)
+    if columns < width or columns * len(lines) != len(tokens):
+        return None
+    return np.array(tokens, dtype=np.float32).reshape(-1, columns)[:, :width].ravel()
+
+
+def _parse_obj_block(
+    lines: List[bytes],
+    positions: array,
+    texcoords: array,
+    normals: array,
+    corners: Tuple[array, array, array]
+) -> bool:
+    """
+    Parse a block of OBJ lines in bulk
+    
+    Returns:
+        False (with nothing appended) if the block needs line-by-line parsing
+    """
+    faces = [line[2:] for line in lines if line[:2] == b'f ']
+    face_text = b'\n'.join(faces)
+    # Relative indices depend on the records before each face
+    if b'-' in face_text:
+        return False
+    
+    records = []
+    for prefix, width, out in ((b'v ', 3, positions), (b'vt ', 2, texcoords), (b'vn ', 3, normals)):
+        size = len(prefix)
+        values = _obj_floats([line[size:] for line in lines if line[:size] == prefix], width)
+        if values is None:
+            return False
+        records.append((values, out))
+    
+    if faces:
+        # Tokens per polygon: token starts counted per line of the joined text
+        chars = np.frombuffer(face_text, dtype=np.uint8)
+        blank = chars <= 32
+        begins = ~blank
+        begins[1:] &= blank[:-1]
+        sizes = np.bincount(np.cumsum(chars == 10)[begins], minlength=len(faces))
+        if sizes.min() < 3:
+            return False
+        first = face_text.split(None, 1)[0]
+        fields = first.count(b'/') + 1
+        tokens = face_text.replace(b'//', b'/0/').replace(b'/', b' ').split()
+        if len(tokens) != int(sizes.sum()) * fields:
+            return False
+        try:
+            index = np.array(tokens, dtype=np.int64).reshape(-1, fields) - 1
+        except ValueError:
+            return False
+        
+        # Fan triangulation: corners 0, i, i + 1 of every polygon
+        fan = sizes - 2
+        polygon = np.repeat(np.arange(len(faces)), fan)
+        base = (np.cumsum(sizes) - sizes)[polygon]
+        step = np.arange(len(polygon)) - np.repeat(np.cumsum(fan) - fan, fan) + 1
+        triangles = np.column_stack([base, base + step, base + step + 1]).ravel()
+        
+        for column in range(3):
+            if column < fields:
+                # Absent attributes (index 0 in the file) are marked -1
+                corner = np.maximum(index[triangles, column], -1)
+            else:
+                corner = np.full(len(triangles), -1, dtype=np.int64)
+            records.append((corner, corners[column]))
+    
+    for values, out in records:
+        out.frombytes(values.tobytes())
+    return True
+
+
+def _append_obj_face(
+    tokens: List[bytes],
+    num_v: int,
+    num_vt: int,
+    num_vn: int,
+    corner_v: array,
+    corner_vt: array,
+    corner_vn: array
+) -> None:
+    """Resolve one OBJ face record and append it as a triangle fan"""
+    v = []
+    vt = []
+    vn = []
+    for token in tokens:
+        parts = token.split(b'/')
+        index = int(parts[0])
+        v.append(index - 1 if index > 0 else num_v + index)
+        
+        index = int(parts[1]) if len(parts) > 1 and parts[1] else 0
+        vt.append(index - 1 if index > 0 else (num_vt + index if index < 0 else -1))
+        
+        index = int(parts[2]) if len(parts) > 2 and parts[2] else 0
+        vn.append(index - 1 if index > 0 else (num_vn + index if index < 0 else -1))
+    
+    for i in range(1, len(v) - 1):
+        corner_v.extend((v[0], v[i], v[i + 1]))
+        corner_vt.extend((vt[0], vt[i], vt[i + 1]))
+        corner_vn.extend((vn[0], vn[i], vn[i + 1]))
+
+
+def _per_vertex_attribute(
+    values: np.ndarray,
+    v_index: np.ndarray,
+    a_index: np.ndarray,
+    num_vertices: int
+) -> Optional[np.ndarray]:
+    """Map per-corner attribute indices onto vertices if they agree"""
+    # Unreferenced vertices fall back to the attribute with the same index
+    lookup = np.minimum(np.arange(num_vertices), len(values) - 1)
+    lookup[v_index] = a_index
+    if not np.array_equal(lookup[v_index], a_index):
+        return None
+    
+    return values[lookup]
+
+
+def _split_obj_corners(
+    vertices: np.ndarray,
+    v_index: np.ndarray,
+    attributes: Dict[str, Tuple[np.ndarray, np.ndarray]]
+) -> Tuple[np.ndarray, np.ndarray, Dict[str, np.ndarray]]:
+    """
+    One vertex per distinct corner index tuple
+    
+    Args:
+        vertices: Positions
+        v_index: Position index of every corner
+        attributes: Mesh key -> (values, index of every corner)
+    
+    Returns:
+        (vertices, Fx3 faces, mesh key -> per-vertex values)
+    """
+    corners = np.column_stack([v_index] + [index for _, index in attributes.values()])
+    keys, inverse = np.unique(corners, axis=0, return_inverse=True)
+    mapped = {
+        key: values[keys[:, column]]
+        for column, (key, (values, _)) in enumerate(attributes.items(), start=1)
+    }
+    faces = inverse.reshape(-1).astype(np.uint32).reshape(-1, 3)
+    return vertices[keys[:, 0]], faces, mapped
+
+
+# ===== TMSH =====
+
+def load_tmsh(filepath: str) -> Dict[str, np.ndarray]:
+    """Load a TMSH container; arrays are views of the memory-mapped file"""
+    data = np.memmap(filepath, dtype=np.uint8, mode='r')
+    if len(data) < _TMSH_HEADER.size:
+        raise ValueError(f"Not a TMSH file: {filepath}")
+    magic, version, count = _TMSH_HEADER.unpack_from(data, 0)
+    if magic != _TMSH_MAGIC or version != _TMSH_VERSION:
+        raise ValueError(f"Not a TMSH file (or unsupported version): {filepath}")
+    
+    mesh = empty_mesh()
+    for i in range(count):
+        name, dtype, columns, rows, offset = _TMSH_ENTRY.unpack_from(
+            data, _TMSH_HEADER.size + i * _TMSH_ENTRY.size
+        )
+        name = name.rstrip(b'\0').decode('ascii')
+        dtype = np.dtype(dtype.rstrip(b'\0').decode('ascii'))
+        if offset + rows * columns * dtype.itemsize > len(data):
+            raise ValueError(f"Truncated TMSH array '{name}': {filepath}")
+        if name in mesh:
+            mesh[name] = np.ndarray((rows, columns), dtype=dtype, buffer=data, offset=offset)
+    return mesh
+
+
+# ===== Writers =====
+
+@timed('save')
+def save_mesh(filepath: str, mesh: Union[Mesh, Dict[str, Any]]) -> int:
+    """
+    Write a mesh using bulk array I/O
+    
+    Args:
+        filepath: Output path (.glb, .stl, .obj or .tmsh)
+        mesh: Mesh (or dictionary with vertices, faces and optional normals/uvs)
+    
+    Returns:
+        Number of bytes written
+    """
+    path = Path(filepath)
+    ext = path.suffix.lower()
+    
+    mesh = Mesh.from_any(mesh)
+    vertices = mesh.vertices
+    faces = mesh.faces
+    normals = mesh.normals if mesh.has_normals else None
+    uvs = mesh.uvs if mesh.has_uvs else None
+    
+    if ext in STREAM_FORMATS:
+        with open(path, 'wb') as f:
+            for chunk in mesh_chunks(mesh, ext):
+                f.write(chunk)
+    elif ext == '.stl':
+        _save_stl(path, vertices, faces)
+    elif ext == '.obj':
+        _save_obj(path, vertices, faces, normals, uvs)
+    else:
+        raise ValueError(f"Unsupported output format: {ext}")
+    
+    return path.stat().st_size
+
+
+def mesh_chunks(
+    mesh: Union[Mesh, Dict[str, Any]],
+    ext: str,
+    chunk_size: int = _STREAM_CHUNK
+) -> Iterator[Union[bytes, memoryview]]:
+    """
+    Serialize a mesh as a stream of byte chunks
+    
+    Only the headers are built in memory; array data is yielded as
+    memoryview slices of the mesh arrays themselves (no copies).
+    
+    Args:
+        mesh: Mesh (or mesh dictionary)
+        ext: Output format, one of STREAM_FORMATS
+        chunk_size: Largest chunk yielded for array data
+    
+    Returns:
+        Iterator over the bytes of the file
+    """
+    mesh = Mesh.from_any(mesh)
+    arrays = [('faces', mesh.faces), ('vertices', mesh.vertices)]
+    if mesh.has_normals:
+        arrays.append(('normals', mesh.normals))
+    if mesh.has_uvs:
+        arrays.append(('uvs', mesh.uvs))
+    
+    if ext == '.glb':
+        return _glb_chunks(arrays, chunk_size)
+    if ext == '.tmsh':
+        return _tmsh_chunks(arrays, chunk_size)
+    raise ValueError(f"Unsupported stream format: {ext}")
+
+
+def _array_chunks(data: np.ndarray, chunk_size: int) -> Iterator[memoryview]:
+    """Contiguous array as memoryview slices of at most chunk_size bytes"""
+    if data.nbytes == 0:
+        return
+    view = memoryview(np.ascontiguousarray(data)).cast('B')
+    for start in range(0, len(view), chunk_size):
+        yield view[start:start + chunk_size]
+
+
+def _pad4(length: int) -> int:
+    """Padding needed to reach 4-byte alignment"""
+    return (4 - length % 4) % 4
+
+
+# glTF layout of each mesh array: attribute, component type, type, target
+_GLB_ARRAYS = {
+    'faces': ('indices', 5125, 'SCALAR', 34963),
+    'vertices': ('POSITION', 5126, 'VEC3', 34962),
+    'normals': ('NORMAL', 5126, 'VEC3', 34962),
+    'uvs': ('TEXCOORD_0', 5126, 'VEC2', 34962),
+}
+
+
+def _glb_chunks(
+    arrays: List[Tuple[str, np.ndarray]],
+    chunk_size: int
+) -> Iterator[Union[bytes, memoryview]]:
+    """Single-primitive GLB with one binary buffer"""
+    buffer_views = []
+    accessors = []
+    attributes = {}
+    offset = 0
+    for key, data in arrays:
+        name, component, kind, target = _GLB_ARRAYS[key]
+        nbytes = data.nbytes
+        buffer_views.append({'buffer': 0, 'byteOffset': offset, 'byteLength': nbytes, 'target': target})
+        accessor = {
+            'bufferView': len(buffer_views) - 1,
+            'componentType': component,
+            'count': int(data.size // _TYPE_SIZES[kind]),
+            'type': kind,
+        }
+        if name == 'POSITION' and len(data):
+            accessor['min'] = data.min(axis=0).tolist()
+            accessor['max'] = data.max(axis=0).tolist()
+        accessors.append(accessor)
+        if name != 'indices':
+            attributes[name] = len(accessors) - 1
+        offset += nbytes + _pad4(nbytes)
+    
+    document = {
+        'asset': {'version': '2.0', 'generator': 'Teeli Geometry Engine'},
+        'scene': 0,
+        'scenes': [{'nodes': [0]}],
+        'nodes': [{'mesh': 0}],
+        'meshes': [{'primitives': [{'attributes': attributes, 'indices': 0, 'mode': _MODE_TRIANGLES}]}],
+        'accessors': accessors,
+        'bufferViews': buffer_views,
+        'buffers': [{'byteLength': offset}],
+    }
+    json_bytes = json.dumps(document, separators=(',', ':')).encode('utf-8')
+    json_bytes += b' ' * _pad4(len(json_bytes))
+    total = 12 + 8 + len(json_bytes) + 8 + offset
+    
+    yield (
+        struct.pack('<4sII', _GLB_MAGIC, 2, total)
+        + struct.pack('<II', len(json_bytes), _CHUNK_JSON)
+        + json_bytes
+        + struct.pack('<II', offset, _CHUNK_BIN)
+    )
+    for _, data in arrays:
+        yield from _array_chunks(data, chunk_size)
+        if _pad4(data.nbytes):
+            yield b'\0' * _pad4(data.nbytes)
+
+
+def _tmsh_chunks(
+    arrays: List[Tuple[str, np.ndarray]],
+    chunk_size: int
+) -> Iterator[Union[bytes, memoryview]]:
+    """TMSH container: header and array table, then the aligned arrays"""
+    def padding(length: int) -> int:
+        return (_TMSH_ALIGN - length % _TMSH_ALIGN) % _TMSH_ALIGN
+    
+    header_size = _TMSH_HEADER.size + len(arrays) * _TMSH_ENTRY.size
+    offset = header_size + padding(header_size)
+    header = [_TMSH_HEADER.pack(_TMSH_MAGIC, _TMSH_VERSION, len(arrays))]
+    for name, data in arrays:
+        header.append(_TMSH_ENTRY.pack(
+            name.encode('ascii'), data.dtype.str.encode('ascii'), data.shape[1], data.shape[0], offset
+        ))
+        offset += data.nbytes + padding(data.nbytes)
+    header.append(b'\0' * padding(header_size))
+    
+    yield b''.join(header)
+    for _, data in arrays:
+        yield from _array_chunks(data, chunk_size)
+        if padding(data.nbytes):
+            yield b'\0' * padding(data.nbytes)
+
+
+def _save_stl(path: Path, vertices: np.ndarray, faces: np.ndarray) -> None:
+    """Write a binary STL, building records chunk by chunk"""
+    with open(path, 'wb') as f:
+        f.write(b'Teeli Geometry Engine'.ljust(80, b' '))
+        f.write(struct.pack('<I', len(faces)))
+        for start in range(0, len(faces), _WRITE_CHUNK):
+            chunk = faces[start:start + _WRITE_CHUNK]
+            records = np.zeros(len(chunk), dtype=_STL_RECORD)
+            records['vertices'] = vertices[chunk]
+            records['normal'] = batch_face_normals(vertices, chunk)
+            records.tofile(f)
+
+
+def _save_obj(
+    path: Path,
+    vertices: np.ndarray,
+    faces: np.ndarray,
+    normals: Optional[np.ndarray],
+    uvs: Optional[np.ndarray]
+) -> None:
+    """Write an OBJ with per-vertex attributes"""
+    if normals is not None and uvs is not None:
+        face_format = 'f %d/%d/%d %d/%d/%d %d/%d/%d'
+        repeat = 3
+    elif uvs is not None:
+        face_format = 'f %d/%d %d/%d %d/%d'
+        repeat = 2
+    elif normals is not None:
+        face_format = 'f %d//%d %d//%d %d//%d'
+        repeat = 2
+    else:
+        face_format = 'f %d %d %d'
+        repeat = 1
+    
+    with open(path, 'w') as f:
+        f.write('# Teeli Geometry Engine\n')
+        _write_rows(f, vertices, 'v %.9g %.9g %.9g')
+        if uvs is not None:
+            _write_rows(f, uvs, 'vt %.9g %.9g')
+        if normals is not None:
+            _write_rows(f, normals, 'vn %.9g %.9g %.9g')
+        for start in range(0, len(faces), _WRITE_CHUNK):
+            chunk = faces[start:start + _WRITE_CHUNK].astype(np.int64) + 1
+            _write_rows(f, np.repeat(chunk, repeat, axis=1), face_format)
+
+
+def _write_rows(f: Any, data: np.ndarray, row_format: str) -> None:
+    """
+    Write rows of a 2D array as text lines
+    
+    Each chunk is formatted by a single %-operation over all its values
+    (np.savetxt formats row by row in Python).
+    """
+    for start in range(0, len(data), _TEXT_CHUNK):
+        chunk = data[start:start + _TEXT_CHUNK]
+        f.write((row_format + '\n') * len(chunk) % tuple(chunk.ravel().tolist()))
@@ -0,0 +1,317 @@
+"""Instrumentation
+
+Per-request spans and process-wide metrics:
+- span(name) / @timed(name) time a block with perf_counter_ns into the
+  active Trace; without one they cost a single ContextVar lookup
+- A Trace can also record per-span allocation peaks (tracemalloc) and
+  peak RSS (resource); both are opt-in as tracemalloc slows allocation
+- MetricsRegistry aggregates finished traces into Prometheus-style
+  histograms (latency by operation and mesh-size bucket, time per stage)
+- run_traced executes one call under a Trace, optionally under cProfile
+  with the stats dumped to a file
+"""
+
+import time
+import cProfile
+import threading
+import contextvars
+import tracemalloc
+from contextlib import nullcontext
+from functools import wraps
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+# Upper bounds (seconds) of the latency histograms
+LATENCY_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+
+# Mesh-size buckets by face count: (upper bound, label)
+SIZE_BUCKETS = (
+    (10_000, 'lt_10k'),
+    (100_000, '10k_100k'),
+    (1_000_000, '100k_1m'),
+    (10_000_000, '1m_10m'),
+)
+
+_active = contextvars.ContextVar('geometry_trace', default=None)
+_NULL_SPAN = nullcontext()
+_MB = 1024 * 1024
+
+
+def size_bucket(num_faces: Optional[int]) -> str:
+    """Histogram label for a mesh of num_faces faces"""
+    if num_faces is None:
+        return 'unknown'
+    for bound, label in SIZE_BUCKETS:
+        if num_faces < bound:
+            return label
+    return 'ge_10m'
+
+
+def _max_rss_bytes() -> Optional[int]:
+    """Peak resident set size of this process (None where unsupported)"""
+    if resource is None:
+        return None
+    # ru_maxrss is in kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+class Trace:
+    """Spans recorded while one request is processed"""
+    
+    def __init__(self, memory: bool = False):
+        """
+        Args:
+            memory: Also record allocation peaks (tracemalloc) and peak RSS
+                per span (process-wide counters, so only exact while one
+                traced request runs per process)
+        """
+        self.memory = memory
+        self.spans = []
+        self.faces = None
+        self.elapsed = None
+        self._start = None
+        self._stack = []
+        self._owns_tracemalloc = False
+        self._token = None
+    
+    def __enter__(self) -> 'Trace':
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._owns_tracemalloc = True
+        self._token = _active.set(self)
+        self._start = time.perf_counter_ns()
+        return self
+    
+    def __exit__(self, *exc: Any) -> None:
+        self.elapsed = (time.perf_counter_ns() - self._start) / 1e9
+        _active.reset(self._token)
+        if self._owns_tracemalloc:
+            tracemalloc.stop()
+            self._owns_tracemalloc = False
+    
+    def note_mesh(self, num_faces: int) -> None:
+        """Size of the request's input mesh (the first mesh noted wins)"""
+        if self.faces is None:
+            self.faces = int(num_faces)
+    
+    def report(self) -> Dict[str, Any]:
+        """Picklable / JSON-safe summary"""
+        return {
+            'elapsed': self.elapsed,
+            'faces': self.faces,
+            'spans': self.spans,
+        }
+
+
+class _Span:
+    """Context manager of one span of an active Trace"""
+    
+    __slots__ = ('trace', 'name', 'start', 'alloc_base', 'alloc_peak', 'rss_base')
+    
+    def __init__(self, trace: Trace, name: str):
+        self.trace = trace
+        self.name = name
+    
+    def __enter__(self) -> '_Span':
+        trace = self.trace
+        if trace.memory:
+            current, peak = tracemalloc.get_traced_memory()
+            # The global peak is reset per span; hand the parent what it saw so far
+            if trace._stack:
+                parent = trace._stack[-1]
+                parent.alloc_peak = max(parent.alloc_peak, peak)
+            tracemalloc.reset_peak()
+            self.alloc_base = current
+            self.alloc_peak = current
+            self.rss_base = _max_rss_bytes()
+            trace._stack.append(self)
+        self.start = time.perf_counter_ns()
+        return self
+    
+    def __exit__(self, *exc: Any) -> None:
+        elapsed = time.perf_counter_ns() - self.start
+        trace = self.trace
+        entry = {'name': self.name, 'seconds': elapsed / 1e9}
+        if trace.memory:
+            trace._stack.pop()
+            self.alloc_peak = max(self.alloc_peak, tracemalloc.get_traced_memory()[1])
+            if trace._stack:
+                parent = trace._stack[-1]
+                parent.alloc_peak = max(parent.alloc_peak, self.alloc_peak)
+            entry['alloc_peak_mb'] = round((self.alloc_peak - self.alloc_base) / _MB, 3)
+            rss = _max_rss_bytes()
+            if rss is not None:
+                entry['rss_peak_mb'] = round(rss / _MB, 1)
+                entry['rss_growth_mb'] = round((rss - self.rss_base) / _MB, 1)
+        trace.spans.append(entry)
+
+
+def span(name: str) -> Any:
+    """Time a block as a span of the active trace (no-op without one)"""
+    trace = _active.get()
+    if trace is None:
+        return _NULL_SPAN
+    return _Span(trace, name)
+
+
+def timed(name: Optional[str] = None) -> Callable:
+    """Decorator recording each call as a span (default name: qualname)"""
+    def decorate(func: Callable) -> Callable:
+        label = name or func.__qualname__
+        
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            trace = _active.get()
+            if trace is None:
+                return func(*args, **kwargs)
+            with _Span(trace, label):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def note_mesh(num_faces: int) -> None:
+    """Record the input mesh size on the active trace"""
+    trace = _active.get()
+    if trace is not None:
+        trace.note_mesh(num_faces)
+
+
+def run_traced(
+    func: Callable,
+    args: Iterable[Any] = (),
+    memory: bool = False,
+    profile_path: Optional[str] = None
+) -> Tuple[Any, Dict[str, Any]]:
+    """
+    Call func(*args) under a new Trace
+    
+    Args:
+        func: Function to call
+        args: Positional arguments
+        memory: Record allocation peaks and peak RSS per span
+        profile_path: If set, run under cProfile and dump the stats here
+            (readable with pstats / snakeviz)
+    
+    Returns:
+        (func's return value, trace report)
+    """
+    with Trace(memory) as trace:
+        if profile_path is None:
+            result = func(*args)
+        else:
+            profiler = cProfile.Profile()
+            try:
+                result = profiler.runcall(func, *args)
+            finally:
+                profiler.dump_stats(profile_path)
+    return result, trace.report()
+
+
+# ===== Aggregation =====
+
+class Histogram:
+    """Cumulative Prometheus histogram with one series per label set"""
+    
+    def __init__(self, name: str, help_text: str, labels: Tuple[str, ...], buckets: Tuple[float, ...]):
+        self.name = name
+        self.help = help_text
+        self.labels = labels
+        self.buckets = buckets
+        self._series = {}
+    
+    def observe(self, value: float, *label_values: str) -> None:
+        series = self._series.get(label_values)
+        if series is None:
+            # [bucket counts..., +Inf count, sum]
+            series = self._series[label_values] = [0] * (len(self.buckets) + 1) + [0.0]
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                series[i] += 1
+        series[-2] += 1
+        series[-1] += value
+    
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for label_values, series in sorted(self._series.items()):
+            labels = ','.join(f'{k}="{v}"' for k, v in zip(self.labels, label_values))
+            prefix = labels + ',' if labels else ''
+            for bound, count in zip(self.buckets, series):
+                lines.append(f'{self.name}_bucket{{{prefix}le="{bound:g}"}} {count}')
+            lines.append(f'{self.name}_bucket{{{prefix}le="+Inf"}} {series[-2]}')
+            lines.append(f'{self.name}_sum{{{labels}}} {series[-1]:.6f}')
+            lines.append(f'{self.name}_count{{{labels}}} {series[-2]}')
+        return lines
+
+
+class MetricsRegistry:
+    """Process-wide aggregation of finished requests (thread-safe)"""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latency = Histogram(
+            'geometry_operation_seconds', 'Operation latency by mesh size',
+            ('operation', 'size', 'cached'), LATENCY_BUCKETS
+        )
+        self.stages = Histogram(
+            'geometry_stage_seconds', 'Time spent per stage',
+            ('operation', 'stage'), LATENCY_BUCKETS
+        )
+        self.jobs = {}
+        self.alloc_peaks = {}
+        self.rss_peaks = {}
+    
+    def record(self, operation: str, status: str, report: Optional[Dict[str, Any]], cached: bool = False) -> None:
+        """
+        Add one finished request
+        
+        Args:
+            operation: Operation name
+            status: Final job status
+            report: Trace report (see Trace.report), None if not traced
+            cached: Result came from the cache
+        """
+        with self._lock:
+            self.jobs[(operation, status)] = self.jobs.get((operation, status), 0) + 1
+            if not report:
+                return
+            self.latency.observe(
+                report['elapsed'], operation, size_bucket(report['faces']), str(cached).lower()
+            )
+            for entry in report['spans']:
+                key = (operation, entry['name'])
+                self.stages.observe(entry['seconds'], *key)
+                if 'alloc_peak_mb' in entry:
+                    self.alloc_peaks[key] = max(self.alloc_peaks.get(key, 0.0), entry['alloc_peak_mb'])
+                if 'rss_peak_mb' in entry:
+                    self.rss_peaks[key] = max(self.rss_peaks.get(key, 0.0), entry['rss_peak_mb'])
+    
+    def render(self, gauges: Optional[Dict[str, float]] = None) -> str:
+        """
+        Prometheus text exposition
+        
+        Args:
+            gauges: Extra point-in-time values (name -> value)
+        """
+        with self._lock:
+            lines = ['# HELP geometry_jobs_total Finished jobs', '# TYPE geometry_jobs_total counter']
+            for (operation, status), count in sorted(self.jobs.items()):
+                lines.append(f'geometry_jobs_total{{operation="{operation}",status="{status}"}} {count}')
+            lines += self.latency.render()
+            lines += self.stages.render()
+            for name, help_text, values in (
+                ('geometry_stage_alloc_peak_megabytes', 'Largest traced allocation peak per stage', self.alloc_peaks),
+                ('geometry_stage_rss_peak_megabytes', 'Largest worker peak RSS seen at the end of a stage', self.rss_peaks),
+            ):
+                if not values:
+                    continue
+                lines += [f"# HELP {name} {help_text}", f"# TYPE {name} gauge"]
+                for (operation, stage), value in sorted(values.items()):
+                    lines.append(f'{name}{{operation="{operation}",stage="{stage}"}} {value}')
+        for name, value in (gauges or {}).items():
+            lines += [f"# TYPE {name} gauge", f"{name} {value}"]
+        return '\n'.join(lines) + '\n'
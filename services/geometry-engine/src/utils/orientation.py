@@ -0,0 +1,241 @@
+"""Face Orientation
+
+Winding consistency and shell orientation on whole arrays:
+- Two faces sharing a manifold edge are consistently wound when they
+  traverse the edge in opposite directions; traversing it the same way is
+  a winding conflict
+- Shells (faces connected through manifold edges) are oriented by a
+  breadth-first search over the CSR face adjacency; the frontiers of all
+  shells advance together, so hundreds of disconnected shells take no
+  more rounds than the largest one
+- Closed shells with negative signed volume are inside out
+"""
+
+import numpy as np
+from typing import Dict, Optional, Tuple
+
+from utils.topology import EdgeTable, face_adjacency, shell_labels
+
+# Counts of an orientation summary (see orient_faces)
+ORIENTATION_COUNTS = (
+    'shells', 'closed_shells', 'winding_conflicts',
+    'inconsistent_shells', 'non_orientable_shells', 'inverted_shells'
+)
+
+
+def winding_conflicts(faces: np.ndarray, edge_table: EdgeTable) -> np.ndarray:
+    """
+    Manifold edges whose two faces traverse them in the same direction
+    
+    Returns:
+        Boolean per entry of edge_table.manifold_slots()
+    """
+    first, second = edge_table.manifold_slots()
+    flat = faces.ravel()
+    return flat[first] == flat[second]
+
+
+def bbox_center(vertices: np.ndarray) -> np.ndarray:
+    """Centre of the bounding box of vertices (float64)"""
+    return (vertices.min(axis=0).astype(np.float64) + vertices.max(axis=0)) / 2
+
+
+def signed_volumes(
+    vertices: np.ndarray,
+    faces: np.ndarray,
+    center: Optional[np.ndarray] = None,
+    chunk_size: int = 1 << 20
+) -> np.ndarray:
+    """
+    Six times the signed volume of the tetrahedron each face spans with
+    the bounding-box centre, or the given centre (summed over a closed
+    shell: positive when the faces point outwards)
+    """
+    if center is None:
+        center = bbox_center(vertices)
+    volume = np.empty(len(faces), dtype=np.float64)
+    for start in range(0, len(faces), chunk_size):
+        chunk = faces[start:start + chunk_size]
+        p = [vertices[chunk[:, k]] - center for k in range(3)]
+        volume[start:start + len(chunk)] = np.einsum('ij,ij->i', p[0], np.cross(p[1], p[2]))
+    return volume
+
+
+def propagate_parity(
+    num_faces: int,
+    roots: np.ndarray,
+    conflict: np.ndarray,
+    edge_table: EdgeTable
+) -> np.ndarray:
+    """
+    Flip parity of every face relative to the root of its shell
+    
+    A face reached across a conflicting edge gets the opposite parity of
+    the face it was reached from.
+    """
+    offsets, neighbors, links = face_adjacency(num_faces, edge_table)
+    parity = np.zeros(num_faces, dtype=bool)
+    visited = np.zeros(num_faces, dtype=bool)
+    visited[roots] = True
+    frontier = roots
+    
+    while len(frontier):
+        starts = offsets[frontier]
+        counts = offsets[frontier + 1] - starts
+        total = int(counts.sum())
+        if total == 0:
+            break
+        source = np.repeat(frontier, counts)
+        position = np.arange(total) + np.repeat(starts - (np.cumsum(counts) - counts), counts)
+        target = neighbors[position]
+        fresh = ~visited[target]
+        
+        # A face reached from several frontier faces takes the first one
+        target, index = np.unique(target[fresh], return_index=True)
+        source = source[fresh][index]
+        link = links[position[fresh][index]]
+        parity[target] = parity[source] ^ conflict[link]
+        visited[target] = True
+        frontier = target
+    
+    return parity
+
+
+def _orient_shells(
+    vertices: np.ndarray,
+    faces: np.ndarray,
+    edge_table: EdgeTable,
+    label: Optional[np.ndarray],
+    center: Optional[np.ndarray]
+) -> Tuple[np.ndarray, np.ndarray, Dict[str, np.ndarray], np.ndarray]:
+    """
+    Shared part of orient_faces and orient_components
+    
+    Returns:
+        (flip, roots, per-root shell flags, faces of the conflicting edges)
+    """
+    num_faces = len(faces)
+    first, second = edge_table.manifold_slots()
+    f1 = first // 3
+    f2 = second // 3
+    conflict = winding_conflicts(faces, edge_table)
+    
+    # Shells are labelled by their smallest face index
+    if label is None:
+        label = shell_labels(num_faces, edge_table)
+    roots = np.flatnonzero(label == np.arange(num_faces))
+    parity = propagate_parity(num_faces, roots, conflict, edge_table)
+    
+    # Conflicts left after the flips cannot be resolved (e.g. a Moebius strip)
+    residual = conflict ^ parity[f1] ^ parity[f2]
+    
+    # Open shells have a face on a boundary or non-manifold edge
+    open_edges = edge_table.counts[edge_table.face_edges] != 2
+    is_open = np.zeros(num_faces, dtype=bool)
+    is_open[np.unique(label[open_edges.any(axis=1)])] = True
+    
+    # Signed volume of each shell as currently wound
+    volume = signed_volumes(vertices, faces, center)
+    shell_volume = np.bincount(label, weights=np.where(parity, -volume, volume), minlength=num_faces)
+    shell_flips = np.bincount(label, weights=parity, minlength=num_faces)
+    shell_size = np.bincount(label, minlength=num_faces)
+    
+    # Turn the whole shell when the consistent orientation points inwards
+    # (closed) or would flip most of its faces (open)
+    turn = np.where(is_open, shell_flips * 2 > shell_size, shell_volume < 0)
+    flip = parity ^ turn[label]
+    
+    inconsistent = np.zeros(num_faces, dtype=bool)
+    inconsistent[label[f1[conflict]]] = True
+    non_orientable = np.zeros(num_faces, dtype=bool)
+    non_orientable[label[f1[residual]]] = True
+    closed = ~is_open[roots]
+    
+    shells = {
+        'closed_shells': closed,
+        'inconsistent_shells': inconsistent[roots],
+        'non_orientable_shells': non_orientable[roots],
+        'inverted_shells': closed & ~inconsistent[roots] & (shell_volume[roots] < 0),
+    }
+    return flip, roots, shells, f1[conflict]
+
+
+def orient_faces(
+    vertices: np.ndarray,
+    faces: np.ndarray,
+    edge_table: EdgeTable,
+    label: Optional[np.ndarray] = None,
+    center: Optional[np.ndarray] = None
+) -> Tuple[np.ndarray, Dict[str, int]]:
+    """
+    Faces to flip for consistent, outward-facing winding
+    
+    Within each shell the faces are made consistent with each other.
+    Closed shells are then turned so their signed volume is positive;
+    open shells keep the orientation of the majority of their faces.
+    
+    Args:
+        vertices: Vx3 vertex positions
+        faces: Fx3 vertex indices
+        edge_table: Edge table of the faces
+        label: Optional precomputed shell labels (see utils.topology.shell_labels)
+        center: Reference point of the signed volumes (default: the
+            bounding-box centre of vertices)
+    
+    Returns:
+        (flip, summary): per-face flip flags, and counts of shells,
+        closed_shells, winding_conflicts (edges), inconsistent_shells,
+        non_orientable_shells and inverted_shells (closed, consistently
+        wound and inside out)
+    """
+    summary = dict.fromkeys(ORIENTATION_COUNTS, 0)
+    if len(faces) == 0:
+        return np.zeros(0, dtype=bool), summary
+    
+    flip, roots, shells, conflicts = _orient_shells(vertices, faces, edge_table, label, center)
+    summary['shells'] = len(roots)
+    summary['winding_conflicts'] = len(conflicts)
+    for key, flags in shells.items():
+        summary[key] = int(np.count_nonzero(flags))
+    return flip, summary
+
+
+def orient_components(
+    vertices: np.ndarray,
+    faces: np.ndarray,
+    edge_table: EdgeTable,
+    component: np.ndarray,
+    num_components: int,
+    label: Optional[np.ndarray] = None,
+    center: Optional[np.ndarray] = None
+) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+    """
+    orient_faces with the summary broken down by connected component
+    
+    Args:
+        vertices, faces, edge_table, label, center: As for orient_faces
+        component: Per-face component index (every shell lies inside
+            one component)
+        num_components: Number of components
+    
+    Returns:
+        (flip, counts): the flip flags of orient_faces, and every summary
+        count as an array with one entry per component
+    """
+    counts = {key: np.zeros(num_components, dtype=np.int64) for key in ORIENTATION_COUNTS}
+    if len(faces) == 0:
+        return np.zeros(0, dtype=bool), counts
+    
+    flip, roots, shells, conflicts = _orient_shells(vertices, faces, edge_table, label, center)
+    counts['shells'] = np.bincount(component[roots], minlength=num_components)
+    counts['winding_conflicts'] = np.bincount(component[conflicts], minlength=num_components)
+    for key, flags in shells.items():
+        counts[key] = np.bincount(component[roots[flags]], minlength=num_components)
+    return flip, counts
+
+
+def flip_faces(faces: np.ndarray, flip: np.ndarray) -> np.ndarray:
+    """Copy of faces with the winding of flagged faces reversed"""
+    faces = faces.copy()
+    faces[flip] = faces[flip][:, [0, 2, 1]]
+    return faces
@@ -0,0 +1,331 @@
+"""Mesh Topology Utilities
+
+Vectorized connectivity structures shared by diagnosis and repair:
+- Undirected edge table (unique edges, face counts, per-face edge ids)
+- Boundary and non-manifold edge queries
+- Face adjacency across manifold edges (CSR) and shell labels
+- Vertex compaction after faces are removed
+- Incremental edge table updates for repair edits (removed, flipped or
+  appended faces, renumbered vertices)
+
+All builders work on whole index arrays at once; there are no
+Python-level loops over faces, so they scale to tens of millions of
+triangles.
+"""
+
+import numpy as np
+from typing import Optional, Tuple
+
+from utils.metrics import timed
+
+# Vertex indices are packed two-per-key into 64-bit edge keys
+_KEY_SHIFT = np.uint64(32)
+_KEY_MASK = np.uint64(0xFFFFFFFF)
+
+
+def face_edge_keys(faces: np.ndarray) -> np.ndarray:
+    """
+    Pack the three edges of every face into undirected 64-bit keys
+    
+    Edge k of face f runs from faces[f, k] to faces[f, (k + 1) % 3].
+    Each key stores the smaller vertex index in the high 32 bits and
+    the larger one in the low 32 bits, so both directions of an edge
+    map to the same key.
+    
+    Args:
+        faces: Fx3 array of vertex indices
+    
+    Returns:
+        Fx3 uint64 array of edge keys
+    """
+    faces = np.asarray(faces)
+    a = faces.astype(np.uint64, copy=False)
+    b = np.roll(a, -1, axis=1)
+    lo = np.minimum(a, b)
+    hi = np.maximum(a, b)
+    lo <<= _KEY_SHIFT
+    lo |= hi
+    return lo
+
+
+def unpack_edge_keys(keys: np.ndarray) -> np.ndarray:
+    """Unpack 64-bit edge keys into an Ex2 array of (low, high) vertex indices"""
+    edges = np.empty((len(keys), 2), dtype=np.int64)
+    edges[:, 0] = keys >> _KEY_SHIFT
+    edges[:, 1] = keys & _KEY_MASK
+    return edges
+
+
+class EdgeTable:
+    """
+    Unique undirected edges of a triangle mesh
+    
+    Attributes:
+        keys: E sorted uint64 edge keys
+        counts: E number of faces using each edge
+        face_edges: Fx3 index into keys for every face edge
+    """
+    
+    __slots__ = ('keys', 'counts', 'face_edges', '_edges', '_manifold_slots')
+    
+    def __init__(
+        self,
+        keys: np.ndarray,
+        counts: np.ndarray,
+        face_edges: Optional[np.ndarray] = None
+    ):
+        self.keys = keys
+        self.counts = counts
+        self.face_edges = face_edges
+        self._edges = None
+        self._manifold_slots = None
+    
+    @classmethod
+    @timed('topology.edge_table')
+    def from_faces(cls, faces: np.ndarray) -> 'EdgeTable':
+        """
+        Build the edge table for a triangle mesh
+        
+        Args:
+            faces: Fx3 array of vertex indices
+        
+        Returns:
+            EdgeTable with one entry per distinct undirected edge
+        """
+        faces = np.asarray(faces)
+        if faces.size == 0:
+            return cls(
+                np.empty(0, dtype=np.uint64),
+                np.empty(0, dtype=np.int64),
+                np.empty((0, 3), dtype=np.int64)
+            )
+        
+        keys = face_edge_keys(faces).ravel()
+        unique_keys, inverse, counts = np.unique(
+            keys, return_inverse=True, return_counts=True
+        )
+        return cls(unique_keys, counts, inverse.reshape(-1, 3))
+    
+    def __len__(self) -> int:
+        return len(self.keys)
+    
+    @property
+    def edges(self) -> np.ndarray:
+        """Ex2 vertex indices of every unique edge"""
+        if self._edges is None:
+            self._edges = unpack_edge_keys(self.keys)
+        return self._edges
+    
+    @property
+    def boundary_mask(self) -> np.ndarray:
+        """Edges used by exactly one face (open boundaries / holes)"""
+        return self.counts == 1
+    
+    @property
+    def non_manifold_mask(self) -> np.ndarray:
+        """Edges shared by more than two faces"""
+        return self.counts > 2
+    
+    def boundary_edges(self) -> np.ndarray:
+        """Bx2 vertex indices of boundary edges"""
+        return self.edges[self.boundary_mask]
+    
+    def non_manifold_edges(self) -> np.ndarray:
+        """Nx2 vertex indices of non-manifold edges"""
+        return self.edges[self.non_manifold_mask]
+    
+    def manifold_slots(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        The two face-edge slots of every manifold edge
+        
+        Slot 3 * f + k is edge k of face f (from faces[f, k] to
+        faces[f, (k + 1) % 3]).
+        
+        Returns:
+            (first, second): slot arrays with one entry per edge shared by
+            exactly two faces (first < second)
+        """
+        if self._manifold_slots is None:
+            # Repeated fancy assignment keeps the last value written
+            edge_ids = self.face_edges.ravel()
+            slot_ids = np.arange(len(edge_ids))
+            first = np.empty(len(self.keys), dtype=np.int64)
+            last = np.empty(len(self.keys), dtype=np.int64)
+            first[edge_ids[::-1]] = slot_ids[::-1]
+            last[edge_ids] = slot_ids
+            manifold = self.counts == 2
+            self._manifold_slots = (first[manifold], last[manifold])
+        return self._manifold_slots
+    
+    # ===== Incremental updates =====
+    # Each returns a new table (tables may be shared between meshes)
+    
+    def without_faces(self, remove: np.ndarray) -> 'EdgeTable':
+        """Table of the faces left after removing the masked ones"""
+        face_edges = self.face_edges[~remove]
+        counts = self.counts - np.bincount(self.face_edges[remove].ravel(), minlength=len(self.keys))
+        alive = counts > 0
+        renumber = np.cumsum(alive) - 1
+        return EdgeTable(self.keys[alive], counts[alive], renumber[face_edges])
+    
+    def flipped(self, flip: np.ndarray) -> 'EdgeTable':
+        """
+        Table after reversing the winding of the flagged faces
+        (vertex order 0, 2, 1; see utils.orientation.flip_faces)
+        
+        The edges are unchanged; only the slots of flipped faces move
+        (edge 0 becomes edge 2 and vice versa).
+        """
+        face_edges = self.face_edges.copy()
+        face_edges[flip] = face_edges[flip][:, ::-1]
+        table = EdgeTable(self.keys, self.counts, face_edges)
+        table._edges = self._edges
+        return table
+    
+    def renumbered(self, remap: np.ndarray) -> 'EdgeTable':
+        """
+        Table after renumbering vertices (faces -> remap[faces])
+        
+        Edges whose endpoints merge are combined by sorting the E edge
+        keys instead of the 3F face-edge keys.
+        """
+        edges = remap[self.edges].astype(np.uint64)
+        keys = np.minimum(edges[:, 0], edges[:, 1]) << _KEY_SHIFT
+        keys |= np.maximum(edges[:, 0], edges[:, 1])
+        if len(keys) < 2 or (keys[1:] > keys[:-1]).all():
+            # Order-preserving renumbering (e.g. compaction)
+            return EdgeTable(keys, self.counts, self.face_edges)
+        unique_keys, inverse = np.unique(keys, return_inverse=True)
+        counts = np.bincount(inverse, weights=self.counts, minlength=len(unique_keys)).astype(np.int64)
+        return EdgeTable(unique_keys, counts, inverse[self.face_edges])
+    
+    def with_faces(self, faces: np.ndarray) -> 'EdgeTable':
+        """Table after appending faces (existing edge ids may shift)"""
+        new_keys = face_edge_keys(faces).ravel()
+        position = np.searchsorted(self.keys, new_keys)
+        found = position < len(self.keys)
+        found[found] = self.keys[position[found]] == new_keys[found]
+        fresh = np.unique(new_keys[~found])
+        
+        # Both runs are sorted, so the stable (merge) sort is linear
+        merged = np.concatenate([self.keys, fresh])
+        order = np.argsort(merged, kind='stable')
+        rank = np.empty(len(merged), dtype=np.int64)
+        rank[order] = np.arange(len(merged))
+        
+        new_edges = np.empty(len(new_keys), dtype=np.int64)
+        new_edges[found] = rank[position[found]]
+        new_edges[~found] = rank[len(self.keys) + np.searchsorted(fresh, new_keys[~found])]
+        counts = np.zeros(len(merged), dtype=np.int64)
+        counts[rank[:len(self.keys)]] = self.counts
+        counts += np.bincount(new_edges, minlength=len(merged))
+        face_edges = np.concatenate([rank[self.face_edges], new_edges.reshape(-1, 3)])
+        return EdgeTable(merged[order], counts, face_edges)
+
+
+def connected_components(
+    num_nodes: int,
+    a: np.ndarray,
+    b: np.ndarray
+) -> np.ndarray:
+    """
+    Label connected components of an undirected graph given as edge arrays
+    
+    Uses vectorized hooking (attach the larger root to the smaller one)
+    followed by pointer jumping, so each round is a handful of whole-array
+    operations and the number of rounds grows only logarithmically in
+    practice.
+    
+    Args:
+        num_nodes: Number of nodes
+        a, b: Endpoint arrays of the edges
+    
+    Returns:
+        Per-node label equal to the smallest node index in its component
+    """
+    label = np.arange(num_nodes)
+    a = np.asarray(a, dtype=np.int64)
+    b = np.asarray(b, dtype=np.int64)
+    
+    while True:
+        la = label[a]
+        lb = label[b]
+        active = la != lb
+        if not active.any():
+            break
+        a = a[active]
+        b = b[active]
+        lo = np.minimum(la[active], lb[active])
+        hi = np.maximum(la[active], lb[active])
+        label[hi] = lo
+        
+        # Compress paths so every node points straight at its root
+        while True:
+            jumped = label[label]
+            if np.array_equal(jumped, label):
+                break
+            label = jumped
+    
+    return label
+
+
+def face_adjacency(
+    num_faces: int,
+    edge_table: EdgeTable
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Faces adjacent across manifold edges, in CSR form
+    
+    Args:
+        num_faces: Number of faces
+        edge_table: Edge table of the faces
+    
+    Returns:
+        (offsets, neighbors, links): the neighbors of face f are
+        neighbors[offsets[f]:offsets[f + 1]]; links holds the index of the
+        shared edge in edge_table.manifold_slots() for each entry
+    """
+    first, second = edge_table.manifold_slots()
+    
+    # Partner slot across every face-edge slot; slots are already in face
+    # order, so dropping the unpaired ones leaves the CSR layout
+    partner = np.full(3 * num_faces, -1, dtype=np.int64)
+    partner[first] = second
+    partner[second] = first
+    link = np.empty(3 * num_faces, dtype=np.int64)
+    link[first] = np.arange(len(first))
+    link[second] = np.arange(len(first))
+    
+    paired = partner >= 0
+    offsets = np.zeros(num_faces + 1, dtype=np.int64)
+    np.cumsum(paired.reshape(-1, 3).sum(axis=1), out=offsets[1:])
+    return offsets, partner[paired] // 3, link[paired]
+
+
+def shell_labels(num_faces: int, edge_table: EdgeTable) -> np.ndarray:
+    """
+    Label shells: faces connected through manifold edges
+    
+    Returns:
+        Per-face label equal to the smallest face index in its shell
+    """
+    first, second = edge_table.manifold_slots()
+    return connected_components(num_faces, first // 3, second // 3)
+
+
+def compact_vertices(faces: np.ndarray, num_vertices: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Find the vertices referenced by faces and a dense renumbering for them
+    
+    Args:
+        faces: Fx3 array of vertex indices
+        num_vertices: Total number of vertices
+    
+    Returns:
+        (keep, remap): sorted indices of referenced vertices, and the new
+        index of every old vertex (-1 for unreferenced ones)
+    """
+    used = np.bincount(np.asarray(faces).ravel(), minlength=num_vertices) > 0
+    remap = np.cumsum(used) - 1
+    remap[~used] = -1
+    return np.flatnonzero(used), remap
@@ -0,0 +1,41 @@
+"""Shared fixtures for the geometry engine tests"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / 'src'))
+sys.path.insert(0, str(ROOT / 'benchmarks'))
+sys.path.insert(0, str(ROOT))
+
+from utils.helper import Config
+from utils.mesh import Mesh
+
+
+@pytest.fixture
+def config(tmp_path):
+    """Default configuration writing below the test's temporary directory"""
+    config = Config()
+    config.config.update({
+        'temp_dir': str(tmp_path / 'engine'),
+        'num_workers': 1,
+        'parallel_processing': False,
+    })
+    return config
+
+
+def cube_mesh() -> Mesh:
+    """Closed unit cube, 8 vertices and 12 outward-facing triangles"""
+    vertices = np.array([
+        [0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 0],
+        [0, 0, 1], [1, 0, 1], [1, 1, 1], [0, 1, 1],
+    ], dtype=np.float32)
+    faces = np.array([
+        [0, 2, 1], [0, 3, 2], [4, 5, 6], [4, 6, 7],
+        [0, 1, 5], [0, 5, 4], [2, 3, 7], [2, 7, 6],
+        [1, 2, 6], [1, 6, 5], [3, 0, 4], [3, 4, 7],
+    ], dtype=np.uint32)
+    return Mesh(vertices, faces)
@@ -0,0 +1,33 @@
+"""Stand-in for Blender's bpy module, importable by scripts run by tests/stubs/blender
+
+Import operators check that their file exists; export operators write the
+operator name to the path they were given, so tests see exactly which
+paths a generated script passed.
+"""
+
+import os
+from types import SimpleNamespace
+
+
+class _Operators:
+    def __init__(self, group: str):
+        self.group = group
+    
+    def __getattr__(self, name: str):
+        def operator(filepath: str = None, **kwargs):
+            if self.group.startswith('import') and not os.path.exists(filepath):
+                raise RuntimeError(f"Cannot read {filepath}")
+            if self.group.startswith('export'):
+                with open(filepath, 'w') as f:
+                    f.write(f"{self.group}.{name}")
+            return {'FINISHED'}
+        return operator
+
+
+class _Ops:
+    def __getattr__(self, group: str) -> _Operators:
+        return _Operators(group)
+
+
+ops = _Ops()
+context = SimpleNamespace(scene=SimpleNamespace(objects=[]))
@@ -0,0 +1,101 @@
+"""Tests for the HTTP API in main.py (jobs run in the engine's worker pool)"""
+
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from main import GeometryEngine, create_api_server
+from utils.mesh_io import load_mesh, save_mesh
+
+from conftest import cube_mesh
+
+
+@pytest.fixture
+def client(config):
+    engine = GeometryEngine(config, use_blender=False)
+    with TestClient(create_api_server(engine, run=False)) as client:
+        yield client
+
+
+@pytest.fixture
+def cube_stl(tmp_path):
+    path = tmp_path / 'cube.stl'
+    save_mesh(str(path), cube_mesh())
+    return path.read_bytes()
+
+
+def _wait(client, job_id: str, timeout: float = 30) -> dict:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        status = client.get(f"/jobs/{job_id}").json()
+        if status['status'] in ('completed', 'failed'):
+            return status
+        time.sleep(0.05)
+    raise AssertionError(f"Job {job_id} did not finish")
+
+
+def test_diagnose_job(client, cube_stl):
+    response = client.post('/diagnose', files={'file': ('cube.stl', cube_stl)})
+    
+    assert response.status_code == 202
+    job_id = response.json()['job_id']
+    assert _wait(client, job_id)['status'] == 'completed'
+    result = client.get(f"/jobs/{job_id}/result").json()['result']
+    assert result['stats']['face_count'] == 12
+
+
+def test_repaired_mesh_streams_as_tmsh(client, cube_stl, tmp_path):
+    job_id = client.post(
+        '/repair', files={'file': ('cube.stl', cube_stl)}, data={'output_format': 'glb'}
+    ).json()['job_id']
+    assert _wait(client, job_id)['status'] == 'completed'
+    
+    response = client.get(f"/jobs/{job_id}/mesh", params={'format': 'tmsh'})
+    
+    assert response.status_code == 200
+    assert response.headers['content-type'] == 'application/x-teeli-mesh'
+    path = tmp_path / 'streamed.tmsh'
+    path.write_bytes(response.content)
+    mesh = load_mesh(str(path))
+    assert mesh.num_faces == 12
+    assert mesh.num_vertices == 8
+
+
+def test_multi_format_conversion(client, cube_stl):
+    job_id = client.post(
+        '/convert', files={'file': ('cube.stl', cube_stl)}, data={'output_format': 'glb,obj'}
+    ).json()['job_id']
+    assert _wait(client, job_id)['status'] == 'completed'
+    
+    glb = client.get(f"/jobs/{job_id}/download", params={'format': 'glb'})
+    obj = client.get(f"/jobs/{job_id}/download", params={'format': 'obj'})
+    
+    assert glb.status_code == 200 and glb.content[:4] == b'glTF'
+    assert obj.status_code == 200 and b'\nf ' in obj.content
+    assert client.get(f"/jobs/{job_id}/download", params={'format': 'stl'}).status_code == 404
+
+
+def test_unknown_job(client):
+    assert client.get('/jobs/missing').status_code == 404
+
+
+def test_shutdown_closes_the_engine(config, monkeypatch):
+    engine = GeometryEngine(config, use_blender=False)
+    closed = []
+    monkeypatch.setattr(engine, 'close', lambda: closed.append(True))
+    
+    with TestClient(create_api_server(engine, run=False)) as client:
+        assert client.get('/health').status_code == 200
+        assert not closed
+    
+    assert closed == [True]
+
+
+def test_metrics_count_jobs(client, cube_stl):
+    job_id = client.post('/diagnose', files={'file': ('cube.stl', cube_stl)}).json()['job_id']
+    _wait(client, job_id)
+    
+    text = client.get('/metrics').text
+    
+    assert 'geometry_jobs_total{operation="diagnose",status="completed"} 1' in text
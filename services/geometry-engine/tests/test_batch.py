@@ -0,0 +1,157 @@
+"""Tests for convert.batch scheduling, driven by a stub converter"""
+
+import threading
+import time
+from pathlib import Path
+
+from convert.batch import BatchConverter, conversion_timeout
+from main import GeometryEngine
+from utils.mesh_io import load_mesh, save_mesh
+
+from conftest import cube_mesh
+
+
+class StubConvert:
+    """Records calls and writes '<output>' plus a '<output>.bin' sidecar"""
+    
+    def __init__(self, delay: float = 0.0, fail: tuple = ()):
+        self.delay = delay
+        self.fail = fail
+        self.calls = []
+        self.running = {}
+        self.peak = {}
+        self._lock = threading.Lock()
+    
+    def __call__(self, input_path, output_path, options, timeout=None):
+        fmt = Path(input_path).suffix
+        with self._lock:
+            self.calls.append((Path(input_path).name, output_path, timeout))
+            self.running[fmt] = self.running.get(fmt, 0) + 1
+            self.peak[fmt] = max(self.peak.get(fmt, 0), self.running[fmt])
+            self.peak['*'] = max(self.peak.get('*', 0), sum(self.running.values()))
+        try:
+            time.sleep(self.delay)
+            name = Path(input_path).name
+            if name in self.fail:
+                raise RuntimeError(f"cannot convert {name}")
+            outputs = output_path if isinstance(output_path, list) else [output_path]
+            for path in outputs:
+                Path(path).write_text(name)
+                Path(path + '.bin').write_text(name)
+            if isinstance(output_path, list):
+                return {'success': True, 'outputs': [{'output': path} for path in outputs]}
+            return {'success': True, 'output': output_path}
+        finally:
+            with self._lock:
+                self.running[fmt] -= 1
+
+
+def _inputs(directory: Path, sizes: dict) -> dict:
+    paths = {}
+    for name, size in sizes.items():
+        path = directory / name
+        path.write_bytes(b'x' * size)
+        paths[name] = str(path)
+    return paths
+
+
+def test_smallest_inputs_run_first(tmp_path):
+    inputs = _inputs(tmp_path, {'large.stl': 300, 'small.stl': 100, 'medium.obj': 200})
+    convert = StubConvert()
+    jobs = [{'input': path, 'output': str(tmp_path / 'out' / f"{name}.glb")} for name, path in inputs.items()]
+    
+    results = list(BatchConverter(convert, num_workers=1, scratch_dir=str(tmp_path / 'scratch')).run(jobs))
+    
+    assert [name for name, _, _ in convert.calls] == ['small.stl', 'medium.obj', 'large.stl']
+    assert [result['index'] for result in results] == [1, 2, 0]
+    assert all(result['success'] for result in results)
+
+
+def test_format_limits_cap_concurrency(tmp_path):
+    inputs = _inputs(tmp_path, {f"{i}{ext}": 10 for i in range(4) for ext in ('.fbx', '.stl')})
+    convert = StubConvert(delay=0.1)
+    jobs = [{'input': path, 'output': str(tmp_path / 'out' / f"{name}.glb")} for name, path in inputs.items()]
+    
+    results = list(BatchConverter(convert, num_workers=4, format_limits={'.FBX': 1}).run(jobs))
+    
+    assert len(results) == 8
+    assert convert.peak['.fbx'] == 1
+    assert convert.peak['*'] > 1
+
+
+def test_outputs_are_moved_into_place_and_scratch_is_removed(tmp_path):
+    inputs = _inputs(tmp_path, {'a.stl': 10, 'b.stl': 20})
+    scratch = tmp_path / 'scratch'
+    convert = StubConvert()
+    jobs = [
+        {'input': inputs['a.stl'], 'output': str(tmp_path / 'out' / 'a.gltf')},
+        {'input': inputs['b.stl'], 'output': [str(tmp_path / 'out' / 'b.obj'), str(tmp_path / 'out' / 'b.glb')]},
+    ]
+    timeout = lambda size: 100.0 + size
+    
+    results = {r['index']: r for r in BatchConverter(convert, scratch_dir=str(scratch), timeout=timeout).run(jobs)}
+    
+    # The converter only ever writes into the scratch directory
+    for _, output, _ in convert.calls:
+        for path in output if isinstance(output, list) else [output]:
+            assert Path(path).is_relative_to(scratch)
+    assert sorted(path.name for path in (tmp_path / 'out').iterdir()) == [
+        'a.gltf', 'a.gltf.bin', 'b.glb', 'b.glb.bin', 'b.obj', 'b.obj.bin'
+    ]
+    assert results[0]['output'] == jobs[0]['output']
+    assert results[0]['timeout'] == 110.0
+    assert [entry['output'] for entry in results[1]['outputs']] == jobs[1]['output']
+    assert list(scratch.iterdir()) == []
+
+
+def test_a_failing_job_does_not_affect_the_others(tmp_path):
+    inputs = _inputs(tmp_path, {'good.stl': 10, 'bad.stl': 20, 'later.stl': 30})
+    scratch = tmp_path / 'scratch'
+    jobs = [{'input': path, 'output': str(tmp_path / 'out' / f"{name}.glb")} for name, path in inputs.items()]
+    jobs += [{'input': str(tmp_path / 'missing.stl'), 'output': 'x.glb'}, {'output': 'y.glb'}]
+    
+    results = {r['index']: r for r in BatchConverter(StubConvert(fail=('bad.stl',)), scratch_dir=str(scratch)).run(jobs)}
+    
+    assert [results[i]['success'] for i in range(5)] == [True, False, True, False, False]
+    assert 'cannot convert bad.stl' in results[1]['error']
+    assert sorted(path.name for path in (tmp_path / 'out').iterdir()) == [
+        'good.stl.glb', 'good.stl.glb.bin', 'later.stl.glb', 'later.stl.glb.bin'
+    ]
+    assert list(scratch.iterdir()) == []
+
+
+def test_stopping_early_cancels_pending_jobs(tmp_path):
+    inputs = _inputs(tmp_path, {f"{i}.stl": 10 + i for i in range(4)})
+    scratch = tmp_path / 'scratch'
+    convert = StubConvert()
+    jobs = [{'input': path, 'output': str(tmp_path / 'out' / f"{name}.glb")} for name, path in inputs.items()]
+    
+    results = BatchConverter(convert, num_workers=1, scratch_dir=str(scratch)).run(jobs)
+    first = next(results)
+    results.close()
+    
+    assert first['index'] == 0
+    assert len(convert.calls) == 1
+    assert list(scratch.iterdir()) == []
+
+
+def test_conversion_timeout_grows_with_size():
+    assert conversion_timeout(0) == 300.0
+    assert conversion_timeout(10 * 1024 * 1024, base=10, per_mb=2) == 30.0
+    assert conversion_timeout(10 * 1024 * 1024, base=10, per_mb=2, maximum=20) == 20.0
+
+
+def test_engine_batch_converts_natively(tmp_path, config):
+    source = tmp_path / 'cube.stl'
+    save_mesh(str(source), cube_mesh())
+    engine = GeometryEngine(config, use_blender=False)
+    outputs = [str(tmp_path / 'out' / 'cube.obj'), str(tmp_path / 'out' / 'cube.glb')]
+    
+    results = {result['index']: result for result in engine.convert_batch([
+        {'input': str(source), 'output': outputs},
+        {'input': str(tmp_path / 'missing.stl'), 'output': str(tmp_path / 'out' / 'missing.glb')},
+    ])}
+    
+    assert results[0]['success'] and not results[1]['success']
+    for path in outputs:
+        assert load_mesh(path).num_faces == 12
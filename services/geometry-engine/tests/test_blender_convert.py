@@ -0,0 +1,29 @@
+"""Tests for convert.blender_convert, driven by the stubs in tests/stubs"""
+
+from pathlib import Path
+
+import pytest
+
+from convert.blender_convert import BlenderConverter
+
+STUB_BLENDER = str(Path(__file__).parent / 'stubs' / 'blender')
+
+
+@pytest.mark.parametrize('num_workers', [0, 1])
+def test_paths_are_passed_verbatim(tmp_path, num_workers):
+    converter = BlenderConverter(STUB_BLENDER, num_workers=num_workers)
+    source = tmp_path / "it's \\new.fbx"
+    source.write_bytes(b'fbx')
+    outputs = [str(tmp_path / "out's\\new.glb"), str(tmp_path / 'a"b\\tc.stl')]
+    
+    try:
+        result = converter.convert(str(source), outputs, timeout=30)
+    finally:
+        converter.close()
+    
+    assert result['success'], result.get('error')
+    assert Path(outputs[0]).read_text() == 'export_scene.gltf'
+    assert Path(outputs[1]).read_text() == 'export_mesh.stl'
+    assert sorted(path.name for path in tmp_path.iterdir()) == sorted(
+        [source.name] + [Path(path).name for path in outputs]
+    )
@@ -0,0 +1,78 @@
+"""Tests for convert.blender_pool, driven by the stub in tests/stubs"""
+
+from pathlib import Path
+
+import pytest
+
+from convert.blender_pool import BlenderWorkerPool
+
+STUB_BLENDER = str(Path(__file__).parent / 'stubs' / 'blender')
+
+PRINT_PID = "import os\nprint(os.getpid())"
+
+
+@pytest.fixture
+def pool():
+    pool = BlenderWorkerPool(STUB_BLENDER, size=1, max_jobs_per_worker=3, startup_timeout=10)
+    yield pool
+    pool.close()
+
+
+def _pid(pool: BlenderWorkerPool) -> int:
+    return int(pool.run(PRINT_PID, timeout=10).strip())
+
+
+def test_worker_is_reused(pool):
+    assert _pid(pool) == _pid(pool)
+
+
+def test_worker_is_recycled_after_max_jobs(pool):
+    pids = [_pid(pool) for _ in range(4)]
+    
+    assert pids[0] == pids[1] == pids[2]
+    assert pids[3] != pids[0]
+
+
+def test_worker_is_recycled_above_max_memory():
+    pool = BlenderWorkerPool(STUB_BLENDER, size=1, max_memory_mb=1, startup_timeout=10)
+    try:
+        assert _pid(pool) != _pid(pool)
+    finally:
+        pool.close()
+
+
+def test_worker_is_replaced_after_a_crash(pool):
+    first = _pid(pool)
+    
+    with pytest.raises(RuntimeError, match='exited'):
+        pool.run("import os\nos._exit(3)", timeout=10)
+    
+    assert _pid(pool) != first
+
+
+def test_worker_is_replaced_after_a_timeout(pool):
+    first = _pid(pool)
+    
+    with pytest.raises(RuntimeError, match='timed out'):
+        pool.run("import time\ntime.sleep(30)", timeout=0.5)
+    
+    assert _pid(pool) != first
+
+
+def test_script_errors_are_reported_and_the_worker_kept(pool):
+    first = _pid(pool)
+    
+    with pytest.raises(RuntimeError, match='ZeroDivisionError'):
+        pool.run("1 / 0", timeout=10)
+    with pytest.raises(RuntimeError, match='exit code 2'):
+        pool.run("import sys\nsys.exit(2)", timeout=10)
+    
+    # The failed jobs count towards max_jobs_per_worker (3)
+    assert _pid(pool) != first
+
+
+def test_closed_pool_rejects_jobs(pool):
+    pool.close()
+    
+    with pytest.raises(RuntimeError, match='closed'):
+        pool.run(PRINT_PID, timeout=10)
@@ -0,0 +1,127 @@
+"""Tests for utils.cache"""
+
+import os
+import multiprocessing
+
+from utils import cache as cache_module
+from utils.cache import ResultCache
+
+
+def _disk_usage(directory) -> int:
+    return sum(
+        os.path.getsize(os.path.join(root, name))
+        for root, _, names in os.walk(directory)
+        for name in names
+        if name.endswith(('.json', '.artifact'))
+    )
+
+
+def _fill(directory, prefix: str, count: int, max_disk_bytes: int) -> None:
+    cache = ResultCache(directory, max_disk_bytes=max_disk_bytes)
+    for i in range(count):
+        cache.put(cache.make_key(f"{prefix}{i}", 'diagnose'), {'status': 'success', 'payload': 'x' * 500})
+
+
+def test_get_returns_what_put_stored(tmp_path):
+    cache = ResultCache(str(tmp_path))
+    key = cache.make_key('abc', 'diagnose', {'deep': True})
+    
+    cache.put(key, {'status': 'success', 'score': 90})
+    
+    assert cache.get(key)[0] == {'status': 'success', 'score': 90}
+    # A new instance only sees the disk tier
+    assert ResultCache(str(tmp_path)).get(key)[0] == {'status': 'success', 'score': 90}
+    assert cache.get(cache.make_key('abc', 'diagnose', {'deep': False})) is None
+
+
+def test_get_or_compute_restores_the_artifact(tmp_path):
+    cache = ResultCache(str(tmp_path / 'cache'))
+    source = tmp_path / 'in.obj'
+    source.write_text('v 0 0 0\n')
+    output = tmp_path / 'out.glb'
+    
+    def compute():
+        output.write_bytes(b'mesh')
+        return {'status': 'success', 'output': str(output)}
+    
+    assert cache.get_or_compute(str(source), 'repair', {}, compute, str(output))['cached'] is False
+    output.unlink()
+    
+    result = cache.get_or_compute(str(source), 'repair', {}, compute, str(output))
+    
+    assert result['cached'] is True
+    assert output.read_bytes() == b'mesh'
+
+
+def test_artifact_evicted_after_the_lookup_is_recomputed(tmp_path):
+    cache = ResultCache(str(tmp_path / 'cache'))
+    source = tmp_path / 'in.obj'
+    source.write_text('v 0 0 0\n')
+    output = tmp_path / 'out.glb'
+    
+    def compute():
+        output.write_bytes(b'mesh')
+        return {'status': 'success', 'output': str(output)}
+    
+    cache.get_or_compute(str(source), 'repair', {}, compute, str(output))
+    output.unlink()
+    
+    # Another process evicts the entry between get() and the copy
+    lookup = cache.get
+    def get_then_evict(key):
+        hit = lookup(key)
+        hit[1].unlink()
+        return hit
+    cache.get = get_then_evict
+    
+    result = cache.get_or_compute(str(source), 'repair', {}, compute, str(output))
+    
+    assert result['cached'] is False
+    assert output.read_bytes() == b'mesh'
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = ResultCache(str(tmp_path), max_disk_bytes=6000)
+    keys = [cache.make_key(str(i), 'diagnose') for i in range(20)]
+    for key in keys:
+        cache.put(key, {'status': 'success', 'payload': 'x' * 500})
+        # Keep the first entry in use
+        cache.get(keys[0])
+    
+    fresh = ResultCache(str(tmp_path))
+    assert fresh.get(keys[0]) is not None
+    assert fresh.get(keys[1]) is None
+    assert fresh.get(keys[-1]) is not None
+    assert _disk_usage(tmp_path) <= 6000
+
+
+def test_disk_limit_holds_across_processes(tmp_path):
+    directory = str(tmp_path)
+    limit = 20000
+    context = multiprocessing.get_context('fork')
+    workers = [
+        context.Process(target=_fill, args=(directory, f"p{n}-", 40, limit))
+        for n in range(4)
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join(60)
+        assert worker.exitcode == 0
+    
+    # Each process alone writes more than the limit
+    assert _disk_usage(directory) <= limit
+
+
+def test_file_hashes_are_bounded(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache_module, 'MAX_FILE_HASHES', 3)
+    cache = ResultCache(str(tmp_path / 'cache'))
+    paths = []
+    for i in range(5):
+        path = tmp_path / f"{i}.stl"
+        path.write_text(str(i))
+        paths.append(str(path))
+        cache.file_hash(str(path))
+    
+    assert len(cache._file_hashes) == 3
+    assert cache.file_hash(paths[0]) == cache.file_hash(paths[0])
@@ -0,0 +1,112 @@
+"""Tests for diagnose.index and diagnose.parallel"""
+
+from functools import partial
+
+import numpy as np
+import pytest
+
+from diagnose import parallel
+from diagnose.index import GeometryDiagnostics, diagnose_mesh
+from generators import GENERATORS
+from repair.index import repair_mesh
+from utils.mesh import Mesh
+from utils.topology import EdgeTable
+
+from conftest import cube_mesh
+
+
+def _findings(mesh: Mesh) -> dict:
+    report = GeometryDiagnostics(mesh).analyze()
+    return {item['type']: item for item in report['issues'] + report['warnings']}
+
+
+def test_clean_cube():
+    report = GeometryDiagnostics(cube_mesh()).analyze()
+    
+    assert [item['type'] for item in report['issues'] + report['warnings']] == ['missing_normals']
+    assert report['stats']['edge_count'] == 18
+    assert report['stats']['surface_area'] == pytest.approx(6.0)
+    assert report['stats']['closed_shells'] == 1
+
+
+def test_open_boundary():
+    findings = _findings(cube_mesh().submesh(np.arange(1, 12)))
+    
+    assert findings['open_boundaries']['count'] == 3
+
+
+def test_non_manifold_edge():
+    cube = cube_mesh()
+    vertices = np.vstack([cube.vertices, [[0.5, -1, -1]]]).astype(np.float32)
+    faces = np.vstack([cube.faces, [[0, 1, 8]]]).astype(np.uint32)
+    
+    findings = _findings(Mesh(vertices, faces))
+    
+    assert findings['non_manifold_edges']['count'] == 1
+
+
+def test_degenerate_face():
+    cube = cube_mesh()
+    faces = np.vstack([cube.faces, [[0, 0, 1]]]).astype(np.uint32)
+    
+    findings = _findings(Mesh(cube.vertices, faces))
+    
+    assert findings['degenerate_faces']['count'] == 1
+    assert findings['degenerate_faces']['sample_faces'] == [12]
+
+
+def test_one_flipped_face_is_inconsistent_winding():
+    cube = cube_mesh()
+    faces = cube.faces.copy()
+    faces[0] = faces[0][::-1]
+    
+    findings = _findings(Mesh(cube.vertices, faces))
+    
+    assert 'inconsistent_winding' in findings
+    assert 'inverted_normals' not in findings
+
+
+def test_inside_out_shell_is_inverted():
+    cube = cube_mesh()
+    
+    findings = _findings(Mesh(cube.vertices, cube.faces[:, ::-1].copy()))
+    
+    assert findings['inverted_normals']['count'] == 1
+    assert 'inconsistent_winding' not in findings
+
+
+def test_overlapping_cubes_intersect():
+    cube = cube_mesh()
+    vertices = np.vstack([cube.vertices, cube.vertices + np.float32(0.5)])
+    faces = np.vstack([cube.faces, cube.faces + 8]).astype(np.uint32)
+    
+    findings = _findings(Mesh(vertices, faces))
+    
+    assert findings['self_intersections']['pair_count'] == 18
+    # Touching neighbours inside one cube are not intersections
+    assert 'self_intersections' not in _findings(cube)
+
+
+@pytest.mark.parametrize('name', ['scan', 'knot', 'scene'])
+def test_parallel_stats_match_serial(name, monkeypatch):
+    # Small chunks so that several workers get work
+    monkeypatch.setattr(parallel, 'face_chunks', partial(parallel.face_chunks, chunk_size=1000))
+    mesh = GENERATORS[name](10_000)
+    
+    serial = parallel.serial_mesh_stats(mesh.vertices, mesh.faces, EdgeTable.from_faces(mesh.faces))
+    result = parallel.parallel_mesh_stats(mesh.vertices, mesh.faces, num_workers=2)
+    
+    assert result.keys() == serial.keys()
+    for key, value in serial.items():
+        if isinstance(value, np.ndarray):
+            assert np.array_equal(result[key], value), key
+        else:
+            assert result[key] == value, key
+
+
+def test_malformed_file_gives_an_error_report(tmp_path):
+    path = tmp_path / 'bad.obj'
+    path.write_text("v 0 0 0\nv 1 0 0\nv 0 1 0\nf 1 2 99\n")
+    
+    assert diagnose_mesh(str(path))['status'] == 'error'
+    assert repair_mesh(str(path), str(tmp_path / 'out.obj'))['status'] == 'error'
@@ -0,0 +1,77 @@
+"""Tests for the batched geometry helpers in utils.helper"""
+
+import numpy as np
+
+from utils.helper import (
+    FaceBuffers, batch_face_normals, batch_triangle_areas, batch_face_centroids,
+    calculate_face_geometry, calculate_face_normal, find_degenerate_faces
+)
+
+from conftest import cube_mesh
+
+
+def _reference(vertices: np.ndarray, faces: np.ndarray):
+    """Per-face normals, areas and centroids with plain NumPy"""
+    p = vertices[faces].astype(np.float64)
+    cross = np.cross(p[:, 1] - p[:, 0], p[:, 2] - p[:, 0])
+    length = np.linalg.norm(cross, axis=1)
+    return cross / length[:, None], 0.5 * length, p.mean(axis=1)
+
+
+def test_batched_geometry_matches_reference():
+    rng = np.random.default_rng(0)
+    vertices = rng.random((500, 3))
+    faces = rng.integers(0, 500, (2000, 3))
+    faces = faces[(faces[:, 0] != faces[:, 1]) & (faces[:, 1] != faces[:, 2]) & (faces[:, 2] != faces[:, 0])]
+    normals, areas, centroids = _reference(vertices, faces)
+    
+    assert np.allclose(batch_face_normals(vertices, faces), normals)
+    assert np.allclose(batch_triangle_areas(vertices, faces), areas)
+    assert np.allclose(batch_face_centroids(vertices, faces), centroids)
+
+
+def test_chunked_pass_matches_single_pass():
+    rng = np.random.default_rng(1)
+    vertices = rng.random((300, 3))
+    faces = rng.integers(0, 300, (1000, 3))
+    
+    whole = calculate_face_geometry(vertices, faces)
+    chunked = calculate_face_geometry(vertices, faces, buffers=FaceBuffers(64, np.float64))
+    
+    for a, b in zip(whole, chunked):
+        assert np.allclose(a, b)
+
+
+def test_cube_faces_point_outwards():
+    cube = cube_mesh()
+    normals = batch_face_normals(cube.vertices, cube.faces)
+    outward = batch_face_centroids(cube.vertices, cube.faces) - 0.5
+    
+    assert (np.einsum('ij,ij->i', normals, outward) > 0).all()
+    assert np.allclose(batch_triangle_areas(cube.vertices, cube.faces), 0.5)
+
+
+def test_single_face_helper():
+    normal = calculate_face_normal(np.zeros(3), np.array([1.0, 0, 0]), np.array([0, 1.0, 0]))
+    
+    assert np.allclose(normal, [0, 0, 1])
+
+
+def test_zero_area_face_gets_a_zero_normal():
+    vertices = np.array([[0, 0, 0], [1, 0, 0], [2, 0, 0]], dtype=np.float64)
+    
+    assert np.array_equal(batch_face_normals(vertices, np.array([[0, 1, 2]])), [[0, 0, 0]])
+
+
+def test_degenerate_and_sliver_faces():
+    vertices = np.array([
+        [0, 0, 0], [1, 0, 0], [0, 1, 0],   # regular
+        [2, 0, 0],                         # collinear with 0 and 1
+        [0.5, 1e-5, 0],                    # needle over edge 0-1
+    ], dtype=np.float64)
+    faces = np.array([[0, 1, 2], [0, 1, 3], [0, 0, 2], [0, 1, 4]])
+    
+    degenerate, sliver = find_degenerate_faces(vertices, faces, area_epsilon=1e-12)
+    
+    assert degenerate.tolist() == [False, True, True, False]
+    assert sliver.tolist() == [False, False, False, True]
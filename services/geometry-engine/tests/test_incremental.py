@@ -0,0 +1,73 @@
+"""Tests for the component-level reuse of diagnose.incremental and utils.components"""
+
+import numpy as np
+import pytest
+
+from diagnose.incremental import diagnose_incremental
+from diagnose.index import diagnose_mesh
+from generators import scene
+from utils.cache import ResultCache
+from utils.components import MeshComponents, component_flips
+from utils.mesh_io import Mesh, save_mesh
+from utils.orientation import orient_faces
+from utils.topology import EdgeTable
+
+
+def _moved(mesh: Mesh, offset: float) -> Mesh:
+    """The mesh with the shell of the first face moved along x"""
+    components = MeshComponents(mesh.vertices, mesh.faces)
+    vertices = mesh.vertices.copy()
+    shell = np.unique(mesh.faces[components.faces(components.component[0])])
+    vertices[shell, 0] += offset
+    return Mesh(vertices, mesh.faces)
+
+
+def test_hashes_ignore_the_rest_of_the_mesh():
+    mesh = scene(5000)
+    moved = _moved(mesh, 0.5)
+    
+    before = MeshComponents(mesh.vertices, mesh.faces).hashes
+    after = MeshComponents(moved.vertices, moved.faces).hashes
+    
+    assert len(before) == len(after)
+    assert len(set(before) - set(after)) == 1
+
+
+def test_component_flips_match_orient_faces(tmp_path):
+    cache = ResultCache(str(tmp_path))
+    for mesh in (scene(5000), _moved(scene(5000), 0.5)):
+        edge_table = EdgeTable.from_faces(mesh.faces)
+        expected = orient_faces(mesh.vertices, mesh.faces, edge_table)[0]
+        
+        # Cold, then fully cached
+        assert np.array_equal(component_flips(mesh.vertices, mesh.faces, edge_table, cache), expected)
+        assert np.array_equal(component_flips(mesh.vertices, mesh.faces, edge_table, cache), expected)
+
+
+@pytest.mark.parametrize('offset', [0.5, 40.0])
+def test_incremental_diagnosis_matches_a_fresh_one(tmp_path, offset):
+    cache = ResultCache(str(tmp_path / 'cache'))
+    mesh = scene(5000)
+    first, second = str(tmp_path / 'first.tmsh'), str(tmp_path / 'second.tmsh')
+    save_mesh(first, mesh)
+    save_mesh(second, _moved(mesh, offset))
+    
+    for path in (first, second, second):
+        report = diagnose_incremental(path, cache)
+        fresh = diagnose_mesh(path)
+        
+        assert report['status'] == 'success'
+        assert report == fresh
+
+
+def test_reupload_reports_the_same_sample_pairs(tmp_path):
+    cache = ResultCache(str(tmp_path / 'cache'))
+    path = str(tmp_path / 'scene.tmsh')
+    save_mesh(path, scene(5000))
+    
+    reports = [diagnose_incremental(path, cache) for _ in range(2)]
+    
+    assert reports[0] == reports[1] == diagnose_mesh(path)
+    samples = next(item for item in reports[1]['issues'] + reports[1]['warnings']
+                   if item['type'] == 'self_intersections')['sample_pairs']
+    assert samples == sorted(samples) and len(samples) == 10
@@ -0,0 +1,87 @@
+"""Job lifecycle of jobs.job_queue.JobManager"""
+
+import os
+import time
+
+import pytest
+
+from jobs.job_queue import JobManager, COMPLETED, FAILED, QueueFullError
+
+
+class FakeEngine:
+    """Engine stand-in: diagnose succeeds, or kills its worker process for input 'crash'"""
+    
+    def __init__(self, config, use_blender=True):
+        self.config = config
+    
+    def diagnose(self, mesh_path):
+        with open(mesh_path) as f:
+            if f.read() == 'crash':
+                os._exit(1)
+        return {'status': 'success', 'pid': os.getpid()}
+
+
+def submit(manager, content):
+    job = manager.create_job('diagnose', '.obj')
+    with open(job.input_path, 'w') as f:
+        f.write(content)
+    return manager.start(job)
+
+
+def wait(manager, job, timeout=30.0):
+    deadline = time.time() + timeout
+    while not job.done or manager.stats()['running']:
+        assert time.time() < deadline, f"job {job.status}, {manager.stats()}"
+        time.sleep(0.02)
+    return job
+
+
+@pytest.fixture
+def manager(config):
+    config.config['max_queued_jobs'] = 1
+    manager = JobManager(FakeEngine(config), config)
+    yield manager
+    manager.shutdown()
+
+
+def test_job_completes(manager):
+    job = wait(manager, submit(manager, 'ok'))
+    assert job.status == COMPLETED
+    assert job.result['status'] == 'success'
+    assert manager.stats()['active'] == 0
+
+
+def test_dead_worker_fails_its_job_and_the_pool_recovers(manager):
+    crashed = wait(manager, submit(manager, 'crash'))
+    assert crashed.status == FAILED
+    assert 'Worker process died' in crashed.error
+    assert manager.stats()['running'] == 0
+    
+    # The pool is replaced, so later jobs run (and capacity is not leaked)
+    for _ in range(3):
+        job = wait(manager, submit(manager, 'ok'))
+        assert job.status == COMPLETED
+    stats = manager.stats()
+    assert (stats['running'], stats['queued'], stats['active']) == (0, 0, 0)
+
+
+def test_job_queued_behind_a_crash_runs(manager):
+    crashed = submit(manager, 'crash')
+    queued = submit(manager, 'ok')
+    wait(manager, crashed)
+    assert wait(manager, queued).status == COMPLETED
+
+
+def test_queue_rejects_beyond_capacity(manager):
+    # num_workers + max_queued_jobs slots; created jobs hold one until they finish
+    jobs = [manager.create_job('diagnose', '.obj') for _ in range(2)]
+    with pytest.raises(QueueFullError):
+        manager.create_job('diagnose', '.obj')
+    for job in jobs:
+        manager.cancel(job)
+    manager.create_job('diagnose', '.obj')
+
+
+def test_unknown_operation(manager):
+    with pytest.raises(ValueError):
+        manager.create_job('explode', '.obj')
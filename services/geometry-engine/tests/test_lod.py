@@ -0,0 +1,79 @@
+"""Tests for lod.decimate and lod.index"""
+
+import numpy as np
+import pytest
+
+from diagnose.index import GeometryDiagnostics
+from generators import scan, sphere
+from lod.decimate import decimate
+from lod.index import generate_lods, lod_path, normalize_ratios
+from utils.mesh_io import load_mesh, save_mesh
+from utils.topology import EdgeTable
+
+
+def test_sphere_keeps_its_shape():
+    mesh = sphere(5000)
+    
+    lod = decimate(mesh, 0.25)
+    
+    assert lod.num_faces <= 0.25 * mesh.num_faces * 1.05
+    radius = np.linalg.norm(lod.vertices, axis=1)
+    assert np.abs(radius - 1).max() < 0.05
+    report = GeometryDiagnostics(lod).analyze()
+    assert not {'open_boundaries', 'non_manifold_edges', 'inconsistent_winding'} & {
+        item['type'] for item in report['issues']
+    }
+
+
+def _boundary_length(mesh) -> float:
+    edges = EdgeTable.from_faces(mesh.faces).boundary_edges()
+    return float(np.linalg.norm(mesh.vertices[edges[:, 0]] - mesh.vertices[edges[:, 1]], axis=1).sum())
+
+
+def test_open_borders_are_kept():
+    mesh = scan(5000)
+    
+    lod = decimate(mesh, 0.3)
+    
+    assert lod.num_faces < 0.35 * mesh.num_faces
+    assert _boundary_length(lod) == pytest.approx(_boundary_length(mesh), rel=0.02)
+    assert np.allclose(lod.vertices[:, :2].max(axis=0), mesh.vertices[:, :2].max(axis=0), atol=0.1)
+
+
+def test_lod_chain_files(tmp_path):
+    source = tmp_path / 'sphere.tmsh'
+    save_mesh(str(source), sphere(5000))
+    output = tmp_path / 'out.glb'
+    
+    report = generate_lods(str(source), str(output), ratios=[0.1, 0.5])
+    
+    assert report['status'] == 'success'
+    faces = [level['faces'] for level in report['lods']]
+    assert [level['ratio'] for level in report['lods']] == [0.5, 0.1]
+    assert faces[0] > faces[1]
+    for level, entry in enumerate(report['lods']):
+        assert entry['output'] == lod_path(str(output), level)
+        assert load_mesh(entry['output']).num_faces == entry['faces']
+
+
+def test_unwelded_stl_stays_closed(tmp_path):
+    source = tmp_path / 'sphere.stl'
+    mesh = sphere(5000)
+    save_mesh(str(source), mesh)
+    
+    report = generate_lods(str(source), ratios=[0.5, 0.25])
+    
+    assert report['status'] == 'success'
+    for entry in report['lods']:
+        lod = entry['mesh']
+        assert lod.num_faces == pytest.approx(entry['ratio'] * mesh.num_faces, rel=0.05)
+        # Closed genus-0 surface: V = F / 2 + 2
+        assert lod.num_vertices == lod.num_faces // 2 + 2
+        assert len(EdgeTable.from_faces(lod.faces).boundary_edges()) == 0
+
+
+def test_invalid_ratios():
+    with pytest.raises(ValueError):
+        normalize_ratios([0.5, 1.5])
+    with pytest.raises(ValueError):
+        normalize_ratios([])
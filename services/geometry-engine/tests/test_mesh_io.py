@@ -0,0 +1,145 @@
+"""Tests for utils.mesh_io round trips and streaming"""
+
+import numpy as np
+import pytest
+
+from utils.mesh import Mesh
+from utils.mesh_io import load_mesh, save_mesh, mesh_chunks, STREAM_FORMATS
+
+from conftest import cube_mesh
+
+
+def _attributed_cube() -> Mesh:
+    cube = cube_mesh()
+    normals = cube.vertices - np.float32(0.5)
+    normals /= np.linalg.norm(normals, axis=1, keepdims=True)
+    return Mesh(cube.vertices, cube.faces, normals, cube.vertices[:, :2].copy())
+
+
+@pytest.mark.parametrize('ext', ['.glb', '.obj', '.tmsh'])
+def test_round_trip_keeps_all_attributes(tmp_path, ext):
+    mesh = _attributed_cube()
+    path = tmp_path / f"cube{ext}"
+    
+    size = save_mesh(str(path), mesh)
+    loaded = load_mesh(str(path))
+    
+    assert size == path.stat().st_size
+    assert loaded.vertices.dtype == np.float32
+    assert loaded.faces.dtype == np.uint32
+    assert np.array_equal(loaded.faces, mesh.faces)
+    assert np.allclose(loaded.vertices, mesh.vertices)
+    assert np.allclose(loaded.normals, mesh.normals, atol=1e-6)
+    assert np.allclose(loaded.uvs, mesh.uvs)
+
+
+def test_stl_round_trip_keeps_the_triangles(tmp_path):
+    mesh = cube_mesh()
+    path = tmp_path / 'cube.stl'
+    
+    save_mesh(str(path), mesh)
+    loaded = load_mesh(str(path))
+    
+    # STL stores every corner separately
+    assert loaded.num_faces == 12
+    assert np.allclose(loaded.vertices[loaded.faces], mesh.vertices[mesh.faces])
+
+
+def test_ascii_stl(tmp_path):
+    path = tmp_path / 'tri.stl'
+    path.write_text(
+        "solid tri\n"
+        " facet normal 0 0 1\n  outer loop\n"
+        "   vertex 0 0 0\n   vertex 1 0 0\n   vertex 0 1 0\n"
+        "  endloop\n endfacet\n"
+        "endsolid tri\n"
+    )
+    
+    loaded = load_mesh(str(path))
+    
+    assert loaded.num_faces == 1
+    assert np.allclose(loaded.vertices[loaded.faces[0]], [[0, 0, 0], [1, 0, 0], [0, 1, 0]])
+
+
+def test_obj_polygons_and_relative_indices(tmp_path):
+    path = tmp_path / 'quad.obj'
+    path.write_text("v 0 0 0\nv 1 0 0\nv 1 1 0\nv 0 1 0\nf -4 -3 -2 -1\n")
+    
+    loaded = load_mesh(str(path))
+    
+    assert loaded.faces.tolist() == [[0, 1, 2], [0, 2, 3]]
+
+
+def test_obj_trailing_comments(tmp_path):
+    path = tmp_path / 'quad.obj'
+    # The relative indices send the second block through the line parser
+    path.write_text(
+        "# quad\nv 0 0 0\nv 1 0 0 # x\nv 1 1 0\nv 0 1 0\nf 1 2 3 # tri\n"
+        "v 0 0 1\nf -5 -3 -2 # relative\n"
+    )
+    
+    loaded = load_mesh(str(path))
+    
+    assert loaded.num_vertices == 5
+    assert loaded.faces.tolist() == [[0, 1, 2], [0, 2, 3]]
+
+
+@pytest.mark.parametrize('text', [
+    "v 0 0 0\nv 1 0 0\nv 0 1 0\nf 1 2 99\n",
+    "v 0 0 0\nv 1 0 0\nv 0 1 0\nf -4 1 2\n",
+    "v 0 0 0\nv 1 0 0\nv 0 1 0\nvt 0 0\nf 1/1 2/2 3/1\n",
+])
+def test_obj_indices_out_of_range(tmp_path, text):
+    path = tmp_path / 'bad.obj'
+    path.write_text(text)
+    
+    with pytest.raises(ValueError):
+        load_mesh(str(path))
+    with pytest.raises(ValueError):
+        load_mesh(str(path), split_seams=True)
+
+
+@pytest.mark.parametrize('ext', ['.glb', '.tmsh'])
+def test_index_buffers_out_of_range(tmp_path, ext):
+    cube = cube_mesh()
+    path = tmp_path / f"bad{ext}"
+    save_mesh(str(path), Mesh(cube.vertices, np.vstack([cube.faces, [[0, 1, 8]]])))
+    
+    with pytest.raises(ValueError, match='out of range'):
+        load_mesh(str(path))
+
+
+def test_unsupported_format(tmp_path):
+    with pytest.raises(ValueError):
+        load_mesh(str(tmp_path / 'mesh.fbx'))
+
+
+@pytest.mark.parametrize('ext', sorted(STREAM_FORMATS))
+def test_streamed_chunks_equal_the_saved_file(tmp_path, ext):
+    mesh = _attributed_cube()
+    path = tmp_path / f"cube{ext}"
+    save_mesh(str(path), mesh)
+    
+    streamed = b''.join(bytes(chunk) for chunk in mesh_chunks(mesh, ext, chunk_size=64))
+    
+    assert streamed == path.read_bytes()
+
+
+def test_incremental_edits_keep_derived_data_exact():
+    mesh = _attributed_cube()
+    mesh.edge_table, mesh.face_areas
+    remove = np.zeros(12, dtype=bool)
+    remove[[0, 5]] = True
+    flip = np.zeros(10, dtype=bool)
+    flip[[1, 2]] = True
+    
+    mesh.remove_faces(remove)
+    mesh.flip_faces(flip)
+    mesh.add_faces(np.array([[0, 2, 1]]))
+    
+    fresh = Mesh(mesh.vertices, mesh.faces)
+    assert np.array_equal(mesh.edge_table.keys, fresh.edge_table.keys)
+    assert np.array_equal(mesh.edge_table.counts, fresh.edge_table.counts)
+    assert np.array_equal(mesh.edge_table.face_edges, fresh.edge_table.face_edges)
+    assert np.allclose(mesh.face_normals, fresh.face_normals)
+    assert np.allclose(mesh.face_areas, fresh.face_areas)
@@ -0,0 +1,51 @@
+"""Tests for utils.metrics"""
+
+from utils.metrics import MetricsRegistry, note_mesh, run_traced, span, timed
+
+
+@timed('outer')
+def _work():
+    with span('inner'):
+        note_mesh(1234)
+    with span('inner'):
+        pass
+    return 7
+
+
+def test_spans_are_recorded_per_trace():
+    result, report = run_traced(_work)
+    
+    assert result == 7
+    assert report['faces'] == 1234
+    names = [entry['name'] for entry in report['spans']]
+    assert sorted(set(names)) == ['inner', 'outer']
+    assert report['elapsed'] >= max(entry['seconds'] for entry in report['spans'])
+
+
+def test_spans_outside_a_trace_are_free():
+    assert _work() == 7
+
+
+def test_memory_trace_adds_allocation_peaks():
+    def allocate():
+        with span('allocate'):
+            return bytearray(4 << 20)
+    
+    _, report = run_traced(allocate, memory=True)
+    
+    entry = next(entry for entry in report['spans'] if entry['name'] == 'allocate')
+    assert entry['alloc_peak_mb'] >= 4
+
+
+def test_registry_renders_prometheus_text():
+    registry = MetricsRegistry()
+    _, report = run_traced(_work)
+    
+    registry.record('diagnose', 'completed', report)
+    registry.record('diagnose', 'failed', None)
+    text = registry.render({'geometry_queue_depth': 3})
+    
+    assert 'geometry_jobs_total{operation="diagnose",status="completed"} 1' in text
+    assert 'geometry_jobs_total{operation="diagnose",status="failed"} 1' in text
+    assert 'geometry_stage_seconds_count{operation="diagnose",stage="inner"}' in text
+    assert 'geometry_queue_depth 3' in text
@@ -0,0 +1,107 @@
+"""Tests for convert.native_convert"""
+
+import json
+import struct
+
+import numpy as np
+
+from convert.native_convert import NativeConverter
+from utils.mesh_io import load_mesh, save_mesh
+
+from conftest import cube_mesh
+
+# Two triangles sharing an edge whose corners on that edge have different
+# texture coordinates and normals on each side (a UV seam / hard edge)
+SEAM_OBJ = b"""\
+v 0 0 0
+v 1 0 0
+v 1 1 0
+v 0 1 1
+vt 0 0
+vt 1 0
+vt 1 1
+vt 0.5 0.5
+vt 0.6 0.6
+vt 0 1
+vn 0 0 1
+vn 0 -1 1
+f 1/1/1 2/2/1 3/3/1
+f 1/4/2 3/5/2 4/6/2
+"""
+
+
+def test_obj_seams_keep_uvs_and_normals(tmp_path):
+    source = tmp_path / 'seam.obj'
+    source.write_bytes(SEAM_OBJ)
+    output = tmp_path / 'seam.glb'
+    converter = NativeConverter()
+    
+    assert converter.supports(str(source), str(output))
+    result = converter.convert(str(source), str(output))
+    
+    assert result['success']
+    mesh = load_mesh(str(output))
+    assert mesh.num_faces == 2
+    # Vertices 1 and 3 are split along the seam
+    assert mesh.num_vertices == 6
+    corner_uvs = {tuple(uv) for uv in mesh.uvs[mesh.faces.ravel()].astype(np.float64).round(3)}
+    assert corner_uvs == {(0, 0), (1, 0), (1, 1), (0.5, 0.5), (0.6, 0.6), (0, 1)}
+    assert len(mesh.normals) == 6
+
+
+def test_obj_seams_stay_welded_for_repair(tmp_path):
+    source = tmp_path / 'seam.obj'
+    source.write_bytes(SEAM_OBJ)
+    
+    mesh = load_mesh(str(source))
+    
+    assert mesh.num_vertices == 4
+    assert len(mesh.uvs) == 0
+    assert len(mesh.normals) == 0
+
+
+def test_per_vertex_obj_is_unchanged(tmp_path):
+    source = tmp_path / 'cube.obj'
+    save_mesh(str(source), cube_mesh())
+    
+    assert np.array_equal(load_mesh(str(source), split_seams=True).faces, load_mesh(str(source)).faces)
+
+
+def _write_gltf(path, document):
+    cube = cube_mesh()
+    data = cube.vertices.tobytes() + cube.faces.tobytes()
+    document.update({
+        'asset': {'version': '2.0'},
+        'buffers': [{'byteLength': len(data)}],
+        'bufferViews': [
+            {'buffer': 0, 'byteOffset': 0, 'byteLength': cube.vertices.nbytes},
+            {'buffer': 0, 'byteOffset': cube.vertices.nbytes, 'byteLength': cube.faces.nbytes},
+        ],
+        'accessors': [
+            {'bufferView': 0, 'componentType': 5126, 'count': 8, 'type': 'VEC3',
+             'min': [0, 0, 0], 'max': [1, 1, 1]},
+            {'bufferView': 1, 'componentType': 5125, 'count': 36, 'type': 'SCALAR'},
+        ],
+        'nodes': [{'mesh': 0}],
+        'scenes': [{'nodes': [0]}],
+    })
+    text = json.dumps(document).encode()
+    text += b' ' * (-len(text) % 4)
+    with open(path, 'wb') as f:
+        f.write(struct.pack('<4sII', b'glTF', 2, 12 + 8 + len(text) + 8 + len(data)))
+        f.write(struct.pack('<II', len(text), 0x4E4F534A) + text)
+        f.write(struct.pack('<II', len(data), 0x004E4942) + data)
+
+
+def test_gltf_with_a_material_goes_to_blender(tmp_path):
+    plain = tmp_path / 'plain.glb'
+    _write_gltf(plain, {'meshes': [{'primitives': [{'attributes': {'POSITION': 0}, 'indices': 1}]}]})
+    textured = tmp_path / 'material.glb'
+    _write_gltf(textured, {
+        'meshes': [{'primitives': [{'attributes': {'POSITION': 0}, 'indices': 1, 'material': 0}]}],
+        'materials': [{'name': 'red', 'pbrMetallicRoughness': {'baseColorFactor': [1, 0, 0, 1]}}],
+    })
+    converter = NativeConverter()
+    
+    assert converter.supports(str(plain), str(tmp_path / 'out.stl'))
+    assert not converter.supports(str(textured), str(tmp_path / 'out.stl'))
@@ -0,0 +1,126 @@
+"""Tests for repair.index"""
+
+import numpy as np
+
+from diagnose.index import GeometryDiagnostics
+from generators import sphere, scan
+from pipeline.index import RepairPipeline
+from repair.holes import boundary_loops, fill_holes
+from repair.index import GeometryRepair
+from repair.normals import compute_vertex_normals
+from utils.mesh import Mesh
+
+from conftest import cube_mesh
+
+
+def _rotated(faces: np.ndarray) -> np.ndarray:
+    """Faces rotated to start at their lowest vertex (same winding)"""
+    faces = np.asarray(faces, dtype=np.int64)
+    shift = np.argmin(faces, axis=1)
+    return faces[np.arange(len(faces))[:, None], (np.arange(3) + shift[:, None]) % 3]
+
+
+def test_repair_keeps_a_clean_cube():
+    result = GeometryRepair(cube_mesh()).repair_all()
+    
+    mesh = result['mesh']
+    assert mesh.num_faces == 12
+    assert mesh.num_vertices == 8
+    assert len(mesh.normals) == 8
+
+
+def test_split_copies_are_welded():
+    cube = cube_mesh()
+    # Every face gets its own three corners
+    mesh = Mesh(cube.vertices[cube.faces.ravel()], np.arange(36, dtype=np.uint32).reshape(-1, 3))
+    
+    result = GeometryRepair(mesh).repair_all()
+    
+    assert result['mesh'].num_vertices == 8
+    assert 'open_boundaries' not in {item['type'] for item in GeometryDiagnostics(result['mesh']).analyze()['issues']}
+
+
+def test_degenerate_faces_and_orphans_are_removed():
+    cube = cube_mesh()
+    vertices = np.vstack([cube.vertices, [[5, 5, 5]]]).astype(np.float32)
+    faces = np.vstack([cube.faces[:6], [[0, 0, 1]], [[1, 2, 8]], cube.faces[6:]]).astype(np.uint32)
+    faces[7] = [8, 8, 3]
+    
+    mesh = GeometryRepair(Mesh(vertices, faces)).repair_all()['mesh']
+    
+    assert mesh.num_faces == 12
+    assert mesh.num_vertices == 8
+    assert np.array_equal(mesh.faces, cube.faces)
+
+
+def test_winding_is_unified_and_outward():
+    cube = cube_mesh()
+    faces = cube.faces.copy()
+    faces[[0, 4, 7]] = faces[[0, 4, 7]][:, ::-1]
+    
+    result = GeometryRepair(Mesh(cube.vertices, faces)).repair_all()
+    inverted = GeometryRepair(Mesh(cube.vertices, cube.faces[:, ::-1])).repair_all()
+    
+    assert np.array_equal(_rotated(result['mesh'].faces), _rotated(cube.faces))
+    assert np.array_equal(_rotated(inverted['mesh'].faces), _rotated(cube.faces))
+
+
+def test_holes_are_filled_and_closed():
+    mesh = scan(5000)
+    loops = len(boundary_loops(mesh.faces)[1]) - 1
+    
+    new_faces, filled, skipped = fill_holes(mesh.vertices, mesh.faces, max_perimeter=30.0)
+    closed = np.vstack([mesh.faces, new_faces])
+    
+    # Everything but the outer rim of the scan is filled
+    assert loops > 1
+    assert filled == loops - 1 and skipped == 1
+    assert len(boundary_loops(closed)[1]) - 1 == 1
+
+
+def test_vertex_normals_of_a_cube_point_out_of_the_corners():
+    cube = cube_mesh()
+    
+    normals = compute_vertex_normals(cube.vertices, cube.faces, weighting='angle')
+    
+    expected = cube.vertices - 0.5
+    assert np.allclose(normals, expected / np.linalg.norm(expected, axis=1, keepdims=True))
+    # Area weighting is unit length too, and leans towards the same octant
+    area = compute_vertex_normals(cube.vertices, cube.faces)
+    assert np.allclose(np.linalg.norm(area, axis=1), 1.0)
+    assert (np.sign(area) == np.sign(expected)).all()
+
+
+def test_aggressive_crease_split_adds_no_faces():
+    # Hard edges are split into seams; these must not be filled as holes
+    result = GeometryRepair(cube_mesh(), crease_angle=30.0, max_hole_perimeter=10.0).repair_all(aggressive=True)
+    
+    mesh = result['mesh']
+    assert mesh.num_faces == 12
+    assert mesh.num_vertices == 24
+    assert 'fill_holes' in result['repairs']
+
+
+def test_aggressive_crease_split_on_a_sphere():
+    result = GeometryRepair(sphere(2000), crease_angle=1.0).repair_all(aggressive=True)
+    
+    assert result['stats']['after']['faces'] == result['stats']['before']['faces']
+
+
+def test_aggressive_fills_a_hole_before_splitting_creases():
+    mesh = cube_mesh()
+    open_cube = mesh.submesh(np.arange(1, 12))
+    
+    result = GeometryRepair(open_cube, crease_angle=30.0, max_hole_perimeter=10.0).repair_all(aggressive=True)
+    
+    assert result['mesh'].num_faces == 12
+
+
+def test_pipeline_matches_repair_all():
+    mesh = cube_mesh().submesh(np.arange(1, 12))
+    
+    expected = GeometryRepair(mesh, crease_angle=30.0).repair_all(aggressive=True)['mesh']
+    result = RepairPipeline(mesh, aggressive=True, crease_angle=30.0).run()['mesh']
+    
+    assert np.array_equal(result.faces, expected.faces)
+    assert np.allclose(result.vertices, expected.vertices)
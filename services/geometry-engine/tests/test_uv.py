@@ -0,0 +1,54 @@
+"""Tests for diagnose.uv"""
+
+import numpy as np
+import pytest
+
+from diagnose.uv import analyze_uvs
+
+# Two unit squares side by side, split into two triangles each
+STRIP = np.array([[0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 0], [2, 0, 0], [2, 1, 0]], dtype=np.float32)
+STRIP_FACES = np.array([[0, 1, 2], [0, 2, 3], [1, 4, 5], [1, 5, 2]], dtype=np.uint32)
+
+
+def test_planar_projection_is_clean():
+    stats = analyze_uvs(STRIP, STRIP_FACES, STRIP[:, :2] / 2)
+    
+    assert stats['islands'] == 1
+    assert stats['flipped_faces'] == stats['degenerate_faces'] == stats['out_of_range_faces'] == 0
+    assert stats['stretch'] == pytest.approx(1.0)
+    assert stats['coverage'] == pytest.approx(0.5, abs=0.01)
+
+
+def test_flipped_face():
+    uvs = STRIP[:, :2] / 2
+    uvs[3] = [0.5, 0]
+    
+    stats = analyze_uvs(STRIP, STRIP_FACES, uvs)
+    
+    assert stats['flipped_faces'] == 1
+    assert stats['flipped_samples'] == [1]
+
+
+def test_squashed_mapping_stretches():
+    stats = analyze_uvs(STRIP, STRIP_FACES, STRIP[:, :2] * np.float32([0.1, 0.5]))
+    
+    assert stats['stretch'] > 1.5
+    assert stats['max_stretch'] >= stats['stretch']
+
+
+def test_out_of_range():
+    stats = analyze_uvs(STRIP, STRIP_FACES, STRIP[:, :2] + np.float32(1.5))
+    
+    assert stats['out_of_range_faces'] == 4
+
+
+def test_islands_sharing_texture_space_overlap():
+    vertices = np.vstack([STRIP, STRIP + np.float32([5, 0, 0])])
+    faces = np.vstack([STRIP_FACES, STRIP_FACES + 6]).astype(np.uint32)
+    uvs = np.vstack([STRIP[:, :2] / 2] * 2)
+    
+    stats = analyze_uvs(vertices, faces, uvs)
+    
+    assert stats['islands'] == 2
+    assert stats['overlapping_islands'] == 2
+    assert stats['overlap'] == pytest.approx(1.0)
@@ -0,0 +1,71 @@
+"""Tests for repair.weld"""
+
+import time
+
+import numpy as np
+
+from repair.weld import weld_vertices
+
+
+def test_exact_duplicates_merge():
+    vertices = np.array([[0, 0, 0], [1, 0, 0], [0, 0, 0], [1, 0, 0], [0, 1, 0]], dtype=np.float32)
+    
+    keep, remap = weld_vertices(vertices, 1e-6)
+    
+    assert keep.tolist() == [0, 1, 4]
+    assert remap.tolist() == [0, 1, 0, 1, 2]
+
+
+def test_pairs_across_a_cell_boundary_merge():
+    tolerance = 1e-3
+    # 4 x tolerance is the cell size; the two points straddle x = 0.004
+    vertices = np.array([[0.0039995, 0, 0], [0.0040005, 0, 0], [0.5, 0, 0]])
+    
+    keep, remap = weld_vertices(vertices, tolerance)
+    
+    assert keep.tolist() == [0, 2]
+    assert remap.tolist() == [0, 0, 1]
+
+
+def test_points_farther_than_tolerance_stay():
+    vertices = np.array([[0, 0, 0], [2e-6, 0, 0]])
+    
+    keep, _ = weld_vertices(vertices, 1e-6)
+    
+    assert keep.tolist() == [0, 1]
+
+
+def test_jittered_copies_merge():
+    rng = np.random.default_rng(0)
+    base = rng.random((200, 3))
+    vertices = np.concatenate([base, base + rng.normal(0, 1e-5, base.shape)])
+    
+    keep, remap = weld_vertices(vertices, 1e-3)
+    
+    # The base points are far apart, so every point pairs with its jittered copy
+    assert keep.tolist() == list(range(200))
+    assert np.array_equal(remap, np.tile(np.arange(200), 2))
+
+
+def test_many_coincident_vertices_are_fast():
+    vertices = np.zeros((40000, 3))
+    
+    start = time.perf_counter()
+    keep, remap = weld_vertices(vertices, 1e-6)
+    elapsed = time.perf_counter() - start
+    
+    assert keep.tolist() == [0]
+    assert not remap.any()
+    assert elapsed < 2.0
+
+
+def test_crowded_and_sparse_cells_give_the_same_clusters():
+    rng = np.random.default_rng(1)
+    base = rng.random((50, 3))
+    for copies in (3, 40):
+        vertices = np.tile(base, (copies, 1))
+        
+        keep, remap = weld_vertices(vertices, 1e-6)
+        
+        assert keep.tolist() == list(range(50))
+        assert np.array_equal(remap, np.tile(np.arange(50), copies))